@@ -166,17 +166,21 @@ class Settings(BaseSettings):
         default="/app/data/riddle_state.json",
         description="Path to riddle state JSON",
     )
+    riddle_db_path: str = Field(
+        default="/app/data/riddle_game.db",
+        description="Path to riddle game SQLite database (scores, attempts, solvers)",
+    )
     riddle_scores_path: str = Field(
         default="/app/data/riddle_scores.json",
-        description="Path to riddle season scores JSON",
+        description="Path to riddle season scores JSON (pre-SQLite, imported once)",
     )
     riddle_daily_log_path: str = Field(
         default="/app/data/riddle_daily_log.json",
-        description="Path to riddle daily log JSON",
+        description="Path to riddle daily log JSON (pre-SQLite, imported once)",
     )
     riddle_archive_path: str = Field(
         default="/app/data/riddle_game_archive.json",
-        description="Path to riddle game archive JSON",
+        description="Path to riddle game archive JSON (pre-SQLite, imported once)",
     )
     sensor_log_dir: str = Field(
         default="/app/data/sensor_log",
@@ -25,7 +25,7 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, script_dir)
 sys.path.insert(0, os.path.dirname(script_dir))  # Parent for app.config
 
-from utils.io import atomic_write_json, atomic_read_json
+from utils.io import atomic_read_json
 from utils.logger import create_logger
 
 log = create_logger("backfill_scores")
@@ -253,7 +253,8 @@ def score_guesses(guesses: List[Dict[str, Any]], dry_run: bool = True) -> None:
             judgment = narrator.judge_riddle(
                 user_guess=guess_text,
                 correct_answer=correct_answer,
-                riddle_text=riddle_text
+                riddle_text=riddle_text,
+                riddle_date=date_id,
             )
             
             is_correct = judgment["correct"]
@@ -286,24 +287,7 @@ def score_guesses(guesses: List[Dict[str, Any]], dry_run: bool = True) -> None:
                 
                 if not dry_run:
                     # Actually update scores
-                    scores = atomic_read_json("/app/data/riddle_scores.json", default={"players": {}})
-                    players = scores.setdefault("players", {})
-                    
-                    if sender not in players:
-                        players[sender] = {
-                            "display_name": sender.split("@")[0].lower(),
-                            "points": 0,
-                            "wins": 0,
-                            "last_played": date_id
-                        }
-                    
-                    player = players[sender]
-                    player["points"] = player.get("points", 0) + points
-                    if is_first:
-                        player["wins"] = player.get("wins", 0) + 1
-                    player["last_played"] = date_id
-                    
-                    atomic_write_json("/app/data/riddle_scores.json", scores)
+                    scorekeeper.award_points(sender, points, is_first, date_id)
             else:
                 log(f"  {sender}: '{guess_text[:20]}' -> wrong")
     
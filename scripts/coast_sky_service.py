@@ -1,7 +1,9 @@
 """Coast & Sky Service for The Greenhouse Gazette.
 
-Provides tide predictions (NOAA CO-OPS) and astronomical event summaries
-(meteor showers, named moon events) from static calendars.
+Provides tide predictions (computed offline from the station's harmonic
+constituents, see tide_predictor.py; NOAA CO-OPS as fallback and optional
+cross-check) and astronomical event summaries (meteor showers, named moon
+events) from static calendars.
 
 Ocean Station: 8652226 (Jennette's Pier, NC) - Predictions for surfing/charts
 Sound Station: 8652247 (Oregon Inlet Marina) - Observed levels for flooding
@@ -10,17 +12,20 @@ Datum: MLLW
 Units: Feet
 """
 
+import asyncio
 import json
 import os
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
 import requests
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+import tide_predictor
+from utils.fetch_cache import cached_fetch, cached_fetch_async
+from utils.http_client import fetch_json_async
 from utils.logger import create_logger
-from utils.io import atomic_write_json
 
 # Lazy settings loader for app.config integration
 _settings = None
@@ -54,9 +59,9 @@ NOAA_STATION_NAME = OCEAN_STATION_NAME
 
 NOAA_BASE_URL = "https://api.tidesandcurrents.noaa.gov/api/prod/datagetter"
 
-# Cache configuration - persist to mounted volume (survives container restarts)
-CACHE_PATH = os.getenv("COAST_SKY_CACHE_PATH", "/app/data/coast_sky_cache.json")
-CACHE_TTL_HOURS = int(os.getenv("COAST_SKY_CACHE_TTL_HOURS", "6"))
+# Also fetch NOAA's hi/lo predictions and log how far the local harmonic
+# predictions are from them (the local result is still used)
+TIDE_NOAA_CROSSCHECK = os.getenv("TIDE_NOAA_CROSSCHECK", "false").lower() == "true"
 
 # Calendar paths
 CALENDARS_DIR = os.getenv("CALENDARS_DIR", "/app/data/calendars")
@@ -75,34 +80,6 @@ def _get_local_tz() -> ZoneInfo:
         return ZoneInfo("America/New_York")
 
 
-def _load_cache() -> Optional[Dict[str, Any]]:
-    """Load cached coast/sky data if fresh enough."""
-    if not os.path.exists(CACHE_PATH):
-        return None
-    try:
-        with open(CACHE_PATH, "r", encoding="utf-8") as f:
-            cache = json.load(f)
-        cached_at = datetime.fromisoformat(cache.get("cached_at", ""))
-        if datetime.utcnow() - cached_at < timedelta(hours=CACHE_TTL_HOURS):
-            log(f"Using cached coast/sky data from {cached_at.isoformat()}")
-            return cache.get("data")
-    except Exception as exc:
-        log(f"Cache read error: {exc}")
-    return None
-
-
-def _save_cache(data: Dict[str, Any]) -> None:
-    """Save coast/sky data to cache."""
-    try:
-        cache = {
-            "cached_at": datetime.utcnow().isoformat(),
-            "data": data,
-        }
-        atomic_write_json(CACHE_PATH, cache, indent=None)
-    except Exception as exc:
-        log(f"Cache write error: {exc}")
-
-
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=2, max=30),
@@ -116,11 +93,38 @@ def _fetch_noaa_data(params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     return resp.json()
 
 
-def _fetch_noaa_tides(date_local: datetime) -> Dict[str, Any]:
-    """Fetch tide predictions from NOAA CO-OPS for the given date.
+def _fetch_noaa_cached(source: str, params: Dict[str, Any], key: str) -> Optional[Dict[str, Any]]:
+    """Fetch NOAA data through the shared cache (error payloads aren't cached)."""
 
-    Returns structured tide_summary or empty dict on failure.
-    """
+    def fetch() -> Optional[Dict[str, Any]]:
+        data = _fetch_noaa_data(params)
+        if data and "error" in data:
+            log(f"NOAA error for station {params.get('station')}: "
+                f"{data.get('error', {}).get('message', 'Unknown')}")
+            return None
+        return data
+
+    return cached_fetch(source, fetch, key=key)
+
+
+async def _fetch_noaa_cached_async(
+    client, source: str, params: Dict[str, Any], key: str, deadline: float
+) -> Optional[Dict[str, Any]]:
+    """Async twin of _fetch_noaa_cached on a shared httpx client."""
+
+    async def fetch() -> Optional[Dict[str, Any]]:
+        data = await fetch_json_async(client, NOAA_BASE_URL, params, deadline)
+        if data and "error" in data:
+            log(f"NOAA error for station {params.get('station')}: "
+                f"{data.get('error', {}).get('message', 'Unknown')}")
+            return None
+        return data
+
+    return await cached_fetch_async(source, fetch, key=key, deadline=deadline)
+
+
+def _tide_request(date_local: datetime) -> Tuple[Dict[str, Any], str]:
+    """NOAA prediction params for today and tomorrow, plus the cache key."""
     # Request predictions for today and tomorrow (48 hours)
     begin_date = date_local.strftime("%Y%m%d")
     end_date = (date_local + timedelta(days=1)).strftime("%Y%m%d")
@@ -136,81 +140,157 @@ def _fetch_noaa_tides(date_local: datetime) -> Dict[str, Any]:
         "interval": "hilo",  # high/low only
         "format": "json",
     }
+    log(f"Fetching NOAA tides for station {NOAA_STATION_ID} ({begin_date} to {end_date})")
+    return params, f"{NOAA_STATION_ID}-{begin_date}"
+
+
+def _fetch_noaa_tides(date_local: datetime) -> Dict[str, Any]:
+    """Fetch tide predictions from NOAA CO-OPS for the given date.
 
+    Returns structured tide_summary or empty dict on failure.
+    """
+    params, key = _tide_request(date_local)
     try:
-        log(
-            f"Fetching NOAA tides for station {NOAA_STATION_ID} ({begin_date} to {end_date})"
-        )
-        data = _fetch_noaa_data(params)
+        data = _fetch_noaa_cached("noaa_tides", params, key=key)
         if data is None:
             log("NOAA API request failed after retries")
             return None
+        return _parse_tides(data, date_local)
+    except Exception as exc:
+        log(f"NOAA tide fetch error: {exc}")
+        return {}
 
-        predictions = data.get("predictions", [])
-        if not predictions:
-            log("NOAA returned no predictions")
-            return {}
 
-        high_tides = []
-        low_tides = []
+def _predict_tides(date_local: datetime) -> Optional[Dict[str, Any]]:
+    """Tide summary for today and tomorrow from the local harmonic model.
 
-        for pred in predictions:
-            time_str = pred.get("t", "")
-            height_str = pred.get("v", "0")
-            tide_type = pred.get("type", "")  # "H" for high, "L" for low
+    Covers the same 48 hours as the NOAA request. Returns None (callers
+    then use NOAA's predictions) unless the station has constituents
+    downloaded from NOAA by ``tide_predictor.py --refresh``.
+    """
+    station = tide_predictor.get_station(NOAA_STATION_ID)
+    if station is None:
+        return None
+    if not station.published:
+        log("Tide constituents are not NOAA's published values; using NOAA predictions")
+        return None
+    start = date_local.replace(hour=0, minute=0, second=0, microsecond=0)
+    try:
+        events = tide_predictor.predict_hilo(start, start + timedelta(days=2), NOAA_STATION_ID)
+    except Exception as exc:  # noqa: BLE001
+        log(f"Harmonic tide prediction error: {exc}")
+        return None
+    if events is None:
+        return None
+    return _parse_tides({"predictions": events}, date_local, source="harmonic")
+
+
+def _crosscheck_tides(tide_summary: Dict[str, Any], noaa_data: Optional[Dict[str, Any]]) -> None:
+    """Log the worst time/height disagreement with NOAA's own predictions."""
+    if not noaa_data:
+        log("Tide cross-check skipped: no NOAA predictions")
+        return
+    ours = [
+        {"t": e["time_local"], "v": str(e["height_ft"]), "type": kind}
+        for kind, key in (("H", "high_tides"), ("L", "low_tides"))
+        for e in tide_summary.get(key, [])
+    ]
+    diff = tide_predictor.compare_hilo(ours, noaa_data.get("predictions", []))
+    if diff:
+        log(f"Tide cross-check vs NOAA: {diff['matched']} events, "
+            f"max {diff['max_minutes']} min / {diff['max_feet']} ft off")
+
+
+def _get_tides(date_local: datetime) -> Optional[Dict[str, Any]]:
+    """Harmonic tide summary if NOAA's constants are on disk, else NOAA's predictions."""
+    summary = _predict_tides(date_local)
+    if summary is None:
+        return _fetch_noaa_tides(date_local)
+    if TIDE_NOAA_CROSSCHECK:
+        params, key = _tide_request(date_local)
+        _crosscheck_tides(summary, _fetch_noaa_cached("noaa_tides", params, key=key))
+    return summary
+
+
+def _parse_tides(data: Dict[str, Any], date_local: datetime, source: str = "noaa") -> Dict[str, Any]:
+    """Build tide_summary from a hi/lo predictions response (NOAA-shaped).
+
+    ``source`` records where the predictions came from ("noaa" or "harmonic").
+    """
+    predictions = data.get("predictions", [])
+    if not predictions:
+        log(f"No tide predictions ({source})")
+        return {}
 
-            try:
-                height_ft = round(float(height_str), 1)
-            except (ValueError, TypeError):
-                height_ft = 0.0
+    high_tides = []
+    low_tides = []
 
-            entry = {
-                "time_local": time_str,
-                "height_ft": height_ft,
-            }
+    for pred in predictions:
+        time_str = pred.get("t", "")
+        height_str = pred.get("v", "0")
+        tide_type = pred.get("type", "")  # "H" for high, "L" for low
 
-            if tide_type == "H":
-                high_tides.append(entry)
-            elif tide_type == "L":
-                low_tides.append(entry)
-
-        # Compute today's extremes
-        today_str = date_local.strftime("%Y-%m-%d")
-        today_highs = [h for h in high_tides if h["time_local"].startswith(today_str)]
-        today_lows = [
-            low for low in low_tides if low["time_local"].startswith(today_str)
-        ]
-
-        max_high_ft = max((h["height_ft"] for h in today_highs), default=None)
-        min_low_ft = min((low["height_ft"] for low in today_lows), default=None)
-
-        # Simple king tide heuristic: if max high > 5.5 ft at Jennette's Pier
-        # (this threshold should be tuned for local conditions)
-        KING_TIDE_THRESHOLD_FT = 5.5
-        is_king_tide_window = (
-            max_high_ft is not None and max_high_ft >= KING_TIDE_THRESHOLD_FT
-        )
+        try:
+            height_ft = round(float(height_str), 1)
+        except (ValueError, TypeError):
+            height_ft = 0.0
 
-        tide_summary = {
-            "station_id": NOAA_STATION_ID,
-            "station_name": NOAA_STATION_NAME,
-            "high_tides": high_tides,
-            "low_tides": low_tides,
-            "today_high_tides": today_highs,
-            "today_low_tides": today_lows,
-            "max_high_ft": max_high_ft,
-            "min_low_ft": min_low_ft,
-            "is_king_tide_window": is_king_tide_window,
+        entry = {
+            "time_local": time_str,
+            "height_ft": height_ft,
         }
 
-        log(
-            f"NOAA tides fetched: {len(high_tides)} highs, {len(low_tides)} lows, max={max_high_ft}ft"
-        )
-        return tide_summary
+        if tide_type == "H":
+            high_tides.append(entry)
+        elif tide_type == "L":
+            low_tides.append(entry)
 
-    except Exception as exc:
-        log(f"NOAA tide fetch error: {exc}")
-        return {}
+    # Compute today's extremes
+    today_str = date_local.strftime("%Y-%m-%d")
+    today_highs = [h for h in high_tides if h["time_local"].startswith(today_str)]
+    today_lows = [
+        low for low in low_tides if low["time_local"].startswith(today_str)
+    ]
+
+    max_high_ft = max((h["height_ft"] for h in today_highs), default=None)
+    min_low_ft = min((low["height_ft"] for low in today_lows), default=None)
+
+    # Simple king tide heuristic: if max high > 5.5 ft at Jennette's Pier
+    # (this threshold should be tuned for local conditions)
+    KING_TIDE_THRESHOLD_FT = 5.5
+    is_king_tide_window = (
+        max_high_ft is not None and max_high_ft >= KING_TIDE_THRESHOLD_FT
+    )
+
+    tide_summary = {
+        "station_id": NOAA_STATION_ID,
+        "station_name": NOAA_STATION_NAME,
+        "high_tides": high_tides,
+        "low_tides": low_tides,
+        "today_high_tides": today_highs,
+        "today_low_tides": today_lows,
+        "max_high_ft": max_high_ft,
+        "min_low_ft": min_low_ft,
+        "is_king_tide_window": is_king_tide_window,
+        "source": source,
+    }
+
+    log(
+        f"Tides ({source}): {len(high_tides)} highs, {len(low_tides)} lows, max={max_high_ft}ft"
+    )
+    return tide_summary
+
+
+# Last observed sound-side water level (used for current level and flood status)
+_SOUND_PARAMS = {
+    "station": SOUND_STATION_ID,
+    "product": "water_level",
+    "datum": "MLLW",
+    "units": "english",  # feet
+    "time_zone": "lst_ldt",  # local standard/daylight time
+    "date": "latest",
+    "format": "json",
+}
 
 
 def _fetch_sound_water_level() -> Dict[str, Any]:
@@ -227,77 +307,64 @@ def _fetch_sound_water_level() -> Dict[str, Any]:
     
     Returns observed water level data or empty dict on failure.
     """
-    # Request last 6 hours of observed data to get current level and trend
-    params = {
-        "station": SOUND_STATION_ID,
-        "product": "water_level",
-        "datum": "MLLW",
-        "units": "english",  # feet
-        "time_zone": "lst_ldt",  # local standard/daylight time
-        "date": "latest",
-        "format": "json",
-    }
-    
     try:
         log(f"Fetching observed water level from {SOUND_STATION_NAME} ({SOUND_STATION_ID})")
-        data = _fetch_noaa_data(params)
+        data = _fetch_noaa_cached("noaa_sound", _SOUND_PARAMS, key=SOUND_STATION_ID)
         if data is None:
             log("Sound water level API request failed after retries")
             return {}
-        
-        # Check for NOAA error response
-        if "error" in data:
-            log(f"NOAA sound station error: {data.get('error', {}).get('message', 'Unknown')}")
-            return {}
-        
-        observations = data.get("data", [])
-        if not observations:
-            log("No observed water level data returned")
-            return {}
-        
-        # Get the most recent observation
-        latest = observations[-1]
-        time_str = latest.get("t", "")
-        level_str = latest.get("v", "")
-        
-        try:
-            level_ft = round(float(level_str), 2)
-        except (ValueError, TypeError):
-            log(f"Invalid water level value: {level_str}")
-            return {}
-        
-        # Determine flood status
-        if level_ft >= 4.5:
-            flood_status = "major"
-            flood_description = "Major flooding - widespread and dangerous"
-        elif level_ft >= 3.0:
-            flood_status = "moderate"
-            flood_description = "Moderate flooding - roads may be impassable"
-        elif level_ft >= 2.0:
-            flood_status = "minor"
-            flood_description = "Minor flooding - low spots wet, water over bulkheads"
-        else:
-            flood_status = "normal"
-            flood_description = None
-        
-        sound_summary = {
-            "station_id": SOUND_STATION_ID,
-            "station_name": SOUND_STATION_NAME,
-            "observed_level_ft": level_ft,
-            "observed_time": time_str,
-            "flood_status": flood_status,
-            "flood_description": flood_description,
-            "is_flooding": flood_status != "normal",
-        }
-        
-        log(f"Sound water level: {level_ft} ft ({flood_status}) at {time_str}")
-        return sound_summary
-        
+        return _parse_sound_level(data)
     except Exception as exc:
         log(f"Sound water level fetch error: {exc}")
         return {}
 
 
+def _parse_sound_level(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build sound_level summary (with flood status) from a NOAA water_level response."""
+    observations = data.get("data", [])
+    if not observations:
+        log("No observed water level data returned")
+        return {}
+
+    # Get the most recent observation
+    latest = observations[-1]
+    time_str = latest.get("t", "")
+    level_str = latest.get("v", "")
+
+    try:
+        level_ft = round(float(level_str), 2)
+    except (ValueError, TypeError):
+        log(f"Invalid water level value: {level_str}")
+        return {}
+
+    # Determine flood status
+    if level_ft >= 4.5:
+        flood_status = "major"
+        flood_description = "Major flooding - widespread and dangerous"
+    elif level_ft >= 3.0:
+        flood_status = "moderate"
+        flood_description = "Moderate flooding - roads may be impassable"
+    elif level_ft >= 2.0:
+        flood_status = "minor"
+        flood_description = "Minor flooding - low spots wet, water over bulkheads"
+    else:
+        flood_status = "normal"
+        flood_description = None
+
+    sound_summary = {
+        "station_id": SOUND_STATION_ID,
+        "station_name": SOUND_STATION_NAME,
+        "observed_level_ft": level_ft,
+        "observed_time": time_str,
+        "flood_status": flood_status,
+        "flood_description": flood_description,
+        "is_flooding": flood_status != "normal",
+    }
+
+    log(f"Sound water level: {level_ft} ft ({flood_status}) at {time_str}")
+    return sound_summary
+
+
 def _load_meteor_calendar() -> List[Dict[str, Any]]:
     """Load meteor shower calendar from static JSON file.
 
@@ -501,31 +568,75 @@ def get_coast_sky_summary(now_local: Optional[datetime] = None) -> Dict[str, Any
     """Get combined coast & sky summary for the current day.
 
     Returns a dict with optional keys:
-    - tide_summary: NOAA tide predictions
+    - tide_summary: harmonic (or NOAA fallback) tide predictions
     - sky_summary: meteor shower info
     - moon_event_summary: named moon events
 
-    Uses caching to avoid repeated API calls.
+    Tides are predicted locally; NOAA responses (sound level, tide
+    fallback/cross-check) go through the shared fetch cache (tides 6h,
+    sound level 30 min); the calendar lookups are local.
     """
     if now_local is None:
         tz = _get_local_tz()
         now_local = datetime.now(tz)
 
-    # Check cache first
-    cached = _load_cache()
-    if cached:
-        return cached
+    # Ocean tides (Jennette's Pier) for charts/surfing; sound-side observed
+    # water level (Oregon Inlet Marina) for narrative/flooding
+    return _assemble_summary(now_local, _get_tides(now_local), _fetch_sound_water_level())
+
+
+async def get_coast_sky_summary_async(
+    client, deadline: float, now_local: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """Async variant of get_coast_sky_summary(): both NOAA requests run concurrently.
 
+    Args:
+        client: httpx.AsyncClient (see utils.http_client.async_client)
+        deadline: time.monotonic() value by which to give up on NOAA
+        now_local: Local time to summarise (default: now)
+    """
+    if now_local is None:
+        now_local = datetime.now(_get_local_tz())
+
+    async def tides() -> Optional[Dict[str, Any]]:
+        summary = _predict_tides(now_local)
+        if summary is not None and not TIDE_NOAA_CROSSCHECK:
+            return summary
+        params, key = _tide_request(now_local)
+        data = await _fetch_noaa_cached_async(client, "noaa_tides", params, key, deadline)
+        if summary is not None:
+            _crosscheck_tides(summary, data)
+            return summary
+        return _parse_tides(data, now_local) if data else None
+
+    async def sound() -> Dict[str, Any]:
+        data = await _fetch_noaa_cached_async(
+            client, "noaa_sound", _SOUND_PARAMS, SOUND_STATION_ID, deadline
+        )
+        return _parse_sound_level(data) if data else {}
+
+    tide_summary, sound_summary = await asyncio.gather(tides(), sound(), return_exceptions=True)
+    if isinstance(tide_summary, Exception):
+        log(f"NOAA tide fetch error: {tide_summary}")
+        tide_summary = {}
+    if isinstance(sound_summary, Exception):
+        log(f"Sound water level fetch error: {sound_summary}")
+        sound_summary = {}
+    return _assemble_summary(now_local, tide_summary, sound_summary)
+
+
+def _assemble_summary(
+    now_local: datetime,
+    tide_summary: Optional[Dict[str, Any]],
+    sound_summary: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Combine NOAA results with the local meteor/moon calendars."""
     result: Dict[str, Any] = {}
 
-    # Fetch ocean tides (Jennette's Pier) - for charts/surfing
-    tide_summary = _fetch_noaa_tides(now_local)
     if tide_summary:
         result["tide_summary"] = tide_summary  # Keep for backwards compatibility
         result["ocean_tides"] = tide_summary   # New explicit key
 
-    # Fetch sound-side observed water level (Oregon Inlet Marina) - for narrative/flooding
-    sound_summary = _fetch_sound_water_level()
     if sound_summary:
         result["sound_level"] = sound_summary
 
@@ -539,10 +650,6 @@ def get_coast_sky_summary(now_local: Optional[datetime] = None) -> Dict[str, Any
     if moon_event:
         result["moon_event_summary"] = moon_event
 
-    # Cache result
-    if result:
-        _save_cache(result)
-
     return result
 
 
@@ -0,0 +1,130 @@
+"""Hourly weather & coast snapshots for Greenhouse Gazette backtesting.
+
+The sensor log (status_daemon) only records what the greenhouse sensors
+saw; the context engine also needs the OpenWeather and NOAA readings it
+was given. The scheduler calls ``record_conditions()`` every hour and the
+snapshot is appended next to the sensor log, in the same monthly JSONL
+layout:
+
+    /app/data/sensor_log/
+        2025-12.jsonl                 # {"ts": ..., "sensors": {...}}
+        conditions/2025-12.jsonl      # {"ts": ..., "weather": {...}, "coast": {...}}
+
+Fetches go through the shared fetch cache, so a snapshot normally costs
+no extra API calls.
+
+Usage:
+    python conditions_log.py          # record one snapshot now
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import external_data
+from utils.logger import create_logger
+
+log = create_logger("conditions_log")
+
+# Lazy settings loader for app.config integration
+_settings = None
+
+
+def _get_settings():
+    """Get settings lazily to avoid import-time failures."""
+    global _settings
+    if _settings is None:
+        try:
+            from app.config import settings
+            _settings = settings
+        except Exception:
+            _settings = None
+    return _settings
+
+
+_cfg = _get_settings()
+SENSOR_LOG_DIR = _cfg.sensor_log_dir if _cfg else os.getenv("SENSOR_LOG_DIR", "/app/data/sensor_log")
+CONDITIONS_LOG_DIR = os.getenv("CONDITIONS_LOG_DIR", os.path.join(SENSOR_LOG_DIR, "conditions"))
+
+# Every line starts like this (compact JSON, "ts" first)
+_TS_PREFIX = '{"ts":"'
+
+# Presentation-only weather fields not worth keeping
+_DROP_WEATHER_KEYS = ("wind_arrow", "daily_wind_arrow", "moon_icon")
+
+
+def record_conditions(now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+    """Append the current weather and sound-side water level to the conditions log.
+
+    Args:
+        now: Naive UTC timestamp for the entry (default: utcnow)
+
+    Returns:
+        The entry written, or None if neither source returned data
+    """
+    now = now or datetime.utcnow()
+    data = external_data.gather_external_data()
+    weather = {k: v for k, v in data.get("weather", {}).items() if k not in _DROP_WEATHER_KEYS}
+    coast = data.get("coast_sky", {}).get("sound_level", {})
+    if not weather and not coast:
+        log("No weather or coast data; snapshot skipped")
+        return None
+
+    entry = {"ts": now.isoformat() + "Z", "weather": weather, "coast": coast}
+    try:
+        os.makedirs(CONDITIONS_LOG_DIR, exist_ok=True)
+        filepath = os.path.join(CONDITIONS_LOG_DIR, now.strftime("%Y-%m") + ".jsonl")
+        with open(filepath, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+    except OSError as exc:
+        log(f"Failed to write conditions snapshot: {exc}")
+        return None
+    return entry
+
+
+def read_hourly(log_dir: str, start: datetime, end: datetime) -> Dict[str, Dict[str, Any]]:
+    """Last entry per UTC hour from a monthly JSONL log directory.
+
+    Works for both the sensor log and the conditions log. ``start`` and
+    ``end`` are naive UTC; only the month files overlapping the range are
+    opened. Lines are grouped by the hour in their leading "ts" field
+    and only the last line of each hour is parsed (the sensor log holds
+    one line a minute).
+
+    Returns:
+        {"YYYY-MM-DDTHH": entry} for start <= hour < end
+    """
+    lo, hi = start.strftime("%Y-%m-%dT%H"), end.strftime("%Y-%m-%dT%H")
+    if end > datetime.strptime(hi, "%Y-%m-%dT%H"):
+        hi += "~"  # Partial final hour is included (sorts after any minute)
+    last_line: Dict[str, str] = {}
+    month = datetime(start.year, start.month, 1)
+    while month < end:
+        filepath = os.path.join(log_dir, month.strftime("%Y-%m") + ".jsonl")
+        month = datetime(month.year + month.month // 12, month.month % 12 + 1, 1)
+        if not os.path.exists(filepath):
+            continue
+        with open(filepath, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(_TS_PREFIX):
+                    hour = line[len(_TS_PREFIX):len(_TS_PREFIX) + 13]
+                else:  # Not written by us; parse to find the timestamp
+                    try:
+                        hour = json.loads(line)["ts"][:13]
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                if lo <= hour < hi:
+                    last_line[hour] = line
+
+    entries = {}
+    for hour, line in last_line.items():
+        try:
+            entries[hour] = json.loads(line)
+        except ValueError:
+            continue
+    return entries
+
+
+if __name__ == "__main__":
+    print(json.dumps(record_conditions(), indent=2, default=str))
@@ -0,0 +1,287 @@
+"""Backtest knowledge-graph rules against logged conditions.
+
+Replays the sensor log and the hourly weather/coast snapshots
+(conditions_log.py) through context_engine at hourly resolution, so
+thresholds in colington_knowledge_graph.json can be tuned against what
+actually happened instead of guessed. Months are replayed in parallel
+worker processes, each evaluating its hours column-wise with
+context_engine.evaluate_context_matrix().
+
+Each replayed hour sees the last sensor reading and the last conditions
+snapshot (up to SNAPSHOT_MAX_AGE_HOURS old) at that hour, merged the way
+the narrator merges them (weather over sensors). Hours with neither are
+counted as gaps.
+
+Reports, per rule: hours fired, share of replayed hours and number of
+episodes (consecutive firing hours); the most common co-occurring pairs;
+and optionally the episode timeline.
+
+Usage:
+    python context_backtest.py --start 2025-01-01 --end 2026-01-01
+    python context_backtest.py --start 2025-06-01 --end 2025-09-01 \\
+        --set thresholds.sound_flood_minor_ft=1.8 \\
+        --set alerts.bridge_wind.triggers.wind_gt_mph=35 --timeline
+    python context_backtest.py --start 2024-01-01 --end 2026-01-01 --json report.json
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+import conditions_log
+import context_engine
+from utils.logger import create_logger
+
+log = create_logger("context_backtest")
+
+SNAPSHOT_MAX_AGE_HOURS = 3  # Forward-fill limit for weather/coast snapshots
+SENSOR_MAX_AGE_HOURS = 1  # ...and for sensor readings
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+_HOUR = timedelta(hours=1)
+
+
+def _local_zone() -> ZoneInfo:
+    cfg = context_engine._get_settings()
+    return ZoneInfo(cfg.tz if cfg else os.getenv("TZ", "America/New_York"))
+
+
+def _recent(by_hour: Dict[str, Any], hour: datetime, max_age_hours: int) -> Optional[Any]:
+    for age in range(max_age_hours + 1):
+        value = by_hour.get((hour - age * _HOUR).strftime("%Y-%m-%dT%H"))
+        if value is not None:
+            return value
+    return None
+
+
+def build_cases(
+    start: datetime, end: datetime, tz: ZoneInfo
+) -> Tuple[List[int], List[Tuple[datetime, Dict[str, Any], Dict[str, Any]]]]:
+    """Hourly context_engine cases between two naive UTC hours.
+
+    Returns:
+        (hour numbers since the epoch, cases) for every hour with data;
+        case datetimes are local, as get_rich_context receives them
+    """
+    sensors = {
+        hour: entry.get("sensors") or {}
+        for hour, entry in conditions_log.read_hourly(
+            conditions_log.SENSOR_LOG_DIR, start - SENSOR_MAX_AGE_HOURS * _HOUR, end
+        ).items()
+    }
+    snapshots = conditions_log.read_hourly(
+        conditions_log.CONDITIONS_LOG_DIR, start - SNAPSHOT_MAX_AGE_HOURS * _HOUR, end
+    )
+
+    hours, cases = [], []
+    hour = start
+    while hour < end:
+        sensor = _recent(sensors, hour, SENSOR_MAX_AGE_HOURS)
+        snapshot = _recent(snapshots, hour, SNAPSHOT_MAX_AGE_HOURS)
+        if sensor is not None or snapshot is not None:
+            snapshot = snapshot or {}
+            weather = {**(sensor or {}), **(snapshot.get("weather") or {})}
+            local = hour.replace(tzinfo=timezone.utc).astimezone(tz)
+            hours.append(int(hour.replace(tzinfo=timezone.utc).timestamp()) // 3600)
+            cases.append((local, weather, snapshot.get("coast") or {}))
+        hour += _HOUR
+    return hours, cases
+
+
+def _episodes(hours: np.ndarray, fired: np.ndarray) -> List[Tuple[int, int]]:
+    """(first hour, last hour) runs of consecutive firing hours."""
+    firing = hours[fired]
+    if not len(firing):
+        return []
+    breaks = np.flatnonzero(np.diff(firing) != 1)
+    starts = np.concatenate([[0], breaks + 1])
+    ends = np.concatenate([breaks, [len(firing) - 1]])
+    return [(int(firing[s]), int(firing[e])) for s, e in zip(starts, ends)]
+
+
+def replay_chunk(start: datetime, end: datetime, graph: Dict[str, Any], tz_name: str) -> Dict[str, Any]:
+    """Replay one UTC hour range (a worker process's unit of work)."""
+    hours, cases = build_cases(start, end, ZoneInfo(tz_name))
+    rules, mask = context_engine.evaluate_context_matrix(cases, graph=graph)
+    hours = np.array(hours, dtype=np.int64)
+    counts = mask.astype(np.int64)
+    return {
+        "rules": [{"id": r["id"], "kind": r["kind"], "priority": r["priority"]} for r in rules],
+        "span_hours": int((end - start) / _HOUR),
+        "hours": len(cases),
+        "fired": counts.sum(axis=0),
+        "cooccurrence": counts.T @ counts,
+        "episodes": [_episodes(hours, mask[:, j]) for j in range(mask.shape[1])],
+    }
+
+
+def _month_chunks(start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+    chunks = []
+    lo = start
+    while lo < end:
+        next_month = datetime(lo.year + lo.month // 12, lo.month % 12 + 1, 1)
+        chunks.append((lo, min(next_month, end)))
+        lo = next_month
+    return chunks
+
+
+def _merge_episodes(runs: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Join runs split across chunk boundaries."""
+    merged: List[Tuple[int, int]] = []
+    for first, last in runs:
+        if merged and first == merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], last)
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def apply_override(graph: Dict[str, Any], assignment: str) -> None:
+    """Apply a ``dotted.path=value`` override in place.
+
+    List elements are addressed by their "id" (alerts.bridge_wind.triggers.
+    wind_gt_mph=35); the value is parsed as JSON, falling back to a string.
+    """
+    path, _, raw = assignment.partition("=")
+    keys = path.strip().split(".")
+    if not raw or not all(keys):
+        raise ValueError(f"Expected path=value, got {assignment!r}")
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw
+
+    node: Any = graph
+    for key in keys[:-1]:
+        if isinstance(node, list):
+            matches = [item for item in node if isinstance(item, dict) and item.get("id") == key]
+            if not matches:
+                raise KeyError(f"No entry with id {key!r} in {path}")
+            node = matches[0]
+        else:
+            node = node.setdefault(key, {})
+    node[keys[-1]] = value
+
+
+def run_backtest(
+    start: datetime,
+    end: datetime,
+    graph: Dict[str, Any],
+    workers: int = DEFAULT_WORKERS,
+) -> Dict[str, Any]:
+    """Replay [start, end) (naive local dates/times) and aggregate the results."""
+    tz = _local_zone()
+    utc_start = start.replace(tzinfo=tz).astimezone(timezone.utc).replace(tzinfo=None, minute=0, second=0, microsecond=0)
+    utc_end = end.replace(tzinfo=tz).astimezone(timezone.utc).replace(tzinfo=None)
+    chunks = _month_chunks(utc_start, utc_end)
+    args = [(lo, hi, graph, tz.key) for lo, hi in chunks]
+
+    began = time.monotonic()
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            results = list(pool.map(replay_chunk, *zip(*args)))
+    else:
+        results = [replay_chunk(*a) for a in args]
+    elapsed = time.monotonic() - began
+
+    rules = results[0]["rules"] if results else []
+    fired = sum((r["fired"] for r in results), np.zeros(len(rules), dtype=np.int64))
+    cooccurrence = sum((r["cooccurrence"] for r in results), np.zeros((len(rules), len(rules)), dtype=np.int64))
+    hours = sum(r["hours"] for r in results)
+
+    def to_local(hour: int) -> datetime:
+        return datetime.fromtimestamp(hour * 3600, tz=timezone.utc).astimezone(tz)
+
+    report_rules = []
+    timeline = []
+    for j, rule in enumerate(rules):
+        runs = _merge_episodes([run for r in results for run in r["episodes"][j]])
+        report_rules.append({
+            **rule,
+            "hours": int(fired[j]),
+            "share": round(float(fired[j]) / hours, 4) if hours else 0.0,
+            "episodes": len(runs),
+        })
+        timeline.extend(
+            {"id": rule["id"], "start": to_local(a).isoformat(), "end": to_local(b).isoformat(), "hours": b - a + 1}
+            for a, b in runs
+        )
+    timeline.sort(key=lambda e: (e["start"], e["id"]))
+
+    pairs = [
+        {"a": rules[i]["id"], "b": rules[j]["id"], "hours": int(cooccurrence[i, j])}
+        for i in range(len(rules)) for j in range(i + 1, len(rules)) if cooccurrence[i, j]
+    ]
+    pairs.sort(key=lambda p: -p["hours"])
+
+    log(f"Replayed {hours} hours in {len(chunks)} chunks ({elapsed:.2f}s)")
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "hours": hours,
+        "gaps": sum(r["span_hours"] for r in results) - hours,
+        "elapsed_s": round(elapsed, 3),
+        "rules": report_rules,
+        "cooccurrence": pairs,
+        "timeline": timeline,
+    }
+
+
+def format_report(report: Dict[str, Any], top_pairs: int = 10, timeline: bool = False) -> str:
+    lines = [
+        f"Backtest {report['start'][:10]} to {report['end'][:10]}: {report['hours']} hours replayed, "
+        f"{report['gaps']} without data ({report['elapsed_s']}s)",
+        "",
+        f"{'Rule':<32} {'Kind':<15} {'Hours':>7} {'Share':>7} {'Episodes':>9}",
+    ]
+    for rule in sorted(report["rules"], key=lambda r: -r["hours"]):
+        lines.append(
+            f"{str(rule['id']):<32} {rule['kind']:<15} {rule['hours']:>7} "
+            f"{rule['share']:>7.1%} {rule['episodes']:>9}"
+        )
+    if report["cooccurrence"]:
+        lines += ["", "Most frequent co-occurrences:"]
+        lines += [f"  {p['a']} + {p['b']}: {p['hours']} h" for p in report["cooccurrence"][:top_pairs]]
+    if timeline:
+        lines += ["", "Timeline:"]
+        lines += [
+            f"  {e['start'][:16].replace('T', ' ')} -> {e['end'][:16].replace('T', ' ')}  {e['id']} ({e['hours']} h)"
+            for e in report["timeline"]
+        ]
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backtest knowledge-graph rules against logged conditions")
+    parser.add_argument("--start", required=True, help="First local date (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, help="End local date, exclusive (YYYY-MM-DD)")
+    parser.add_argument("--graph", help="Knowledge graph JSON (default: the configured one)")
+    parser.add_argument("--set", action="append", default=[], metavar="PATH=VALUE",
+                        help="Override a graph value, e.g. thresholds.sound_flood_minor_ft=1.8")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--timeline", action="store_true", help="List every firing episode")
+    parser.add_argument("--json", help="Also write the full report to this file")
+    args = parser.parse_args()
+
+    if args.graph:
+        with open(args.graph, "r", encoding="utf-8") as f:
+            graph = json.load(f)
+    else:
+        graph = json.loads(json.dumps(context_engine._load_graph()))  # copy before overriding
+    for assignment in args.set:
+        apply_override(graph, assignment)
+
+    report = run_backtest(
+        datetime.fromisoformat(args.start), datetime.fromisoformat(args.end), graph, workers=args.workers
+    )
+    print(format_report(report, timeline=args.timeline))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
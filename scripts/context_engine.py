@@ -3,6 +3,14 @@
 Evaluates the Knowledge Graph against current conditions to produce
 prioritized intelligence flags for narrative injection.
 
+The graph is compiled once per file change: every trigger block becomes
+a predicate closure and micro-seasons are indexed by day of year and
+weekday, so an evaluation only runs the predicates that can match.
+evaluate_context_batch() runs many conditions through one compiled graph
+(a year of hourly readings takes a fraction of a second) for backtesting;
+evaluate_context_matrix() does the same column-wise with NumPy and returns
+a (case x rule) boolean matrix (see context_backtest.py).
+
 Usage:
     from context_engine import get_rich_context, get_random_riddle_topic
     
@@ -18,7 +26,9 @@ import json
 import os
 import random
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
 
 from utils.logger import create_logger
 
@@ -80,98 +90,180 @@ def _load_graph() -> Dict[str, Any]:
         return {}
 
 
+_CARDINALS = ["N", "NE", "E", "SE", "S", "SW", "W", "NW"]
+
+
 def _wind_dir_from_deg(deg: float) -> str:
     """Convert wind degrees to cardinal direction."""
     if deg is None:
         return ""
-    dirs = ["N", "NE", "E", "SE", "S", "SW", "W", "NW"]
     idx = int((deg % 360) / 45.0 + 0.5) % 8
-    return dirs[idx]
+    return _CARDINALS[idx]
 
 
-def _is_wind_direction(deg: float, target_dir: str) -> bool:
-    """Check if wind is from a general direction (allows 45° tolerance)."""
-    if deg is None:
-        return False
-    
-    actual_dir = _wind_dir_from_deg(deg)
-    target_dir = target_dir.upper()
-    
-    # Direct match
-    if actual_dir == target_dir:
-        return True
-    
-    # Allow adjacent directions for broader matching
-    # E.g., "W" matches W, SW, NW
-    direction_groups = {
-        "N": ["N", "NNE", "NNW"],
-        "S": ["S", "SSE", "SSW"],
-        "E": ["E", "ENE", "ESE"],
-        "W": ["W", "WNW", "WSW"],
-        "NE": ["NE", "N", "E"],
-        "SE": ["SE", "S", "E"],
-        "SW": ["SW", "S", "W"],
-        "NW": ["NW", "N", "W"],
-    }
-    
-    return actual_dir in direction_groups.get(target_dir, [target_dir])
+# Allow adjacent directions for broader matching
+# E.g., "W" matches W, SW, NW
+_DIRECTION_GROUPS = {
+    "N": ["N", "NNE", "NNW"],
+    "S": ["S", "SSE", "SSW"],
+    "E": ["E", "ENE", "ESE"],
+    "W": ["W", "WNW", "WSW"],
+    "NE": ["NE", "N", "E"],
+    "SE": ["SE", "S", "E"],
+    "SW": ["SW", "S", "W"],
+    "NW": ["NW", "N", "W"],
+}
 
+# Day-of-year index (leap-year calendar, so Feb 29 has a slot)
+_MONTH_DAYS = [0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+_MONTH_START = [sum(_MONTH_DAYS[:m]) for m in range(13)]
+_PRIORITY_ORDER = {"critical": 0, "warning": 1, "flavor": 2}
 
-def _evaluate_triggers(triggers: Dict[str, Any], weather: Dict, coast: Dict, now: datetime) -> bool:
-    """Evaluate all triggers in a trigger block. All must pass (AND logic)."""
-    if not triggers:
-        return True
-    
-    wind_mph = weather.get('wind_mph') or 0
+
+def _day_index(month: int, day: int) -> int:
+    return _MONTH_START[month] + day - 1
+
+
+class _Conditions(NamedTuple):
+    """Readings every trigger is evaluated against, extracted once per call."""
+
+    wind_mph: float
+    wind_deg: Optional[float]
+    wind_dir: str
+    rain_in: float
+    sound_ft: float
+    temp_f: Optional[float]
+    hour: int
+
+
+def _conditions(weather: Dict, coast: Dict, now: datetime) -> _Conditions:
     wind_deg = weather.get('wind_deg')
-    rain_in = weather.get('rain_last_24h_in') or 0
-    sound_ft = coast.get('observed_level_ft') or 0
-    # Use outdoor_temp if available, fall back to exterior_temp (from sensors)
-    temp_f = weather.get('outdoor_temp') or weather.get('exterior_temp') or weather.get('low_temp')
-    hour = now.hour
-    
-    for key, value in triggers.items():
-        if key == "temp_gt_f":
-            if temp_f is None or temp_f <= value:
-                return False
-        elif key == "temp_lt_f":
-            if temp_f is None or temp_f >= value:
-                return False
-        elif key == "wind_gt_mph":
-            if wind_mph <= value:
-                return False
-        elif key == "wind_lt_mph":
-            if wind_mph >= value:
-                return False
-        elif key == "wind_dir":
-            if not _is_wind_direction(wind_deg, value):
-                return False
-        elif key == "rain_24h_gt_in":
-            if rain_in <= value:
-                return False
-        elif key == "rain_24h_lt_in":
-            if rain_in >= value:
-                return False
-        elif key == "sound_gt_ft":
-            if sound_ft <= value:
-                return False
-        elif key == "sound_lt_ft":
-            if sound_ft >= value:
-                return False
-        elif key == "hour_between":
-            start_hour, end_hour = value
-            if not (start_hour <= hour <= end_hour):
-                return False
-    
-    return True
+    return _Conditions(
+        wind_mph=weather.get('wind_mph') or 0,
+        wind_deg=wind_deg,
+        wind_dir=_wind_dir_from_deg(wind_deg),
+        rain_in=weather.get('rain_last_24h_in') or 0,
+        sound_ft=coast.get('observed_level_ft') or 0,
+        # Use outdoor_temp if available, fall back to exterior_temp (from sensors)
+        temp_f=weather.get('outdoor_temp') or weather.get('exterior_temp') or weather.get('low_temp'),
+        hour=now.hour,
+    )
 
 
-def _check_date_range(item: Dict, now: datetime) -> bool:
-    """Check if current date falls within item's date constraints."""
-    month = now.month
-    day = now.day
-    dow = now.isoweekday()  # 1=Mon, 7=Sun
-    
+def _compile_trigger(key: str, value: Any) -> Optional[Callable[[_Conditions], bool]]:
+    """One trigger -> predicate over _Conditions (None for unknown keys)."""
+    if key == "temp_gt_f":
+        return lambda c: c.temp_f is not None and c.temp_f > value
+    if key == "temp_lt_f":
+        return lambda c: c.temp_f is not None and c.temp_f < value
+    if key == "wind_gt_mph":
+        return lambda c: c.wind_mph > value
+    if key == "wind_lt_mph":
+        return lambda c: c.wind_mph < value
+    if key == "wind_dir":
+        allowed = _wind_dir_allowed(value)
+        return lambda c: c.wind_dir in allowed
+    if key == "rain_24h_gt_in":
+        return lambda c: c.rain_in > value
+    if key == "rain_24h_lt_in":
+        return lambda c: c.rain_in < value
+    if key == "sound_gt_ft":
+        return lambda c: c.sound_ft > value
+    if key == "sound_lt_ft":
+        return lambda c: c.sound_ft < value
+    if key == "hour_between":
+        start_hour, end_hour = value
+        return lambda c: start_hour <= c.hour <= end_hour
+    return None
+
+
+def _wind_dir_allowed(value: str) -> frozenset:
+    target = value.upper()
+    return frozenset(_DIRECTION_GROUPS.get(target, [target])) | {target}
+
+
+def _compile_triggers(triggers: Dict[str, Any]) -> Callable[[_Conditions], bool]:
+    """Compile a trigger block into one predicate. All must pass (AND logic)."""
+    predicates = tuple(
+        p for p in (_compile_trigger(k, v) for k, v in (triggers or {}).items()) if p
+    )
+    if not predicates:
+        return lambda c: True
+    # Chain as nested `and`s (short-circuits without a generator per call)
+    combined = predicates[0]
+    for predicate in predicates[1:]:
+        combined = _both(combined, predicate)
+    return combined
+
+
+def _both(first: Callable[[_Conditions], bool], second: Callable[[_Conditions], bool]) -> Callable[[_Conditions], bool]:
+    return lambda c: first(c) and second(c)
+
+
+Columns = Dict[str, np.ndarray]
+
+
+def _condition_columns(cases: List[Tuple[datetime, Dict, Dict]]) -> Columns:
+    """_Conditions for many cases as NumPy columns (missing values are NaN / -1)."""
+    rows = [_conditions(weather, coast, now) for now, weather, coast in cases]
+
+    def column(field: str) -> np.ndarray:
+        return np.array(
+            [np.nan if getattr(r, field) is None else getattr(r, field) for r in rows], dtype=float
+        )
+
+    cardinal = {name: i for i, name in enumerate(_CARDINALS)}
+    return {
+        "wind_mph": column("wind_mph"),
+        "wind_deg": column("wind_deg"),
+        "wind_dir": np.array([cardinal.get(r.wind_dir, -1) for r in rows], dtype=int),
+        "rain_in": column("rain_in"),
+        "sound_ft": column("sound_ft"),
+        "temp_f": column("temp_f"),
+        "hour": np.array([r.hour for r in rows], dtype=int),
+        "day_index": np.array([_day_index(now.month, now.day) for now, _, _ in cases], dtype=int),
+        "weekday": np.array([now.isoweekday() - 1 for now, _, _ in cases], dtype=int),
+    }
+
+
+def _compile_trigger_columns(key: str, value: Any) -> Optional[Callable[[Columns], np.ndarray]]:
+    """Column-wise twin of _compile_trigger (NaN compares False, like None)."""
+    if key == "temp_gt_f":
+        return lambda c: c["temp_f"] > value
+    if key == "temp_lt_f":
+        return lambda c: c["temp_f"] < value
+    if key == "wind_gt_mph":
+        return lambda c: c["wind_mph"] > value
+    if key == "wind_lt_mph":
+        return lambda c: c["wind_mph"] < value
+    if key == "wind_dir":
+        allowed = [i for i, name in enumerate(_CARDINALS) if name in _wind_dir_allowed(value)]
+        return lambda c: np.isin(c["wind_dir"], allowed)
+    if key == "rain_24h_gt_in":
+        return lambda c: c["rain_in"] > value
+    if key == "rain_24h_lt_in":
+        return lambda c: c["rain_in"] < value
+    if key == "sound_gt_ft":
+        return lambda c: c["sound_ft"] > value
+    if key == "sound_lt_ft":
+        return lambda c: c["sound_ft"] < value
+    if key == "hour_between":
+        start_hour, end_hour = value
+        return lambda c: (c["hour"] >= start_hour) & (c["hour"] <= end_hour)
+    return None
+
+
+def _triggers_mask(triggers: Dict[str, Any], columns: Columns) -> np.ndarray:
+    mask = np.ones(len(columns["hour"]), dtype=bool)
+    for key, value in (triggers or {}).items():
+        predicate = _compile_trigger_columns(key, value)
+        if predicate:
+            mask &= predicate(columns)
+    return mask
+
+
+def _check_date_range(item: Dict, month: int, day: int, dow: int) -> bool:
+    """Check if a date falls within item's date constraints."""
     # Month-based matching
     if "months" in item:
         if month not in item["months"]:
@@ -205,125 +297,198 @@ def _check_date_range(item: Dict, now: datetime) -> bool:
     return True
 
 
-def _evaluate_alerts(graph: Dict, weather: Dict, coast: Dict, now: datetime) -> List[Dict]:
-    """Evaluate alert conditions from knowledge graph."""
-    results = []
-    
-    for alert in graph.get("alerts", []):
-        triggers = alert.get("triggers", {})
-        if _evaluate_triggers(triggers, weather, coast, now):
-            results.append({
-                "id": alert.get("id"),
-                "priority": alert.get("priority", "warning"),
-                "icon": alert.get("icon", "⚠️"),
-                "text": alert.get("text", ""),
-            })
-    
-    return results
-
-
-def _evaluate_micro_seasons(graph: Dict, weather: Dict, coast: Dict, now: datetime) -> List[Dict]:
-    """Evaluate micro-season conditions."""
-    results = []
-    
-    for season in graph.get("micro_seasons", []):
-        # First check date constraints
-        if not _check_date_range(season, now):
-            continue
-        
-        # Then check conditional triggers (if any)
-        triggers = season.get("triggers", {})
-        if not _evaluate_triggers(triggers, weather, coast, now):
-            continue
-        
-        results.append({
-            "id": season.get("id"),
-            "name": season.get("name"),
-            "priority": season.get("priority", "flavor"),
-            "vibe": season.get("vibe", ""),
-        })
-    
-    return results
-
-
-def _evaluate_sensory(graph: Dict, weather: Dict, coast: Dict, now: datetime) -> List[Dict]:
-    """Evaluate sensory trigger conditions."""
-    results = []
-    
-    for sensory in graph.get("sensory", []):
-        triggers = sensory.get("triggers", {})
-        if _evaluate_triggers(triggers, weather, coast, now):
-            results.append({
-                "id": sensory.get("id"),
-                "priority": sensory.get("priority", "flavor"),
-                "icon": sensory.get("icon", ""),
-                "text": sensory.get("text", ""),
-            })
-    
-    return results
+class _CompiledGraph:
+    """Knowledge graph compiled into predicate closures.
 
+    Built once per loaded graph. Alerts, sensory and infrastructure
+    entries become (predicate, flag) pairs; micro-seasons are indexed by
+    (day of year, weekday) so only the seasons whose dates match are
+    looked at, leaving just their triggers to evaluate.
+    """
 
-def _evaluate_infrastructure(graph: Dict, weather: Dict, coast: Dict, now: datetime) -> List[Dict]:
-    """Evaluate infrastructure intel conditions."""
-    results = []
-    
-    for item in graph.get("infrastructure", []):
-        triggers = item.get("triggers", {})
-        if _evaluate_triggers(triggers, weather, coast, now):
-            results.append({
-                "id": item.get("id"),
-                "priority": item.get("priority", "flavor"),
-                "icon": item.get("icon", "📍"),
-                "text": item.get("text", ""),
+    def __init__(self, graph: Dict[str, Any]):
+        self.graph = graph
+        alerts = graph.get("alerts", [])
+        # Evaluated after flooding, in this order
+        others = [("sensory", item) for item in graph.get("sensory", [])] + [
+            ("infrastructure", item) for item in graph.get("infrastructure", [])
+        ]
+        self.alerts = [self._compile_item("alerts", item, "warning", "⚠️") for item in alerts]
+        self.rules = [
+            self._compile_item(kind, item, "flavor", "📍" if kind == "infrastructure" else "")
+            for kind, item in others
+        ]
+        self.alert_triggers = [item.get("triggers", {}) for item in alerts]
+        self.rule_triggers = [item.get("triggers", {}) for _, item in others]
+
+        season_items = graph.get("micro_seasons", [])
+        self.seasons = [
+            (_compile_triggers(season.get("triggers", {})), {
+                "id": season.get("id"),
+                "kind": "micro_seasons",
+                "name": season.get("name"),
+                "priority": season.get("priority", "flavor"),
+                "vibe": season.get("vibe", ""),
             })
-    
-    return results
-
+            for season in season_items
+        ]
+        self.season_triggers = [season.get("triggers", {}) for season in season_items]
+        # season_dates[day_index, isoweekday - 1, season] -> date constraints pass
+        self.season_dates = np.array([
+            [[_check_date_range(season, month, day, dow) for season in season_items] for dow in range(1, 8)]
+            for month in range(1, 13)
+            for day in range(1, _MONTH_DAYS[month] + 1)
+        ], dtype=bool)
+        # season_index[day_index][isoweekday - 1] -> candidate seasons
+        self.season_index: List[List[Tuple]] = [
+            [tuple(self.seasons[j] for j in np.flatnonzero(by_weekday)) for by_weekday in by_day]
+            for by_day in self.season_dates
+        ]
+
+        thresholds = graph.get("thresholds", {})
+        self.flooding_zones = graph.get("flooding_zones", {})
+        self.major_ft = thresholds.get("sound_flood_major_ft", 4.5)
+        self.moderate_ft = thresholds.get("sound_flood_moderate_ft", 3.0)
+        self.minor_ft = thresholds.get("sound_flood_minor_ft", 2.0)
+        self.blowout_ft = thresholds.get("sound_blowout_ft", 0.5)
+
+    @staticmethod
+    def _compile_item(
+        kind: str, item: Dict[str, Any], priority: str, icon: str
+    ) -> Tuple[Callable[[_Conditions], bool], Dict[str, Any]]:
+        return (_compile_triggers(item.get("triggers", {})), {
+            "id": item.get("id"),
+            "kind": kind,
+            "priority": item.get("priority", priority),
+            "icon": item.get("icon", icon),
+            "text": item.get("text", ""),
+        })
 
-def _evaluate_flooding(graph: Dict, weather: Dict, coast: Dict) -> Optional[Dict]:
-    """Evaluate flooding conditions based on thresholds."""
-    thresholds = graph.get("thresholds", {})
-    zones = graph.get("flooding_zones", {})
-    
-    sound_ft = coast.get("observed_level_ft") or 0
-    wind_deg = weather.get("wind_deg")
-    
-    # Determine wind direction context
-    is_sw_wind = wind_deg is not None and 200 <= wind_deg <= 260
-    is_ne_wind = wind_deg is not None and ((0 <= wind_deg <= 70) or wind_deg >= 330)
-    
-    major_ft = thresholds.get("sound_flood_major_ft", 4.5)
-    moderate_ft = thresholds.get("sound_flood_moderate_ft", 3.0)
-    minor_ft = thresholds.get("sound_flood_minor_ft", 2.0)
-    blowout_ft = thresholds.get("sound_blowout_ft", 0.5)
-    
-    if sound_ft >= major_ft:
-        return {
-            "priority": "critical",
-            "icon": "🚨",
-            "text": f"MAJOR FLOODING: Sound at {sound_ft:.1f} ft. {zones.get('first_to_flood', 'Low areas')} likely impassable.",
-        }
-    elif sound_ft >= moderate_ft:
-        wind_context = "SW winds still piling water in." if is_sw_wind else "Should drain as wind shifts."
-        return {
-            "priority": "warning",
-            "icon": "🌊",
-            "text": f"Moderate flooding: Sound at {sound_ft:.1f} ft. {zones.get('second_to_flood', 'Roads')} may have water. {wind_context}",
-        }
-    elif sound_ft >= minor_ft and is_sw_wind:
-        return {
-            "priority": "warning",
-            "icon": "🌊",
-            "text": f"Rising water: SW wind pushing sound to {sound_ft:.1f} ft. Watch the bulkheads.",
-        }
-    elif sound_ft < blowout_ft and is_ne_wind:
-        return {
-            "priority": "flavor",
-            "icon": "📉",
-            "text": "Blowout conditions: North wind emptied the harbor. Watch for grounding at the dock.",
-        }
-    
-    return None
+    def seasons_for(self, now: datetime, conditions: _Conditions) -> List[Dict[str, Any]]:
+        candidates = self.season_index[_day_index(now.month, now.day)][now.isoweekday() - 1]
+        return [flag for pred, flag in candidates if pred(conditions)]
+
+    def evaluate(self, now: datetime, weather: Dict, coast: Dict) -> List[Dict[str, Any]]:
+        """Every matching flag (alerts, flooding, sensory, infrastructure, seasons)."""
+        conditions = _conditions(weather, coast, now)
+        flags = [flag for pred, flag in self.alerts if pred(conditions)]
+        flood = self.flooding(conditions)
+        if flood:
+            flags.append(flood)
+        flags.extend(flag for pred, flag in self.rules if pred(conditions))
+        return flags + self.seasons_for(now, conditions)
+
+    def matrix(self, cases: List[Tuple[datetime, Dict, Dict]]) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+        """Column-wise evaluate(): every rule over every case at once.
+
+        Returns (rules, mask) where rules are flag dicts (flooding rules
+        without text) in evaluate()'s order and mask[case, rule] is True
+        where the rule fires.
+        """
+        columns = _condition_columns(cases)
+        rules, masks = [], []
+        for triggers, (_, flag) in zip(self.alert_triggers, self.alerts):
+            rules.append(flag)
+            masks.append(_triggers_mask(triggers, columns))
+        for flag, mask in self.flooding_columns(columns):
+            rules.append(flag)
+            masks.append(mask)
+        for triggers, (_, flag) in zip(self.rule_triggers, self.rules):
+            rules.append(flag)
+            masks.append(_triggers_mask(triggers, columns))
+        dates = self.season_dates[columns["day_index"], columns["weekday"]]
+        for j, (triggers, (_, flag)) in enumerate(zip(self.season_triggers, self.seasons)):
+            rules.append(flag)
+            masks.append(dates[:, j] & _triggers_mask(triggers, columns))
+        mask = np.column_stack(masks) if masks else np.zeros((len(cases), 0), dtype=bool)
+        return rules, mask
+
+    def flooding_columns(self, c: Columns) -> List[Tuple[Dict[str, Any], np.ndarray]]:
+        """Column-wise flooding(): one (rule, mask) per flood level."""
+        sound_ft, wind_deg = c["sound_ft"], c["wind_deg"]
+        is_sw_wind = (wind_deg >= 200) & (wind_deg <= 260)
+        is_ne_wind = ((wind_deg >= 0) & (wind_deg <= 70)) | (wind_deg >= 330)
+
+        major = sound_ft >= self.major_ft
+        moderate = ~major & (sound_ft >= self.moderate_ft)
+        minor = ~major & ~moderate & (sound_ft >= self.minor_ft) & is_sw_wind
+        blowout = ~major & ~moderate & ~minor & (sound_ft < self.blowout_ft) & is_ne_wind
+        return [
+            ({"id": "flood_major", "kind": "flooding", "priority": "critical", "icon": "🚨"}, major),
+            ({"id": "flood_moderate", "kind": "flooding", "priority": "warning", "icon": "🌊"}, moderate),
+            ({"id": "flood_minor", "kind": "flooding", "priority": "warning", "icon": "🌊"}, minor),
+            ({"id": "blowout", "kind": "flooding", "priority": "flavor", "icon": "📉"}, blowout),
+        ]
+
+    def flooding(self, c: _Conditions) -> Optional[Dict[str, Any]]:
+        """Evaluate flooding conditions based on thresholds."""
+        sound_ft = c.sound_ft
+        zones = self.flooding_zones
+
+        # Determine wind direction context
+        is_sw_wind = c.wind_deg is not None and 200 <= c.wind_deg <= 260
+        is_ne_wind = c.wind_deg is not None and ((0 <= c.wind_deg <= 70) or c.wind_deg >= 330)
+
+        if sound_ft >= self.major_ft:
+            return {
+                "id": "flood_major",
+                "kind": "flooding",
+                "priority": "critical",
+                "icon": "🚨",
+                "text": f"MAJOR FLOODING: Sound at {sound_ft:.1f} ft. {zones.get('first_to_flood', 'Low areas')} likely impassable.",
+            }
+        elif sound_ft >= self.moderate_ft:
+            wind_context = "SW winds still piling water in." if is_sw_wind else "Should drain as wind shifts."
+            return {
+                "id": "flood_moderate",
+                "kind": "flooding",
+                "priority": "warning",
+                "icon": "🌊",
+                "text": f"Moderate flooding: Sound at {sound_ft:.1f} ft. {zones.get('second_to_flood', 'Roads')} may have water. {wind_context}",
+            }
+        elif sound_ft >= self.minor_ft and is_sw_wind:
+            return {
+                "id": "flood_minor",
+                "kind": "flooding",
+                "priority": "warning",
+                "icon": "🌊",
+                "text": f"Rising water: SW wind pushing sound to {sound_ft:.1f} ft. Watch the bulkheads.",
+            }
+        elif sound_ft < self.blowout_ft and is_ne_wind:
+            return {
+                "id": "blowout",
+                "kind": "flooding",
+                "priority": "flavor",
+                "icon": "📉",
+                "text": "Blowout conditions: North wind emptied the harbor. Watch for grounding at the dock.",
+            }
+
+        return None
+
+
+_compiled_cache: Optional[_CompiledGraph] = None
+
+
+def _get_compiled(graph: Optional[Dict[str, Any]] = None) -> Optional[_CompiledGraph]:
+    """Compiled form of ``graph`` (default: the on-disk graph, recompiled when it changes)."""
+    global _compiled_cache
+    if graph is not None:
+        return _CompiledGraph(graph) if graph else None
+    graph = _load_graph()
+    if not graph:
+        return None
+    if _compiled_cache is None or _compiled_cache.graph is not graph:
+        _compiled_cache = _CompiledGraph(graph)
+    return _compiled_cache
+
+
+def _season_flag(season: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": season["id"],
+        "priority": season["priority"],
+        "icon": "📅",
+        "text": f"SEASON: {season['name']}. {season['vibe']}",
+    }
 
 
 def get_rich_context(
@@ -342,43 +507,20 @@ def get_rich_context(
     Returns:
         List of formatted flag strings, prioritized (critical first), max 5
     """
-    graph = _load_graph()
-    if not graph:
+    compiled = _get_compiled()
+    if compiled is None:
         return []
     
     all_flags: List[Dict] = []
-    
-    # 1. Evaluate alerts (highest priority)
-    alerts = _evaluate_alerts(graph, weather_data, coast_data, date_obj)
-    all_flags.extend(alerts)
-    
-    # 2. Evaluate flooding (computed from thresholds)
-    flood_flag = _evaluate_flooding(graph, weather_data, coast_data)
-    if flood_flag:
-        all_flags.append(flood_flag)
-    
-    # 3. Evaluate sensory triggers
-    sensory = _evaluate_sensory(graph, weather_data, coast_data, date_obj)
-    all_flags.extend(sensory)
-    
-    # 4. Evaluate infrastructure intel
-    infrastructure = _evaluate_infrastructure(graph, weather_data, coast_data, date_obj)
-    all_flags.extend(infrastructure)
-    
-    # 5. Evaluate micro-seasons (with random sampling to avoid repetition)
-    seasons = _evaluate_micro_seasons(graph, weather_data, coast_data, date_obj)
-    # Only include ~35% of matching seasons to add variety
-    sampled_seasons = [s for s in seasons if random.random() < 0.35]
-    for season in sampled_seasons:
-        all_flags.append({
-            "priority": season["priority"],
-            "icon": "📅",
-            "text": f"SEASON: {season['name']}. {season['vibe']}",
-        })
+    for flag in compiled.evaluate(date_obj, weather_data, coast_data):
+        if flag["kind"] != "micro_seasons":
+            all_flags.append(flag)
+        # Only include ~35% of matching seasons to add variety
+        elif random.random() < 0.35:
+            all_flags.append(_season_flag(flag))
     
     # Sort by priority (critical > warning > flavor)
-    priority_order = {"critical": 0, "warning": 1, "flavor": 2}
-    all_flags.sort(key=lambda x: priority_order.get(x.get("priority", "flavor"), 2))
+    all_flags.sort(key=lambda x: _PRIORITY_ORDER.get(x.get("priority", "flavor"), 2))
     
     # Format as strings and limit to 5
     formatted = []
@@ -393,6 +535,54 @@ def get_rich_context(
     return formatted
 
 
+def evaluate_context_batch(
+    cases: Iterable[Tuple[datetime, Dict[str, Any], Dict[str, Any]]],
+    graph: Optional[Dict[str, Any]] = None,
+) -> List[List[Dict[str, Any]]]:
+    """
+    Evaluate many (date, weather, coast) tuples against the graph at once.
+    
+    Meant for backtesting and threshold tuning: the graph is compiled once
+    and every matching flag is returned, without get_rich_context's random
+    season sampling or top-5 cut.
+    
+    Args:
+        cases: (date_obj, weather_data, coast_data) tuples, as for get_rich_context
+        graph: Alternative graph dict (e.g. with tuned thresholds); default the loaded one
+    
+    Returns:
+        One list per case of flag dicts with id, kind (alerts, flooding,
+        sensory, infrastructure, micro_seasons), priority and icon/text
+        (vibe/name for seasons), in get_rich_context's evaluation order
+    """
+    compiled = _get_compiled(graph)
+    if compiled is None:
+        return [[] for _ in cases]
+    return [compiled.evaluate(date_obj, weather, coast) for date_obj, weather, coast in cases]
+
+
+def evaluate_context_matrix(
+    cases: Iterable[Tuple[datetime, Dict[str, Any], Dict[str, Any]]],
+    graph: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+    """
+    Vectorised evaluate_context_batch(): one NumPy pass per rule over all cases.
+    
+    Args:
+        cases: (date_obj, weather_data, coast_data) tuples, as for get_rich_context
+        graph: Alternative graph dict (e.g. with tuned thresholds); default the loaded one
+    
+    Returns:
+        (rules, mask): rule dicts (id, kind, priority, ...) in evaluation
+        order, and a boolean array with mask[case, rule] set where the rule fires
+    """
+    cases = list(cases)
+    compiled = _get_compiled(graph)
+    if compiled is None:
+        return [], np.zeros((len(cases), 0), dtype=bool)
+    return compiled.matrix(cases)
+
+
 def get_random_riddle_topic(exclude_recent: List[str] = None) -> str:
     """
     Get a random riddle topic from knowledge graph.
@@ -15,6 +15,7 @@ BRIGHTNESS_MIN_DIM = 30.0  # Below this = dim but valid, log warning
 BRIGHTNESS_MAX_OVEREXPOSED = 250.0  # Above this = overexposed, reject
 
 
+from utils.image_utils import compute_frame_metrics, record_frame_metrics
 from utils.logger import create_logger
 
 log = create_logger("curator")
@@ -58,6 +59,15 @@ def archive_path_for(filename: str) -> str:
     return os.path.join(dest_dir, basename)
 
 
+def _store_frame_metrics(dest: str, gray) -> None:
+    """Compute and cache luminance/sharpness/hash for an archived image."""
+    try:
+        metrics = compute_frame_metrics(gray)
+        record_frame_metrics(dest, metrics)
+    except Exception as exc:  # noqa: BLE001
+        log(f"Warning: Could not store frame metrics for '{dest}': {exc}")
+
+
 def process_file(path: str) -> None:
     """Score image by luminance and move/delete according to thresholds."""
     try:
@@ -107,6 +117,9 @@ def process_file(path: str) -> None:
         shutil.move(path, dest)
         log(f"Archived '{path}' -> '{dest}' (mean luminance {mean_brightness:.2f}).")
 
+        # Cache quality metrics once so timelapse jobs never re-open images
+        _store_frame_metrics(dest, gray)
+
     except Exception as exc:  # noqa: BLE001
         log(f"Error processing '{path}': {exc}")
         # As a safety measure, avoid leaving obviously bad files to loop forever
@@ -5,12 +5,11 @@ Monitors greenhouse devices and sends email alerts when they go online or offlin
 
 import json
 import os
-import smtplib
-import ssl
 from datetime import datetime, timedelta, timezone
 from email.message import EmailMessage
 from typing import Dict, Optional, Any
 
+import mail_outbox
 from utils.logger import create_logger
 from utils.io import atomic_write_json, atomic_read_json
 
@@ -133,28 +132,22 @@ def _load_status() -> Dict[str, Any]:
 
 
 def _send_alert_email(subject: str, body: str) -> bool:
-    """Send an alert email."""
+    """Queue an alert email (delivered by mail_outbox in the background)."""
     if not SMTP_USER or not SMTP_PASS or not ALERT_EMAIL:
         log("Email not configured, skipping alert")
         return False
 
-    try:
-        msg = EmailMessage()
-        msg["From"] = SMTP_FROM
-        msg["To"] = ALERT_EMAIL
-        msg["Subject"] = subject
-        msg.set_content(body)
-
-        context = ssl.create_default_context()
-        with smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, context=context) as server:
-            server.login(SMTP_USER, SMTP_PASS)
-            server.send_message(msg)
-
-        log(f"Sent alert email: {subject}")
-        return True
-    except Exception as exc:
-        log(f"Failed to send alert email: {exc}")
+    msg = EmailMessage()
+    msg["From"] = SMTP_FROM
+    msg["To"] = ALERT_EMAIL
+    msg["Subject"] = subject
+    msg.set_content(body)
+
+    if mail_outbox.enqueue(msg) is None:
+        log(f"Failed to queue alert email: {subject}")
         return False
+    log(f"Queued alert email: {subject}")
+    return True
 
 
 def _get_device_last_seen(
@@ -0,0 +1,259 @@
+"""Overnight pre-build of Greenhouse Gazette edition assets.
+
+The day's images are complete at sunset, so the expensive parts of the
+07:00 edition don't have to wait for it. The scheduler runs
+``prebuild_edition()`` shortly after sunset and again around 05:00; the
+renders land in a versioned staging directory and the publisher picks
+them up with ``load_staged_assets()``, refreshing only what has changed
+(current readings, narrative). Anything missing or stale is simply built
+inline as before.
+
+Staging layout:
+    /app/data/edition_staging/
+        2025-06-21/                  # edition date (the morning it's sent)
+            current.json             # pointer to the newest complete build
+            20250620T203012/         # one build
+                manifest.json
+                timelapse.gif
+                chart.png
+                weather.json
+                coast_sky.json
+
+Asset freshness:
+    timelapse  - valid for its edition (yesterday's images don't change)
+    chart, weather, coast_sky - only built within FRESH_MAX_AGE_HOURS of
+        dispatch, and only used if still that fresh at 07:00
+
+Usage:
+    python edition_prebuild.py            # build for the next edition
+    python edition_prebuild.py --show     # print the staged manifest
+"""
+
+import os
+import shutil
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Optional
+from zoneinfo import ZoneInfo
+
+import chart_generator
+import external_data
+import timelapse
+from utils.io import atomic_read_json, atomic_write_json
+from utils.logger import create_logger
+from utils.task_graph import TaskGraph
+
+log = create_logger("edition_prebuild")
+
+# Lazy settings loader for app.config integration
+_settings = None
+
+
+def _get_settings():
+    """Get settings lazily to avoid import-time failures."""
+    global _settings
+    if _settings is None:
+        try:
+            from app.config import settings
+            _settings = settings
+        except Exception:
+            _settings = None
+    return _settings
+
+
+STAGING_ROOT = os.getenv("EDITION_STAGING_DIR", "/app/data/edition_staging")
+DISPATCH_TIME = time(7, 0)  # Matches the scheduler's daily dispatch
+FRESH_MAX_AGE_HOURS = float(os.getenv("EDITION_PREBUILD_MAX_AGE_HOURS", "3"))
+KEEP_EDITIONS = 3  # Edition directories retained on disk
+
+# Staged asset -> file name in a build directory
+ASSET_FILES = {
+    "timelapse": "timelapse.gif",
+    "chart": "chart.png",
+    "weather": "weather.json",
+    "coast_sky": "coast_sky.json",
+}
+FRESH_ASSETS = ("chart", "weather", "coast_sky")
+
+
+def _local_zone() -> ZoneInfo:
+    cfg = _get_settings()
+    return ZoneInfo(cfg.tz if cfg else os.getenv("TZ", "America/New_York"))
+
+
+def _dispatch_at(edition: date) -> datetime:
+    return datetime.combine(edition, DISPATCH_TIME, tzinfo=_local_zone())
+
+
+def edition_date_for(now: Optional[datetime] = None) -> date:
+    """The edition the next dispatch will send (today before 07:00, else tomorrow)."""
+    now = now or datetime.now(_local_zone())
+    if now.timetz().replace(tzinfo=None) < DISPATCH_TIME:
+        return now.date()
+    return now.date() + timedelta(days=1)
+
+
+def _edition_dir(edition: date) -> str:
+    return os.path.join(STAGING_ROOT, edition.isoformat())
+
+
+def _current_build(edition: date) -> Optional[Dict[str, Any]]:
+    """Manifest of the newest complete build for an edition, if any."""
+    pointer = atomic_read_json(os.path.join(_edition_dir(edition), "current.json"), default=None)
+    if not pointer or not pointer.get("build"):
+        return None
+    build_dir = os.path.join(_edition_dir(edition), pointer["build"])
+    manifest = atomic_read_json(os.path.join(build_dir, "manifest.json"), default=None)
+    if not manifest:
+        return None
+    manifest["path"] = build_dir
+    return manifest
+
+
+def _write_asset(build_dir: str, name: str, value: Any) -> None:
+    path = os.path.join(build_dir, ASSET_FILES[name])
+    if path.endswith(".json"):
+        atomic_write_json(path, value)
+    else:
+        with open(path, "wb") as f:
+            f.write(value)
+
+
+def _read_asset(build_dir: str, name: str) -> Any:
+    path = os.path.join(build_dir, ASSET_FILES[name])
+    if path.endswith(".json"):
+        return atomic_read_json(path, default=None)
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _prune(keep_from: date) -> None:
+    """Remove edition directories older than ``keep_from`` and superseded builds."""
+    if not os.path.isdir(STAGING_ROOT):
+        return
+    for entry in os.listdir(STAGING_ROOT):
+        edition_path = os.path.join(STAGING_ROOT, entry)
+        try:
+            edition = date.fromisoformat(entry)
+        except ValueError:
+            continue
+        if edition < keep_from:
+            shutil.rmtree(edition_path, ignore_errors=True)
+            continue
+        current = (_current_build(edition) or {}).get("build")
+        for build in os.listdir(edition_path):
+            build_path = os.path.join(edition_path, build)
+            if os.path.isdir(build_path) and build != current:
+                shutil.rmtree(build_path, ignore_errors=True)
+
+
+def prebuild_edition(now: Optional[datetime] = None) -> Optional[str]:
+    """Render the next edition's assets into a new staging build.
+
+    The GIF is reused from an earlier build of the same edition when
+    present; fresh assets (chart, weather, tides) are only built when
+    dispatch is close enough for them to still be current.
+
+    Returns:
+        Path of the new build directory, or None if nothing was staged
+    """
+    now = now or datetime.now(_local_zone())
+    edition = edition_date_for(now)
+    weekly = edition.weekday() == 6
+    until_dispatch = _dispatch_at(edition) - now
+    build_fresh = until_dispatch <= timedelta(hours=FRESH_MAX_AGE_HOURS)
+    log(f"Pre-building {'weekly' if weekly else 'daily'} edition {edition} "
+        f"({until_dispatch.total_seconds() / 3600:.1f}h before dispatch)")
+
+    previous = _current_build(edition)
+    reuse_gif = bool(previous and "timelapse" in previous.get("assets", {}))
+
+    graph = TaskGraph("prebuild")
+    if reuse_gif:
+        graph.add("timelapse", _read_asset, args=(previous["path"], "timelapse"))
+    elif weekly:
+        graph.add("timelapse", timelapse.create_weekly_timelapse, in_process=True)
+    else:
+        graph.add(
+            "timelapse",
+            timelapse.create_daily_timelapse,
+            args=(edition - timedelta(days=1),),
+            in_process=True,
+        )
+    if build_fresh:
+        graph.add(
+            "chart",
+            chart_generator.generate_temperature_chart,
+            kwargs={"hours": 168 if weekly else 24},
+            in_process=True,
+        )
+        graph.add("external", external_data.gather_external_data)
+    results = graph.run()
+    results.update(results.pop("external", None) or {})
+
+    built = {name: value for name, value in results.items() if value}
+    if not built:
+        log("Pre-build produced no assets; 07:00 will build inline")
+        return None
+
+    build_id = now.strftime("%Y%m%dT%H%M%S")
+    build_dir = os.path.join(_edition_dir(edition), build_id)
+    os.makedirs(build_dir, exist_ok=True)
+    assets = {}
+    for name, value in built.items():
+        _write_asset(build_dir, name, value)
+        built_at = previous["assets"]["timelapse"] if name == "timelapse" and reuse_gif else now.isoformat()
+        assets[name] = built_at
+    atomic_write_json(
+        os.path.join(build_dir, "manifest.json"),
+        {"edition": edition.isoformat(), "weekly": weekly, "build": build_id, "assets": assets},
+    )
+    # Publish the build only once every file is in place
+    atomic_write_json(os.path.join(_edition_dir(edition), "current.json"), {"build": build_id})
+    _prune(edition - timedelta(days=KEEP_EDITIONS - 1))
+
+    log(f"Staged {sorted(assets)} in {build_dir}")
+    return build_dir
+
+
+def load_staged_assets(weekly_mode: bool, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Pre-built assets usable for the edition being sent now.
+
+    Returns a dict with any of 'timelapse', 'chart', 'weather' and
+    'coast_sky'; missing keys should be built inline. Never raises.
+    """
+    now = now or datetime.now(_local_zone())
+    try:
+        manifest = _current_build(now.date())
+        if not manifest or manifest.get("weekly") != weekly_mode:
+            return {}
+        staged = {}
+        for name, built_at in manifest.get("assets", {}).items():
+            if name in FRESH_ASSETS:
+                age = now - datetime.fromisoformat(built_at)
+                if age > timedelta(hours=FRESH_MAX_AGE_HOURS):
+                    log(f"Staged {name} is {age.total_seconds() / 3600:.1f}h old; rebuilding inline")
+                    continue
+            value = _read_asset(manifest["path"], name)
+            if value:
+                staged[name] = value
+        if staged:
+            log(f"Using pre-built {sorted(staged)} from build {manifest['build']}")
+        return staged
+    except Exception as exc:  # noqa: BLE001
+        log(f"Error loading pre-built assets: {exc}")
+        return {}
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Pre-build the next edition's assets")
+    parser.add_argument("--show", action="store_true", help="Print the staged manifest and exit")
+    args = parser.parse_args()
+
+    if args.show:
+        print(json.dumps(_current_build(edition_date_for()), indent=2))
+    else:
+        result = prebuild_edition()
+        print(result or "Nothing staged")
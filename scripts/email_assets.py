@@ -0,0 +1,120 @@
+"""Hosted images for the daily email (EMAIL_ASSET_MODE=hosted).
+
+Instead of embedding the timelapse GIF, hero image and chart in every
+message as MIME related parts, the publisher writes them to the web
+server's static tree and the email references them by URL:
+
+    /app/data/www/email/<sha256 prefix>.<ext>
+    -> $EMAIL_ASSET_BASE_URL/<sha256 prefix>.<ext>
+
+EMAIL_ASSET_BASE_URL has no default: the dashboard sits behind Cloudflare
+Access, which mail clients and image proxies can't log in to, so the
+URL must be one they can fetch anonymously. Without it, hosted mode is
+off and images stay inline.
+
+Names are content hashes, so a URL never changes meaning. The web API
+serves them with a one-year immutable Cache-Control header. Files older
+than RETENTION_DAYS are pruned when new ones are published.
+
+Recipients listed in EMAIL_INLINE_RECIPIENTS (e.g. clients that block
+remote images) still get the inline version. Any asset that can't be
+published is embedded inline too.
+"""
+
+import hashlib
+import os
+import time
+from typing import List, Optional
+
+from utils.logger import create_logger
+
+log = create_logger("email_assets")
+
+DEFAULT_ASSET_DIR = "/app/data/www/email"
+RETENTION_DAYS = 90
+
+
+def asset_dir() -> str:
+    """Directory assets are published to (EMAIL_ASSET_DIR), also served by the web API."""
+    # Read per call so tests and tools can redirect it
+    return os.getenv("EMAIL_ASSET_DIR", DEFAULT_ASSET_DIR)
+
+
+def base_url() -> Optional[str]:
+    """Public URL the asset dir is served at (EMAIL_ASSET_BASE_URL), if configured."""
+    return os.getenv("EMAIL_ASSET_BASE_URL", "").strip().rstrip("/") or None
+
+
+def hosted_enabled() -> bool:
+    """Whether EMAIL_ASSET_MODE asks for hosted images and they have a public URL."""
+    if os.getenv("EMAIL_ASSET_MODE", "inline").strip().lower() != "hosted":
+        return False
+    if not base_url():
+        log("EMAIL_ASSET_MODE=hosted but EMAIL_ASSET_BASE_URL is not set; embedding images inline")
+        return False
+    return True
+
+
+def inline_recipients() -> List[str]:
+    """Recipients who always get images embedded (EMAIL_INLINE_RECIPIENTS)."""
+    value = os.getenv("EMAIL_INLINE_RECIPIENTS", "")
+    return [addr.strip().lower() for addr in value.split(",") if addr.strip()]
+
+
+def publish(data: bytes, ext: str) -> Optional[str]:
+    """Write an asset under its content hash and return its public URL.
+
+    Args:
+        data: File contents
+        ext: File extension without the dot ("gif", "jpg", "png")
+
+    Returns:
+        URL, or None if it couldn't be written or there is no base URL (embed it instead)
+    """
+    public_url = base_url()
+    if not public_url:
+        return None
+    name = f"{hashlib.sha256(data).hexdigest()[:24]}.{ext}"
+    path = os.path.join(asset_dir(), name)
+    try:
+        if not os.path.exists(path):
+            os.makedirs(asset_dir(), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            log(f"Published {name} ({len(data)} bytes)")
+        else:
+            # Reused by a new email: restart its retention clock
+            os.utime(path)
+        prune()
+    except OSError as exc:
+        log(f"Failed to publish email asset {name}: {exc}")
+        return None
+    return f"{public_url}/{name}"
+
+
+def prune(max_age_days: int = RETENTION_DAYS) -> int:
+    """Delete assets older than ``max_age_days`` (old emails lose their images).
+
+    Returns:
+        Number of files removed
+    """
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    try:
+        entries = list(os.scandir(asset_dir()))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            pass
+    if removed:
+        log(f"Pruned {removed} email asset(s) older than {max_age_days} days")
+    return removed
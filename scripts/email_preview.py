@@ -2,20 +2,27 @@
 """Email template preview server with hot reload.
 
 Renders email templates with mock data for design iteration.
-Templates reload on every request - no restart needed.
+Edited templates are picked up on the next request - no restart needed.
 
 Usage:
     python scripts/email_preview.py
     
 Then visit: http://localhost:8081/
+
+Benchmark daily and weekly rendering:
+    python scripts/email_preview.py --benchmark
 """
 
+import contextlib
 import http.server
+import io
 import json
 import os
 import socketserver
 import sys
+import time
 from datetime import datetime
+from typing import Dict
 from urllib.parse import parse_qs, urlparse
 
 # Add scripts to path for imports
@@ -156,17 +163,64 @@ MOCK_DATA = {
 }
 
 
+MOCK_DATA["weekly"] = {
+    **MOCK_DATA["normal"],
+    "subject": "A week of steady growing",
+    "headline": "Seven days, no surprises.",
+    "weekly_mode": True,
+    "weekly_stats": {
+        "interior_temp_min": 58,
+        "interior_temp_max": 81,
+        "interior_humidity_min": 38,
+        "interior_humidity_max": 71,
+        "exterior_temp_min": 34,
+        "exterior_temp_max": 63,
+        "exterior_humidity_min": 44,
+        "exterior_humidity_max": 96,
+        "days_recorded": 7,
+    },
+}
+
+
 def render_email(scenario: str = "normal") -> str:
-    """Render email template with mock data. Reloads template on each call."""
-    # Import fresh each time for hot reload
-    import importlib
+    """Render email template with mock data.
+
+    The template environment re-checks file mtimes, so edits show up on
+    the next render without reloading anything.
+    """
     import email_templates
-    importlib.reload(email_templates)
-    
+
     data = MOCK_DATA.get(scenario, MOCK_DATA["normal"])
     return email_templates.render_daily_email(**data)
 
 
+def benchmark(iterations: int = 200) -> Dict[str, Dict[str, float]]:
+    """Time daily and weekly edition renders.
+
+    The first render uses a fresh environment, so it includes loading
+    templates (from the bytecode cache, or compiling them if it's cold).
+
+    Returns:
+        {"daily": {"first_ms": ..., "render_ms": ...}, "weekly": {...}}
+    """
+    import email_templates
+
+    results = {}
+    for edition, scenario in (("daily", "normal"), ("weekly", "weekly")):
+        email_templates._env = None
+        email_templates._partials.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            render_email(scenario)
+            first_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            for _ in range(iterations):
+                render_email(scenario)
+            render_ms = (time.perf_counter() - start) * 1000 / iterations
+        results[edition] = {"first_ms": first_ms, "render_ms": render_ms}
+    return results
+
+
 def render_index() -> str:
     """Render the preview index page."""
     return """<!DOCTYPE html>
@@ -226,6 +280,10 @@ def render_index() -> str:
             <h3>⚠️ Stale Data</h3>
             <p>Missing sensor readings</p>
         </a>
+        <a href="/preview?scenario=weekly" class="scenario">
+            <h3>📅 Weekly Edition</h3>
+            <p>Sunday layout with 7-day highs and lows</p>
+        </a>
     </div>
     
     <div class="tip">
@@ -284,4 +342,11 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if "--benchmark" in sys.argv:
+        for edition, timing in benchmark().items():
+            print(
+                f"{edition}: first render {timing['first_ms']:.1f}ms, "
+                f"then {timing['render_ms']:.2f}ms per render"
+            )
+    else:
+        main()
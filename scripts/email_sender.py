@@ -2,20 +2,24 @@
 
 Extracted from publisher.py to separate concerns and improve testability.
 
+Delivery goes through mail_outbox (durable queue, pooled connection,
+retries); send_email() waits for it, mail_outbox.enqueue() doesn't.
+
 Usage:
     from email_sender import send_email
     send_email(msg, recipients=["user@example.com"])
 """
 
-import ssl
-import smtplib
 from email.message import EmailMessage
 from typing import List, Optional
 
+import mail_outbox
 from utils.logger import create_logger
 
 log = create_logger("email_sender")
 
+SEND_TIMEOUT_SECONDS = 300
+
 # Lazy import of settings to avoid circular imports
 _settings = None
 
@@ -36,7 +40,11 @@ def send_email(
     msg: EmailMessage,
     recipients: Optional[List[str]] = None,
 ) -> bool:
-    """Send an email via SMTP over SSL.
+    """Send an email through the shared outbox and wait for delivery.
+    
+    The message goes through mail_outbox's pooled connection, pacing and
+    retries. If it is still queued after SEND_TIMEOUT_SECONDS it stays
+    queued (and is retried), but this returns False.
     
     Args:
         msg: The EmailMessage to send
@@ -47,40 +55,13 @@ def send_email(
     
     Configuration loaded from app.config.settings (falls back to env vars).
     """
-    settings = _get_settings()
-    
-    if settings:
-        smtp_server = settings.smtp_server_host
-        smtp_port = settings.smtp_port
-        smtp_user = settings.smtp_user
-        smtp_pass = settings.smtp_password
-    else:
-        # Fallback to environment variables if settings not available
-        import os
-        smtp_server = os.getenv("SMTP_SERVER") or os.getenv("SMTP_HOST")
-        smtp_port = int(os.getenv("SMTP_PORT", "465"))
-        smtp_user = os.getenv("SMTP_USER") or os.getenv("SMTP_USERNAME")
-        smtp_pass = os.getenv("SMTP_PASSWORD")
-
-    if not smtp_server:
-        log("ERROR: SMTP_SERVER/SMTP_HOST is not configured; cannot send email.")
-        return False
-
-    log(f"Connecting to SMTP server {smtp_server}:{smtp_port} using SSL...")
-
-    context = ssl.create_default_context()
-    try:
-        with smtplib.SMTP_SSL(smtp_server, smtp_port, context=context) as server:
-            if smtp_user and smtp_pass:
-                server.login(smtp_user, smtp_pass)
-            server.send_message(msg, to_addrs=recipients)
-        
-        recipient_count = len(recipients) if recipients else "unknown"
-        log(f"Email sent successfully to {recipient_count} recipients.")
-        return True
-    except Exception as exc:  # noqa: BLE001
-        log(f"Error while sending email: {exc}")
+    if not mail_outbox.send(msg, recipients, timeout=SEND_TIMEOUT_SECONDS):
+        log("Email not confirmed sent.")
         return False
+    
+    recipient_count = len(recipients) if recipients else "unknown"
+    log(f"Email sent successfully to {recipient_count} recipients.")
+    return True
 
 
 def get_recipients_from_env() -> List[str]:
@@ -16,10 +16,18 @@ Usage:
 """
 
 import os
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    select_autoescape,
+)
+from markupsafe import Markup
 
 from utils.logger import create_logger
 
@@ -28,16 +36,67 @@ log = create_logger("templates")
 # Template directory (relative to project root)
 TEMPLATE_DIR = Path(__file__).parent.parent / "templates"
 
+# Compiled template bytecode, shared by every process that renders email
+# (publisher, preview server, test editions)
+DEFAULT_CACHE_DIR = "/app/data/cache/jinja"
+
+# One environment per process: templates are parsed and compiled on first
+# use, then only re-checked by mtime (auto_reload) so edits still show up.
+_env: Optional[Environment] = None
+_env_lock = threading.Lock()
+
+# Context-free partials rendered once and reused until their file changes
+_partials: Dict[str, Tuple[Template, Markup]] = {}
+
+# Placeholder left in a shared render for the per-recipient card
+PERSONAL_SLOT = "<!-- personal -->"
+
+
+def _cache_dir() -> str:
+    # Read per call so tests and tools can redirect it
+    return os.getenv("TEMPLATE_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+
+def _bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    try:
+        os.makedirs(_cache_dir(), exist_ok=True)
+    except OSError as exc:
+        log(f"Template bytecode cache disabled: {exc}")
+        return None
+    return FileSystemBytecodeCache(_cache_dir())
+
 
 def _get_jinja_env() -> Environment:
-    """Create and configure Jinja2 environment."""
-    env = Environment(
-        loader=FileSystemLoader(TEMPLATE_DIR),
-        autoescape=select_autoescape(["html", "xml"]),
-        trim_blocks=True,
-        lstrip_blocks=True,
-    )
-    return env
+    """Return the process-wide Jinja2 environment, creating it on first use."""
+    global _env
+    with _env_lock:
+        if _env is None:
+            _env = Environment(
+                loader=FileSystemLoader(TEMPLATE_DIR),
+                autoescape=select_autoescape(["html", "xml"]),
+                trim_blocks=True,
+                lstrip_blocks=True,
+                bytecode_cache=_bytecode_cache(),
+                auto_reload=True,
+            )
+            _env.globals["partial"] = render_partial
+        return _env
+
+
+def render_partial(name: str) -> Markup:
+    """Render a template that takes no context, memoised per process.
+
+    Used from templates as ``{{ partial("styles/head.html") }}`` for
+    blocks that are the same in every edition, such as the stylesheet.
+    The cached HTML is re-rendered when the file changes.
+    """
+    cached = _partials.get(name)
+    if cached and cached[0].is_up_to_date:
+        return cached[1]
+    template = _get_jinja_env().get_template(name)
+    html = Markup(template.render())
+    _partials[name] = (template, html)
+    return html
 
 
 def render_daily_email(
@@ -66,8 +125,10 @@ def render_daily_email(
     tide_display: str = "",
     # Optional sections
     image_cid: Optional[str] = None,
+    image_url: Optional[str] = None,
     timelapse_url: Optional[str] = None,
     chart_cid: Optional[str] = None,
+    chart_url: Optional[str] = None,
     stats_24h: Optional[Dict[str, Any]] = None,
     riddle_text: Optional[str] = None,
     yesterday_answer: Optional[str] = None,
@@ -84,6 +145,8 @@ def render_daily_email(
     # Debug/test mode
     test_mode: bool = False,
     debug_info: Optional[Dict[str, Any]] = None,
+    # Leave PERSONAL_SLOT for fill_personal_slot() (personalised editions)
+    personal_slot: bool = False,
 ) -> str:
     """
     Render the daily email HTML using Jinja2 templates.
@@ -109,10 +172,14 @@ def render_daily_email(
         moon_icon: Moon phase emoji
         moon_phase: Moon phase name
         tide_display: Formatted tide string
+        image_cid: CID for embedded hero image/timelapse
+        image_url: Hosted hero image URL (used instead of image_cid)
         chart_cid: CID for embedded temperature chart image
+        chart_url: Hosted chart URL (used instead of chart_cid)
         riddle_text: Today's riddle (optional)
         yesterday_answer: Yesterday's riddle answer (optional)
         alerts: List of alert dicts with 'icon', 'title', 'detail' keys
+        personal_slot: Mark where each recipient's card goes (below the riddle)
     
     Returns:
         Rendered HTML string
@@ -142,8 +209,10 @@ def render_daily_email(
         moon_phase=moon_phase,
         tide_display=tide_display,
         image_cid=image_cid,
+        image_url=image_url,
         timelapse_url=timelapse_url,
         chart_cid=chart_cid,
+        chart_url=chart_url,
         stats_24h=stats_24h,
         riddle_text=riddle_text,
         yesterday_answer=yesterday_answer,
@@ -157,12 +226,29 @@ def render_daily_email(
         weekly_stats=weekly_stats,
         test_mode=test_mode,
         debug_info=debug_info,
+        personal_slot=Markup(PERSONAL_SLOT) if personal_slot else None,
     )
     
     log(f"Rendered daily email template ({len(html)} chars)")
     return html
 
 
+def render_personal_card(display_name: str, stats: Optional[Dict[str, Any]] = None) -> str:
+    """Render one recipient's card for a personalised edition.
+
+    Args:
+        display_name: Name to greet the recipient by
+        stats: scorekeeper.get_player_stats() result, or None for non-players
+    """
+    module = _get_jinja_env().get_template("components/personal_card.html").module
+    return str(module.personal_card(display_name, stats))
+
+
+def fill_personal_slot(html: str, fragment: str) -> str:
+    """Put a recipient's card into HTML rendered with ``personal_slot=True``."""
+    return html.replace(PERSONAL_SLOT, fragment, 1)
+
+
 def get_condition_emoji(condition: Optional[str]) -> str:
     """Get emoji for weather condition."""
     if not condition:
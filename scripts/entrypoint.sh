@@ -9,6 +9,7 @@ cleanup() {
     kill -TERM "$SCHEDULER_PID" 2>/dev/null || true
     kill -TERM "$STATUS_PID" 2>/dev/null || true
     kill -TERM "$WEBSERVER_PID" 2>/dev/null || true
+    kill -TERM "$INBOX_PID" 2>/dev/null || true
     wait
     echo "[$(date -u +"%Y-%m-%dT%H:%M:%SZ")] [entrypoint] Services stopped."
     exit 0
@@ -43,12 +44,17 @@ python -u scripts/web_server.py &
 WEBSERVER_PID=$!
 echo "[$(date -u +"%Y-%m-%dT%H:%M:%SZ")] [entrypoint] Started web_server.py (PID=${WEBSERVER_PID})"
 
+# Start inbox monitor daemon (IMAP IDLE; INBOX_MODE=poll to poll instead)
+python -u scripts/inbox_monitor.py --daemon &
+INBOX_PID=$!
+echo "[$(date -u +"%Y-%m-%dT%H:%M:%SZ")] [entrypoint] Started inbox_monitor.py (PID=${INBOX_PID})"
+
 # Wait for the first process to exit; let Docker handle restart policy
 # Note: wait -n is not available in all shells, but standard in bash 4.3+ (Debian/Alpine usually have it)
 # However, with trap, we need a loop or wait on specific PIDs to keep trap active.
 # Simple wait will return when a signal is caught.
 
-wait "$INGESTION_PID" "$CURATOR_PID" "$SCHEDULER_PID" "$STATUS_PID" "$WEBSERVER_PID"
+wait "$INGESTION_PID" "$CURATOR_PID" "$SCHEDULER_PID" "$STATUS_PID" "$WEBSERVER_PID" "$INBOX_PID"
 
 EXIT_CODE=$?
 echo "[$(date -u +"%Y-%m-%dT%H:%M:%SZ")] [entrypoint] Child process exited with code ${EXIT_CODE}, stopping container."
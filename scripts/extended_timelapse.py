@@ -8,18 +8,25 @@ Outputs to data/www/timelapses/ for web access via Tailscale.
 import glob
 import os
 import shutil
-import smtplib
-import ssl
 import subprocess
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from email.message import EmailMessage
 from typing import List, Optional
 
 from PIL import Image
 
+import mail_outbox
 from utils.logger import create_logger
-from utils.image_utils import sample_frames_evenly
+from utils.image_utils import (
+    FRAME_PREP_WORKERS,
+    apply_gain,
+    deflicker_gains,
+    frame_luminances,
+    select_quality_frames,
+)
 
 log = create_logger("extended_timelapse")
 
@@ -87,45 +94,82 @@ def get_images_for_year(year: int) -> List[str]:
     return images
 
 
-# sample_frames_evenly imported from utils.image_utils
+# select_quality_frames imported from utils.image_utils
 
 
-def prepare_frames(images: List[str], temp_dir: str, max_width: int = 1280) -> int:
-    """Resize and copy frames to temp directory with sequential naming for ffmpeg."""
-    frame_count = 0
-
-    for i, img_path in enumerate(images):
-        try:
-            img = Image.open(img_path)
-
-            # Convert to RGB if necessary
-            if img.mode != "RGB":
-                img = img.convert("RGB")
-
-            # Resize to max_width maintaining aspect ratio
-            if img.width > max_width:
-                ratio = max_width / img.width
-                new_height = int(img.height * ratio)
-                # Ensure even dimensions for H.264
-                new_height = new_height - (new_height % 2)
-                new_width = max_width - (max_width % 2)
+def _prepare_frame(img_path: str, output_path: str, max_width: int, gain: float) -> bool:
+    """Resize, exposure-correct and save one frame. Returns True on success."""
+    try:
+        img = Image.open(img_path)
+        img.draft("RGB", (max_width, max_width))
+
+        # Convert to RGB if necessary
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+
+        # Resize to max_width maintaining aspect ratio
+        if img.width > max_width:
+            ratio = max_width / img.width
+            new_height = int(img.height * ratio)
+            # Ensure even dimensions for H.264
+            new_height = new_height - (new_height % 2)
+            new_width = max_width - (max_width % 2)
+            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        else:
+            # Still ensure even dimensions
+            new_width = img.width - (img.width % 2)
+            new_height = img.height - (img.height % 2)
+            if new_width != img.width or new_height != img.height:
                 img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            else:
-                # Still ensure even dimensions
-                new_width = img.width - (img.width % 2)
-                new_height = img.height - (img.height % 2)
-                if new_width != img.width or new_height != img.height:
-                    img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-            # Save with sequential naming
-            output_path = os.path.join(temp_dir, f"frame_{i:06d}.jpg")
-            img.save(output_path, "JPEG", quality=90)
-            frame_count += 1
 
-        except Exception as e:
-            log(f"Error processing {img_path}: {e}")
-            continue
+        img = apply_gain(img, gain)
+        img.save(output_path, "JPEG", quality=90)
+        return True
+
+    except Exception as e:
+        log(f"Error processing {img_path}: {e}")
+        return False
+
+
+def prepare_frames(
+    images: List[str],
+    temp_dir: str,
+    max_width: int = 1280,
+    deflicker: bool = True,
+) -> int:
+    """Resize and copy frames to temp directory with sequential naming for ffmpeg.
+
+    Luminance for the deflicker gain curve comes from cached curator
+    metrics (or a thumbnail decode), so each frame is fully decoded once.
+    """
+    start = time.perf_counter()
+    gains = [1.0] * len(images)
+    if deflicker:
+        gains = deflicker_gains(frame_luminances(images))
+
+    staged = [os.path.join(temp_dir, f"raw_{i:06d}.jpg") for i in range(len(images))]
+    with ThreadPoolExecutor(max_workers=max(1, FRAME_PREP_WORKERS)) as pool:
+        results = list(
+            pool.map(
+                lambda args: _prepare_frame(*args),
+                [(path, out, max_width, gain) for path, out, gain in zip(images, staged, gains)],
+            )
+        )
+
+    # ffmpeg's %06d pattern stops at the first gap, so renumber contiguously
+    frame_count = 0
+    for ok, path in zip(results, staged):
+        if ok:
+            os.replace(path, os.path.join(temp_dir, f"frame_{frame_count:06d}.jpg"))
+            frame_count += 1
 
+    elapsed = time.perf_counter() - start
+    if frame_count:
+        log(
+            f"Prepared {frame_count} frames in {elapsed:.1f}s "
+            f"({elapsed * 1000 / frame_count:.0f}ms/frame, "
+            f"deflicker={'on' if deflicker else 'off'})"
+        )
     return frame_count
 
 
@@ -134,6 +178,7 @@ def create_mp4_timelapse(
     output_path: str,
     fps: int = 24,
     max_width: int = 1280,
+    deflicker: bool = True,
 ) -> Optional[str]:
     """Create an MP4 timelapse from images using ffmpeg.
 
@@ -142,6 +187,7 @@ def create_mp4_timelapse(
         output_path: Path to save the MP4
         fps: Frames per second
         max_width: Maximum width of output video
+        deflicker: Whether to smooth frame-to-frame exposure changes
 
     Returns:
         Output path on success, None on failure
@@ -161,14 +207,12 @@ def create_mp4_timelapse(
 
     try:
         # Prepare frames
-        frame_count = prepare_frames(images, temp_dir, max_width)
+        frame_count = prepare_frames(images, temp_dir, max_width, deflicker)
 
         if frame_count < 2:
             log("Not enough valid frames after processing")
             return None
 
-        log(f"Prepared {frame_count} frames")
-
         # Ensure output directory exists
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
@@ -197,6 +241,7 @@ def create_mp4_timelapse(
 
         log(f"Running ffmpeg: {' '.join(ffmpeg_cmd)}")
 
+        encode_start = time.perf_counter()
         result = subprocess.run(
             ffmpeg_cmd,
             capture_output=True,
@@ -208,12 +253,16 @@ def create_mp4_timelapse(
             log(f"ffmpeg error: {result.stderr}")
             return None
 
+        encode_seconds = time.perf_counter() - encode_start
+
         # Get file size
         file_size = os.path.getsize(output_path)
         duration_sec = frame_count / fps
 
         log(
-            f"Created {output_path}: {file_size / 1024 / 1024:.1f}MB, {duration_sec:.1f}s @ {fps}fps"
+            f"Created {output_path}: {file_size / 1024 / 1024:.1f}MB "
+            f"({file_size / frame_count / 1024:.1f}KB/frame), {duration_sec:.1f}s @ {fps}fps, "
+            f"encoded in {encode_seconds:.1f}s ({encode_seconds * 1000 / frame_count:.0f}ms/frame)"
         )
 
         return output_path
@@ -246,7 +295,7 @@ def create_daily_timelapse_mp4(target_frames: int = 60) -> Optional[str]:
         return None
     
     # Sample to target frame count
-    sampled = sample_frames_evenly(images, target_frames)
+    sampled = select_quality_frames(images, target_frames)
     
     if len(sampled) < 2:
         log("Not enough daylight images for daily MP4 timelapse")
@@ -274,18 +323,18 @@ def create_weekly_timelapse_mp4(target_frames: int = 200) -> Optional[str]:
     
     # Import from timelapse.py
     try:
-        from scripts.timelapse import get_images_for_period
+        from scripts.timelapse import filter_daylight_images, get_images_for_period
     except ImportError:
-        from timelapse import get_images_for_period
+        from timelapse import filter_daylight_images, get_images_for_period
     
-    images = get_images_for_period(days=7)
+    images = filter_daylight_images(get_images_for_period(days=7))
     
     if not images:
         log("No images found for weekly MP4 timelapse")
         return None
     
     # Sample to target frame count
-    sampled = sample_frames_evenly(images, target_frames)
+    sampled = select_quality_frames(images, target_frames)
     
     if len(sampled) < 2:
         log("Not enough images for weekly MP4 timelapse")
@@ -328,7 +377,7 @@ def create_monthly_timelapse(
         return None
 
     # Sample to target frame count
-    sampled = sample_frames_evenly(images, target_frames)
+    sampled = select_quality_frames(images, target_frames)
 
     # Output filename
     output_filename = f"monthly_{year}_{month:02d}.mp4"
@@ -350,14 +399,19 @@ def create_yearly_timelapse(
 
     log(f"Creating yearly timelapse for {year} (target: {target_frames} frames)")
 
-    images = get_images_for_year(year)
+    try:
+        from scripts.timelapse import filter_daylight_images
+    except ImportError:
+        from timelapse import filter_daylight_images
+
+    images = filter_daylight_images(get_images_for_year(year))
 
     if not images:
         log(f"No images found for {year}")
         return None
 
     # Sample to target frame count (or use all if fewer)
-    sampled = sample_frames_evenly(images, target_frames)
+    sampled = select_quality_frames(images, target_frames)
 
     # Output filename
     output_filename = f"yearly_{year}.mp4"
@@ -387,8 +441,6 @@ def send_timelapse_notification(
     """
     recipient = "joshcrow1193@gmail.com"
 
-    smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-    smtp_port = int(os.getenv("SMTP_PORT", "465"))
     smtp_user = os.getenv("SMTP_USER", "")
     smtp_pass = os.getenv("SMTP_PASSWORD", "")
     smtp_from = os.getenv("SMTP_FROM", "Greenhouse Gazette <joshcrow1193@gmail.com>")
@@ -440,15 +492,10 @@ The Greenhouse Gazette
     msg["Subject"] = subject
     msg.set_content(body)
 
-    try:
-        context = ssl.create_default_context()
-        with smtplib.SMTP_SSL(smtp_server, smtp_port, context=context) as server:
-            if smtp_user and smtp_pass:
-                server.login(smtp_user, smtp_pass)
-            server.send_message(msg)
-        log(f"Timelapse notification sent to {recipient}")
-    except Exception as exc:  # noqa: BLE001
-        log(f"Failed to send timelapse notification: {exc}")
+    if mail_outbox.enqueue(msg) is None:
+        log("Failed to queue timelapse notification")
+    else:
+        log(f"Timelapse notification queued for {recipient}")
 
 
 def list_available_timelapses() -> List[dict]:
@@ -0,0 +1,91 @@
+"""Concurrent external data gathering for Greenhouse Gazette editions.
+
+Runs the OpenWeather call and both NOAA CO-OPS requests (ocean tide
+predictions, sound-side water level) at the same time on one pooled
+httpx client, under a single deadline. Responses go through the shared
+fetch cache, so anything fetched recently (or a stale copy, if a refresh
+fails) is served without waiting on the network.
+
+Usage:
+    from external_data import gather_external_data
+
+    data = gather_external_data()
+    data["weather"], data["coast_sky"]
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+import coast_sky_service
+import weather_service
+from utils.http_client import async_client
+from utils.logger import create_logger
+
+log = create_logger("external_data")
+
+# Wall-time budget for the whole gathering phase (all sources, all retries)
+FETCH_DEADLINE_SECONDS = float(os.getenv("EXTERNAL_FETCH_DEADLINE_SECONDS", "25"))
+
+
+async def _gather(weather: bool, coast_sky: bool, deadline: float) -> Dict[str, Dict[str, Any]]:
+    names = []
+    jobs = []
+    async with async_client() as client:
+        if weather:
+            names.append("weather")
+            jobs.append(weather_service.get_current_weather_async(client, deadline))
+        if coast_sky:
+            names.append("coast_sky")
+            jobs.append(coast_sky_service.get_coast_sky_summary_async(client, deadline))
+        results = await asyncio.gather(*jobs, return_exceptions=True)
+
+    gathered = {}
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            log(f"{name} fetch failed: {result}")
+            result = {}
+        gathered[name] = result
+    return gathered
+
+
+def gather_external_data(
+    weather: bool = True,
+    coast_sky: bool = True,
+    deadline_seconds: Optional[float] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Fetch weather and coast/sky data concurrently within one deadline.
+
+    Args:
+        weather: Include the OpenWeather summary
+        coast_sky: Include the coast & sky summary (NOAA + calendars)
+        deadline_seconds: Wall-time budget (default: EXTERNAL_FETCH_DEADLINE_SECONDS)
+
+    Returns:
+        {"weather": {...}, "coast_sky": {...}} for the requested sources;
+        a source that failed or ran out of time maps to {}. Never raises.
+    """
+    budget = FETCH_DEADLINE_SECONDS if deadline_seconds is None else deadline_seconds
+    start = time.monotonic()
+    # Private loop: callers are often worker threads, and the calling
+    # thread's current event loop (if any) is left untouched
+    loop = asyncio.new_event_loop()
+    try:
+        gathered = loop.run_until_complete(_gather(weather, coast_sky, start + budget))
+    except Exception as exc:  # noqa: BLE001
+        log(f"External data gathering failed: {exc}")
+        gathered = {}
+    finally:
+        loop.close()
+    for name, wanted in (("weather", weather), ("coast_sky", coast_sky)):
+        if wanted:
+            gathered.setdefault(name, {})
+    log(f"Gathered {sorted(gathered)} in {time.monotonic() - start:.2f}s (budget {budget:.0f}s)")
+    return gathered
+
+
+if __name__ == "__main__":
+    import json
+
+    print(json.dumps(gather_external_data(), indent=2, default=str))
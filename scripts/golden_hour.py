@@ -1,68 +1,53 @@
 #!/usr/bin/env python3
 """Golden Hour Photo Capture for Greenhouse Gazette.
 
-Calculates the optimal photo capture time (golden hour) based on sunset,
-and triggers the camera bridge at that time.
+Calculates the optimal photo capture time (golden hour) from the offline
+solar calculator, and triggers the camera bridge at that time.
 """
 
-import os
-from datetime import datetime, timedelta
+from datetime import date, datetime
 from typing import Optional
-import requests
-
 
+import solar
 from utils.logger import create_logger
 
 log = create_logger("golden_hour")
 
 
-def get_sunset_time() -> Optional[datetime]:
-    """Fetch today's sunset time from OpenWeather API."""
-    api_key = os.getenv("OPENWEATHER_API_KEY")
-    lat = os.getenv("LAT")
-    lon = os.getenv("LON")
-
-    if not api_key or not lat or not lon:
-        log("Weather API config missing")
+def get_sunset_time(target_date: Optional[date] = None) -> Optional[datetime]:
+    """Sunset (naive local time) for a date, computed offline. Defaults to today."""
+    sunset = solar.get_sun_times(target_date).sunset
+    if not sunset:
         return None
 
-    url = "https://api.openweathermap.org/data/3.0/onecall"
-    params = {
-        "lat": lat,
-        "lon": lon,
-        "appid": api_key,
-        "exclude": "minutely,hourly,alerts",
-    }
-
-    try:
-        resp = requests.get(url, params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-
-        current = data.get("current", {})
-        sunset_ts = current.get("sunset")
-
-        if sunset_ts:
-            sunset = datetime.fromtimestamp(sunset_ts)
-            log(f"Today's sunset: {sunset.strftime('%H:%M')}")
-            return sunset
-    except Exception as e:
-        log(f"Error fetching sunset time: {e}")
+    sunset = sunset.replace(tzinfo=None)
+    log(f"Sunset: {sunset.strftime('%Y-%m-%d %H:%M')}")
+    return sunset
 
-    return None
 
-
-def get_golden_hour() -> Optional[datetime]:
-    """Calculate golden hour (1 hour before sunset)."""
-    sunset = get_sunset_time()
-    if not sunset:
+def get_golden_hour(target_date: Optional[date] = None) -> Optional[datetime]:
+    """Start of the evening golden hour (sun 6° above the horizon), naive local."""
+    start, _ = solar.get_sun_times(target_date).golden_evening
+    if not start:
         return None
 
-    golden = sunset - timedelta(hours=1)
+    golden = start.replace(tzinfo=None)
     log(f"Golden hour calculated: {golden.strftime('%H:%M')}")
     return golden
 
 
+def get_golden_hour_time(target_date: Optional[date] = None) -> str:
+    """Golden hour start as "HH:MM" for the scheduler.
+
+    Falls back to the seasonal table if the sun never reaches golden-hour
+    elevation on that date.
+    """
+    golden = get_golden_hour(target_date)
+    if golden:
+        return golden.strftime("%H:%M")
+    return get_seasonal_golden_hour()
+
+
 def should_capture_now(tolerance_minutes: int = 30) -> bool:
     """Check if current time is within golden hour window."""
     golden = get_golden_hour()
@@ -79,7 +64,8 @@ def should_capture_now(tolerance_minutes: int = 30) -> bool:
 
 
 # Default golden hour times by month (for Outer Banks, NC ~36°N)
-# These are approximate times for 1 hour before sunset
+# These are approximate times for 1 hour before sunset. Only used when the
+# solar calculation can't produce a golden hour.
 SEASONAL_GOLDEN_HOURS = {
     1: "16:00",  # January - sunset ~5:15 PM
     2: "16:30",  # February
@@ -97,7 +83,7 @@ SEASONAL_GOLDEN_HOURS = {
 
 
 def get_seasonal_golden_hour() -> str:
-    """Get golden hour based on current month (no API needed)."""
+    """Get approximate golden hour based on current month (fallback table)."""
     month = datetime.now().month
     return SEASONAL_GOLDEN_HOURS.get(month, "16:30")
 
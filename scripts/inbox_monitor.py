@@ -1,7 +1,18 @@
 """Unified Inbox Monitor - Handles BROADCAST, INJECT, and GUESS commands.
 
 Extends broadcast_email.py functionality to add riddle game support.
-Polls Gmail inbox for commands and routes to appropriate handlers.
+Watches the Gmail inbox for commands and routes to appropriate handlers.
+
+Runs as its own daemon (``python inbox_monitor.py --daemon``): one IMAP
+connection held open in IDLE, so the server pushes new mail and guesses
+are scored within seconds. IDLE is re-issued every IDLE_REFRESH_SECONDS
+(Gmail ends IDLE after 29 minutes) and dropped connections reconnect
+with exponential backoff. INBOX_MODE=poll, or a server without IDLE,
+falls back to polling every POLL_INTERVAL_MINUTES.
+
+Unread mail is fetched header-first in batches: one FETCH of routing
+headers for all UNSEEN UIDs, one FETCH of just the text/plain part of
+mail that will be handled, one STORE to mark everything read.
 
 Email subject formats:
   BROADCAST: Your Title Here  -> Creates broadcast card in email
@@ -15,12 +26,17 @@ import imaplib
 import json
 import os
 import re
-import smtplib
+import select
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from email.header import decode_header
 from email.mime.text import MIMEText
 from email.utils import parsedate_to_datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from utils.io import atomic_write_json, atomic_read_json
 from utils.logger import create_logger
@@ -28,6 +44,7 @@ from utils.logger import create_logger
 log = create_logger("inbox_monitor")
 
 # Import game modules
+import mail_outbox
 import narrator
 import scorekeeper
 
@@ -66,6 +83,14 @@ def _get_riddle_state_path() -> str:
 MAX_REPLIES_PER_USER_PER_DAY = 5
 POLL_INTERVAL_MINUTES = 5  # Kept at 5 minutes for Gmail friendliness
 
+IMAP_SERVER = "imap.gmail.com"
+IMAP_TIMEOUT_SECONDS = 60
+INBOX_MODE = os.getenv("INBOX_MODE", "idle").lower()  # "idle" (push) or "poll"
+IDLE_REFRESH_SECONDS = 25 * 60  # Re-issue IDLE well inside Gmail's 29-minute limit
+IDLE_BACKOFF_MIN_SECONDS = 5
+IDLE_BACKOFF_MAX_SECONDS = 300
+GUESS_JUDGE_WORKERS = int(os.getenv("GUESS_JUDGE_WORKERS", "10"))  # Guesses judged at once per batch
+
 # Auto-reply detection
 AUTO_REPLY_HEADERS = [
     "X-Auto-Response-Suppress",
@@ -214,14 +239,11 @@ def record_reply_sent(user_email: str) -> None:
 # =============================================================================
 
 def send_reply(original_msg, body: str, sender_email: str) -> bool:
-    """Send a reply that threads properly with the original email."""
+    """Queue a reply that threads properly with the original email."""
     cfg = _get_settings()
     # Use settings if available, otherwise fall back to env vars
     smtp_user = (cfg.smtp_user if cfg else None) or os.getenv("SMTP_USER")
     smtp_password = (cfg.smtp_password if cfg else None) or os.getenv("SMTP_PASSWORD")
-    smtp_server = (cfg.smtp_server or cfg.smtp_host) if cfg else None
-    smtp_server = smtp_server or os.getenv("SMTP_SERVER", "smtp.gmail.com")
-    smtp_port = cfg.smtp_port if cfg else int(os.getenv("SMTP_PORT", "465"))
     
     if not smtp_user or not smtp_password:
         log("ERROR: SMTP credentials not configured")
@@ -247,19 +269,13 @@ def send_reply(original_msg, body: str, sender_email: str) -> bool:
         msg["Auto-Submitted"] = "auto-replied"
         msg["X-Auto-Response-Suppress"] = "All"
         
-        # Use SSL for port 465, STARTTLS for 587
-        if smtp_port == 465:
-            with smtplib.SMTP_SSL(smtp_server, smtp_port) as server:
-                server.login(smtp_user, smtp_password)
-                server.send_message(msg)
-        else:
-            with smtplib.SMTP(smtp_server, smtp_port) as server:
-                server.starttls()
-                server.login(smtp_user, smtp_password)
-                server.send_message(msg)
+        # Delivered in the background over the outbox's pooled connection
+        if mail_outbox.enqueue(msg, [sender_email]) is None:
+            log(f"Failed to queue reply to {sender_email}")
+            return False
         
         record_reply_sent(sender_email)
-        log(f"Sent reply to {sender_email}")
+        log(f"Queued reply to {sender_email}")
         return True
         
     except Exception as exc:
@@ -361,8 +377,19 @@ def _extract_guess_text(body: str) -> str:
     return guess.strip()
 
 
-def handle_guess(msg, sender_email: str) -> bool:
-    """Process a riddle guess email.
+@dataclass
+class PendingGuess:
+    """A guess that passed the checks and is waiting to be judged."""
+    msg: Any
+    sender_email: str
+    guess_text: str
+    date_id: str
+    email_timestamp: datetime
+    riddle_state: Dict[str, Any]
+
+
+def _prepare_guess(msg, sender_email: str, riddle_state: Dict[str, Any]) -> Optional[PendingGuess]:
+    """Parse and validate a guess email; reply and return None if it's rejected.
     
     Supports multiple formats:
     1. Subject: GUESS [2026-01-18]: answer
@@ -371,6 +398,7 @@ def handle_guess(msg, sender_email: str) -> bool:
     """
     subject = decode_email_subject(msg.get("Subject", ""))
     body = get_email_body(msg).strip()
+    current_date = riddle_state.get("date")
     
     # Try to parse structured format from subject
     parsed = parse_guess_subject(subject)
@@ -382,14 +410,11 @@ def handle_guess(msg, sender_email: str) -> bool:
             guess_text = _extract_guess_text(body)
     else:
         # Subject didn't have proper format - use body as guess with current date
-        riddle_state = _load_riddle_state()
-        current_date = riddle_state.get("date")
-        
         if not current_date:
             send_reply(msg,
                 "The Captain hasn't posed a riddle yet. Check back after the morning Gazette.",
                 sender_email)
-            return False
+            return None
         
         guess_text = _extract_guess_text(body)
         date_id = current_date
@@ -398,46 +423,54 @@ def handle_guess(msg, sender_email: str) -> bool:
         send_reply(msg,
             "You sent an empty guess. Put something in it next time.",
             sender_email)
-        return False
+        return None
     
     # Validate date matches current riddle
-    riddle_state = _load_riddle_state()
-    current_date = riddle_state.get("date")
-    
     if not current_date:
         send_reply(msg,
             "The Captain hasn't posed a riddle yet. Check back after the morning Gazette.",
             sender_email)
-        return False
+        return None
     
     if date_id != current_date:
         send_reply(msg,
             f"That riddle is old news. Today's riddle is dated {current_date}. "
             "Check the latest Gazette.",
             sender_email)
-        return False
-    
-    # Get email timestamp for fair first-solver determination
-    email_timestamp = parse_email_timestamp(msg) or datetime.utcnow()
-    
-    # Judge the guess
-    correct_answer = riddle_state.get("answer", "")
-    riddle_text = riddle_state.get("riddle", "")
+        return None
     
+    return PendingGuess(
+        msg=msg,
+        sender_email=sender_email,
+        guess_text=guess_text,
+        date_id=date_id,
+        # Email timestamp for fair first-solver determination
+        email_timestamp=parse_email_timestamp(msg) or datetime.utcnow(),
+        riddle_state=riddle_state,
+    )
+
+
+def _judge_guess(guess: PendingGuess) -> Dict[str, Any]:
+    """Judge one guess (blocking; safe to run on a worker thread)."""
     try:
         judgment = narrator.judge_riddle(
-            user_guess=guess_text,
-            correct_answer=correct_answer,
-            riddle_text=riddle_text
+            user_guess=guess.guess_text,
+            correct_answer=guess.riddle_state.get("answer", ""),
+            riddle_text=guess.riddle_state.get("riddle", ""),
+            riddle_date=guess.date_id,
         )
-        log(f"AI judgment for '{guess_text[:30]}...': correct={judgment.get('correct')}, reply_len={len(judgment.get('reply_text', ''))}")
+        log(f"AI judgment for '{guess.guess_text[:30]}...': correct={judgment.get('correct')}, reply_len={len(judgment.get('reply_text', ''))}")
+        return judgment
     except Exception as exc:
         log(f"ERROR: judge_riddle failed: {exc}")
-        judgment = {
+        return {
             "correct": False,
             "reply_text": "Something's off with my end. Try again in a bit."
         }
-    
+
+
+def _settle_guess(guess: PendingGuess, judgment: Dict[str, Any]) -> None:
+    """Record a judged guess and reply to the sender."""
     # Ensure reply_text is never empty for wrong guesses
     reply_text = judgment.get("reply_text", "").strip()
     if not reply_text:
@@ -446,14 +479,14 @@ def handle_guess(msg, sender_email: str) -> bool:
     
     # For wrong guesses, remind them of the riddle
     if not judgment.get("correct", False):
-        reply_text += f"\n\nThe riddle was:\n\"{riddle_text}\""
+        reply_text += f"\n\nThe riddle was:\n\"{guess.riddle_state.get('riddle', '')}\""
     
     # Record the attempt
     result = scorekeeper.record_attempt(
-        user_email=sender_email,
+        user_email=guess.sender_email,
         guess_is_correct=judgment.get("correct", False),
-        riddle_date=date_id,
-        email_timestamp=email_timestamp
+        riddle_date=guess.date_id,
+        email_timestamp=guess.email_timestamp
     )
     
     # Build reply based on result status
@@ -468,10 +501,44 @@ def handle_guess(msg, sender_email: str) -> bool:
         reply_text = "That riddle's from another tide. Check the latest Gazette."
     # status == "wrong" uses the AI's reply_text (with fallback guarantee above)
     
-    success = send_reply(msg, reply_text, sender_email)
+    success = send_reply(guess.msg, reply_text, guess.sender_email)
     if not success:
-        log(f"WARNING: Failed to send reply to {sender_email}")
-    return True
+        log(f"WARNING: Failed to send reply to {guess.sender_email}")
+
+
+def handle_guesses(items: List[Tuple[Any, str]]) -> int:
+    """Process a batch of (guess email, sender) pairs.
+    
+    Guesses are judged concurrently on up to GUESS_JUDGE_WORKERS threads
+    (Gemini concurrency is still capped by the LLM gateway), then
+    recorded strictly in email-timestamp order so first-solver points go
+    to whoever sent first. Replies are queued in that order and go out
+    over the outbox's one pooled SMTP connection.
+    
+    Returns:
+        Number of guesses judged and recorded
+    """
+    riddle_state = _load_riddle_state()
+    pending = [g for g in (_prepare_guess(msg, sender, riddle_state) for msg, sender in items) if g]
+    if not pending:
+        return 0
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(GUESS_JUDGE_WORKERS, len(pending)))) as pool:
+        judgments = list(pool.map(_judge_guess, pending))
+    
+    settled = 0
+    for guess, judgment in sorted(zip(pending, judgments), key=lambda gj: gj[0].email_timestamp):
+        try:
+            _settle_guess(guess, judgment)
+            settled += 1
+        except Exception as exc:
+            log(f"Error recording guess from {guess.sender_email}: {exc}")
+    return settled
+
+
+def handle_guess(msg, sender_email: str) -> bool:
+    """Process a single riddle guess email (see handle_guesses)."""
+    return handle_guesses([(msg, sender_email)]) > 0
 
 
 # =============================================================================
@@ -549,12 +616,252 @@ def handle_injection(msg, sender_email: str) -> bool:
     return True
 
 
+# =============================================================================
+# BATCHED FETCH
+# =============================================================================
+
+# Only what routing and the handlers read; bodies are fetched separately
+HEADER_FIELDS = (
+    "FROM", "SUBJECT", "DATE", "MESSAGE-ID",
+    "AUTO-SUBMITTED", "X-AUTO-RESPONSE-SUPPRESS", "PRECEDENCE",
+)
+
+_NO_BODY = ("", "7bit", "utf-8")
+
+
+def _tokenize(chunks) -> List[Any]:
+    """Split imaplib FETCH response data into atoms, strings, literals and parens.
+    
+    imaplib hands back lines as bytes and literals as (line, literal)
+    tuples; literals become bytes tokens, everything else str.
+    """
+    tokens: List[Any] = []
+    for chunk in chunks:
+        line, literal = chunk if isinstance(chunk, tuple) else (chunk, None)
+        text = line.decode("utf-8", errors="replace")
+        if literal is not None:
+            text = re.sub(r"\{\d+\}$", "", text.rstrip())
+        i = 0
+        while i < len(text):
+            ch = text[i]
+            if ch.isspace():
+                i += 1
+            elif ch in "()":
+                tokens.append(ch)
+                i += 1
+            elif ch == '"':
+                i += 1
+                value = []
+                while i < len(text) and text[i] != '"':
+                    if text[i] == "\\":
+                        i += 1
+                    value.append(text[i])
+                    i += 1
+                tokens.append(("quoted", "".join(value)))
+                i += 1
+            else:
+                # Atom; a section spec like BODY[HEADER.FIELDS (FROM)] is one token
+                start = i
+                while i < len(text) and not text[i].isspace() and text[i] not in "()":
+                    if text[i] == "[" and "]" in text[i:]:
+                        i = text.index("]", i)
+                    i += 1
+                tokens.append(text[start:i])
+        if literal is not None:
+            tokens.append(literal)
+    return tokens
+
+
+def _parse_list(tokens: List[Any], pos: int) -> Tuple[List[Any], int]:
+    """Parse a parenthesised list starting just after its "("."""
+    items: List[Any] = []
+    while pos < len(tokens) and tokens[pos] != ")":
+        token = tokens[pos]
+        if token == "(":
+            value, pos = _parse_list(tokens, pos + 1)
+        elif isinstance(token, tuple):
+            value = token[1]
+        elif isinstance(token, str) and token.upper() == "NIL":
+            value = None
+        else:
+            value = token
+        items.append(value)
+        pos += 1
+    return items, pos
+
+
+def parse_fetch_response(data) -> Dict[str, Dict[str, Any]]:
+    """Map UID -> {ITEM: value} from an imaplib ``uid("FETCH", ...)`` result.
+    
+    Item names are upper-cased as sent by the server (``BODY[TEXT]``,
+    ``BODYSTRUCTURE``). Unsolicited FETCH responses without a UID are
+    dropped.
+    """
+    tokens = _tokenize(chunk for chunk in data if chunk is not None)
+    messages: Dict[str, Dict[str, Any]] = {}
+    pos = 0
+    while pos < len(tokens):
+        if tokens[pos] != "(":
+            pos += 1  # Sequence number (or a stray ")")
+            continue
+        items, pos = _parse_list(tokens, pos + 1)
+        pos += 1
+        fields = {
+            str(items[i]).upper(): items[i + 1]
+            for i in range(0, len(items) - 1, 2)
+        }
+        if "UID" in fields:
+            messages[str(fields["UID"])] = fields
+    return messages
+
+
+def _text(value) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return value if isinstance(value, str) else ""
+
+
+def _params(value) -> Dict[str, str]:
+    if not isinstance(value, list):
+        return {}
+    return {_text(value[i]).lower(): _text(value[i + 1]) for i in range(0, len(value) - 1, 2)}
+
+
+def find_text_part(structure, prefix: str = "") -> Optional[Tuple[str, str, str]]:
+    """Locate the part get_email_body() would read, from a BODYSTRUCTURE.
+    
+    Returns:
+        (section, transfer encoding, charset) for the first non-attachment
+        text/plain part in depth-first order, or None
+    """
+    if not isinstance(structure, list) or not structure:
+        return None
+    if isinstance(structure[0], list):
+        # multipart: (part)(part)... subtype [extensions]
+        for index, part in enumerate(p for p in structure if isinstance(p, list)):
+            found = find_text_part(part, f"{prefix}{index + 1}.")
+            if found:
+                return found
+        return None
+    if _text(structure[0]).lower() != "text" or _text(structure[1]).lower() != "plain":
+        return None
+    # text/plain: type subtype params id desc encoding size lines md5 disposition ...
+    disposition = structure[9] if len(structure) > 9 else None
+    if isinstance(disposition, list) and _text(disposition[0]).lower() == "attachment":
+        return None
+    section = prefix.rstrip(".") or "TEXT"
+    encoding = _text(structure[5]) or "7bit"
+    charset = _params(structure[2]).get("charset") or "utf-8"
+    return section, encoding, charset
+
+
+def _build_message(header: bytes, body: bytes, encoding: str, charset: str):
+    """Reassemble routing headers and the fetched text part into one message.
+    
+    The result reads like a plain-text email, so handlers and
+    get_email_body() work on it unchanged.
+    """
+    mime = (
+        f"MIME-Version: 1.0\r\n"
+        f"Content-Type: text/plain; charset=\"{charset}\"\r\n"
+        f"Content-Transfer-Encoding: {encoding}\r\n\r\n"
+    ).encode("ascii", errors="replace")
+    return email.message_from_bytes(header.rstrip(b"\r\n") + b"\r\n" + mime + body)
+
+
 # =============================================================================
 # MAIN INBOX POLLING
 # =============================================================================
 
-def poll_inbox() -> None:
-    """Poll inbox for all command types: BROADCAST, INJECT, GUESS."""
+def _credentials() -> Tuple[Optional[str], Optional[str]]:
+    cfg = _get_settings()
+    # Use settings if available, otherwise fall back to env vars (like publisher.py)
+    email_addr = (cfg.smtp_user if cfg else None) or os.getenv("SMTP_USER")
+    password = (cfg.smtp_password if cfg else None) or os.getenv("SMTP_PASSWORD")
+    return email_addr, password
+
+
+def _connect() -> imaplib.IMAP4_SSL:
+    """Log in and select the inbox."""
+    email_addr, password = _credentials()
+    if not email_addr or not password:
+        raise imaplib.IMAP4.error("SMTP_USER or SMTP_PASSWORD not configured")
+    mail = imaplib.IMAP4_SSL(IMAP_SERVER, timeout=IMAP_TIMEOUT_SECONDS)
+    mail.login(email_addr, password)
+    mail.select("inbox")
+    return mail
+
+
+def _logout(mail) -> None:
+    try:
+        mail.logout()
+    except Exception:
+        pass
+
+
+def _route(msg, sender: str, admin_senders: List[str], player_emails: List[str],
+           game_enabled: bool) -> Optional[Callable[[Any, str], bool]]:
+    """Pick the handler for an email from its headers alone (None = discard)."""
+    subject = decode_email_subject(msg.get("Subject", ""))
+    subject_upper = subject.upper()
+    
+    # Skip auto-replies
+    if is_auto_reply(msg):
+        log(f"Skipping auto-reply from {sender}")
+        return None
+    
+    # Admin commands
+    if sender in admin_senders:
+        if subject_upper.startswith("BROADCAST:"):
+            return handle_broadcast
+        if "INJECT" in subject_upper and ":" in subject:
+            return handle_injection
+        if subject_upper.startswith("GUESS") and game_enabled:
+            return handle_guess
+        if subject_upper.startswith("HELP") and game_enabled:
+            return handle_help
+        if subject_upper.startswith("STATS") and game_enabled:
+            return handle_stats
+        return None
+    
+    # Player commands (non-admin)
+    if sender in player_emails and game_enabled:
+        # Strip Re:/Fwd: prefixes to detect command type
+        clean_subject = re.sub(r'^(Re:\s*|Fwd:\s*)+', '', subject, flags=re.IGNORECASE).strip()
+        clean_upper = clean_subject.upper()
+        
+        if clean_upper.startswith("GUESS") or "GUESS" in subject_upper:
+            return handle_guess
+        if clean_upper.startswith("HELP"):
+            return handle_help
+        if clean_upper.startswith("STATS"):
+            return handle_stats
+        log(f"Ignoring unrecognized email from player {sender}: {subject[:50]}")
+        return None
+    
+    log(f"Ignoring email from unknown sender {sender}: {subject[:50]}")
+    return None
+
+
+def _header_bytes(fields: Dict[str, Any]) -> bytes:
+    for key, value in fields.items():
+        if key.startswith("BODY[HEADER") and isinstance(value, bytes):
+            return value
+    return b""
+
+
+def _process_unseen(mail) -> int:
+    """Handle every unread email on a selected connection.
+    
+    Two phases, each one round trip however many emails are waiting:
+    routing headers and BODYSTRUCTURE for every UNSEEN UID, then only the
+    text/plain part of emails a handler will read. Attachments and
+    discarded mail (auto-replies, unknown senders) are never downloaded.
+    Guesses are judged as one concurrent batch. Everything routed is marked read with a single STORE at the end.
+    
+    Returns:
+        Number of emails processed
+    """
     cfg = _get_settings()
     
     # Check kill switch
@@ -564,98 +871,100 @@ def poll_inbox() -> None:
     else:
         game_enabled = True
     
-    imap_server = "imap.gmail.com"
-    cfg = _get_settings()
-    # Use settings if available, otherwise fall back to env vars (like publisher.py)
-    email_addr = (cfg.smtp_user if cfg else None) or os.getenv("SMTP_USER")
-    password = (cfg.smtp_password if cfg else None) or os.getenv("SMTP_PASSWORD")
-    
     # Sender allow-lists
     admin_senders_env = os.getenv("BROADCAST_ALLOWED_SENDERS", "")
     admin_senders = [s.strip().lower() for s in admin_senders_env.split(",") if s.strip()]
     
     player_emails = [e.lower() for e in cfg.smtp_recipients] if cfg else []
     
-    if not email_addr or not password:
-        log("ERROR: SMTP_USER or SMTP_PASSWORD not configured")
-        return
+    # Search for unread emails
+    _, data = mail.uid("SEARCH", None, "(UNSEEN)")
+    uids = [uid.decode() for uid in data[0].split()]
+    
+    if not uids:
+        return 0
     
+    log(f"Found {len(uids)} unread email(s)")
+    
+    seen: List[str] = []
     try:
-        mail = imaplib.IMAP4_SSL(imap_server)
-        mail.login(email_addr, password)
-        mail.select("inbox")
-        
-        # Search for unread emails
-        _, data = mail.search(None, "(UNSEEN)")
-        email_ids = data[0].split()
+        # Phase 1: headers + structure, routed without touching bodies
+        _, data = mail.uid(
+            "FETCH", ",".join(uids),
+            f"(BODYSTRUCTURE BODY.PEEK[HEADER.FIELDS ({' '.join(HEADER_FIELDS)})])",
+        )
+        fetched = parse_fetch_response(data)
         
-        if not email_ids:
-            mail.logout()
-            return
+        wanted: List[Tuple[str, Any, str, Callable[[Any, str], bool], Tuple[str, str, str]]] = []
+        for uid in uids:
+            fields = fetched.get(uid)
+            if fields is None:
+                log(f"Error processing email {uid}: not returned by FETCH")
+                seen.append(uid)
+                continue
+            header = _header_bytes(fields)
+            msg = email.message_from_bytes(header)
+            sender = extract_sender_email(msg)
+            handler = _route(msg, sender, admin_senders, player_emails, game_enabled)
+            if handler is None:
+                seen.append(uid)
+            else:
+                part = find_text_part(fields.get("BODYSTRUCTURE")) or _NO_BODY
+                wanted.append((uid, header, sender, handler, part))
         
-        log(f"Found {len(email_ids)} unread email(s)")
+        # Phase 2: one FETCH per distinct text-part section (usually one or two)
+        bodies: Dict[str, bytes] = {}
+        for section in sorted({part[0] for *_, part in wanted if part[0]}):
+            section_uids = [uid for uid, *_, part in wanted if part[0] == section]
+            _, data = mail.uid("FETCH", ",".join(section_uids), f"(BODY.PEEK[{section}])")
+            for uid, fields in parse_fetch_response(data).items():
+                body = fields.get(f"BODY[{section}]")
+                bodies[uid] = body if isinstance(body, bytes) else _text(body).encode()
         
-        for email_id in email_ids:
+        # Guesses are judged together (handle_guesses)
+        guesses: List[Tuple[Any, str]] = []
+        guess_uids: List[str] = []
+        for uid, header, sender, handler, (_, encoding, charset) in wanted:
             try:
-                _, msg_data = mail.fetch(email_id, "(RFC822)")
-                raw_email = msg_data[0][1]
-                msg = email.message_from_bytes(raw_email)
-                
-                sender = extract_sender_email(msg)
-                subject = decode_email_subject(msg.get("Subject", ""))
-                subject_upper = subject.upper()
-                
-                # Skip auto-replies
-                if is_auto_reply(msg):
-                    log(f"Skipping auto-reply from {sender}")
-                    mail.store(email_id, "+FLAGS", "\\Seen")
+                msg = _build_message(header, bodies.get(uid, b""), encoding, charset)
+                if handler is handle_guess:
+                    guesses.append((msg, sender))
+                    guess_uids.append(uid)
                     continue
-                
-                # Route based on sender and subject
-                handled = False
-                
-                # Admin commands
-                if sender in admin_senders:
-                    if subject_upper.startswith("BROADCAST:"):
-                        handled = handle_broadcast(msg, sender)
-                    elif "INJECT" in subject_upper and ":" in subject:
-                        handled = handle_injection(msg, sender)
-                    elif subject_upper.startswith("GUESS") and game_enabled:
-                        handled = handle_guess(msg, sender)
-                    elif subject_upper.startswith("HELP") and game_enabled:
-                        handled = handle_help(msg, sender)
-                    elif subject_upper.startswith("STATS") and game_enabled:
-                        handled = handle_stats(msg, sender)
-                
-                # Player commands (non-admin)
-                elif sender in player_emails and game_enabled:
-                    # Strip Re:/Fwd: prefixes to detect command type
-                    clean_subject = re.sub(r'^(Re:\s*|Fwd:\s*)+', '', subject, flags=re.IGNORECASE).strip()
-                    clean_upper = clean_subject.upper()
-                    
-                    if clean_upper.startswith("GUESS") or "GUESS" in subject_upper:
-                        handled = handle_guess(msg, sender)
-                    elif clean_upper.startswith("HELP"):
-                        handled = handle_help(msg, sender)
-                    elif clean_upper.startswith("STATS"):
-                        handled = handle_stats(msg, sender)
-                    else:
-                        log(f"Ignoring unrecognized email from player {sender}: {subject[:50]}")
-                
-                else:
-                    log(f"Ignoring email from unknown sender {sender}: {subject[:50]}")
-                
-                # Mark as read regardless of handling
-                mail.store(email_id, "+FLAGS", "\\Seen")
-                
+                handler(msg, sender)
+            except (imaplib.IMAP4.abort, OSError):
+                raise  # Connection is gone; the caller reconnects
             except Exception as exc:
-                log(f"Error processing email {email_id}: {exc}")
-                # Still mark as read to avoid reprocessing
-                try:
-                    mail.store(email_id, "+FLAGS", "\\Seen")
-                except Exception:
-                    pass
+                log(f"Error processing email {uid}: {exc}")
+            # Mark as read regardless of handling, to avoid reprocessing
+            seen.append(uid)
         
+        if guesses:
+            try:
+                handle_guesses(guesses)
+            except Exception as exc:
+                log(f"Error processing {len(guesses)} guess email(s): {exc}")
+            seen.extend(guess_uids)
+    finally:
+        if seen:
+            try:
+                mail.uid("STORE", ",".join(seen), "+FLAGS", "(\\Seen)")
+            except Exception as exc:
+                log(f"Failed to mark {len(seen)} email(s) read: {exc}")
+    
+    return len(uids)
+
+
+def poll_inbox() -> None:
+    """Poll inbox once for all command types: BROADCAST, INJECT, GUESS."""
+    email_addr, password = _credentials()
+    if not email_addr or not password:
+        log("ERROR: SMTP_USER or SMTP_PASSWORD not configured")
+        return
+    
+    try:
+        mail = _connect()
+        _process_unseen(mail)
         mail.logout()
         
     except imaplib.IMAP4.error as exc:
@@ -664,6 +973,112 @@ def poll_inbox() -> None:
         log(f"Inbox poll failed: {exc}")
 
 
+_idle_tags = iter(range(1, 1 << 62))
+
+
+def _wait_readable(mail, timeout: float) -> bool:
+    """Whether a response line can be read within ``timeout`` seconds.
+    
+    imaplib reads through a buffered file, so a line may already be
+    buffered (or decrypted by TLS) with nothing left on the socket for
+    select(); a non-blocking peek finds those first.
+    """
+    previous = mail.sock.gettimeout()
+    mail.sock.setblocking(False)
+    try:
+        if mail.file.peek(1):
+            return True
+    except (BlockingIOError, ssl.SSLWantReadError):
+        pass
+    finally:
+        mail.sock.settimeout(previous)
+    return timeout > 0 and bool(select.select([mail.sock], [], [], timeout)[0])
+
+
+def idle_wait(mail, timeout: float) -> bool:
+    """Hold the connection in IMAP IDLE (RFC 2177) until new mail or ``timeout``.
+    
+    imaplib (before 3.14) has no IDLE command, so it is written on the
+    connection directly with its own tag.
+    
+    Returns:
+        True if the server reported new messages
+    
+    Raises:
+        imaplib.IMAP4.abort: Connection closed
+        imaplib.IMAP4.error: IDLE refused or not ended cleanly
+    """
+    tag = f"IDLE{next(_idle_tags)}".encode()
+    mail.send(tag + b" IDLE\r\n")
+    line = mail.readline()
+    if not line.startswith(b"+"):
+        raise imaplib.IMAP4.error(f"IDLE refused: {line.strip()!r}")
+    
+    new_mail = False
+    deadline = time.monotonic() + timeout
+    while not new_mail and _wait_readable(mail, deadline - time.monotonic()):
+        line = mail.readline()
+        if not line:
+            raise imaplib.IMAP4.abort("Connection closed during IDLE")
+        # "* 12 EXISTS" - anything else (EXPUNGE, FETCH flags, keepalives) is ignored
+        new_mail = line.startswith(b"*") and line.rstrip().upper().endswith((b"EXISTS", b"RECENT"))
+    
+    mail.send(b"DONE\r\n")
+    while True:
+        line = mail.readline()
+        if not line:
+            raise imaplib.IMAP4.abort("Connection closed ending IDLE")
+        if line.startswith(tag + b" "):
+            if not line[len(tag) + 1:].upper().startswith(b"OK"):
+                raise imaplib.IMAP4.error(f"IDLE failed: {line.strip()!r}")
+            return new_mail
+
+
+def _poll_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        poll_inbox()
+        stop.wait(POLL_INTERVAL_MINUTES * 60)
+
+
+def run_daemon(stop: Optional[threading.Event] = None) -> None:
+    """Process mail as it arrives over one IDLE connection until ``stop`` is set.
+    
+    Unread mail is handled on every (re)connect and after every IDLE
+    return, so nothing is missed while reconnecting or refreshing IDLE.
+    Falls back to polling for INBOX_MODE=poll or a server without IDLE.
+    """
+    stop = stop or threading.Event()
+    if INBOX_MODE == "poll":
+        log(f"Polling inbox every {POLL_INTERVAL_MINUTES} minutes (INBOX_MODE=poll)")
+        _poll_loop(stop)
+        return
+    
+    backoff = IDLE_BACKOFF_MIN_SECONDS
+    while not stop.is_set():
+        mail = None
+        try:
+            mail = _connect()
+            if "IDLE" not in mail.capabilities:
+                log("IMAP server does not support IDLE; falling back to polling")
+                _logout(mail)
+                _poll_loop(stop)
+                return
+            log("Connected to inbox; waiting for new mail (IDLE)")
+            backoff = IDLE_BACKOFF_MIN_SECONDS
+            while not stop.is_set():
+                _process_unseen(mail)
+                if stop.is_set():
+                    break
+                idle_wait(mail, IDLE_REFRESH_SECONDS)
+        except Exception as exc:  # noqa: BLE001
+            log(f"IMAP connection lost: {exc}; reconnecting in {backoff}s")
+            stop.wait(backoff)
+            backoff = min(backoff * 2, IDLE_BACKOFF_MAX_SECONDS)
+        finally:
+            if mail is not None:
+                _logout(mail)
+
+
 # Legacy compatibility - scheduler may still call this
 def poll_broadcast_inbox() -> None:
     """Legacy wrapper for backward compatibility with scheduler."""
@@ -671,4 +1086,13 @@ def poll_broadcast_inbox() -> None:
 
 
 if __name__ == "__main__":
-    poll_inbox()
+    import sys
+    
+    if "--daemon" in sys.argv:
+        try:
+            run_daemon()
+        except KeyboardInterrupt:
+            log("KeyboardInterrupt received; exiting")
+    else:
+        poll_inbox()
+        mail_outbox.flush()  # Deliver queued replies before exiting
@@ -0,0 +1,558 @@
+"""LLM gateway: every Gemini call in a process goes through here.
+
+- One async client (``client.aio``) driven by a dedicated event-loop
+  thread, shared by sync callers (publisher, inbox monitor) and async
+  ones (web routes). Waiting on a call never ties up a web worker thread.
+- Per-call deadline covering queueing, the primary model and the fallback
+- Global concurrency limit with priority scheduling: the 07:00 edition
+  goes ahead of web narrative refreshes, which go ahead of riddle judging
+  (FIFO within a priority). Across processes, LLM_MAX_CONCURRENCY slot
+  locks are shared and one of them is reserved for the edition.
+- Fallback to ``gemini_fallback_model`` inside the same deadline
+- Static prompt prefixes sent through Gemini context caching where the
+  model supports it (``cached_prefix``)
+- Latency, time to first token, prompt size and token usage recorded per
+  call (``get_stats()``). Responses are streamed to time the first chunk.
+  Every call is also added to the shared rolling metrics file
+  (llm_metrics), with the reason for each failed attempt.
+
+Usage:
+    import llm_gateway
+
+    result = llm_gateway.generate(
+        prompt, purpose="narrative", priority=llm_gateway.PRIORITY_EDITION,
+        config={...}, validate=NarrativeResponse.model_validate_json,
+    )
+    if result and result.value is not None:
+        ...
+
+    # From a coroutine (any event loop)
+    result = await llm_gateway.generate_async(prompt, purpose="judge",
+                                              priority=llm_gateway.PRIORITY_JUDGE)
+
+``generate`` returns None if no attempt produced text. Otherwise
+``result.value`` is what ``validate`` returned, or None if no attempt's
+text passed validation (``result.text`` is then the last text received).
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import heapq
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from google import genai
+
+import llm_metrics
+from utils.logger import create_logger
+
+log = create_logger("llm_gateway")
+
+T = TypeVar("T")
+
+# Lazy settings loader for app.config integration
+_settings = None
+
+
+def _get_settings():
+    """Get settings lazily to avoid import-time failures."""
+    global _settings
+    if _settings is None:
+        try:
+            from app.config import settings
+            _settings = settings
+        except Exception:
+            _settings = None
+    return _settings
+
+
+# Priorities (lower runs first)
+PRIORITY_EDITION = 0  # Daily/weekly email narrative and riddle
+PRIORITY_WEB = 1  # Web narrative refresh
+PRIORITY_JUDGE = 2  # Riddle guess judging
+
+# Whole-call budget per priority (seconds), including queueing and fallback
+DEFAULT_DEADLINE_SECONDS = {
+    PRIORITY_EDITION: 120.0,
+    PRIORITY_WEB: 45.0,
+    PRIORITY_JUDGE: 20.0,
+}
+# Share of the deadline held back for the fallback model
+FALLBACK_SHARE = 0.35
+SLOT_POLL_SECONDS = 0.1
+
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "2"))
+DEFAULT_SLOT_DIR = "/app/data/llm_slots"
+
+# Gemini explicit context caching for static prompt prefixes
+CONTEXT_CACHE_ENABLED = os.getenv("LLM_CONTEXT_CACHE", "true").lower() == "true"
+CONTEXT_CACHE_MIN_TOKENS = int(os.getenv("LLM_CONTEXT_CACHE_MIN_TOKENS", "1024"))  # Gemini's floor for Flash
+CONTEXT_CACHE_TTL_SECONDS = 3600
+
+
+@dataclass
+class LLMResult:
+    """Outcome of one gateway call."""
+
+    text: str
+    value: Any  # validate(text), or None if no attempt passed validation
+    model: str
+    fallback: bool  # Served by the fallback model
+    latency_s: float  # Whole call, including queueing
+    queue_s: float
+    ttft_s: float = 0.0  # From request to first streamed chunk
+    prompt_chars: int = 0  # Prompt text sent with the request (excludes a context cache)
+    prompt_tokens: int = 0
+    cached_tokens: int = 0  # Served from a context cache (explicit or implicit)
+    output_tokens: int = 0
+
+
+def _slot_dir() -> str:
+    # Read per call so tests and tools can redirect it
+    return os.getenv("LLM_SLOT_DIR", DEFAULT_SLOT_DIR)
+
+
+def default_model() -> str:
+    cfg = _get_settings()
+    return cfg.gemini_model if cfg else os.getenv("GEMINI_MODEL", "gemini-3-flash-preview")
+
+
+def default_fallback_model() -> str:
+    cfg = _get_settings()
+    return cfg.gemini_fallback_model if cfg else os.getenv("GEMINI_FALLBACK_MODEL", "gemini-2.0-flash-lite")
+
+
+# =============================================================================
+# CLIENT AND EVENT LOOP
+# =============================================================================
+
+_client: Optional[genai.Client] = None
+_client_pid: Optional[int] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_pid: Optional[int] = None
+_loop_lock = threading.Lock()
+_semaphore: Optional["_PrioritySemaphore"] = None
+
+
+def get_client() -> genai.Client:
+    """The process-wide Gemini client (created on first use).
+
+    Raises:
+        ValueError: If GEMINI_API_KEY is not set (fail-fast).
+    """
+    global _client, _client_pid
+    if _client is None or _client_pid != os.getpid():
+        cfg = _get_settings()
+        api_key = cfg.gemini_api_key if cfg else os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise ValueError(
+                "GEMINI_API_KEY environment variable is not set. "
+                "Cannot initialize Gemini client."
+            )
+        _client = genai.Client(api_key=api_key)
+        _client_pid = os.getpid()  # A forked child must not share the parent's connections
+    return _client
+
+
+def _gateway_loop() -> asyncio.AbstractEventLoop:
+    """The gateway's event loop, started on a daemon thread on first use."""
+    global _loop, _loop_pid, _semaphore
+    with _loop_lock:
+        if _loop is None or _loop_pid != os.getpid():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="llm-gateway", daemon=True).start()
+            _loop, _loop_pid = loop, os.getpid()
+            _semaphore = _PrioritySemaphore(max(1, MAX_CONCURRENCY))
+    return _loop
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """Run a coroutine on the gateway loop and wait for it (for sync callers)."""
+    return asyncio.run_coroutine_threadsafe(coro, _gateway_loop()).result()
+
+
+# =============================================================================
+# CONCURRENCY
+# =============================================================================
+
+class _PrioritySemaphore:
+    """Counting semaphore that wakes the lowest-priority-number waiter first.
+
+    Only used from the gateway loop, so it needs no thread locking.
+    """
+
+    def __init__(self, value: int):
+        self._value = value
+        self._waiters: List[tuple] = []
+        self._seq = itertools.count()
+
+    async def acquire(self, priority: int) -> None:
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)  # Timed out while queued
+        if self._value > 0 and not self._waiters:
+            self._value -= 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # Woken and cancelled at once: pass the slot on
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._value += 1
+
+
+async def _acquire_slot(priority: int, deadline: float):
+    """Take one of the cross-process slot locks; None if the deadline passes.
+
+    Slot 0 is only for the edition (when there is more than one slot), so
+    a backlog of web or judging calls in other processes can't hold up
+    the 07:00 email.
+    """
+    slots = range(MAX_CONCURRENCY)
+    if priority != PRIORITY_EDITION and MAX_CONCURRENCY > 1:
+        slots = range(1, MAX_CONCURRENCY)
+    os.makedirs(_slot_dir(), exist_ok=True)
+    while True:
+        for i in slots:
+            lock_file = open(os.path.join(_slot_dir(), f"slot-{i}.lock"), "w")
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return lock_file
+            except OSError:
+                lock_file.close()
+        if time.monotonic() + SLOT_POLL_SECONDS >= deadline:
+            return None
+        await asyncio.sleep(SLOT_POLL_SECONDS)
+
+
+def _release_slot(lock_file) -> None:
+    try:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    finally:
+        lock_file.close()
+
+
+# =============================================================================
+# CONTEXT CACHING
+# =============================================================================
+
+# Explicit context caches (server-side), per (model, prefix digest):
+# {key: (cache name or None if the model refused, expiry monotonic)}
+_context_caches: Dict[Tuple[str, str], Tuple[Optional[str], float]] = {}
+
+
+def _prefix_tokens(prefix: str) -> int:
+    return len(prefix) // 4  # Rough: ~4 characters per token for English prose
+
+
+async def _cached_content(client: Any, model: str, prefix: str) -> Optional[str]:
+    """Name of a context cache holding ``prefix`` for ``model``, or None to send it inline.
+
+    Gemini only caches prompts above a model-specific minimum size, and not
+    every model supports it; a refusal is remembered for the cache TTL so
+    it isn't retried on every call. Prefixes under the minimum still
+    benefit from Gemini's implicit prefix caching, since they lead the
+    prompt.
+    """
+    if not CONTEXT_CACHE_ENABLED or _prefix_tokens(prefix) < CONTEXT_CACHE_MIN_TOKENS:
+        return None
+    key = (model, hashlib.sha256(prefix.encode("utf-8")).hexdigest())
+    name, expires = _context_caches.get(key, (None, 0.0))
+    if time.monotonic() < expires:
+        return name
+    try:
+        cache = await client.aio.caches.create(
+            model=model,
+            config={
+                "contents": [prefix],
+                "ttl": f"{CONTEXT_CACHE_TTL_SECONDS}s",
+                "display_name": "gazette-prompt",
+            },
+        )
+        name = cache.name
+        log(f"Created context cache for {model} (~{_prefix_tokens(prefix)} tokens)")
+    except Exception as exc:  # noqa: BLE001
+        log(f"Context caching unavailable for {model}: {exc}")
+        name = None
+    # Expire a little early so a cache is never used as it lapses
+    _context_caches[key] = (name, time.monotonic() + CONTEXT_CACHE_TTL_SECONDS - 60)
+    return name
+
+
+# =============================================================================
+# CALLS
+# =============================================================================
+
+_stats: Dict[str, Dict[str, Any]] = {}
+_stats_lock = threading.Lock()
+
+
+async def _record(
+    purpose: str, result: Optional[LLMResult], elapsed: float, error: Optional[str], reasons: List[str]
+) -> None:
+    """Update the in-process stats and the shared metrics file."""
+    with _stats_lock:
+        entry = _stats.setdefault(purpose, {
+            "calls": 0, "failures": 0, "fallbacks": 0,
+            "latency_s_total": 0.0, "latency_s_max": 0.0, "ttft_s_total": 0.0,
+            "prompt_chars": 0, "prompt_tokens": 0, "cached_tokens": 0, "output_tokens": 0,
+        })
+        entry["calls"] += 1
+        entry["latency_s_total"] += elapsed
+        entry["latency_s_max"] = max(entry["latency_s_max"], elapsed)
+        if result is None or result.value is None:
+            entry["failures"] += 1
+        if result is not None:
+            entry["fallbacks"] += int(result.fallback)
+            entry["ttft_s_total"] += result.ttft_s
+            entry["prompt_chars"] += result.prompt_chars
+            entry["prompt_tokens"] += result.prompt_tokens
+            entry["cached_tokens"] += result.cached_tokens
+            entry["output_tokens"] += result.output_tokens
+    if result is None:
+        log(f"{purpose}: failed after {elapsed:.2f}s ({error})")
+    else:
+        cached = f", {result.cached_tokens} cached" if result.cached_tokens else ""
+        log(
+            f"{purpose}: {result.model} {result.latency_s:.2f}s (queued {result.queue_s:.2f}s, "
+            f"first token {result.ttft_s:.2f}s), {result.prompt_chars} chars sent, "
+            f"{result.prompt_tokens}+{result.output_tokens} tokens{cached}"
+        )
+    ok = result is not None and result.value is not None
+    try:
+        await asyncio.to_thread(
+            llm_metrics.record,
+            purpose,
+            elapsed,
+            model=result.model if result else None,
+            fallback=bool(result and result.fallback),
+            failed=not ok,
+            ttft_s=result.ttft_s if result else 0.0,
+            prompt_chars=result.prompt_chars if result else 0,
+            prompt_tokens=result.prompt_tokens if result else 0,
+            cached_tokens=result.cached_tokens if result else 0,
+            output_tokens=result.output_tokens if result else 0,
+            reasons=reasons,
+        )
+    except Exception as exc:  # noqa: BLE001
+        log(f"Metrics not recorded: {exc}")
+
+
+def get_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-purpose call counts, latency, time to first token and token totals since process start."""
+    with _stats_lock:
+        stats = {}
+        for purpose, entry in _stats.items():
+            answered = entry["calls"] - entry["failures"]
+            stats[purpose] = {
+                **entry,
+                "latency_s_avg": round(entry["latency_s_total"] / entry["calls"], 3) if entry["calls"] else 0.0,
+                "ttft_s_avg": round(entry["ttft_s_total"] / answered, 3) if answered > 0 else 0.0,
+            }
+        return stats
+
+
+def _chunk_text(chunk: Any) -> str:
+    """Text of a streamed Gemini response chunk ("" if none)."""
+    text = getattr(chunk, "text", None)
+    if not text and hasattr(chunk, "candidates"):
+        try:
+            text = chunk.candidates[0].content.parts[0].text
+        except Exception:  # noqa: BLE001
+            text = None
+    return text if isinstance(text, str) else ""
+
+
+async def _attempt(
+    client: Any, model: str, contents: Any, config: Optional[Dict[str, Any]], timeout: float
+) -> Tuple[str, Any, float]:
+    """Stream one response within ``timeout``.
+
+    Returns:
+        (text, usage_metadata of the last chunk carrying one, seconds to first chunk)
+    """
+    async def stream() -> Tuple[str, Any, float]:
+        began = time.monotonic()
+        ttft = None
+        parts: List[str] = []
+        usage = None
+        chunks = await client.aio.models.generate_content_stream(model=model, contents=contents, config=config)
+        async for chunk in chunks:
+            if ttft is None:
+                ttft = time.monotonic() - began
+            parts.append(_chunk_text(chunk))
+            usage = getattr(chunk, "usage_metadata", None) or usage
+        return "".join(parts), usage, ttft or 0.0
+
+    return await asyncio.wait_for(stream(), timeout=max(timeout, 0.0))
+
+
+def _usage(usage: Any) -> Tuple[int, int, int]:
+    """(prompt, cached, output incl. thinking) token counts."""
+    as_int = lambda v: v if isinstance(v, int) else 0  # noqa: E731
+    return (
+        as_int(getattr(usage, "prompt_token_count", None)),
+        as_int(getattr(usage, "cached_content_token_count", None)),
+        as_int(getattr(usage, "candidates_token_count", None)) + as_int(getattr(usage, "thoughts_token_count", None)),
+    )
+
+
+async def _generate(
+    prompt: str,
+    purpose: str,
+    priority: int,
+    model: str,
+    fallback_model: str,
+    config: Optional[Dict[str, Any]],
+    validate: Optional[Callable[[str], Any]],
+    deadline_s: float,
+    client: Any,
+    cached_prefix: Optional[str],
+) -> Optional[LLMResult]:
+    """Queue, then try the primary and fallback models (runs on the gateway loop)."""
+    began = time.monotonic()
+    deadline = began + deadline_s
+    models = [model] if fallback_model in (None, "", model) else [model, fallback_model]
+
+    try:
+        await asyncio.wait_for(_semaphore.acquire(priority), timeout=deadline_s)
+    except asyncio.TimeoutError:
+        await _record(purpose, None, time.monotonic() - began, "queued past the deadline", ["queued"])
+        return None
+    slot = None
+    best: Optional[LLMResult] = None
+    error = None
+    reasons: List[str] = []  # llm_metrics.REASONS code per failed attempt
+    try:
+        slot = await _acquire_slot(priority, deadline)
+        queue_s = time.monotonic() - began
+        if slot is None:
+            error = "no free slot before the deadline"
+            reasons.append("no_slot")
+        for i, name in enumerate(models if slot else []):
+            remaining = deadline - time.monotonic()
+            # The primary leaves a share of the budget for the fallback
+            timeout = remaining - deadline_s * FALLBACK_SHARE if i < len(models) - 1 else remaining
+            if timeout <= 0:
+                error = error or "deadline"
+                reasons.append("timeout")
+                continue
+
+            contents, attempt_config = prompt, config
+            if cached_prefix:
+                cache_name = await _cached_content(client, name, cached_prefix)
+                if cache_name:
+                    attempt_config = {**(config or {}), "cached_content": cache_name}
+                else:
+                    contents = f"{cached_prefix}\n{prompt}"
+            try:
+                text, usage, ttft = await _attempt(client, name, contents, attempt_config, timeout)
+            except asyncio.TimeoutError:
+                error = f"{name} timed out after {timeout:.1f}s"
+                reasons.append("timeout")
+                continue
+            except Exception as exc:  # noqa: BLE001
+                error = f"{name}: {exc}"
+                reasons.append("api_error")
+                continue
+
+            if not text.strip():
+                error = f"{name}: empty response"
+                reasons.append("empty")
+                continue
+            prompt_tokens, cached_tokens, output_tokens = _usage(usage)
+            value = text
+            if validate is not None:
+                try:
+                    value = validate(text)
+                except Exception as exc:  # noqa: BLE001
+                    error = f"{name}: invalid response ({exc})"
+                    reasons.append("invalid")
+                    value = None
+            best = LLMResult(
+                text=text, value=value, model=name, fallback=i > 0,
+                latency_s=time.monotonic() - began, queue_s=queue_s, ttft_s=ttft,
+                prompt_chars=len(contents) if isinstance(contents, str) else 0,
+                prompt_tokens=prompt_tokens, cached_tokens=cached_tokens, output_tokens=output_tokens,
+            )
+            if value is not None:
+                break
+    finally:
+        if slot is not None:
+            _release_slot(slot)
+        _semaphore.release()
+    await _record(purpose, best, time.monotonic() - began, error, reasons)
+    return best
+
+
+async def generate_async(
+    prompt: str,
+    *,
+    purpose: str,
+    priority: int = PRIORITY_WEB,
+    model: Optional[str] = None,
+    fallback_model: Optional[str] = None,
+    config: Optional[Dict[str, Any]] = None,
+    validate: Optional[Callable[[str], Any]] = None,
+    deadline_s: Optional[float] = None,
+    client: Any = None,
+    cached_prefix: Optional[str] = None,
+) -> Optional[LLMResult]:
+    """Generate content through the gateway from any event loop.
+
+    Args:
+        prompt: Prompt text (the per-request part if ``cached_prefix`` is given)
+        purpose: Label for logs and stats ("narrative", "judge", ...)
+        priority: PRIORITY_EDITION, PRIORITY_WEB or PRIORITY_JUDGE
+        model: Primary model (default: GEMINI_MODEL)
+        fallback_model: Tried if the primary fails or returns invalid text
+            (default: gemini_fallback_model; pass ``model`` to disable)
+        config: ``generate_content`` config (structured output, thinking...)
+        validate: Parses/validates the text; raising counts as a failure
+        deadline_s: Whole-call budget (default: per priority)
+        client: Gemini client (default: ``get_client()``)
+        cached_prefix: Static leading part of the prompt. Sent through a
+            Gemini context cache when the model supports it and it is large
+            enough, otherwise prepended to ``prompt`` (joined by a newline).
+    """
+    coro = _generate(
+        prompt,
+        purpose,
+        priority,
+        model or default_model(),
+        default_fallback_model() if fallback_model is None else fallback_model,
+        config,
+        validate,
+        deadline_s or DEFAULT_DEADLINE_SECONDS.get(priority, DEFAULT_DEADLINE_SECONDS[PRIORITY_WEB]),
+        client or get_client(),
+        cached_prefix,
+    )
+    loop = _gateway_loop()
+    try:
+        on_gateway = asyncio.get_running_loop() is loop
+    except RuntimeError:
+        on_gateway = False
+    if on_gateway:
+        return await coro
+    future: Future = asyncio.run_coroutine_threadsafe(coro, loop)
+    return await asyncio.wrap_future(future)
+
+
+def generate(prompt: str, **kwargs: Any) -> Optional[LLMResult]:
+    """Blocking generate_async() for sync callers (same arguments)."""
+    return run_sync(generate_async(prompt, **kwargs))
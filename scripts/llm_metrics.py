@@ -0,0 +1,222 @@
+"""Rolling LLM call metrics shared by every process.
+
+llm_gateway records each call here: latency histogram, time to first
+token, fallbacks, tokens in/out and failure reasons, bucketed per UTC
+hour and purpose ("narrative", "riddle", "web_narrative", "judge", ...).
+The scheduler, inbox monitor and web API all append to the same file,
+so updates are serialised with a lock file. Hours older than
+RETENTION_HOURS are dropped on write.
+
+    /app/data/llm_metrics.json
+    {"hours": {"2026-01-25T12": {"narrative": {"calls": 1, "latency_hist": [...], ...}}}}
+
+``summarize()`` turns the file into the /api/metrics/llm response.
+
+Usage:
+    python llm_metrics.py              # last 24 hours
+    python llm_metrics.py --hours 168
+"""
+
+import fcntl
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.io import atomic_read_json, atomic_write_json
+from utils.logger import create_logger
+
+log = create_logger("llm_metrics")
+
+DEFAULT_METRICS_PATH = "/app/data/llm_metrics.json"
+RETENTION_HOURS = 24 * 14
+
+# Latency histogram upper bounds (seconds); the last bucket is open-ended
+LATENCY_BUCKETS_S = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 45.0, 120.0)
+
+# Failure reasons, in the order llm_gateway classifies them
+REASONS = ("queued", "no_slot", "timeout", "empty", "invalid", "api_error")
+
+_COUNTERS = (
+    "calls", "failures", "fallbacks", "prompt_tokens", "cached_tokens", "output_tokens", "prompt_chars",
+)
+_TIMERS = ("latency_s_total", "ttft_s_total")
+
+
+def _metrics_path() -> str:
+    # Read per call so tests and tools can redirect it
+    return os.getenv("LLM_METRICS_PATH", DEFAULT_METRICS_PATH)
+
+
+def _bucket(latency_s: float) -> int:
+    for i, bound in enumerate(LATENCY_BUCKETS_S):
+        if latency_s <= bound:
+            return i
+    return len(LATENCY_BUCKETS_S)
+
+
+def _empty_entry() -> Dict[str, Any]:
+    entry: Dict[str, Any] = {name: 0 for name in _COUNTERS}
+    entry.update({name: 0.0 for name in _TIMERS})
+    entry["latency_hist"] = [0] * (len(LATENCY_BUCKETS_S) + 1)
+    entry["models"] = {}
+    entry["errors"] = {}
+    return entry
+
+
+def record(
+    purpose: str,
+    latency_s: float,
+    *,
+    model: Optional[str] = None,
+    fallback: bool = False,
+    failed: bool = False,
+    ttft_s: float = 0.0,
+    prompt_chars: int = 0,
+    prompt_tokens: int = 0,
+    cached_tokens: int = 0,
+    output_tokens: int = 0,
+    reasons: Iterable[str] = (),
+    now: Optional[datetime] = None,
+) -> None:
+    """Add one call to the metrics file.
+
+    Args:
+        purpose: Gateway purpose label
+        latency_s: Whole call, including queueing
+        model: Model that answered (None if none did)
+        fallback: Answered by the fallback model
+        failed: No usable answer
+        reasons: Failure reason of every failed attempt (see REASONS),
+            including ones the fallback recovered from
+        now: Naive UTC time of the call (default: utcnow)
+    """
+    hour = (now or datetime.utcnow()).strftime("%Y-%m-%dT%H")
+    path = _metrics_path()
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Not path + ".lock": atomic_write_json takes that one itself
+        with open(path + ".update.lock", "w") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            data = atomic_read_json(path, default=None) or {}
+            hours = data.setdefault("hours", {})
+            entry = hours.setdefault(hour, {}).setdefault(purpose, _empty_entry())
+
+            entry["calls"] += 1
+            entry["failures"] += int(failed)
+            entry["fallbacks"] += int(fallback)
+            entry["latency_s_total"] = round(entry["latency_s_total"] + latency_s, 3)
+            entry["ttft_s_total"] = round(entry["ttft_s_total"] + ttft_s, 3)
+            entry["prompt_chars"] += prompt_chars
+            entry["prompt_tokens"] += prompt_tokens
+            entry["cached_tokens"] += cached_tokens
+            entry["output_tokens"] += output_tokens
+            entry["latency_hist"][_bucket(latency_s)] += 1
+            if model:
+                entry["models"][model] = entry["models"].get(model, 0) + 1
+            for reason in reasons:
+                entry["errors"][reason] = entry["errors"].get(reason, 0) + 1
+
+            cutoff = ((now or datetime.utcnow()) - timedelta(hours=RETENTION_HOURS)).strftime("%Y-%m-%dT%H")
+            data["hours"] = {h: v for h, v in sorted(hours.items()) if h >= cutoff}
+            atomic_write_json(path, data)
+    except OSError as exc:
+        log(f"Failed to record LLM metrics: {exc}")
+
+
+def _merge(into: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    for name in _COUNTERS + _TIMERS:
+        into[name] += entry.get(name, 0)
+    for i, count in enumerate(entry.get("latency_hist", [])[:len(into["latency_hist"])]):
+        into["latency_hist"][i] += count
+    for key in ("models", "errors"):
+        for name, count in entry.get(key, {}).items():
+            into[key][name] = into[key].get(name, 0) + count
+
+
+def _percentile(hist: List[int], q: float) -> Optional[float]:
+    """Upper bound of the bucket holding the q-th quantile (None past the last bound)."""
+    total = sum(hist)
+    if not total:
+        return None
+    seen = 0
+    for i, count in enumerate(hist):
+        seen += count
+        if seen >= q * total:
+            return LATENCY_BUCKETS_S[i] if i < len(LATENCY_BUCKETS_S) else None
+    return None
+
+
+def _summary(entry: Dict[str, Any]) -> Dict[str, Any]:
+    calls = entry["calls"]
+    answered = calls - entry["failures"]
+    hist = entry["latency_hist"]
+    return {
+        "calls": calls,
+        "failures": entry["failures"],
+        "fallbacks": entry["fallbacks"],
+        "fallback_rate": round(entry["fallbacks"] / calls, 3) if calls else 0.0,
+        "latency_s_avg": round(entry["latency_s_total"] / calls, 3) if calls else 0.0,
+        "latency_s_p50": _percentile(hist, 0.5),
+        "latency_s_p90": _percentile(hist, 0.9),
+        "ttft_s_avg": round(entry["ttft_s_total"] / answered, 3) if answered > 0 else 0.0,
+        "latency_hist": dict(zip([f"<={b:g}s" for b in LATENCY_BUCKETS_S] + ["slower"], hist)),
+        "prompt_tokens": entry["prompt_tokens"],
+        "cached_tokens": entry["cached_tokens"],
+        "output_tokens": entry["output_tokens"],
+        "prompt_chars_avg": round(entry["prompt_chars"] / answered) if answered > 0 else 0,
+        "models": entry["models"],
+        "errors": entry["errors"],
+    }
+
+
+def summarize(hours: int = 24, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Metrics for the last ``hours`` hours.
+
+    Returns:
+        {"window_hours", "purposes": {purpose: summary}, "total": summary,
+         "hourly": [{"hour", "calls", "failures", "fallbacks", "latency_s_avg"}],
+         "daily_tokens": {date: {purpose: prompt + output tokens}}}
+    """
+    hours = max(1, min(hours, RETENTION_HOURS))
+    cutoff = ((now or datetime.utcnow()) - timedelta(hours=hours - 1)).strftime("%Y-%m-%dT%H")
+    data = atomic_read_json(_metrics_path(), default=None) or {}
+
+    purposes: Dict[str, Dict[str, Any]] = {}
+    total = _empty_entry()
+    hourly = []
+    daily_tokens: Dict[str, Dict[str, int]] = {}
+    for hour, by_purpose in sorted(data.get("hours", {}).items()):
+        if hour < cutoff:
+            continue
+        this_hour = _empty_entry()
+        for purpose, entry in by_purpose.items():
+            _merge(purposes.setdefault(purpose, _empty_entry()), entry)
+            _merge(this_hour, entry)
+            day = daily_tokens.setdefault(hour[:10], {})
+            day[purpose] = day.get(purpose, 0) + entry.get("prompt_tokens", 0) + entry.get("output_tokens", 0)
+        _merge(total, this_hour)
+        hourly.append({
+            "hour": hour,
+            "calls": this_hour["calls"],
+            "failures": this_hour["failures"],
+            "fallbacks": this_hour["fallbacks"],
+            "latency_s_avg": round(this_hour["latency_s_total"] / this_hour["calls"], 3) if this_hour["calls"] else 0.0,
+        })
+
+    return {
+        "window_hours": hours,
+        "purposes": {purpose: _summary(entry) for purpose, entry in sorted(purposes.items())},
+        "total": _summary(total),
+        "hourly": hourly,
+        "daily_tokens": daily_tokens,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Summarise LLM call metrics")
+    parser.add_argument("--hours", type=int, default=24)
+    args = parser.parse_args()
+    print(json.dumps(summarize(args.hours), indent=2))
@@ -0,0 +1,465 @@
+"""Outbound mail service: every email a process sends goes through here.
+
+Callers hand a message to ``enqueue()`` and return at once; a background
+sender thread delivers it.
+
+- Durable queue: each message is written to OUTBOX_DIR/queue as
+  ``<id>.eml`` plus a ``<id>.json`` envelope (sender, recipients,
+  attempts, next try) before ``enqueue()`` returns, so mail survives
+  restarts. Every process's sender delivers whatever is queued.
+- One sender at a time across processes (``sender.lock``). It keeps one
+  authenticated SMTP connection open for a burst and closes it after
+  IDLE_CLOSE_SECONDS.
+- Temporary failures are retried with exponential backoff
+  (RETRY_BASE_SECONDS doubling up to RETRY_MAX_SECONDS) for MAX_ATTEMPTS.
+  Permanent ones (5xx, all recipients refused) and exhausted ones move
+  to OUTBOX_DIR/failed.
+- Pacing for Gmail: at least MIN_SEND_INTERVAL_SECONDS between messages
+  and at most DAILY_RECIPIENT_LIMIT recipients per rolling 24 hours.
+  Mail over the limit waits in the queue.
+
+Usage:
+    import mail_outbox
+
+    mail_outbox.enqueue(msg)                        # To/Cc/Bcc from headers
+    mail_outbox.enqueue(msg, recipients=[...])
+    mail_outbox.send(msg, recipients, timeout=300)  # wait for delivery (bool)
+    mail_outbox.start()                             # long-running processes: deliver leftovers
+    mail_outbox.flush()                             # one-shot scripts: wait for the queue to empty
+"""
+
+import copy
+import fcntl
+import json
+import os
+import smtplib
+import ssl
+import threading
+import time
+import uuid
+from datetime import datetime
+from email.utils import getaddresses, parseaddr
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.io import atomic_read_json
+from utils.logger import create_logger
+
+log = create_logger("mail_outbox")
+
+# Lazy settings loader for app.config integration
+_settings = None
+
+def _get_settings():
+    """Get settings lazily to avoid import-time failures."""
+    global _settings
+    if _settings is None:
+        try:
+            from app.config import settings
+            _settings = settings
+        except Exception:
+            _settings = None
+    return _settings
+
+
+DEFAULT_OUTBOX_DIR = "/app/data/outbox"
+
+MAX_ATTEMPTS = 6
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 30 * 60
+IDLE_CLOSE_SECONDS = 60  # Keep the connection for bursts, not forever
+IDLE_POLL_SECONDS = 60  # Look for mail queued (or deferred) by other processes
+LOCK_POLL_SECONDS = 2  # Another process is sending
+MIN_SEND_INTERVAL_SECONDS = float(os.getenv("MAIL_MIN_SEND_INTERVAL_SECONDS", "1"))
+DAILY_RECIPIENT_LIMIT = int(os.getenv("MAIL_DAILY_RECIPIENT_LIMIT", "450"))  # Gmail allows ~500/day
+
+
+def _outbox_dir() -> str:
+    # Read per call so tests and tools can redirect it
+    return os.getenv("MAIL_OUTBOX_DIR", DEFAULT_OUTBOX_DIR)
+
+
+def _queue_dir() -> str:
+    return os.path.join(_outbox_dir(), "queue")
+
+
+def _failed_dir() -> str:
+    return os.path.join(_outbox_dir(), "failed")
+
+
+def _smtp_config() -> Tuple[Optional[str], int, Optional[str], Optional[str]]:
+    """(server, port, user, password) from app.config, falling back to env vars (and Gmail)."""
+    cfg = _get_settings()
+    if cfg:
+        return cfg.smtp_server_host, cfg.smtp_port, cfg.smtp_user, cfg.smtp_password
+    return (
+        os.getenv("SMTP_SERVER") or os.getenv("SMTP_HOST", "smtp.gmail.com"),
+        int(os.getenv("SMTP_PORT", "465")),
+        os.getenv("SMTP_USER") or os.getenv("SMTP_USERNAME"),
+        os.getenv("SMTP_PASSWORD"),
+    )
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """temp file + fsync + rename; queue files have a single writer, so no lock."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _write_json(path: str, data: Any) -> None:
+    _write_atomic(path, json.dumps(data, indent=2).encode("utf-8"))
+
+
+# =============================================================================
+# QUEUE
+# =============================================================================
+
+def enqueue(msg, recipients: Optional[List[str]] = None) -> Optional[str]:
+    """Queue a message for delivery and wake the sender.
+
+    Args:
+        msg: EmailMessage (or any email.message.Message)
+        recipients: Envelope recipients (default: To, Cc and Bcc headers)
+
+    Returns:
+        Queue id, or None if there is no recipient or SMTP isn't configured
+    """
+    smtp_server, _, smtp_user, _ = _smtp_config()
+    if not smtp_server:
+        log("ERROR: SMTP_SERVER/SMTP_HOST is not configured; cannot send email.")
+        return None
+
+    to_addrs = list(recipients or [
+        addr for _, addr in getaddresses(msg.get_all("To", []) + msg.get_all("Cc", []) + msg.get_all("Bcc", []))
+        if addr
+    ])
+    if not to_addrs:
+        log(f"No recipients for '{msg.get('Subject', '')}', not queued")
+        return None
+
+    if msg.get("Bcc") is not None:
+        msg = copy.copy(msg)
+        del msg["Bcc"]
+
+    msg_id = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+    os.makedirs(_queue_dir(), exist_ok=True)
+    raw = msg.as_bytes(policy=msg.policy.clone(linesep="\r\n"))  # As send_message() would send it
+    _write_atomic(os.path.join(_queue_dir(), f"{msg_id}.eml"), raw)
+    # The envelope is written last: a message is queued once its .json exists
+    _write_json(os.path.join(_queue_dir(), f"{msg_id}.json"), {
+        "id": msg_id,
+        "from": parseaddr(msg.get("From", ""))[1] or smtp_user or "",
+        "to": to_addrs,
+        "subject": str(msg.get("Subject", "")),
+        "queued_at": datetime.utcnow().isoformat() + "Z",
+        "attempts": 0,
+        "next_attempt": time.time(),
+    })
+    log(f"Queued '{msg.get('Subject', '')}' for {len(to_addrs)} recipient(s) ({msg_id})")
+    start()
+    return msg_id
+
+
+def _envelopes() -> List[Dict[str, Any]]:
+    """Queued envelopes, oldest first."""
+    try:
+        names = sorted(n for n in os.listdir(_queue_dir()) if n.endswith(".json"))
+    except FileNotFoundError:
+        return []
+    envelopes = []
+    for name in names:
+        envelope = atomic_read_json(os.path.join(_queue_dir(), name))
+        if envelope:
+            envelopes.append(envelope)
+    return envelopes
+
+
+def _remove(msg_id: str) -> None:
+    for ext in (".json", ".eml"):
+        try:
+            os.remove(os.path.join(_queue_dir(), msg_id + ext))
+        except FileNotFoundError:
+            pass
+
+
+def _fail(envelope: Dict[str, Any], reason: str) -> None:
+    """Move a message out of the queue for good."""
+    os.makedirs(_failed_dir(), exist_ok=True)
+    msg_id = envelope["id"]
+    envelope["error"] = reason
+    try:
+        os.replace(os.path.join(_queue_dir(), f"{msg_id}.eml"), os.path.join(_failed_dir(), f"{msg_id}.eml"))
+    except FileNotFoundError:
+        pass
+    _write_json(os.path.join(_failed_dir(), f"{msg_id}.json"), envelope)
+    _remove(msg_id)
+    log(f"Giving up on '{envelope.get('subject', '')}' after {envelope['attempts']} attempt(s): {reason}")
+
+
+# =============================================================================
+# PACING
+# =============================================================================
+
+_last_send = 0.0
+
+
+def _sent_log_path() -> str:
+    return os.path.join(_outbox_dir(), "sent_log.json")
+
+
+def _recent_sends(now: float) -> List[List[float]]:
+    """[[epoch, recipient_count], ...] for the last 24 hours."""
+    return [entry for entry in atomic_read_json(_sent_log_path(), default=[]) if entry[0] > now - 86400]
+
+
+def _pacing_delay(now: float, recipient_count: int) -> float:
+    """Seconds to wait before a message to ``recipient_count`` people may go out."""
+    delay = max(0.0, _last_send + MIN_SEND_INTERVAL_SECONDS - time.monotonic())
+    recent = _recent_sends(now)
+    total = sum(count for _, count in recent)
+    for sent_at, count in recent:
+        if total + recipient_count <= DAILY_RECIPIENT_LIMIT:
+            break
+        total -= count
+        delay = max(delay, sent_at + 86400 - now)
+    return delay
+
+
+def _record_send(now: float, recipient_count: int) -> None:
+    global _last_send
+    _last_send = time.monotonic()
+    _write_json(_sent_log_path(), _recent_sends(now) + [[now, recipient_count]])
+
+
+# =============================================================================
+# DELIVERY
+# =============================================================================
+
+def _open_smtp() -> smtplib.SMTP:
+    """Connect and log in (SSL for port 465, STARTTLS otherwise)."""
+    smtp_server, smtp_port, smtp_user, smtp_password = _smtp_config()
+    context = ssl.create_default_context()
+    if smtp_port == 465:
+        server = smtplib.SMTP_SSL(smtp_server, smtp_port, context=context)
+    else:
+        server = smtplib.SMTP(smtp_server, smtp_port)
+        server.starttls(context=context)
+    if smtp_user and smtp_password:
+        server.login(smtp_user, smtp_password)
+    return server
+
+
+class _Connection:
+    """The sender's SMTP connection, opened on demand and reused for bursts."""
+
+    def __init__(self):
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+
+    def sendmail(self, from_addr: str, to_addrs: List[str], raw: bytes) -> Dict[str, Any]:
+        for attempt in range(2):
+            if self._server is None:
+                self._server = _open_smtp()
+            try:
+                refused = self._server.sendmail(from_addr, to_addrs, raw)
+                self._last_used = time.monotonic()
+                return refused
+            except smtplib.SMTPServerDisconnected:
+                # Server timed the idle connection out; reconnect once
+                self._server = None
+                if attempt:
+                    raise
+        return {}
+
+    def close_if_idle(self) -> None:
+        if self._server is not None and time.monotonic() - self._last_used >= IDLE_CLOSE_SECONDS:
+            self.close()
+
+    def close(self) -> None:
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.quit()
+            except Exception:
+                pass
+
+
+_connection = _Connection()
+
+
+def _is_permanent(exc: Exception) -> bool:
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return True
+    if isinstance(exc, smtplib.SMTPAuthenticationError):
+        return False  # Credentials can be fixed; keep the mail
+    if isinstance(exc, smtplib.SMTPResponseException):
+        # 550 5.4.5 is Gmail's daily quota: it lifts, so retry
+        return exc.smtp_code >= 500 and b"5.4.5" not in (exc.smtp_error or b"")
+    return False
+
+
+def _deliver(envelope: Dict[str, Any]) -> None:
+    msg_id = envelope["id"]
+    try:
+        with open(os.path.join(_queue_dir(), f"{msg_id}.eml"), "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
+        _fail(envelope, "message body missing")
+        return
+
+    now = time.time()
+    try:
+        refused = _connection.sendmail(envelope["from"], envelope["to"], raw)
+    except Exception as exc:  # noqa: BLE001
+        _connection.close()
+        envelope["attempts"] += 1
+        if _is_permanent(exc) or envelope["attempts"] >= MAX_ATTEMPTS:
+            _fail(envelope, str(exc))
+            return
+        backoff = min(RETRY_BASE_SECONDS * 2 ** (envelope["attempts"] - 1), RETRY_MAX_SECONDS)
+        envelope["next_attempt"] = now + backoff
+        envelope["error"] = str(exc)
+        _write_json(os.path.join(_queue_dir(), f"{msg_id}.json"), envelope)
+        log(f"Send of '{envelope.get('subject', '')}' failed ({exc}); retry {envelope['attempts']} in {backoff}s")
+        return
+
+    _record_send(now, len(envelope["to"]))
+    _remove(msg_id)
+    if refused:
+        log(f"Recipients refused for '{envelope.get('subject', '')}': {', '.join(refused)}")
+    log(f"Sent '{envelope.get('subject', '')}' to {len(envelope['to']) - len(refused)} recipient(s)")
+
+
+def drain() -> float:
+    """Deliver every due message, pacing as needed.
+
+    Returns:
+        Seconds until the sender should look again
+    """
+    os.makedirs(_outbox_dir(), exist_ok=True)
+    with open(os.path.join(_outbox_dir(), "sender.lock"), "w") as lock_file:
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return LOCK_POLL_SECONDS
+        try:
+            while True:
+                now = time.time()
+                envelopes = _envelopes()
+                due = [e for e in envelopes if e.get("next_attempt", 0) <= now]
+                if not due:
+                    upcoming = [e["next_attempt"] - now for e in envelopes]
+                    return min(upcoming + [IDLE_POLL_SECONDS])
+                delay = _pacing_delay(now, len(due[0]["to"]))
+                if delay > MIN_SEND_INTERVAL_SECONDS:
+                    log(f"Daily limit of {DAILY_RECIPIENT_LIMIT} recipients reached; {len(due)} message(s) wait {delay:.0f}s")
+                    return delay
+                if delay > 0:
+                    time.sleep(delay)
+                _deliver(due[0])
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+# =============================================================================
+# SENDER THREAD
+# =============================================================================
+
+_wake = threading.Event()
+_sender_lock = threading.Lock()
+_sender: Optional[threading.Thread] = None
+_sender_pid: Optional[int] = None
+
+
+def _run() -> None:
+    while True:
+        try:
+            delay = drain()
+        except Exception as exc:  # noqa: BLE001
+            log(f"Outbox sender error: {exc}")
+            delay = IDLE_POLL_SECONDS
+        if not _wake.wait(min(delay, IDLE_CLOSE_SECONDS)):
+            _connection.close_if_idle()
+        _wake.clear()
+
+
+def start() -> None:
+    """Start this process's sender thread (if needed) and wake it."""
+    global _sender, _sender_pid
+    with _sender_lock:
+        if _sender is None or not _sender.is_alive() or _sender_pid != os.getpid():
+            _sender = threading.Thread(target=_run, name="mail-outbox", daemon=True)
+            _sender.start()
+            _sender_pid = os.getpid()
+    _wake.set()
+
+
+def _delivered(msg_id: str) -> Optional[bool]:
+    """True once sent, False once given up on, None while still queued."""
+    if os.path.exists(os.path.join(_queue_dir(), f"{msg_id}.json")):
+        return None
+    return not os.path.exists(os.path.join(_failed_dir(), f"{msg_id}.json"))
+
+
+def send(msg, recipients: Optional[List[str]] = None, timeout: float = 300) -> bool:
+    """Queue a message and wait up to ``timeout`` seconds for it to go out.
+
+    A message still queued at the timeout stays queued and is retried.
+
+    Returns:
+        True if the message was delivered
+    """
+    msg_id = enqueue(msg, recipients)
+    if msg_id is None:
+        return False
+    return wait([msg_id], timeout)
+
+
+def wait(msg_ids: List[str], timeout: float = 300) -> bool:
+    """Wait up to ``timeout`` seconds for queued messages to go out.
+
+    Messages still queued at the timeout stay queued and are retried.
+
+    Returns:
+        True if every message was delivered
+    """
+    pending = set(msg_ids)
+    delivered = True
+    deadline = time.monotonic() + timeout
+    while pending:
+        for msg_id in list(pending):
+            result = _delivered(msg_id)
+            if result is not None:
+                pending.discard(msg_id)
+                delivered = delivered and result
+        if not pending:
+            break
+        if time.monotonic() >= deadline:
+            log(f"{len(pending)} message(s) still queued after {timeout:.0f}s; they will be retried")
+            return False
+        time.sleep(0.2)
+    return delivered
+
+
+def flush(timeout: float = 60) -> bool:
+    """Wait until nothing is due in the queue (for one-shot scripts).
+
+    Returns:
+        True if no due message is left
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        now = time.time()
+        if not any(e.get("next_attempt", 0) <= now for e in _envelopes()):
+            return True
+        start()
+        time.sleep(0.2)
+    return False
+
+
+if __name__ == "__main__":
+    for envelope in _envelopes():
+        print(f"{envelope['id']}  attempts={envelope['attempts']}  to={len(envelope['to'])}  {envelope.get('subject', '')}")
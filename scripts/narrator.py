@@ -1,14 +1,19 @@
+import fcntl
 import json
 import os
+import random
 import re
+import sys
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from google import genai
 from pydantic import BaseModel, Field
 
 import coast_sky_service
 import context_engine
+import llm_gateway
 import weather_service
 from utils.logger import create_logger
 from utils.io import atomic_write_json, atomic_read_json
@@ -56,11 +61,17 @@ _RIDDLE_STATE_PATH = _cfg.riddle_state_path if _cfg else os.getenv("RIDDLE_STATE
 _RIDDLE_HISTORY_PATH = os.getenv("RIDDLE_HISTORY_PATH", "/app/data/riddle_history.json")
 _HISTORY_PATH = os.getenv("NARRATIVE_HISTORY_PATH", "/app/data/narrative_history.json")
 _INJECTION_PATH = os.getenv("NARRATIVE_INJECTION_PATH", "/app/data/narrative_injection.json")
+_JUDGE_CACHE_PATH = os.getenv("RIDDLE_JUDGE_CACHE_PATH", "/app/data/riddle_judge_cache.json")
 _PROMPTS_DIR = getattr(_cfg, 'prompts_dir', None) or os.getenv("PROMPTS_DIR", "/app/data/prompts")
 
+# Prompt templates by path: (mtime, content)
+_template_cache: Dict[str, Tuple[float, str]] = {}
+
 
 def _load_prompt_template(filename: str, fallback: str = "") -> str:
     """Load prompt template from disk, enabling hot-reload without container restart.
+
+    The file is only re-read when its mtime changes.
     
     Args:
         filename: Name of the prompt file (e.g., "narrator_persona.txt")
@@ -78,9 +89,14 @@ def _load_prompt_template(filename: str, fallback: str = "") -> str:
             path = local_path
     
     try:
+        mtime = os.path.getmtime(path)
+        cached = _template_cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
         with open(path, "r", encoding="utf-8") as f:
             content = f.read()
             log(f"Loaded prompt template: {filename} ({len(content)} chars)")
+            _template_cache[path] = (mtime, content)
             return content
     except FileNotFoundError:
         log(f"Prompt file not found: {path}, using fallback")
@@ -142,27 +158,17 @@ def strip_emojis(text: str) -> str:
 log = create_logger("narrator")
 
 
-# Global client instance (lazy init)
-_client: genai.Client | None = None
-
-
 def _get_client() -> genai.Client:
-    """Get or create the Gemini client using GEMINI_API_KEY from config/environment.
+    """Get the shared Gemini client (owned by llm_gateway).
 
     Raises:
         ValueError: If GEMINI_API_KEY is not set (fail-fast).
     """
-    global _client
-    if _client is None:
-        cfg = _get_settings()
-        api_key = cfg.gemini_api_key if cfg else os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError(
-                "GEMINI_API_KEY environment variable is not set. "
-                "Cannot initialize Gemini client."
-            )
-        _client = genai.Client(api_key=api_key)
-    return _client
+    return llm_gateway.get_client()
+
+
+def _fallback_model_name() -> str:
+    return _cfg.gemini_fallback_model if _cfg else "gemini-2.0-flash-lite"
 
 
 def get_model_name(model_name: str | None = None) -> str:
@@ -244,23 +250,7 @@ def sanitize_data(sensor_data: Dict[str, Any]) -> Dict[str, Any]:
     return sanitized
 
 
-def build_prompt(
-    sanitized_data: Dict[str, Any],
-    history: list[Dict[str, Any]] = None,
-    is_weekly: bool = False,
-    injection: Optional[Dict[str, Any]] = None,
-) -> str:
-    """Construct the narrative prompt enforcing persona and safety constraints.
-    
-    Args:
-        sanitized_data: Sensor and weather data dict
-        history: List of past narrative entries for continuity
-        is_weekly: If True, generate Sunday "Week in Review" edition
-        injection: Optional one-time message to include (e.g., birthday)
-    """
-
-    # Load hot-reloadable persona (voice, style, local slang)
-    persona_fallback = """### ROLE
+_PERSONA_FALLBACK = """### ROLE
 You are **The Canal Captain**.
 - Location: Colington Harbour, Outer Banks, NC.
 - Experience: 30+ years. You've survived Hurricane Isabel. You know the septic rules.
@@ -278,9 +268,12 @@ You are **The Canal Captain**.
 - Use "the bypass" (the main highway, usually with disdain).
 - Never say "OBX" or "The Outer Banks". That's for tourists. Say "here" or "the island".
 """
-    persona = _load_prompt_template("narrator_persona.txt", fallback=persona_fallback)
-    
-    lines = [
+
+
+@lru_cache(maxsize=4)
+def _static_prompt(persona: str) -> str:
+    """Task, persona and rules: the part of the narrative prompt that never changes per request."""
+    return "\n".join([
         "TASK: Write a status update for a family greenhouse based on the data provided.",
         "",
         persona,
@@ -308,7 +301,24 @@ You are **The Canal Captain**.
         "- NO MARKDOWN HEADERS (###).",
         "- ALWAYS include degree symbol (°) when mentioning temperatures (e.g., '68°' not '68').",
         "",
-    ]
+    ])
+
+
+def build_prompt_segments(
+    sanitized_data: Dict[str, Any],
+    history: list[Dict[str, Any]] = None,
+    is_weekly: bool = False,
+    injection: Optional[Dict[str, Any]] = None,
+) -> Tuple[str, str]:
+    """The narrative prompt as (static prefix, per-request part).
+
+    The prefix leads the prompt so Gemini can serve it from a context cache
+    (see llm_gateway ``cached_prefix``); the two joined by a newline are
+    the full prompt. Arguments as for build_prompt().
+    """
+    # Load hot-reloadable persona (voice, style, local slang)
+    persona = _load_prompt_template("narrator_persona.txt", fallback=_PERSONA_FALLBACK)
+    lines: List[str] = []
 
     # Inject context engine intelligence (situational awareness)
     try:
@@ -398,19 +408,24 @@ You are **The Canal Captain**.
         "BODY: <1-2 short paragraphs. What's the vibe? Anything to watch for?>",
     ])
 
-    return "\n".join(lines)
+    return _static_prompt(persona), "\n".join(lines)
 
 
-def _extract_text(response: Any) -> str | None:
-    """Best-effort extraction of text from a Gemini response object."""
-    text = getattr(response, "text", None)
-    if text:
-        return text
-    if hasattr(response, "candidates"):
-        try:
-            return response.candidates[0].content.parts[0].text  # type: ignore[index]
-        except Exception:  # noqa: BLE001
-            return None
+def build_prompt(
+    sanitized_data: Dict[str, Any],
+    history: list[Dict[str, Any]] = None,
+    is_weekly: bool = False,
+    injection: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Construct the narrative prompt enforcing persona and safety constraints.
+    
+    Args:
+        sanitized_data: Sensor and weather data dict
+        history: List of past narrative entries for continuity
+        is_weekly: If True, generate Sunday "Week in Review" edition
+        injection: Optional one-time message to include (e.g., birthday)
+    """
+    return "\n".join(build_prompt_segments(sanitized_data, history, is_weekly, injection))
 
 
 def _get_riddle_state_path(test_mode: bool = False) -> str:
@@ -588,22 +603,11 @@ def _generate_joke_or_riddle_paragraph(narrative_body: str, test_mode: bool = Fa
 
     client = _get_client()
     model_name = get_model_name()
-    raw_text = None
-    try:
-        response = client.models.generate_content(model=model_name, contents=prompt)
-        raw_text = _extract_text(response)
-    except Exception as exc:  # noqa: BLE001
-        log(f"Error during joke/riddle generation with {model_name}: {exc}")
-
-    if not raw_text:
-        fallback_model = _cfg.gemini_fallback_model if _cfg else "gemini-2.0-flash-lite"
-        try:
-            response = client.models.generate_content(
-                model=fallback_model, contents=prompt
-            )
-            raw_text = _extract_text(response)
-        except Exception as exc:  # noqa: BLE001
-            log(f"Error during joke/riddle generation with {fallback_model}: {exc}")
+    result = llm_gateway.generate(
+        prompt, purpose="riddle", priority=llm_gateway.PRIORITY_EDITION,
+        model=model_name, fallback_model=_fallback_model_name(), client=client,
+    )
+    raw_text = result.text if result else None
 
     paragraph = (raw_text or "").strip()
     paragraph = strip_emojis(paragraph)
@@ -632,26 +636,11 @@ def _generate_joke_or_riddle_paragraph(narrative_body: str, test_mode: bool = Fa
             "CORRECT ANSWER (based on assigned topic):",
         ]
         answer_prompt = "\n".join(answer_prompt_lines)
-        answer_raw = None
-        try:
-            answer_resp = client.models.generate_content(
-                model=model_name, contents=answer_prompt
-            )
-            answer_raw = _extract_text(answer_resp)
-        except Exception as exc:  # noqa: BLE001
-            log(f"Error during riddle answer generation with {model_name}: {exc}")
-
-        if not answer_raw:
-            try:
-                fb_model = _cfg.gemini_fallback_model if _cfg else "gemini-2.0-flash-lite"
-                answer_resp = client.models.generate_content(
-                    model=fb_model, contents=answer_prompt
-                )
-                answer_raw = _extract_text(answer_resp)
-            except Exception as exc:  # noqa: BLE001
-                log(
-                    f"Error during riddle answer generation with {fb_model}: {exc}"
-                )
+        answer_result = llm_gateway.generate(
+            answer_prompt, purpose="riddle_answer", priority=llm_gateway.PRIORITY_EDITION,
+            model=model_name, fallback_model=_fallback_model_name(), client=client,
+        )
+        answer_raw = answer_result.text if answer_result else None
 
         answer = strip_emojis((answer_raw or "").strip())
         answer = answer.replace("\n", " ").strip()
@@ -711,6 +700,19 @@ RULES FOR reply_text:
 """
 
 
+_JUDGE_CACHE_RIDDLES = 7  # Most recent riddles kept in the judgement cache
+_JUDGE_CACHE_MAX_GUESSES = 500  # Per riddle; beyond this guesses are judged but not stored
+
+_ARTICLES = {"the", "a", "an"}
+
+# Replies for guesses the local pre-judge accepts without asking Gemini
+_PREJUDGE_REPLIES = [
+    "That's the one.",
+    "Got it. Didn't take you long.",
+    "Yep. That's it.",
+]
+
+
 def _fuzzy_match(guess: str, answer: str) -> bool:
     """Simple fuzzy matching fallback if AI fails."""
     guess = guess.lower().strip()
@@ -734,10 +736,85 @@ def _fuzzy_match(guess: str, answer: str) -> bool:
     return strip_articles(guess) == strip_articles(answer)
 
 
+def _normalize_guess(text: str) -> str:
+    """Lowercase, drop punctuation and articles, collapse whitespace."""
+    words = re.sub(r"[^\w\s]", " ", (text or "").lower()).split()
+    return " ".join(w for w in words if w not in _ARTICLES)
+
+
+def _match_key(text: str) -> str:
+    """Normalised text with spacing and a trailing plural removed ("Sea gulls" -> "seagull")."""
+    key = _normalize_guess(text).replace(" ", "")
+    if key.endswith("ies") and len(key) > 4:
+        return key[:-3] + "y"
+    if key.endswith(("ches", "shes", "sses", "xes")):
+        return key[:-2]
+    if key.endswith("s") and not key.endswith("ss") and len(key) > 3:
+        return key[:-1]
+    return key
+
+
+def _prejudge(user_guess: str, correct_answer: str) -> bool:
+    """Whether a guess obviously matches the answer or one of its listed alternatives.
+
+    Only accepts; anything else still goes to Gemini, which handles real
+    synonyms and misspellings.
+    """
+    guess = _match_key(user_guess)
+    if not guess:
+        return False
+    alternatives = re.split(r"/|\bor\b|[(),;]", (correct_answer or "").lower())
+    return any(guess == _match_key(alt) for alt in [correct_answer, *alternatives] if _match_key(alt))
+
+
+def _judge_cache_key(riddle_date: Optional[str], correct_answer: str) -> str:
+    return riddle_date or f"answer:{_normalize_guess(correct_answer)}"
+
+
+def _get_cached_judgement(cache_key: str, answer: str, guess: str) -> Optional[Dict[str, Any]]:
+    entry = (atomic_read_json(_JUDGE_CACHE_PATH, default={}) or {}).get(cache_key) or {}
+    if entry.get("answer") != answer:
+        return None  # Riddle was regenerated for the same date
+    return entry.get("judgements", {}).get(guess)
+
+
+def _store_judgement(cache_key: str, answer: str, guess: str, judgement: Dict[str, Any]) -> None:
+    # The inbox monitor and the web API both judge guesses; a file lock keeps
+    # their read-modify-writes from dropping each other's judgements
+    try:
+        os.makedirs(os.path.dirname(_JUDGE_CACHE_PATH) or ".", exist_ok=True)
+        # Not path + ".lock": atomic_write_json takes that one itself
+        with open(_JUDGE_CACHE_PATH + ".update.lock", "w") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            cache = atomic_read_json(_JUDGE_CACHE_PATH, default={}) or {}
+            entry = cache.pop(cache_key, None)
+            if not entry or entry.get("answer") != answer:
+                entry = {"answer": answer, "judgements": {}}
+            if len(entry["judgements"]) < _JUDGE_CACHE_MAX_GUESSES:
+                entry["judgements"][guess] = judgement
+            cache[cache_key] = entry  # Most recently used riddle last
+            while len(cache) > _JUDGE_CACHE_RIDDLES:
+                cache.pop(next(iter(cache)))
+            atomic_write_json(_JUDGE_CACHE_PATH, cache)
+    except OSError as exc:
+        log(f"Failed to save judgement cache: {exc}")
+
+
 def judge_riddle(
     user_guess: str,
     correct_answer: str,
-    riddle_text: str
+    riddle_text: str,
+    riddle_date: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Blocking judge_riddle_async() for sync callers (inbox monitor, scripts)."""
+    return llm_gateway.run_sync(judge_riddle_async(user_guess, correct_answer, riddle_text, riddle_date))
+
+
+async def judge_riddle_async(
+    user_guess: str,
+    correct_answer: str,
+    riddle_text: str,
+    riddle_date: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Use AI to judge if a user's riddle guess is correct.
@@ -745,10 +822,17 @@ def judge_riddle(
     Allows synonyms and fuzzy matches. Returns a structured response
     with the judgment and a Canal Captain-voiced reply.
     
+    Obvious matches (same answer after normalising case, articles,
+    punctuation, spacing and plurals) are accepted locally. Gemini
+    judgements are cached per riddle and normalised guess, so the same
+    guess arriving again by email or web is answered from the cache.
+    
     Args:
         user_guess: The user's submitted guess
         correct_answer: The official riddle answer
         riddle_text: The riddle question for context
+        riddle_date: Riddle date the judgement cache is keyed by
+            (default: keyed by the answer)
     
     Returns:
         {"correct": bool, "reply_text": str}
@@ -762,6 +846,18 @@ def judge_riddle(
             "reply_text": "Ye sent an empty bottle, matey. Put yer guess in it next time."
         }
     
+    if _prejudge(user_guess, correct_answer):
+        log(f"Pre-judged guess '{user_guess[:30]}...' as correct")
+        return {"correct": True, "reply_text": random.choice(_PREJUDGE_REPLIES)}
+    
+    cache_key = _judge_cache_key(riddle_date, correct_answer)
+    answer_key = _normalize_guess(correct_answer)
+    guess_key = _normalize_guess(user_guess) or user_guess.lower()
+    cached = _get_cached_judgement(cache_key, answer_key, guess_key)
+    if cached:
+        log(f"Cached judgement for guess '{user_guess[:30]}...'")
+        return cached
+    
     # Build prompt
     prompt = _JUDGE_SYSTEM_PROMPT.format(
         riddle_text=riddle_text or "Unknown riddle",
@@ -770,28 +866,32 @@ def judge_riddle(
     )
     
     try:
-        client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
-        
-        judge_model = _cfg.gemini_fallback_model if _cfg else "gemini-2.0-flash-lite"
-        response = client.models.generate_content(
-            model=judge_model,  # Fast, cheap model for judging
-            contents=prompt,
+        result = await llm_gateway.generate_async(
+            prompt,
+            purpose="judge",
+            priority=llm_gateway.PRIORITY_JUDGE,
+            model=_fallback_model_name(),  # Fast, cheap model for judging
+            fallback_model=get_model_name(),
             config={
                 "response_mime_type": "application/json",
                 "response_schema": JudgeRiddleResponse,
                 "temperature": 0.7,
             },
+            validate=JudgeRiddleResponse.model_validate_json,
+            client=_get_client(),
         )
+        if result is None or result.value is None:
+            raise RuntimeError("no valid judgement before the deadline")
         
-        # Parse structured response
-        result = JudgeRiddleResponse.model_validate_json(response.text)
-        log(f"AI judged guess '{user_guess[:30]}...' as {'correct' if result.correct else 'wrong'}")
-        return result.model_dump()
+        log(f"AI judged guess '{user_guess[:30]}...' as {'correct' if result.value.correct else 'wrong'}")
+        judgement = result.value.model_dump()
+        _store_judgement(cache_key, answer_key, guess_key, judgement)
+        return judgement
         
     except Exception as exc:
         log(f"AI judging failed, using fuzzy match fallback: {exc}")
         
-        # Fallback to simple fuzzy matching
+        # Fallback to simple fuzzy matching (not cached; the next attempt retries the AI)
         is_correct = _fuzzy_match(user_guess, correct_answer)
         
         if is_correct:
@@ -808,6 +908,14 @@ def judge_riddle(
 def generate_narrative_only(
     sensor_data: Dict[str, Any],
     model_name: str | None = None,
+) -> tuple[str, str, str]:
+    """Blocking generate_narrative_only_async() for sync callers."""
+    return llm_gateway.run_sync(generate_narrative_only_async(sensor_data, model_name))
+
+
+async def generate_narrative_only_async(
+    sensor_data: Dict[str, Any],
+    model_name: str | None = None,
 ) -> tuple[str, str, str]:
     """Generate narrative without side effects (for web API).
 
@@ -827,51 +935,38 @@ def generate_narrative_only(
     sanitized = sanitize_data(sensor_data)
 
     # Minimal prompt without history (web narrative is standalone)
-    prompt = build_prompt(sanitized, history=None, is_weekly=False, injection=None)
+    static_prompt, prompt = build_prompt_segments(sanitized, history=None, is_weekly=False, injection=None)
 
     # Default fallback values
     subject = "Greenhouse Update"
     headline = "Conditions Report"
     body = "The greenhouse is holding steady."
 
-    client = _get_client()
-    model = get_model_name(model_name)
-
     structured_config = {
         "response_mime_type": "application/json",
         "response_json_schema": NarrativeResponse.model_json_schema(),
     }
 
     try:
-        response = client.models.generate_content(
-            model=model,
-            contents=prompt,
+        result = await llm_gateway.generate_async(
+            prompt,
+            purpose="web_narrative",
+            priority=llm_gateway.PRIORITY_WEB,
+            cached_prefix=static_prompt,
+            model=get_model_name(model_name),
+            fallback_model=_fallback_model_name(),
             config=structured_config,
+            validate=NarrativeResponse.model_validate_json,
+            client=_get_client(),
         )
-        raw_text = _extract_text(response)
-        if raw_text:
-            narrative = NarrativeResponse.model_validate_json(raw_text)
-            subject = to_sentence_case(narrative.subject)
-            headline = to_sentence_case(narrative.headline)
-            body = narrative.body
+        if result and result.value is not None:
+            subject = to_sentence_case(result.value.subject)
+            headline = to_sentence_case(result.value.headline)
+            body = result.value.body
+        else:
+            log("Web narrative generation failed; using defaults")
     except Exception as exc:
         log(f"Web narrative generation failed: {exc}")
-        # Fallback to lite model
-        try:
-            fallback = _cfg.gemini_fallback_model if _cfg else "gemini-2.0-flash-lite"
-            response = client.models.generate_content(
-                model=fallback,
-                contents=prompt,
-                config=structured_config,
-            )
-            raw_text = _extract_text(response)
-            if raw_text:
-                narrative = NarrativeResponse.model_validate_json(raw_text)
-                subject = to_sentence_case(narrative.subject)
-                headline = to_sentence_case(narrative.headline)
-                body = narrative.body
-        except Exception as fallback_exc:
-            log(f"Fallback generation also failed: {fallback_exc}")
 
     # Convert markdown bold to HTML
     body_html = re.sub(r"\*\*([^*]+)\*\*", r"<b>\1</b>", body)
@@ -884,8 +979,32 @@ def generate_narrative_only(
     return subject, headline, body_html
 
 
+def generate_riddle(test_mode: bool = False) -> Tuple[str, Optional[str]]:
+    """Generate today's riddle and return it with yesterday's answer.
+
+    The riddle prompt doesn't depend on the narrative, so the publisher
+    runs this alongside ``generate_update(..., include_riddle=False)``.
+
+    Returns:
+        tuple: (riddle_text, yesterday_answer) - ("", None) on failure
+    """
+    riddle_text = ""
+    yesterday_answer = None
+    try:
+        state = _load_riddle_state(test_mode=test_mode)
+        yesterday_answer = _extract_yesterday_answer(state)
+        riddle_text = _generate_joke_or_riddle_paragraph("", test_mode=test_mode)
+    except Exception as exc:  # noqa: BLE001
+        log(f"WARNING: Failed generating riddle: {exc}")
+    return riddle_text, yesterday_answer
+
+
 def generate_update(
-    sensor_data: Dict[str, Any], is_weekly: bool = False, test_mode: bool = False
+    sensor_data: Dict[str, Any],
+    is_weekly: bool = False,
+    test_mode: bool = False,
+    augment: bool = True,
+    include_riddle: bool = True,
 ) -> tuple[str, str, str, str, Dict[str, Any]]:
     """Sanitize data and request a narrative update from Gemini.
 
@@ -893,28 +1012,33 @@ def generate_update(
         sensor_data: Sensor and weather data dict
         is_weekly: If True, generate Sunday "Week in Review" edition
         test_mode: If True, use separate riddle state file and log answers
+        augment: If False, skip the weather/coast fetch (caller already merged it)
+        include_riddle: If False, skip riddle generation (see generate_riddle)
 
     Returns:
         tuple: (subject, headline, narrative_text, augmented_sensor_data)
     """
 
-    # Optionally augment with external weather data
-    try:
-        weather = weather_service.get_current_weather()
-        if weather:
-            sensor_data = {**sensor_data, **weather}
-            log(f"Augmented sensor data with external weather: {weather}")
-    except Exception as exc:  # noqa: BLE001
-        log(f"Error while fetching external weather: {exc}")
+    if augment:
+        # Optionally augment with external weather data
+        try:
+            weather = weather_service.get_current_weather()
+            if weather:
+                sensor_data = {**sensor_data, **weather}
+                log(f"Augmented sensor data with external weather: {weather}")
+        except Exception as exc:  # noqa: BLE001
+            log(f"Error while fetching external weather: {exc}")
 
-    # Optionally augment with coast & sky data (tides, meteor showers, moon events)
-    try:
-        coast_sky = coast_sky_service.get_coast_sky_summary()
-        if coast_sky:
-            sensor_data = {**sensor_data, **coast_sky}
-            log(f"Augmented sensor data with coast & sky: {list(coast_sky.keys())}")
-    except Exception as exc:  # noqa: BLE001
-        log(f"Error while fetching coast & sky data: {exc}")
+        # Optionally augment with coast & sky data (tides, meteor showers, moon events)
+        try:
+            coast_sky = coast_sky_service.get_coast_sky_summary()
+            if coast_sky:
+                sensor_data = {**sensor_data, **coast_sky}
+                log(f"Augmented sensor data with coast & sky: {list(coast_sky.keys())}")
+        except Exception as exc:  # noqa: BLE001
+            log(f"Error while fetching coast & sky data: {exc}")
+    else:
+        sensor_data = dict(sensor_data)
 
     sanitized = sanitize_data(sensor_data)
 
@@ -934,7 +1058,7 @@ def generate_update(
     # Check for one-time narrative injection (birthdays, special events, etc.)
     injection = _load_narrative_injection()
 
-    prompt = build_prompt(sanitized, history=history, is_weekly=is_weekly, injection=injection)
+    static_prompt, prompt = build_prompt_segments(sanitized, history=history, is_weekly=is_weekly, injection=injection)
 
     log(f"Generating narrative update for data: {sanitized}")
 
@@ -951,58 +1075,37 @@ def generate_update(
         "thinking_config": {"thinking_budget": 1024},  # Enable thinking with token budget
     }
 
-    client = _get_client()
     model_name = get_model_name()
     raw_text = None
     structured_success = False
 
-    # First attempt: primary Gemini model with structured output
+    # Primary model with structured output, then the fallback model, within one deadline
     try:
-        response = client.models.generate_content(
+        result = llm_gateway.generate(
+            prompt,
+            purpose="narrative",
+            priority=llm_gateway.PRIORITY_EDITION,
+            cached_prefix=static_prompt,
             model=model_name,
-            contents=prompt,
+            fallback_model=_fallback_model_name(),
             config=structured_config,
+            validate=NarrativeResponse.model_validate_json,
+            client=_get_client(),
         )
-        raw_text = _extract_text(response)
-        if raw_text:
-            try:
-                narrative = NarrativeResponse.model_validate_json(raw_text)
-                subject = narrative.subject
-                headline = narrative.headline
-                body = narrative.body
-                structured_success = True
-                log(f"Structured output parsed successfully from {model_name}")
-            except Exception as parse_exc:
-                log(f"WARNING: Structured output parsing failed: {parse_exc}")
-                # Will fall through to text fallback
-        else:
-            log("WARNING: Primary Gemini model response had no text; will try fallback.")
     except Exception as exc:  # noqa: BLE001
-        log(f"Error during Gemini generation with {model_name}: {exc}")
-
-    # Fallback attempt with configured fallback model
-    if not structured_success:
-        fallback_model = _cfg.gemini_fallback_model if _cfg else "gemini-2.0-flash-lite"
-        try:
-            log(f"Attempting fallback generation with model '{fallback_model}'.")
-            response = client.models.generate_content(
-                model=fallback_model,
-                contents=prompt,
-                config=structured_config,
-            )
-            raw_text = _extract_text(response)
-            if raw_text:
-                try:
-                    narrative = NarrativeResponse.model_validate_json(raw_text)
-                    subject = narrative.subject
-                    headline = narrative.headline
-                    body = narrative.body
-                    structured_success = True
-                    log(f"Structured output parsed successfully from {fallback_model}")
-                except Exception as parse_exc:
-                    log(f"WARNING: Fallback structured parsing failed: {parse_exc}")
-        except Exception as exc:  # noqa: BLE001
-            log(f"Error during Gemini generation with {fallback_model}: {exc}")
+        log(f"Error during Gemini generation: {exc}")
+        result = None
+
+    if result is not None:
+        raw_text = result.text
+        if result.value is not None:
+            subject = result.value.subject
+            headline = result.value.headline
+            body = result.value.body
+            structured_success = True
+            log(f"Structured output parsed successfully from {result.model}")
+        else:
+            log("WARNING: Structured output parsing failed for every model")
 
     # TEXT FALLBACK: If structured output failed but we have raw text, try text parsing
     if not structured_success and raw_text:
@@ -1048,18 +1151,19 @@ def generate_update(
     body_plain = re.sub(r"<[^>]+>", "", body_html)
 
     # Generate riddle separately (not appended to body - will be in its own card)
-    riddle_text = ""
-    yesterday_answer = None
-    try:
-        state = _load_riddle_state(test_mode=test_mode)
-        yesterday_answer = _extract_yesterday_answer(state)
-        riddle_text = _generate_joke_or_riddle_paragraph(body, test_mode=test_mode)
-    except Exception as exc:  # noqa: BLE001
-        log(f"WARNING: Failed generating riddle: {exc}")
+    if include_riddle:
+        riddle_text = ""
+        yesterday_answer = None
+        try:
+            state = _load_riddle_state(test_mode=test_mode)
+            yesterday_answer = _extract_yesterday_answer(state)
+            riddle_text = _generate_joke_or_riddle_paragraph(body, test_mode=test_mode)
+        except Exception as exc:  # noqa: BLE001
+            log(f"WARNING: Failed generating riddle: {exc}")
 
-    # Store riddle info in sensor_data for publisher to create dedicated card
-    sensor_data["_riddle_text"] = riddle_text
-    sensor_data["_riddle_yesterday_answer"] = yesterday_answer
+        # Store riddle info in sensor_data for publisher to create dedicated card
+        sensor_data["_riddle_text"] = riddle_text
+        sensor_data["_riddle_yesterday_answer"] = yesterday_answer
 
     # Strip any emojis from AI-generated text (keep emojis only in data tables)
     subject = strip_emojis(subject)
@@ -1071,7 +1175,7 @@ def generate_update(
     body_plain = strip_emojis(body_plain)
 
     # Store narrator model in sensor_data for debug footer
-    sensor_data["_narrator_model"] = model_name
+    sensor_data["_narrator_model"] = result.model if result else model_name
 
     # Save narrative to history for rolling memory (continuity across days)
     today = datetime.now().date().isoformat()
@@ -1085,6 +1189,46 @@ def generate_update(
     return subject, headline, body_html, body_plain, sensor_data
 
 
+def prompt_report(sensor_data: Dict[str, Any], live: bool = False) -> str:
+    """Sizes of the daily and web narrative prompts, split into cached prefix and per-request part.
+
+    With ``live``, also sends the web prompt twice through the gateway and
+    reports time to first token and cached tokens for each call.
+    """
+    sanitized = sanitize_data(sensor_data)
+    history = _load_history()
+    min_tokens = llm_gateway.CONTEXT_CACHE_MIN_TOKENS
+    lines = [f"{'Prompt':<8} {'Static':>8} {'Volatile':>9} {'Total':>7}  (chars; ~4 per token)"]
+    segments = {
+        "daily": build_prompt_segments(sanitized, history=history),
+        "weekly": build_prompt_segments(sanitized, history=history, is_weekly=True),
+        "web": build_prompt_segments(sanitized),
+    }
+    for name, (static, volatile) in segments.items():
+        lines.append(f"{name:<8} {len(static):>8} {len(volatile):>9} {len(static) + len(volatile) + 1:>7}")
+    static_tokens = len(segments["daily"][0]) // 4
+    lines.append(
+        f"Static prefix ~{static_tokens} tokens: "
+        + ("explicit context cache" if llm_gateway.CONTEXT_CACHE_ENABLED and static_tokens >= min_tokens
+           else f"sent inline (context cache needs {min_tokens}+), implicit prefix caching only")
+    )
+    if live:
+        static, volatile = segments["web"]
+        for attempt in (1, 2):
+            result = llm_gateway.generate(
+                volatile, purpose="prompt_report", priority=llm_gateway.PRIORITY_WEB,
+                cached_prefix=static, client=_get_client(),
+            )
+            if result is None:
+                lines.append(f"Live call {attempt}: failed")
+            else:
+                lines.append(
+                    f"Live call {attempt}: {result.model} first token {result.ttft_s:.2f}s, "
+                    f"total {result.latency_s:.2f}s, {result.cached_tokens}/{result.prompt_tokens} prompt tokens cached"
+                )
+    return "\n".join(lines)
+
+
 if __name__ == "__main__":
     # Simple test run with dummy data
     test_data = {
@@ -1095,6 +1239,11 @@ if __name__ == "__main__":
         "satellite_2_pressure": 1012,
         "satellite_2_battery": 4.1,
     }
+    if "--prompt-report" in sys.argv:
+        # python narrator.py --prompt-report [--live]
+        print(prompt_report(test_data, live="--live" in sys.argv))
+        sys.exit(0)
+
     log(f"Running narrator test with data: {test_data}")
 
     # List models visible to this API key for debugging
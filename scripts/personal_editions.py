@@ -0,0 +1,97 @@
+"""Per-recipient personalised editions (EMAIL_PERSONALISED=1).
+
+The edition is built once as usual: narrative, timelapse, chart, weather
+and the full HTML render. That render leaves an empty slot below the
+riddle. Each recipient then only costs:
+
+    scorekeeper lookup -> small card render -> slot fill -> MIME copy -> enqueue
+
+Messages are queued to mail_outbox as they are made, so the pooled SMTP
+connection starts delivering while later copies are still being built.
+Each message is addressed to its recipient alone.
+
+Delivery is still paced by mail_outbox (MAIL_MIN_SEND_INTERVAL_SECONDS
+between messages, MAIL_DAILY_RECIPIENT_LIMIT per day). Use it with
+EMAIL_ASSET_MODE=hosted (and a public EMAIL_ASSET_BASE_URL, see
+email_assets) so each copy doesn't carry the timelapse.
+"""
+
+import copy
+import os
+import time
+from email.message import EmailMessage
+from typing import List
+
+import email_templates
+import mail_outbox
+import scorekeeper
+from utils.logger import create_logger
+
+log = create_logger("personal_editions")
+
+
+def enabled() -> bool:
+    """Whether EMAIL_PERSONALISED asks for one message per recipient."""
+    return os.getenv("EMAIL_PERSONALISED", "0").strip().lower() in ("1", "true", "yes")
+
+
+def personal_card(recipient: str) -> str:
+    """Render the recipient's riddle standing: this season's, else all-time (or an invitation to play)."""
+    stats = scorekeeper.get_player_stats(recipient)
+    display_name = stats["display_name"] if stats else scorekeeper.get_display_name(recipient.lower())
+    return email_templates.render_personal_card(display_name, stats)
+
+
+def personalise(msg: EmailMessage, shared_html: str, recipient: str, card: str) -> EmailMessage:
+    """Copy a shared edition, addressed to ``recipient`` with their card filled in.
+
+    Args:
+        msg: Edition rendered with ``personal_slot=True``
+        shared_html: Its HTML body (read once, not per recipient)
+        recipient: Address for the To header
+        card: render_personal_card() output
+    """
+    personal = copy.deepcopy(msg)  # Image payloads are shared strings, not copied
+    del personal["To"]
+    personal["To"] = recipient
+    for part in personal.walk():
+        if part.get_content_type() == "text/html":
+            part.clear_content()
+            part.set_content(email_templates.fill_personal_slot(shared_html, card), subtype="html")
+            break
+    return personal
+
+
+def queue_personalised(msg: EmailMessage, recipients: List[str]) -> List[str]:
+    """Queue one personalised copy of ``msg`` per recipient.
+
+    Returns:
+        mail_outbox queue ids (for mail_outbox.wait())
+    """
+    html_part = next(
+        (part for part in msg.walk() if part.get_content_type() == "text/html"), None
+    )
+    if html_part is None:
+        log("Edition has no HTML part; queuing it unpersonalised")
+        msg_id = mail_outbox.enqueue(msg, recipients)
+        return [msg_id] if msg_id else []
+    shared_html = html_part.get_content()
+
+    start = time.perf_counter()
+    msg_ids = []
+    for recipient in recipients:
+        try:
+            card = personal_card(recipient)
+        except Exception as exc:  # noqa: BLE001
+            log(f"No personal card for {recipient} ({exc}); sending the shared edition")
+            card = ""
+        msg_id = mail_outbox.enqueue(personalise(msg, shared_html, recipient, card), [recipient])
+        if msg_id:
+            msg_ids.append(msg_id)
+    elapsed = time.perf_counter() - start
+    if recipients:
+        log(
+            f"Queued {len(msg_ids)}/{len(recipients)} personalised editions in {elapsed:.2f}s "
+            f"({elapsed * 1000 / len(recipients):.1f}ms each)"
+        )
+    return msg_ids
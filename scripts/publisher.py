@@ -3,22 +3,28 @@ import html
 import json
 import os
 import re
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from email.message import EmailMessage
 from email.utils import formatdate, make_msgid
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.error import HTTPError, URLError
 from urllib.request import urlopen
 
 import chart_generator
+import edition_prebuild
+import email_assets
+import external_data
 import email_templates
+import mail_outbox
 import narrator
+import personal_editions
 import scorekeeper
 import stats
 import timelapse
 import weekly_digest
-from email_sender import send_email, get_recipients_from_env
+from email_sender import SEND_TIMEOUT_SECONDS, send_email, get_recipients_from_env
 from utils.logger import create_logger
+from utils.task_graph import TaskGraph
 
 # Lazy import of settings to avoid circular imports
 _settings = None
@@ -162,11 +168,164 @@ def load_latest_sensor_snapshot() -> Dict[str, Any]:
     return {"sensors": {}, "last_seen": {}}
 
 
-def build_email(status_snapshot: Dict[str, Any]) -> Tuple[EmailMessage, Optional[str]]:
-    """Construct the email message and return it along with the image path (if any).
+def _gather_external(staged: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """External step: weather and coast/sky, fetched concurrently unless staged."""
+    wanted = [name for name in ("weather", "coast_sky") if name not in staged]
+    fetched = {}
+    if wanted:
+        fetched = external_data.gather_external_data(
+            weather="weather" in wanted, coast_sky="coast_sky" in wanted
+        )
+    return {**fetched, **{name: staged[name] for name in ("weather", "coast_sky") if name in staged}}
+
+
+def _generate_narrative(
+    external: Optional[Dict[str, Dict[str, Any]]],
+    narrator_data: Dict[str, Any],
+    weekly_mode: bool,
+):
+    """Narrative step: merge the fetched external data, then call the narrator."""
+    weather = (external or {}).get("weather")
+    coast_sky = (external or {}).get("coast_sky")
+    if weather:
+        narrator_data = {**narrator_data, **weather}
+        log(f"Augmented sensor data with external weather: {weather}")
+    if coast_sky:
+        narrator_data = {**narrator_data, **coast_sky}
+        log(f"Augmented sensor data with coast & sky: {list(coast_sky.keys())}")
+    return narrator.generate_update(
+        narrator_data,
+        is_weekly=weekly_mode,
+        test_mode=_test_mode,
+        augment=False,
+        include_riddle=False,
+    )
+
+
+def _load_game_data(_riddle: Any) -> Dict[str, Any]:
+    """Game step: riddle date (written by the riddle step), leaderboard, winners."""
+    riddle_state = narrator._load_riddle_state()
+    winners = scorekeeper.get_yesterdays_winners()
+    return {
+        "riddle_date": riddle_state.get("date"),
+        "leaderboard": scorekeeper.get_leaderboard(top_n=5),
+        "yesterdays_winners": [w["display_name"] for w in winners],
+    }
+
+
+def run_edition_tasks(narrator_data: Dict[str, Any], weekly_mode: bool) -> Dict[str, Any]:
+    """Produce the edition's independent pieces concurrently.
+
+    External fetches (concurrent, under one deadline), the riddle and
+    the stats run on threads; the GIF and chart render in worker
+    processes. The narrative waits only for the external data. Failed
+    steps come back as None.
+
+    Assets pre-built overnight (see edition_prebuild) replace their
+    steps; anything not staged is built inline.
+    """
+    staged = edition_prebuild.load_staged_assets(weekly_mode)
+    graph = TaskGraph("edition")
+
+    def add_step(name, func, **options):
+        if name in staged:
+            graph.add(name, staged.get, args=(name,))
+        else:
+            graph.add(name, func, **options)
+
+    graph.add("external", _gather_external, args=(staged,))
+    graph.add(
+        "narrative",
+        _generate_narrative,
+        deps=["external"],
+        args=(narrator_data, weekly_mode),
+    )
+    graph.add("riddle", narrator.generate_riddle, kwargs={"test_mode": _test_mode})
+    graph.add("game", _load_game_data, deps=["riddle"])
+    add_step(
+        "timelapse",
+        timelapse.create_weekly_timelapse if weekly_mode else timelapse.create_daily_timelapse,
+        in_process=True,
+    )
+    add_step(
+        "chart",
+        chart_generator.generate_temperature_chart,
+        kwargs={"hours": 168 if weekly_mode else 24},
+        in_process=True,
+    )
+    graph.add("stats_24h", stats.get_24h_stats, args=(datetime.utcnow(),))
+    return graph.run()
+
+
+def _compose_email(
+    headers: Dict[str, str],
+    body_plain: str,
+    template_args: Dict[str, Any],
+    assets: List[Tuple[str, bytes, str, str]],
+    urls: Dict[str, str],
+) -> EmailMessage:
+    """Render one variant of the edition.
+
+    Args:
+        headers: From/To/Date/Subject
+        body_plain: Plain-text fallback
+        template_args: render_daily_email() arguments other than the images
+        assets: (key, bytes, image subtype, filename) for "image" and "chart"
+        urls: Hosted URL per asset key; assets without one are embedded inline
+    """
+    msg = EmailMessage()
+    for name, value in headers.items():
+        msg[name] = value
+
+    # Plain-text fallback (use body_plain which has HTML tags stripped)
+    msg.set_content(body_plain)
+
+    cids = {key: make_msgid(domain="greenhouse")[1:-1] for key, *_ in assets if key not in urls}
+    html_body = email_templates.render_daily_email(
+        **template_args,
+        image_cid=cids.get("image"),
+        image_url=urls.get("image"),
+        chart_cid=cids.get("chart"),
+        chart_url=urls.get("chart"),
+    )
+    log("Rendered email via Jinja2 templates")
+
+    msg.add_alternative(html_body, subtype="html")
+
+    # Attach inline images as related parts of the HTML part
+    for key, data, subtype, filename in assets:
+        if key not in cids:
+            continue
+        try:
+            # The HTML part is the last part after set_content + add_alternative
+            html_part = msg.get_payload()[-1]
+            html_part.add_related(
+                data,
+                maintype="image",
+                subtype=subtype,
+                cid=f"<{cids[key]}>",
+                filename=filename,
+            )
+            log(f"Attached {filename}: {len(data)} bytes")
+        except Exception as exc:  # noqa: BLE001
+            log(f"Failed to attach {filename}: {exc}")
+
+    return msg
+
+
+def build_email_variants(
+    status_snapshot: Dict[str, Any], personalised: bool = False
+) -> Tuple[Dict[str, EmailMessage], bool]:
+    """Construct the edition as ready-to-send messages.
 
     Args:
         status_snapshot: Full status.json structure with 'sensors' and 'last_seen' keys
+        personalised: Leave the per-recipient slot in the HTML (see personal_editions)
+
+    Returns:
+        ({"inline": msg, "hosted": msg}, weekly_mode). "hosted" (images
+        referenced from the web server) is only present with
+        EMAIL_ASSET_MODE=hosted and EMAIL_ASSET_BASE_URL set.
     """
 
     # Extract sensors and timestamps
@@ -232,6 +391,7 @@ def build_email(status_snapshot: Dict[str, Any]) -> Tuple[EmailMessage, Optional
         if weekly_data and weekly_data.get("days"):
             # Compute summary from raw weekly data
             ws = weekly_digest.compute_weekly_summary(weekly_data)
+            weekly_summary = ws  # Also shown in the weekly stats table
             # Add weekly stats to narrator_data - clearly labeled as greenhouse vs outdoor
             narrator_data["greenhouse_weekly_high"] = ws.get("interior_temp_max")
             narrator_data["greenhouse_weekly_low"] = ws.get("interior_temp_min")
@@ -250,19 +410,20 @@ def build_email(status_snapshot: Dict[str, Any]) -> Tuple[EmailMessage, Optional
                 f"Added weekly stats to narrator: high={narrator_data.get('weekly_high')}, low={narrator_data.get('weekly_low')}"
             )
 
+    # Narrative, riddle, hero image, chart and stats are built concurrently
+    edition = run_edition_tasks(narrator_data, weekly_mode)
+
     # Narrative content and augmented data (includes weather)
     augmented_data = {}  # Initialize to ensure it's defined even if narrator fails
     body_html = ""
     body_plain = ""
-    try:
-        subject, headline, body_html, body_plain, augmented_data = (
-            narrator.generate_update(narrator_data, is_weekly=weekly_mode, test_mode=_test_mode)
-        )
+    if edition.get("narrative"):
+        subject, headline, body_html, body_plain, augmented_data = edition["narrative"]
         # Merge augmented data back (weather info) but preserve stale flags
         stale_flags = {k: v for k, v in sensor_data.items() if k.endswith("_stale")}
         sensor_data = {**augmented_data, **stale_flags}
-    except Exception as exc:  # noqa: BLE001
-        log(f"Narrator failed: {exc}")
+    else:
+        log("Narrator failed: no narrative produced")
         subject = "Greenhouse News"
         headline = "Greenhouse Update"
         body_html = "Error generating update."
@@ -278,40 +439,33 @@ def build_email(status_snapshot: Dict[str, Any]) -> Tuple[EmailMessage, Optional
         # Don't override subject if narrator already made it weekly-themed
         if not subject.lower().startswith("weekly"):
             subject = f"Weekly Edition: {subject}"
-        # Get weekly summary stats for display table
-        weekly_data = weekly_digest.load_weekly_stats()
-        if weekly_data.get("days"):
-            weekly_summary = weekly_digest.compute_weekly_summary(weekly_data)
+        if weekly_summary:
             log(f"Weekly summary: {weekly_summary}")
 
+    # Riddle was generated alongside the narrative; store it for the riddle card
+    riddle_text, yesterday_answer = edition.get("riddle") or ("", None)
+    sensor_data.setdefault("_riddle_text", riddle_text)
+    sensor_data.setdefault("_riddle_yesterday_answer", yesterday_answer)
+
     # Hero image/timelapse
     image_bytes: Optional[bytes] = None
-    image_cid: Optional[str] = None
     image_type = "jpeg"  # Default to jpeg, may change to gif for timelapse
     
     # Generate URL for 4K timelapse on website (deep link from email)
-    from datetime import date
     yesterday = date.today() - timedelta(days=1)
     _timelapse_url = f"https://straightouttacolington.com/timelapse#daily_{yesterday.strftime('%Y-%m-%d')}"
 
+    image_bytes = edition.get("timelapse")
     if weekly_mode:
-        # Weekly Edition: Use existing weekly timelapse logic (golden hour stitch)
-        log("Creating weekly timelapse GIF (golden hour stitch)...")
-        image_bytes = timelapse.create_weekly_timelapse()
+        # Weekly Edition: golden hour stitch
         if image_bytes:
-            image_cid = make_msgid(domain="greenhouse")[1:-1]
             image_type = "gif"
             log(f"Weekly timelapse created: {len(image_bytes)} bytes")
         else:
             log("Weekly timelapse creation failed, falling back to static image")
     else:
-        # Daily Edition: Use new daily timelapse (yesterday's daylight images)
-        log(
-            "Daily Edition: Creating daily timelapse from yesterday's daylight images..."
-        )
-        image_bytes = timelapse.create_daily_timelapse()
+        # Daily Edition: yesterday's daylight images
         if image_bytes:
-            image_cid = make_msgid(domain="greenhouse")[1:-1]
             image_type = "gif"
             log(f"Daily timelapse created: {len(image_bytes)} bytes")
         else:
@@ -323,13 +477,11 @@ def build_email(status_snapshot: Dict[str, Any]) -> Tuple[EmailMessage, Optional
         if image_path:
             try:
                 image_bytes = load_image_bytes(image_path)
-                image_cid = make_msgid(domain="greenhouse")[1:-1]
                 image_type = "jpeg"
                 log(f"Using static fallback image: {image_path}")
             except Exception as exc:  # noqa: BLE001
                 log(f"Failed to load image '{image_path}': {exc}")
                 image_bytes = None
-                image_cid = None
 
     # Envelope fields from settings or environment
     settings = _get_settings()
@@ -341,14 +493,12 @@ def build_email(status_snapshot: Dict[str, Any]) -> Tuple[EmailMessage, Optional
         smtp_to = os.getenv("SMTP_TO", "you@example.com")
         recipients = [addr.strip() for addr in smtp_to.split(",") if addr.strip()]
 
-    msg = EmailMessage()
-    msg["From"] = smtp_from
-    msg["To"] = ", ".join(recipients)  # Display all recipients in header
-    msg["Date"] = formatdate(localtime=True)
-    msg["Subject"] = subject
-
-    # Plain-text fallback (use body_plain which has HTML tags stripped)
-    msg.set_content(body_plain)
+    headers = {
+        "From": smtp_from,
+        "To": ", ".join(recipients),  # Display all recipients in header
+        "Date": formatdate(localtime=True),
+        "Subject": subject,
+    }
 
     # Extract vitals with graceful fallbacks (support both old and new key formats)
     # Interior sensors (from HA bridge or direct MQTT)
@@ -395,7 +545,7 @@ def build_email(status_snapshot: Dict[str, Any]) -> Tuple[EmailMessage, Optional
 
     # 24-hour stats (min/max) for vitals
     # NOTE: status_daemon.py now normalizes keys, so stats use logical keys
-    stats_24h = stats.get_24h_stats(datetime.utcnow())
+    stats_24h = edition.get("stats_24h") or {}
 
     # Extract 24h stats for display (now using normalized keys)
     indoor_temp_min = stats_24h.get("interior_temp_min")
@@ -696,15 +846,12 @@ def build_email(status_snapshot: Dict[str, Any]) -> Tuple[EmailMessage, Optional
 
     # Generate temperature chart (168h for weekly, 24h for daily)
     temp_chart_bytes: Optional[bytes] = None
-    temp_chart_cid: Optional[str] = None
     chart_hours = 168 if weekly_mode else 24
-    try:
-        temp_chart_bytes = chart_generator.generate_temperature_chart(hours=chart_hours)
-        if temp_chart_bytes:
-            temp_chart_cid = make_msgid(domain="greenhouse")[1:-1]
-            log(f"Generated {chart_hours}h temperature chart: {len(temp_chart_bytes)} bytes")
-    except Exception as exc:
-        log(f"Failed to generate temperature chart: {exc}")
+    temp_chart_bytes = edition.get("chart")
+    if temp_chart_bytes:
+        log(f"Generated {chart_hours}h temperature chart: {len(temp_chart_bytes)} bytes")
+    else:
+        log("Failed to generate temperature chart")
 
     # Get tide display for template
     tide_display = _get_tide_display(sensor_data)
@@ -734,22 +881,19 @@ def build_email(status_snapshot: Dict[str, Any]) -> Tuple[EmailMessage, Optional
     # Get bot email with fallback to env var (settings may fail in container)
     _bot_email = (cfg.smtp_user if cfg and cfg.smtp_user else None) or os.getenv("SMTP_USER", "")
     
-    try:
-        # Load riddle state for the date (used in mailto link)
-        riddle_state = narrator._load_riddle_state()
-        _riddle_date = riddle_state.get("date")
-        
-        # Load game data
-        _leaderboard = scorekeeper.get_leaderboard(top_n=5)
-        _yesterdays_winners_data = scorekeeper.get_yesterdays_winners()
-        _yesterdays_winners = [w["display_name"] for w in _yesterdays_winners_data]
-        
+    game = edition.get("game")
+    if game:
+        # Riddle date is used in the mailto link
+        _riddle_date = game["riddle_date"]
+        _leaderboard = game["leaderboard"]
+        _yesterdays_winners = game["yesterdays_winners"]
+
         if _leaderboard:
             log(f"Riddle leaderboard: {len(_leaderboard)} players")
         if _yesterdays_winners:
             log(f"Yesterday's winners: {_yesterdays_winners}")
-    except Exception as exc:
-        log(f"Error loading riddle game data: {exc}")
+    else:
+        log("Error loading riddle game data")
     
     # Load broadcast message (if any) and clear after use
     _broadcast = None
@@ -780,7 +924,7 @@ def build_email(status_snapshot: Dict[str, Any]) -> Tuple[EmailMessage, Optional
             "exterior_humidity_min": round(exterior_humidity_min) if exterior_humidity_min is not None else None,
         }
     
-    html_body = email_templates.render_daily_email(
+    template_args = dict(
         subject=subject,
         headline=headline,
         body_html=body_html_escaped,
@@ -801,9 +945,7 @@ def build_email(status_snapshot: Dict[str, Any]) -> Tuple[EmailMessage, Optional
         moon_icon=moon_icon,
         moon_phase=fmt_moon_phase(moon_phase),
         tide_display=tide_display,
-        image_cid=image_cid,
         timelapse_url=_timelapse_url,
-        chart_cid=temp_chart_cid,
         stats_24h=_stats_24h,
         riddle_text=_riddle_text,
         yesterday_answer=_yesterday_answer,
@@ -821,44 +963,44 @@ def build_email(status_snapshot: Dict[str, Any]) -> Tuple[EmailMessage, Optional
             "battery": round(sat_battery, 2) if sat_battery else "N/A",
             "model": os.getenv("GEMINI_MODEL", "gemini-2.5-flash"),
         } if _test_mode else None,
+        personal_slot=personalised,
     )
-    log("Rendered email via Jinja2 templates")
 
-    msg.add_alternative(html_body, subtype="html")
+    # Hero image/timelapse and chart, embedded inline or hosted on the web server
+    assets = []
+    if image_bytes:
+        filename = "timelapse.gif" if image_type == "gif" else "greenhouse.jpg"
+        assets.append(("image", image_bytes, image_type, filename))
+    if temp_chart_bytes:
+        assets.append(("chart", temp_chart_bytes, "png", "temperature_chart.png"))
+
+    variants = {"inline": _compose_email(headers, body_plain, template_args, assets, {})}
+    if email_assets.hosted_enabled():
+        urls = {}
+        for key, data, subtype, _ in assets:
+            url = email_assets.publish(data, "jpg" if subtype == "jpeg" else subtype)
+            if url:
+                urls[key] = url
+        variants["hosted"] = _compose_email(headers, body_plain, template_args, assets, urls)
+        log(
+            f"Hosted-asset email: {len(variants['hosted'].as_bytes())} bytes "
+            f"(inline: {len(variants['inline'].as_bytes())} bytes)"
+        )
 
-    # Attach image/timelapse as inline related part if available
-    if image_bytes and image_cid:
-        try:
-            # The HTML part is the last part after set_content + add_alternative
-            html_part = msg.get_payload()[-1]
-            filename = "timelapse.gif" if image_type == "gif" else "greenhouse.jpg"
-            html_part.add_related(
-                image_bytes,
-                maintype="image",
-                subtype=image_type,
-                cid=f"<{image_cid}>",
-                filename=filename,
-            )
-            log(f"Attached {image_type} image: {len(image_bytes)} bytes")
-        except Exception as exc:  # noqa: BLE001
-            log(f"Failed to attach inline image: {exc}")
+    return variants, weekly_mode
 
-    # Attach temperature chart as inline related part if available
-    if temp_chart_bytes and temp_chart_cid:
-        try:
-            html_part = msg.get_payload()[-1]
-            html_part.add_related(
-                temp_chart_bytes,
-                maintype="image",
-                subtype="png",
-                cid=f"<{temp_chart_cid}>",
-                filename="temperature_chart.png",
-            )
-            log(f"Attached temperature chart: {len(temp_chart_bytes)} bytes")
-        except Exception as exc:  # noqa: BLE001
-            log(f"Failed to attach temperature chart: {exc}")
 
-    return msg, weekly_mode
+def build_email(status_snapshot: Dict[str, Any]) -> Tuple[EmailMessage, bool]:
+    """Construct the email message and return it with the weekly-mode flag.
+
+    Returns the hosted-asset variant when EMAIL_ASSET_MODE=hosted, else
+    the inline one (see build_email_variants).
+
+    Args:
+        status_snapshot: Full status.json structure with 'sensors' and 'last_seen' keys
+    """
+    variants, weekly_mode = build_email_variants(status_snapshot)
+    return variants.get("hosted") or variants["inline"], weekly_mode
 
 
 def run_once() -> None:
@@ -866,7 +1008,8 @@ def run_once() -> None:
 
     status_snapshot = load_latest_sensor_snapshot()
     log(f"Preparing email with status snapshot: {status_snapshot.get('sensors', {})}")
-    msg, weekly_mode = build_email(status_snapshot)
+    personalised = personal_editions.enabled()
+    variants, weekly_mode = build_email_variants(status_snapshot, personalised=personalised)
 
     # Get recipients from environment
     recipients = get_recipients_from_env()
@@ -876,7 +1019,36 @@ def run_once() -> None:
     else:
         log("Sending daily email...")
 
-    send_email(msg, recipients)
+    # Hosted images for everyone except recipients who need them embedded
+    hosted_msg = variants.get("hosted")
+    if hosted_msg is None:
+        groups = [(variants["inline"], recipients)]
+    else:
+        wants_inline = set(email_assets.inline_recipients())
+        groups = [
+            (hosted_msg, [r for r in recipients if r.lower() not in wants_inline]),
+            (variants["inline"], [r for r in recipients if r.lower() in wants_inline]),
+        ]
+
+    if personalised:
+        # One message per recipient, streamed to the outbox as each is made
+        msg_ids = []
+        for msg, to in groups:
+            msg_ids.extend(personal_editions.queue_personalised(msg, to))
+        delivered = mail_outbox.wait(msg_ids, timeout=SEND_TIMEOUT_SECONDS)
+        if len(msg_ids) < len(recipients):
+            log(
+                f"Personalised edition partially failed: only {len(msg_ids)}/{len(recipients)} "
+                "recipients could be queued."
+            )
+        elif delivered:
+            log(f"Personalised edition sent to {len(msg_ids)} recipients.")
+        else:
+            log("Personalised edition not confirmed sent to every recipient.")
+    else:
+        for msg, to in groups:
+            if to:
+                send_email(msg, to)
     
     # Post-send: Reset riddle game daily log for new day
     try:
@@ -1,10 +1,13 @@
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import schedule
 
-import inbox_monitor
+import conditions_log
+import edition_prebuild
+import mail_outbox
 import publisher
+import solar
 import weekly_digest
 import golden_hour
 import extended_timelapse
@@ -51,6 +54,51 @@ def trigger_golden_hour_capture() -> None:
         log(f"Error during golden hour capture: {exc}")
 
 
+def schedule_golden_hour_capture() -> str:
+    """(Re)register today's golden hour capture from the offline solar times.
+
+    Runs at startup and just after midnight so the capture tracks the
+    actual sunset every day instead of a fixed monthly time.
+    """
+    schedule.clear("golden_hour")
+    gh_time = golden_hour.get_golden_hour_time()
+    schedule.every().day.at(gh_time).do(trigger_golden_hour_capture).tag("golden_hour")
+    log(f"Golden hour for today: {gh_time}")
+    return gh_time
+
+
+def safe_edition_prebuild() -> None:
+    """Pre-build the next edition's assets; 07:00 falls back inline on failure."""
+    try:
+        log("Pre-building edition assets...")
+        result = edition_prebuild.prebuild_edition()
+        log(f"Edition pre-build staged: {result}" if result else "Edition pre-build staged nothing")
+    except Exception as exc:  # noqa: BLE001
+        log(f"Error during edition pre-build: {exc}")
+
+
+def safe_record_conditions() -> None:
+    """Snapshot weather and water level for context_backtest.py."""
+    try:
+        conditions_log.record_conditions()
+    except Exception as exc:  # noqa: BLE001
+        log(f"Error recording conditions snapshot: {exc}")
+
+
+def schedule_sunset_prebuild() -> str:
+    """(Re)register today's post-sunset pre-build (30 min after sunset).
+
+    The day's images are complete once the sun is down, so the GIF for
+    tomorrow's edition can be rendered then instead of at 07:00.
+    """
+    schedule.clear("sunset_prebuild")
+    sunset = solar.get_sun_times().sunset
+    prebuild_time = (sunset + timedelta(minutes=30)).strftime("%H:%M") if sunset else "21:00"
+    schedule.every().day.at(prebuild_time).do(safe_edition_prebuild).tag("sunset_prebuild")
+    log(f"Sunset pre-build for today: {prebuild_time}")
+    return prebuild_time
+
+
 def generate_daily_web_timelapse() -> None:
     """Generate 4K daily timelapse MP4 for website."""
     try:
@@ -142,14 +190,24 @@ def generate_yearly_timelapse() -> None:
 def main() -> None:
     log("Starting scheduler. Registering jobs...")
 
+    # Outbound mail sender; also delivers anything left queued by a restart
+    mail_outbox.start()
+
     # Daily dispatch at 07:00 local time
     # On Sundays, this becomes the "Weekly Edition" with merged content
     schedule.every().day.at("07:00").do(safe_daily_dispatch)
 
-    # Golden hour photo capture (seasonal timing)
-    gh_time = golden_hour.get_seasonal_golden_hour()
-    schedule.every().day.at(gh_time).do(trigger_golden_hour_capture)
-    log(f"Golden hour for this month: {gh_time}")
+    # Golden hour photo capture (computed per day from sun position)
+    gh_time = schedule_golden_hour_capture()
+    schedule.every().day.at("00:05").do(schedule_golden_hour_capture)
+
+    # Edition pre-build after sunset (GIF) and at 05:00 (chart, weather, tides)
+    prebuild_time = schedule_sunset_prebuild()
+    schedule.every().day.at("00:05").do(schedule_sunset_prebuild)
+    schedule.every().day.at("05:00").do(safe_edition_prebuild)
+
+    # Hourly weather/coast snapshot (rule backtesting)
+    schedule.every().hour.at(":00").do(safe_record_conditions)
 
     # Daily website timelapse at 07:30 (after email dispatch, uses yesterday's images)
     schedule.every().day.at("07:30").do(generate_daily_web_timelapse)
@@ -169,11 +227,11 @@ def main() -> None:
         else None
     )
 
-    # Inbox polling every 5 minutes (BROADCAST, INJECT, and GUESS commands)
-    schedule.every(5).minutes.do(inbox_monitor.poll_inbox)
+    # Inbox commands (BROADCAST, INJECT, GUESS) are handled by the inbox
+    # monitor daemon (IMAP IDLE, or polling with INBOX_MODE=poll)
 
     log(
-        f"Registered: Daily @ 07:00, Daily 4K Timelapse @ 07:30, Weekly 4K @ Sun 07:45, Golden Hour @ {gh_time}, Monthly @ 08:00 (1st), Yearly @ 09:00 (Jan 1), Inbox Poll @ 5min"
+        f"Registered: Daily @ 07:00 (pre-build @ {prebuild_time} + 05:00), Daily 4K Timelapse @ 07:30, Weekly 4K @ Sun 07:45, Golden Hour @ {gh_time} (daily recalculation @ 00:05), Monthly @ 08:00 (1st), Yearly @ 09:00 (Jan 1), Conditions Snapshot @ hourly"
     )
 
     while True:
@@ -5,16 +5,43 @@ Manages the riddle guessing game:
 - Maintains season leaderboard
 - Handles first-solver bonus scoring
 
-Data Files:
-  data/riddle_daily_log.json - Ephemeral, reset after each newsletter
-  data/riddle_scores.json - Persistent season leaderboard
-  data/riddle_game_archive.json - Historical archive of daily logs
+State lives in one SQLite database (WAL mode) shared by the web API and
+the inbox monitor. Every guess is one transaction covering the attempt,
+the solver list and the player's score, so concurrent guesses can't
+lose updates.
+
+Tables (data/riddle_game.db):
+  meta          - season_start, current riddle_date, scores_version, schema version
+  days          - per riddle date: first solver/time, archived_at
+  attempts      - every guess (kept 90 days after archiving)
+  solvers       - correct solvers per riddle date, in solve order
+  players       - season leaderboard
+  player_totals - all-time points/wins and solve streaks (survive reset_season)
+
+Leaderboards are served from an in-process ranked view of players and
+player_totals (bisect rank lookup). Awards made in this process update
+the view in place; writes by other processes bump meta scores_version,
+and the view reloads when the database files change and the version no
+longer matches. Streaks are updated per award, not rebuilt from history.
+
+The JSON files used before (riddle_daily_log.json, riddle_scores.json,
+riddle_game_archive.json) are imported automatically when the database
+is first created, and are left in place.
+
+Usage:
+    python scorekeeper.py              # leaderboard and today's solvers
+    python scorekeeper.py --migrate    # (re)import the JSON files into an empty database
 """
 
+import bisect
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from utils.io import atomic_write_json, atomic_read_json
+from utils.io import atomic_read_json
 from utils.logger import create_logger
 
 log = create_logger("scorekeeper")
@@ -34,6 +61,12 @@ def _get_settings():
     return _settings
 
 
+def _get_db_path():
+    s = _get_settings()
+    return s.riddle_db_path if s else os.getenv("RIDDLE_DB_PATH", "/app/data/riddle_game.db")
+
+
+# Pre-SQLite JSON files (migration sources)
 def _get_daily_log_path():
     s = _get_settings()
     return s.riddle_daily_log_path if s else "/app/data/riddle_daily_log.json"
@@ -52,51 +85,241 @@ def _get_archive_path():
 POINTS_CORRECT = 2        # Points for a correct answer
 POINTS_FIRST_BONUS = 1    # Additional point for first solver (total: 3)
 
+ARCHIVE_DAYS = 90
+SCHEMA_VERSION = 2
+BUSY_TIMEOUT_MS = 10000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS days (
+    riddle_date TEXT PRIMARY KEY,
+    first_solver TEXT,
+    first_solve_time TEXT,
+    archived_at TEXT
+);
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    riddle_date TEXT NOT NULL,
+    user TEXT NOT NULL,
+    display_name TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    email_timestamp TEXT NOT NULL,
+    processed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_by_date ON attempts (riddle_date, user);
+CREATE TABLE IF NOT EXISTS solvers (
+    id INTEGER PRIMARY KEY,
+    riddle_date TEXT NOT NULL,
+    user TEXT NOT NULL,
+    UNIQUE (riddle_date, user)
+);
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE,
+    display_name TEXT NOT NULL,
+    points INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    last_played TEXT
+);
+CREATE INDEX IF NOT EXISTS players_by_rank ON players (points DESC, wins DESC, id);
+CREATE TABLE IF NOT EXISTS player_totals (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE,
+    display_name TEXT NOT NULL,
+    points INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    current_streak INTEGER NOT NULL DEFAULT 0,
+    best_streak INTEGER NOT NULL DEFAULT 0,
+    last_solved TEXT
+);
+"""
 
-def _empty_daily_log(date: str) -> Dict[str, Any]:
-    """Create an empty daily log structure."""
-    return {
-        "riddle_date": date,
-        "first_solver": None,
-        "first_solve_time": None,
-        "solvers": [],
-        "attempts": []
-    }
+# Databases already checked for schema/migration in this process
+_ready: set = set()
+_ready_lock = threading.Lock()
 
 
-def _empty_scores() -> Dict[str, Any]:
-    """Create an empty scores structure."""
-    return {
-        "season_start": datetime.now().date().isoformat(),
-        "players": {}
-    }
+def _open(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")  # Durable at checkpoints; safe with WAL
+    return conn
 
 
-def _load_daily_log() -> Dict[str, Any]:
-    """Load the current daily log."""
-    data = atomic_read_json(_get_daily_log_path(), default=None)
-    if data is None:
-        today = datetime.now().date().isoformat()
-        return _empty_daily_log(today)
-    return data
+def _ensure_ready(path: str) -> None:
+    """Create the schema and import the JSON files the first time a database is opened."""
+    with _ready_lock:
+        if path in _ready:
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        conn = _open(path)
+        try:
+            conn.executescript(_SCHEMA)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                version = _get_meta(conn, "schema_version")
+                if version is None:
+                    _import_json(conn)
+                if version is None or int(version) < 2:
+                    _build_totals(conn)
+                if version != str(SCHEMA_VERSION):
+                    _set_meta(conn, "schema_version", str(SCHEMA_VERSION))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+        _ready.add(path)
+
+
+@contextmanager
+def _connect() -> Iterator[sqlite3.Connection]:
+    """Connection to the game database (schema created on first use)."""
+    path = _get_db_path()
+    _ensure_ready(path)
+    conn = _open(path)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@contextmanager
+def _transaction() -> Iterator[sqlite3.Connection]:
+    """Write transaction; the write lock is taken up front so reads inside it are current."""
+    with _connect() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
 
 
-def _save_daily_log(data: Dict[str, Any]) -> None:
-    """Save the daily log atomically."""
-    atomic_write_json(_get_daily_log_path(), data)
+def _get_meta(conn: sqlite3.Connection, key: str) -> Optional[str]:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row["value"] if row else None
 
 
-def _load_scores() -> Dict[str, Any]:
-    """Load the season scores."""
-    data = atomic_read_json(_get_scores_path(), default=None)
-    if data is None:
-        return _empty_scores()
-    return data
+def _set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+        (key, value),
+    )
 
 
-def _save_scores(data: Dict[str, Any]) -> None:
-    """Save scores atomically."""
-    atomic_write_json(_get_scores_path(), data)
+def _current_date(conn: sqlite3.Connection) -> str:
+    """The riddle date guesses are accepted for (today if the game has never been reset)."""
+    return _get_meta(conn, "riddle_date") or datetime.now().date().isoformat()
+
+
+def _insert_day(conn: sqlite3.Connection, day: Dict[str, Any], archived_at: Optional[str] = None) -> None:
+    """Import one JSON daily log (current or archived)."""
+    riddle_date = day.get("riddle_date")
+    if not riddle_date:
+        return
+    conn.execute(
+        "INSERT OR REPLACE INTO days (riddle_date, first_solver, first_solve_time, archived_at) VALUES (?, ?, ?, ?)",
+        (riddle_date, day.get("first_solver"), day.get("first_solve_time"), archived_at),
+    )
+    for attempt in day.get("attempts", []):
+        user = attempt.get("user", "")
+        conn.execute(
+            "INSERT INTO attempts (riddle_date, user, display_name, correct, email_timestamp, processed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                riddle_date, user, attempt.get("display_name") or get_display_name(user),
+                int(bool(attempt.get("correct"))), attempt.get("email_timestamp", ""),
+                attempt.get("processed_at", ""),
+            ),
+        )
+    for user in day.get("solvers", []):
+        conn.execute("INSERT OR IGNORE INTO solvers (riddle_date, user) VALUES (?, ?)", (riddle_date, user))
+
+
+def _import_json(conn: sqlite3.Connection) -> bool:
+    """Copy the JSON game files into an empty database (inside the caller's transaction).
+
+    Returns:
+        True if any file was found
+    """
+    scores = atomic_read_json(_get_scores_path(), default=None)
+    daily_log = atomic_read_json(_get_daily_log_path(), default=None)
+    archive = atomic_read_json(_get_archive_path(), default=None)
+    if scores is None and daily_log is None and archive is None:
+        _set_meta(conn, "season_start", datetime.now().date().isoformat())
+        return False
+
+    scores = scores or {}
+    _set_meta(conn, "season_start", scores.get("season_start") or datetime.now().date().isoformat())
+    for email, info in scores.get("players", {}).items():  # In file order, which breaks rank ties
+        conn.execute(
+            "INSERT OR REPLACE INTO players (email, display_name, points, wins, last_played) VALUES (?, ?, ?, ?, ?)",
+            (
+                email, info.get("display_name", get_display_name(email)),
+                info.get("points", 0), info.get("wins", 0), info.get("last_played"),
+            ),
+        )
+    for day in archive if isinstance(archive, list) else []:
+        if day.get("riddle_date") != (daily_log or {}).get("riddle_date"):
+            _insert_day(conn, day, archived_at=day.get("archived_at"))
+    if daily_log:
+        _insert_day(conn, daily_log)
+        _set_meta(conn, "riddle_date", daily_log.get("riddle_date") or datetime.now().date().isoformat())
+
+    log(
+        f"Imported riddle game JSON: {len(scores.get('players', {}))} players, "
+        f"{len(archive) if isinstance(archive, list) else 0} archived days"
+    )
+    return True
+
+
+def _build_totals(conn: sqlite3.Connection) -> None:
+    """Seed player_totals from the season scores and the solver history (schema v2 upgrade)."""
+    conn.execute(
+        "INSERT OR IGNORE INTO player_totals (email, display_name, points, wins, last_solved) "
+        "SELECT email, display_name, points, wins, last_played FROM players ORDER BY id"
+    )
+    streaks: Dict[str, Tuple[int, int, str]] = {}
+    for row in conn.execute("SELECT user, riddle_date FROM solvers ORDER BY user, riddle_date"):
+        current, best, last = streaks.get(row["user"], (0, 0, ""))
+        current = _next_streak(current, last, row["riddle_date"])
+        streaks[row["user"]] = (current, max(best, current), row["riddle_date"])
+    conn.executemany(
+        "UPDATE player_totals SET current_streak = ?, best_streak = ?, last_solved = ? WHERE email = ?",
+        [(current, best, last, email) for email, (current, best, last) in streaks.items()],
+    )
+    _bump_version(conn)
+
+
+def migrate_from_json() -> bool:
+    """Import the JSON game files if the database holds no game data yet.
+
+    The import also runs automatically when the database is created;
+    this is for importing files restored afterwards.
+
+    Returns:
+        True if files were imported
+    """
+    with _transaction() as conn:
+        has_data = conn.execute(
+            "SELECT EXISTS (SELECT 1 FROM players) OR EXISTS (SELECT 1 FROM attempts)"
+        ).fetchone()[0]
+        if has_data:
+            log("Game database already has data; JSON import skipped")
+            return False
+        if not _import_json(conn):
+            return False
+        conn.execute("DELETE FROM player_totals")
+        _build_totals(conn)
+        return True
 
 
 def get_display_name(email: str) -> str:
@@ -106,6 +329,174 @@ def get_display_name(email: str) -> str:
     return email.split("@")[0].lower()
 
 
+def _next_streak(current: int, last_solved: Optional[str], riddle_date: str) -> int:
+    """Streak after solving riddle_date, given the previous solve date."""
+    if not last_solved:
+        return 1
+    if riddle_date <= last_solved:
+        return current  # Same day, or a backfill of an earlier one
+    previous = (datetime.fromisoformat(riddle_date) - timedelta(days=1)).date().isoformat()
+    return current + 1 if last_solved == previous else 1
+
+
+def _live_streak(current: int, last_solved: Optional[str], riddle_date: str) -> int:
+    """Streak as of riddle_date: still alive if the previous day's riddle was solved."""
+    if not last_solved:
+        return 0
+    previous = (datetime.fromisoformat(riddle_date) - timedelta(days=1)).date().isoformat()
+    return current if last_solved >= previous else 0
+
+
+def _bump_version(conn: sqlite3.Connection) -> Tuple[int, int]:
+    """Advance scores_version (tells other processes' views to reload).
+
+    Returns:
+        (old version, new version)
+    """
+    old = int(_get_meta(conn, "scores_version") or 0)
+    _set_meta(conn, "scores_version", str(old + 1))
+    return old, old + 1
+
+
+_PLAYER_COLUMNS = "id, email, display_name, points, wins, last_played"
+_TOTAL_COLUMNS = "id, email, display_name, points, wins, current_streak, best_streak, last_solved"
+
+
+def _award(conn: sqlite3.Connection, user_email: str, points: int, is_win: bool, riddle_date: str) -> Dict[str, Any]:
+    """Add to the season and all-time scores and advance the solve streak.
+
+    Returns:
+        The change for _apply_award(): versions and the updated rows
+    """
+    display_name = get_display_name(user_email)
+    conn.execute(
+        "INSERT INTO players (email, display_name, points, wins, last_played) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (email) DO UPDATE SET points = points + excluded.points, wins = wins + excluded.wins, "
+        "last_played = excluded.last_played",
+        (user_email, display_name, points, int(is_win), riddle_date),
+    )
+    total = conn.execute(
+        "SELECT current_streak, best_streak, last_solved FROM player_totals WHERE email = ?", (user_email,)
+    ).fetchone()
+    current, best, last_solved = (total["current_streak"], total["best_streak"], total["last_solved"]) if total else (0, 0, None)
+    current = _next_streak(current, last_solved, riddle_date)
+    conn.execute(
+        "INSERT INTO player_totals (email, display_name, points, wins, current_streak, best_streak, last_solved) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (email) DO UPDATE SET points = points + excluded.points, wins = wins + excluded.wins, "
+        "current_streak = excluded.current_streak, best_streak = excluded.best_streak, "
+        "last_solved = excluded.last_solved",
+        (user_email, display_name, points, int(is_win), current, max(best, current),
+         max(last_solved or "", riddle_date)),
+    )
+    old_version, new_version = _bump_version(conn)
+    return {
+        "old_version": old_version,
+        "version": new_version,
+        "player": dict(conn.execute(f"SELECT {_PLAYER_COLUMNS} FROM players WHERE email = ?", (user_email,)).fetchone()),
+        "total": dict(conn.execute(f"SELECT {_TOTAL_COLUMNS} FROM player_totals WHERE email = ?", (user_email,)).fetchone()),
+    }
+
+
+class _RankedView:
+    """Players in leaderboard order (points desc, wins desc, join order).
+
+    Keys are kept in a sorted list, so a rank is a bisect and an award
+    moves one entry instead of re-sorting everyone.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self._rows: Dict[str, Dict[str, Any]] = {row["email"]: row for row in rows}
+        self._keys = sorted(self._key(row) for row in rows)
+
+    @staticmethod
+    def _key(row: Dict[str, Any]) -> Tuple[int, int, int, str]:
+        return (-row["points"], -row["wins"], row["id"], row["email"])
+
+    def put(self, row: Dict[str, Any]) -> None:
+        old = self._rows.get(row["email"])
+        if old is not None:
+            i = bisect.bisect_left(self._keys, self._key(old))
+            del self._keys[i]
+        bisect.insort(self._keys, self._key(row))
+        self._rows[row["email"]] = row
+
+    def get(self, email: str) -> Optional[Dict[str, Any]]:
+        return self._rows.get(email)
+
+    def rank(self, email: str) -> Optional[int]:
+        row = self._rows.get(email)
+        return bisect.bisect_left(self._keys, self._key(row)) + 1 if row else None
+
+    def top(self, n: int) -> List[Dict[str, Any]]:
+        return [self._rows[key[-1]] for key in self._keys[:n]]
+
+
+# Ranked views of the last database read: path, signature, version, riddle_date, season_start, season, alltime
+_board: Dict[str, Any] = {}
+_board_lock = threading.Lock()
+
+
+def _file_signature(path: str) -> Optional[Tuple[Any, ...]]:
+    """mtime and size of the database and its WAL; changes whenever any process commits."""
+    signature = []
+    for name in (path, path + "-wal"):
+        try:
+            st = os.stat(name)
+            signature.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature) if signature[0] else None
+
+
+def _load_board(path: str, signature: Optional[Tuple[Any, ...]]) -> Dict[str, Any]:
+    with _connect() as conn:
+        conn.execute("BEGIN")  # One snapshot for the version and both tables
+        try:
+            version = int(_get_meta(conn, "scores_version") or 0)
+            with _board_lock:
+                if _board.get("path") == path and _board.get("version") == version:
+                    _board["signature"] = signature
+                    return _board
+            board = {
+                "path": path,
+                "signature": signature,
+                "version": version,
+                "riddle_date": _current_date(conn),
+                "season_start": _get_meta(conn, "season_start") or datetime.now().date().isoformat(),
+                "season": _RankedView([dict(r) for r in conn.execute(f"SELECT {_PLAYER_COLUMNS} FROM players")]),
+                "alltime": _RankedView([dict(r) for r in conn.execute(f"SELECT {_TOTAL_COLUMNS} FROM player_totals")]),
+            }
+        finally:
+            conn.execute("COMMIT")
+    with _board_lock:
+        _board.clear()
+        _board.update(board)
+        return _board
+
+
+def _get_board() -> Dict[str, Any]:
+    """The ranked views, reloaded only if another process has changed the scores."""
+    path = _get_db_path()
+    _ensure_ready(path)
+    signature = _file_signature(path)
+    with _board_lock:
+        if _board.get("path") == path and signature is not None and _board.get("signature") == signature:
+            return _board
+    return _load_board(path, signature)
+
+
+def _apply_award(change: Dict[str, Any]) -> None:
+    """Move the awarded player in the cached views after the award commits."""
+    with _board_lock:
+        if _board.get("path") != _get_db_path() or _board.get("version") != change["old_version"]:
+            return  # Missed another write; the next read reloads
+        _board["season"].put(change["player"])
+        _board["alltime"].put(change["total"])
+        _board["version"] = change["version"]
+        _board["signature"] = None  # Our own commit changed the files; recheck the version once
+
+
 def record_attempt(
     user_email: str,
     guess_is_correct: bool,
@@ -129,89 +520,73 @@ def record_attempt(
     """
     user_email = user_email.lower().strip()
     display_name = get_display_name(user_email)
-    now = datetime.utcnow()
-    email_ts = email_timestamp or now
     
-    daily_log = _load_daily_log()
-    
-    # Check if this is for the current riddle
-    if daily_log.get("riddle_date") != riddle_date:
-        log(f"Stale riddle guess from {display_name}: {riddle_date} vs current {daily_log.get('riddle_date')}")
-        return {"status": "stale_riddle"}
-    
-    # Record the attempt
-    attempt = {
-        "user": user_email,
-        "display_name": display_name,
-        "correct": guess_is_correct,
-        "email_timestamp": email_ts.isoformat() + "Z",
-        "processed_at": now.isoformat() + "Z"
-    }
-    daily_log.setdefault("attempts", []).append(attempt)
-    
-    # If wrong, just save and return
-    if not guess_is_correct:
-        _save_daily_log(daily_log)
-        log(f"Wrong guess from {display_name}")
-        return {"status": "wrong"}
-    
-    # Check if user already solved this riddle
-    solvers = daily_log.get("solvers", [])
-    if user_email in solvers:
-        _save_daily_log(daily_log)
-        log(f"Duplicate solve attempt from {display_name}")
-        return {"status": "already_solved"}
-    
-    # Correct answer! Determine if first solver
-    is_first = False
-    points = POINTS_CORRECT
-    
-    current_first_time = daily_log.get("first_solve_time")
-    if current_first_time:
-        # Compare with existing first solver time
-        first_dt = datetime.fromisoformat(current_first_time.replace("Z", "+00:00")).replace(tzinfo=None)
-        if email_ts < first_dt:
-            # This user actually sent their email earlier - they're the real first
+    with _transaction() as conn:
+        # Stamp under the write lock so default timestamps follow commit order;
+        # stamped before it, a later commit could claim an earlier time and take first
+        now = datetime.utcnow()
+        email_ts = email_timestamp or now
+        
+        # Check if this is for the current riddle
+        current_date = _current_date(conn)
+        if current_date != riddle_date:
+            log(f"Stale riddle guess from {display_name}: {riddle_date} vs current {current_date}")
+            return {"status": "stale_riddle"}
+        
+        # Record the attempt
+        conn.execute(
+            "INSERT INTO attempts (riddle_date, user, display_name, correct, email_timestamp, processed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (riddle_date, user_email, display_name, int(guess_is_correct),
+             email_ts.isoformat() + "Z", now.isoformat() + "Z"),
+        )
+        
+        # If wrong, we're done
+        if not guess_is_correct:
+            log(f"Wrong guess from {display_name}")
+            return {"status": "wrong"}
+        
+        # Check if user already solved this riddle
+        solved = conn.execute(
+            "INSERT OR IGNORE INTO solvers (riddle_date, user) VALUES (?, ?)", (riddle_date, user_email)
+        ).rowcount
+        if not solved:
+            log(f"Duplicate solve attempt from {display_name}")
+            return {"status": "already_solved"}
+        
+        # Correct answer! Determine if first solver
+        day = conn.execute(
+            "SELECT first_solve_time FROM days WHERE riddle_date = ?", (riddle_date,)
+        ).fetchone()
+        current_first_time = day["first_solve_time"] if day else None
+        is_first = False
+        if current_first_time:
+            # Compare with existing first solver time
+            first_dt = datetime.fromisoformat(current_first_time.replace("Z", "+00:00")).replace(tzinfo=None)
+            if email_ts < first_dt:
+                # This user actually sent their email earlier - they're the real first
+                is_first = True
+                log(f"{display_name} is the NEW first solver (earlier email timestamp)")
+        else:
+            # No first solver yet
             is_first = True
-            points = POINTS_CORRECT + POINTS_FIRST_BONUS
-            daily_log["first_solver"] = user_email
-            daily_log["first_solve_time"] = email_ts.isoformat() + "Z"
-            log(f"{display_name} is the NEW first solver (earlier email timestamp)")
-    else:
-        # No first solver yet
-        is_first = True
-        points = POINTS_CORRECT + POINTS_FIRST_BONUS
-        daily_log["first_solver"] = user_email
-        daily_log["first_solve_time"] = email_ts.isoformat() + "Z"
-        log(f"{display_name} is the first solver!")
-    
-    # Add to solvers list
-    solvers.append(user_email)
-    daily_log["solvers"] = solvers
-    _save_daily_log(daily_log)
-    
-    # Update season scores
-    scores = _load_scores()
-    players = scores.setdefault("players", {})
-    
-    if user_email not in players:
-        players[user_email] = {
-            "display_name": display_name,
-            "points": 0,
-            "wins": 0,
-            "last_played": riddle_date
-        }
-    
-    player = players[user_email]
-    player["points"] = player.get("points", 0) + points
-    if is_first:
-        player["wins"] = player.get("wins", 0) + 1
-    player["last_played"] = riddle_date
-    
-    _save_scores(scores)
-    
-    # Calculate rank (position in today's solvers)
-    rank = len(solvers)
+            log(f"{display_name} is the first solver!")
+        
+        points = POINTS_CORRECT + (POINTS_FIRST_BONUS if is_first else 0)
+        if is_first:
+            conn.execute(
+                "INSERT INTO days (riddle_date, first_solver, first_solve_time) VALUES (?, ?, ?) "
+                "ON CONFLICT (riddle_date) DO UPDATE SET first_solver = excluded.first_solver, "
+                "first_solve_time = excluded.first_solve_time",
+                (riddle_date, user_email, email_ts.isoformat() + "Z"),
+            )
+        
+        # Update season and all-time scores
+        change = _award(conn, user_email, points, is_first, riddle_date)
+        
+        # Calculate rank (position in today's solvers)
+        rank = conn.execute("SELECT COUNT(*) FROM solvers WHERE riddle_date = ?", (riddle_date,)).fetchone()[0]
+    _apply_award(change)
     
     log(f"Correct! {display_name} earned {points} points (first={is_first}, rank={rank})")
     
@@ -223,38 +598,68 @@ def record_attempt(
     }
 
 
+def award_points(user_email: str, points: int, is_win: bool, riddle_date: str) -> None:
+    """Add points (and a win) to a player's season and all-time scores directly (backfills)."""
+    with _transaction() as conn:
+        change = _award(conn, user_email.lower().strip(), points, is_win, riddle_date)
+    _apply_award(change)
+
+
+def reset_season(season_start: Optional[str] = None) -> None:
+    """Clear the season leaderboard and start a new season (default: today); all-time totals are kept."""
+    with _transaction() as conn:
+        conn.execute("DELETE FROM players")
+        _bump_version(conn)
+        _set_meta(conn, "season_start", season_start or datetime.now().date().isoformat())
+    log(f"Started new season {season_start or 'today'}")
+
+
 def get_season_start() -> str:
-    """Return the season start date from scores file."""
-    scores = _load_scores()
-    return scores.get("season_start", datetime.now().date().isoformat())
+    """Return the season start date."""
+    return _get_board()["season_start"]
 
 
-def get_leaderboard(top_n: int = 5) -> List[Dict[str, Any]]:
-    """Return top N players sorted by points."""
-    scores = _load_scores()
-    players = scores.get("players", {})
-    
-    # Convert to list and sort by points (desc), then by wins (desc)
-    player_list = [
-        {
-            "email": email,
-            "display_name": info.get("display_name", get_display_name(email)),
-            "points": info.get("points", 0),
-            "wins": info.get("wins", 0)
-        }
-        for email, info in players.items()
+def _player_dict(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "email": row["email"],
+        "display_name": row["display_name"] or get_display_name(row["email"]),
+        "points": row["points"],
+        "wins": row["wins"],
+    }
+
+
+def _streak(board: Dict[str, Any], email: str) -> int:
+    total = board["alltime"].get(email)
+    return _live_streak(total["current_streak"], total["last_solved"], board["riddle_date"]) if total else 0
+
+
+def get_leaderboard(top_n: int = 5, view: str = "season") -> List[Dict[str, Any]]:
+    """Return top N players sorted by points, then wins, then who joined first.
+
+    Args:
+        top_n: Number of players
+        view: "season" (since season_start) or "alltime"
+    """
+    if view not in ("season", "alltime"):
+        raise ValueError(f"Unknown leaderboard view: {view}")
+    board = _get_board()
+    return [
+        {**_player_dict(row), "streak": _streak(board, row["email"])}
+        for row in board[view].top(top_n)
     ]
-    
-    player_list.sort(key=lambda x: (-x["points"], -x["wins"]))
-    
-    return player_list[:top_n]
 
 
 def get_yesterdays_winners() -> List[Dict[str, Any]]:
-    """Return solvers from riddle_daily_log for email display."""
-    daily_log = _load_daily_log()
-    solvers = daily_log.get("solvers", [])
-    first_solver = daily_log.get("first_solver")
+    """Return solvers of the current riddle for email display."""
+    with _connect() as conn:
+        riddle_date = _current_date(conn)
+        day = conn.execute("SELECT first_solver FROM days WHERE riddle_date = ?", (riddle_date,)).fetchone()
+        first_solver = day["first_solver"] if day else None
+        solvers = [
+            row["user"] for row in conn.execute(
+                "SELECT user FROM solvers WHERE riddle_date = ? ORDER BY id", (riddle_date,)
+            )
+        ]
     
     result = []
     for email in solvers:
@@ -271,68 +676,79 @@ def get_yesterdays_winners() -> List[Dict[str, Any]]:
 
 
 def reset_daily_log(new_date: str) -> None:
-    """Reset daily log for new riddle (called after email send)."""
+    """Start accepting guesses for a new riddle date (called after email send)."""
     log(f"Resetting daily log for {new_date}")
-    _save_daily_log(_empty_daily_log(new_date))
+    with _transaction() as conn:
+        # A reset to the same date starts it over, as the JSON log did
+        for table in ("attempts", "solvers", "days"):
+            conn.execute(f"DELETE FROM {table} WHERE riddle_date = ?", (new_date,))
+        conn.execute("INSERT INTO days (riddle_date) VALUES (?)", (new_date,))
+        _set_meta(conn, "riddle_date", new_date)
+        _bump_version(conn)  # Live streaks are relative to the riddle date
 
 
 def archive_daily_log() -> None:
-    """Append current daily log to riddle_game_archive.json."""
-    daily_log = _load_daily_log()
-    
-    # Don't archive empty logs
-    if not daily_log.get("attempts") and not daily_log.get("solvers"):
-        log("No attempts to archive, skipping")
-        return
-    
-    archive = atomic_read_json(_get_archive_path(), default=[])
-    if not isinstance(archive, list):
-        archive = []
-    
-    # Add timestamp for when archived
-    daily_log["archived_at"] = datetime.utcnow().isoformat() + "Z"
-    archive.append(daily_log)
-    
-    # Keep last 90 days of archives
-    cutoff = (datetime.utcnow() - timedelta(days=90)).isoformat()
-    archive = [
-        entry for entry in archive
-        if entry.get("riddle_date", "") >= cutoff[:10]
-    ]
-    
-    atomic_write_json(_get_archive_path(), archive)
-    log(f"Archived daily log for {daily_log.get('riddle_date')}")
+    """Mark the current riddle date archived and drop dates past the retention window."""
+    with _transaction() as conn:
+        riddle_date = _current_date(conn)
+        
+        # Don't archive empty logs
+        has_attempts = conn.execute(
+            "SELECT EXISTS (SELECT 1 FROM attempts WHERE riddle_date = ?) "
+            "OR EXISTS (SELECT 1 FROM solvers WHERE riddle_date = ?)",
+            (riddle_date, riddle_date),
+        ).fetchone()[0]
+        if not has_attempts:
+            log("No attempts to archive, skipping")
+            return
+        
+        conn.execute(
+            "INSERT INTO days (riddle_date, archived_at) VALUES (?, ?) "
+            "ON CONFLICT (riddle_date) DO UPDATE SET archived_at = excluded.archived_at",
+            (riddle_date, datetime.utcnow().isoformat() + "Z"),
+        )
+        
+        # Keep last 90 days of archives
+        cutoff = (datetime.utcnow() - timedelta(days=ARCHIVE_DAYS)).date().isoformat()
+        for table in ("attempts", "solvers", "days"):
+            conn.execute(f"DELETE FROM {table} WHERE riddle_date < ?", (cutoff,))
+    log(f"Archived daily log for {riddle_date}")
 
 
 def get_player_stats(user_email: str) -> Optional[Dict[str, Any]]:
-    """Get stats for a specific player."""
+    """Get season stats, all-time totals and streaks for a specific player.
+
+    A player who hasn't scored this season (e.g. right after reset_season) gets
+    their all-time totals with zero season points/wins and no season rank.
+    None only for someone with no all-time row either.
+    """
     user_email = user_email.lower().strip()
-    scores = _load_scores()
-    players = scores.get("players", {})
-    
-    if user_email not in players:
-        return None
-    
-    player = players[user_email]
-    
-    # Calculate rank
-    leaderboard = get_leaderboard(top_n=100)
-    rank = next(
-        (i + 1 for i, p in enumerate(leaderboard) if p["email"] == user_email),
-        None
-    )
+    board = _get_board()
+    player = board["season"].get(user_email)
+    total = board["alltime"].get(user_email)
+    if player is None:
+        if total is None:
+            return None
+        player = {**_player_dict(total), "points": 0, "wins": 0, "last_played": total["last_solved"]}
+    total = total or {}
     
     return {
-        "email": user_email,
-        "display_name": player.get("display_name", get_display_name(user_email)),
-        "points": player.get("points", 0),
-        "wins": player.get("wins", 0),
-        "last_played": player.get("last_played"),
-        "rank": rank
+        **_player_dict(player),
+        "last_played": player["last_played"],
+        "rank": board["season"].rank(user_email),
+        "current_streak": _streak(board, user_email),
+        "best_streak": total.get("best_streak", 0),
+        "alltime_points": total.get("points", player["points"]),
+        "alltime_wins": total.get("wins", player["wins"]),
+        "alltime_rank": board["alltime"].rank(user_email),
     }
 
 
 if __name__ == "__main__":
-    # Quick test
+    import sys
+    
+    if "--migrate" in sys.argv:
+        print("Imported:", migrate_from_json())
     print("Leaderboard:", get_leaderboard())
+    print("All-time:", get_leaderboard(view="alltime"))
     print("Yesterday's winners:", get_yesterdays_winners())
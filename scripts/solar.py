@@ -0,0 +1,257 @@
+"""Offline sun position calculator for Greenhouse Gazette.
+
+Implements the NOAA solar calculator equations (the same ones behind the
+NOAA spreadsheet) so sunrise, sunset, civil twilight and golden-hour
+windows can be computed for any date without a network call. Results are
+memoised per (date, location, timezone).
+
+Usage:
+    from solar import get_sun_times, is_daylight
+
+    sun = get_sun_times(date(2025, 6, 21))
+    print(sun.sunrise, sun.sunset, sun.golden_evening)
+"""
+
+import math
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from utils.logger import create_logger
+
+log = create_logger("solar")
+
+# Lazy settings loader for app.config integration
+_settings = None
+
+
+def _get_settings():
+    """Get settings lazily to avoid import-time failures."""
+    global _settings
+    if _settings is None:
+        try:
+            from app.config import settings
+            _settings = settings
+        except Exception:
+            _settings = None
+    return _settings
+
+
+# Sun elevation (degrees) that defines each event
+SUNRISE_ELEVATION = -0.833  # Upper limb on horizon, with refraction
+CIVIL_TWILIGHT_ELEVATION = -6.0
+GOLDEN_HOUR_HIGH_ELEVATION = 6.0  # Golden light starts/ends here
+GOLDEN_HOUR_LOW_ELEVATION = -4.0  # ...and fades out into blue hour here
+
+# Refinement passes: event time is re-solved with the sun's position at
+# the previous estimate (two passes is well under a minute of error).
+_REFINE_PASSES = 2
+
+
+@dataclass(frozen=True)
+class SunTimes:
+    """Sun events for one local calendar day (timezone-aware datetimes).
+
+    Any event the sun doesn't reach that day (polar day/night) is None.
+    """
+
+    date: date
+    solar_noon: datetime
+    sunrise: Optional[datetime]
+    sunset: Optional[datetime]
+    civil_dawn: Optional[datetime]
+    civil_dusk: Optional[datetime]
+    golden_morning: Tuple[Optional[datetime], Optional[datetime]]
+    golden_evening: Tuple[Optional[datetime], Optional[datetime]]
+
+
+def _site() -> Tuple[float, float, str]:
+    """Site latitude, longitude and timezone name from config or env."""
+    cfg = _get_settings()
+    if cfg:
+        return float(cfg.lat), float(cfg.lon), cfg.tz
+    return (
+        float(os.getenv("LAT", "36.022")),
+        float(os.getenv("LON", "-75.720")),
+        os.getenv("TZ", "America/New_York"),
+    )
+
+
+def _julian_day(day: date) -> float:
+    """Julian day number at 00:00 UTC on ``day``."""
+    return day.toordinal() + 1721424.5
+
+
+def _sun_declination_and_eot(jd: float) -> Tuple[float, float]:
+    """Solar declination (degrees) and equation of time (minutes)."""
+    t = (jd - 2451545.0) / 36525.0
+
+    mean_long = (280.46646 + t * (36000.76983 + t * 0.0003032)) % 360.0
+    mean_anom = 357.52911 + t * (35999.05029 - 0.0001537 * t)
+    ecc = 0.016708634 - t * (0.000042037 + 0.0000001267 * t)
+
+    m = math.radians(mean_anom)
+    center = (
+        math.sin(m) * (1.914602 - t * (0.004817 + 0.000014 * t))
+        + math.sin(2 * m) * (0.019993 - 0.000101 * t)
+        + math.sin(3 * m) * 0.000289
+    )
+    omega = math.radians(125.04 - 1934.136 * t)
+    app_long = mean_long + center - 0.00569 - 0.00478 * math.sin(omega)
+
+    mean_obliq = 23.0 + (26.0 + (21.448 - t * (46.815 + t * (0.00059 - t * 0.001813))) / 60.0) / 60.0
+    obliq = math.radians(mean_obliq + 0.00256 * math.cos(omega))
+
+    declination = math.degrees(math.asin(math.sin(obliq) * math.sin(math.radians(app_long))))
+
+    y = math.tan(obliq / 2) ** 2
+    l0 = math.radians(mean_long)
+    eot = 4 * math.degrees(
+        y * math.sin(2 * l0)
+        - 2 * ecc * math.sin(m)
+        + 4 * ecc * y * math.sin(m) * math.cos(2 * l0)
+        - 0.5 * y * y * math.sin(4 * l0)
+        - 1.25 * ecc * ecc * math.sin(2 * m)
+    )
+    return declination, eot
+
+
+def _solar_noon_minutes(jd: float, lon: float) -> float:
+    """Solar noon in minutes after 00:00 UTC."""
+    minutes = 720.0 - 4.0 * lon
+    for _ in range(_REFINE_PASSES):
+        _, eot = _sun_declination_and_eot(jd + minutes / 1440.0)
+        minutes = 720.0 - 4.0 * lon - eot
+    return minutes
+
+
+def _event_minutes(jd: float, lat: float, lon: float, elevation: float, rising: bool) -> Optional[float]:
+    """Minutes after 00:00 UTC when the sun crosses ``elevation``."""
+    minutes = _solar_noon_minutes(jd, lon)
+    lat_r = math.radians(lat)
+    for _ in range(_REFINE_PASSES):
+        decl, eot = _sun_declination_and_eot(jd + minutes / 1440.0)
+        decl_r = math.radians(decl)
+        cos_ha = (math.sin(math.radians(elevation)) - math.sin(lat_r) * math.sin(decl_r)) / (
+            math.cos(lat_r) * math.cos(decl_r)
+        )
+        if cos_ha < -1.0 or cos_ha > 1.0:
+            return None
+        hour_angle = math.degrees(math.acos(cos_ha))
+        noon = 720.0 - 4.0 * lon - eot
+        minutes = noon - 4.0 * hour_angle if rising else noon + 4.0 * hour_angle
+    return minutes
+
+
+@lru_cache(maxsize=1024)
+def _compute_sun_times(day: date, lat: float, lon: float, tz_name: str) -> SunTimes:
+    zone = ZoneInfo(tz_name)
+    jd = _julian_day(day)
+    midnight_utc = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+    def at(elevation: float, rising: bool) -> Optional[datetime]:
+        minutes = _event_minutes(jd, lat, lon, elevation, rising)
+        if minutes is None:
+            return None
+        return (midnight_utc + timedelta(minutes=minutes)).astimezone(zone)
+
+    noon = (midnight_utc + timedelta(minutes=_solar_noon_minutes(jd, lon))).astimezone(zone)
+
+    return SunTimes(
+        date=day,
+        solar_noon=noon,
+        sunrise=at(SUNRISE_ELEVATION, True),
+        sunset=at(SUNRISE_ELEVATION, False),
+        civil_dawn=at(CIVIL_TWILIGHT_ELEVATION, True),
+        civil_dusk=at(CIVIL_TWILIGHT_ELEVATION, False),
+        golden_morning=(
+            at(GOLDEN_HOUR_LOW_ELEVATION, True),
+            at(GOLDEN_HOUR_HIGH_ELEVATION, True),
+        ),
+        golden_evening=(
+            at(GOLDEN_HOUR_HIGH_ELEVATION, False),
+            at(GOLDEN_HOUR_LOW_ELEVATION, False),
+        ),
+    )
+
+
+def get_sun_times(
+    day: Optional[date] = None,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+    tz_name: Optional[str] = None,
+) -> SunTimes:
+    """Sun events for a local calendar day at the greenhouse (or given site).
+
+    Args:
+        day: Local date (default: today in the site timezone)
+        lat: Latitude in degrees north (default: config LAT)
+        lon: Longitude in degrees east (default: config LON)
+        tz_name: IANA timezone for returned datetimes (default: config TZ)
+
+    Returns:
+        SunTimes with timezone-aware datetimes
+    """
+    site_lat, site_lon, site_tz = _site()
+    tz_name = tz_name or site_tz
+    if day is None:
+        day = datetime.now(ZoneInfo(tz_name)).date()
+    elif isinstance(day, datetime):
+        day = day.date()
+    return _compute_sun_times(
+        day,
+        round(site_lat if lat is None else lat, 4),
+        round(site_lon if lon is None else lon, 4),
+        tz_name,
+    )
+
+
+def is_daylight(moment: datetime, civil: bool = False) -> bool:
+    """Whether the sun is up at ``moment`` (naive values are taken as UTC).
+
+    With ``civil=True`` the window is widened to civil dawn/dusk.
+    """
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+
+    _, _, tz_name = _site()
+    sun = get_sun_times(moment.astimezone(ZoneInfo(tz_name)).date())
+    start, end = (sun.civil_dawn, sun.civil_dusk) if civil else (sun.sunrise, sun.sunset)
+    if start is None or end is None:
+        # Polar day or night: decide from the sun's position at noon
+        return _sun_up_all_day(sun)
+    return start <= moment <= end
+
+
+def _sun_up_all_day(sun: SunTimes) -> bool:
+    """For days without a sunrise/sunset, whether it's polar day."""
+    lat, _, _ = _site()
+    decl, _ = _sun_declination_and_eot(_julian_day(sun.date) + 0.5)
+    noon_elevation = 90.0 - abs(lat - decl)
+    return noon_elevation > SUNRISE_ELEVATION
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Offline sun times for the greenhouse site")
+    parser.add_argument("--date", type=str, help="Local date YYYY-MM-DD (default: today)")
+    args = parser.parse_args()
+
+    target = datetime.strptime(args.date, "%Y-%m-%d").date() if args.date else None
+    sun = get_sun_times(target)
+
+    def fmt(value: Optional[datetime]) -> str:
+        return value.strftime("%H:%M:%S %Z") if value else "--"
+
+    print(f"Sun times for {sun.date}")
+    print(f"  Civil dawn:     {fmt(sun.civil_dawn)}")
+    print(f"  Sunrise:        {fmt(sun.sunrise)}")
+    print(f"  Golden (AM):    {fmt(sun.golden_morning[0])} - {fmt(sun.golden_morning[1])}")
+    print(f"  Solar noon:     {fmt(sun.solar_noon)}")
+    print(f"  Golden (PM):    {fmt(sun.golden_evening[0])} - {fmt(sun.golden_evening[1])}")
+    print(f"  Sunset:         {fmt(sun.sunset)}")
+    print(f"  Civil dusk:     {fmt(sun.civil_dusk)}")
@@ -22,7 +22,6 @@ Usage:
 """
 
 import argparse
-import json
 import sys
 from datetime import datetime
 
@@ -146,33 +145,19 @@ def simulate_guess(guess: str, user_email: str):
 def seed_leaderboard():
     """Add some test players to the leaderboard."""
     import scorekeeper
-    from utils.io import atomic_write_json
-    
-    test_data = {
-        "season_start": "2026-01-01",
-        "players": {
-            "mom@example.com": {
-                "display_name": "mom",
-                "points": 12,
-                "wins": 4,
-                "last_played": "2026-01-10"
-            },
-            "grandma@example.com": {
-                "display_name": "grandma",
-                "points": 8,
-                "wins": 2,
-                "last_played": "2026-01-09"
-            },
-            "nick@example.com": {
-                "display_name": "nick",
-                "points": 5,
-                "wins": 1,
-                "last_played": "2026-01-11"
-            }
-        }
-    }
-    
-    atomic_write_json("/app/data/riddle_scores.json", test_data)
+    
+    # (email, points, wins, last played)
+    test_players = [
+        ("mom@example.com", 12, 4, "2026-01-10"),
+        ("grandma@example.com", 8, 2, "2026-01-09"),
+        ("nick@example.com", 5, 1, "2026-01-11"),
+    ]
+    
+    scorekeeper.reset_season("2026-01-01")
+    for email, points, wins, last_played in test_players:
+        scorekeeper.award_points(email, points - wins, False, last_played)
+        for _ in range(wins):
+            scorekeeper.award_points(email, 1, True, last_played)
     print("✅ Seeded leaderboard with test players")
     show_status()
 
@@ -180,22 +165,11 @@ def seed_leaderboard():
 def reset_game():
     """Reset all game data."""
     import scorekeeper
-    from utils.io import atomic_write_json
     
     today = datetime.now().date().isoformat()
     
-    atomic_write_json("/app/data/riddle_scores.json", {
-        "season_start": today,
-        "players": {}
-    })
-    
-    atomic_write_json("/app/data/riddle_daily_log.json", {
-        "riddle_date": today,
-        "first_solver": None,
-        "first_solve_time": None,
-        "solvers": [],
-        "attempts": []
-    })
+    scorekeeper.reset_season(today)
+    scorekeeper.reset_daily_log(today)
     
     print("✅ Reset all game data")
     show_status()
@@ -0,0 +1,385 @@
+"""Offline harmonic tide predictor for Greenhouse Gazette.
+
+NOAA's tide predictions are themselves a sum of harmonic constituents
+published for each station, so they can be reproduced locally:
+
+    h(t) = Z0 + sum_i f_i(t) * H_i * cos(V_i(t) + u_i(t) - kappa_i)
+
+H/kappa are the station's amplitudes and Greenwich phases (written to
+CALENDARS_DIR/tide_constituents_<station>.json by --refresh, same shape
+as NOAA's harcon.json), V is the equilibrium argument from the mean longitudes of
+the moon and sun, and f/u are the 18.6-year nodal corrections
+(Schureman, "Manual of Harmonic Analysis and Prediction of Tides").
+Everything is evaluated as NumPy arrays over (constituent x time), so a
+week of 6-minute heights costs a few milliseconds and needs no network.
+
+Usage:
+    from tide_predictor import predict_hilo, predict_curve
+
+    events = predict_hilo(start, end)       # NOAA-shaped hi/lo list
+    times, heights = predict_curve(start, end, interval_minutes=6)
+
+    python tide_predictor.py                # today's hi/lo events
+    python tide_predictor.py --refresh      # re-download constituents from NOAA
+"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from utils.io import atomic_write_json
+from utils.logger import create_logger
+
+log = create_logger("tide_predictor")
+
+# Lazy settings loader for app.config integration
+_settings = None
+
+
+def _get_settings():
+    """Get settings lazily to avoid import-time failures."""
+    global _settings
+    if _settings is None:
+        try:
+            from app.config import settings
+            _settings = settings
+        except Exception:
+            _settings = None
+    return _settings
+
+
+CALENDARS_DIR = os.getenv("CALENDARS_DIR", "/app/data/calendars")
+DEFAULT_STATION_ID = os.getenv("NOAA_OCEAN_STATION", "8652226")
+NOAA_METADATA_URL = "https://api.tidesandcurrents.noaa.gov/mdapi/prod/webapi/stations"
+
+# refresh_constituents() stamps its files with this source. Files without
+# it (hand-made or approximate constants) are not trusted for published
+# tide times.
+NOAA_SOURCE_PREFIX = "NOAA CO-OPS"
+
+# Sampling step used to locate highs/lows before parabolic refinement
+HILO_SEARCH_MINUTES = 6
+
+# Mean rates of the astronomical arguments (degrees per mean solar hour):
+# T (hour angle of the mean sun), s (moon), h (sun), p (lunar perigee),
+# p1 (solar perigee)
+_ARG_SPEEDS = np.array([15.0, 0.5490165, 0.0410686, 0.0046418, 0.0000020])
+
+# Constituent -> (coefficients of T, s, h, p, p1; phase offset in degrees;
+# u coefficients of xi, nu, nu', 2nu''; f as powers of the nodal factors
+# in _F_BASES). Covers the 37 constituents NOAA publishes. M1 and L2 use
+# the simplified M2/O1-style corrections (their extra terms are < 0.01 ft
+# at this station).
+_F_BASES = ("M2", "O1", "K1", "K2", "OO1", "J1", "Mm", "Mf")
+_CONSTITUENTS: Dict[str, Tuple[Tuple[int, ...], float, Tuple[int, ...], Dict[str, float]]] = {
+    "M2": ((2, -2, 2, 0, 0), 0, (2, -2, 0, 0), {"M2": 1}),
+    "S2": ((2, 0, 0, 0, 0), 0, (0, 0, 0, 0), {}),
+    "N2": ((2, -3, 2, 1, 0), 0, (2, -2, 0, 0), {"M2": 1}),
+    "K1": ((1, 0, 1, 0, 0), -90, (0, 0, -1, 0), {"K1": 1}),
+    "M4": ((4, -4, 4, 0, 0), 0, (4, -4, 0, 0), {"M2": 2}),
+    "O1": ((1, -2, 1, 0, 0), 90, (2, -1, 0, 0), {"O1": 1}),
+    "M6": ((6, -6, 6, 0, 0), 0, (6, -6, 0, 0), {"M2": 3}),
+    "MK3": ((3, -2, 3, 0, 0), -90, (2, -2, -1, 0), {"M2": 1, "K1": 1}),
+    "S4": ((4, 0, 0, 0, 0), 0, (0, 0, 0, 0), {}),
+    "MN4": ((4, -5, 4, 1, 0), 0, (4, -4, 0, 0), {"M2": 2}),
+    "NU2": ((2, -3, 4, -1, 0), 0, (2, -2, 0, 0), {"M2": 1}),
+    "S6": ((6, 0, 0, 0, 0), 0, (0, 0, 0, 0), {}),
+    "MU2": ((2, -4, 4, 0, 0), 0, (2, -2, 0, 0), {"M2": 1}),
+    "2N2": ((2, -4, 2, 2, 0), 0, (2, -2, 0, 0), {"M2": 1}),
+    "OO1": ((1, 2, 1, 0, 0), -90, (-2, -1, 0, 0), {"OO1": 1}),
+    "LAM2": ((2, -1, 0, 1, 0), 180, (2, -2, 0, 0), {"M2": 1}),
+    "S1": ((1, 0, 0, 0, 0), 0, (0, 0, 0, 0), {}),
+    "M1": ((1, -1, 1, 1, 0), -90, (0, -1, 0, 0), {"O1": 1}),
+    "J1": ((1, 1, 1, -1, 0), -90, (0, -1, 0, 0), {"J1": 1}),
+    "MM": ((0, 1, 0, -1, 0), 0, (0, 0, 0, 0), {"Mm": 1}),
+    "SSA": ((0, 0, 2, 0, 0), 0, (0, 0, 0, 0), {}),
+    "SA": ((0, 0, 1, 0, 0), 0, (0, 0, 0, 0), {}),
+    "MSF": ((0, 2, -2, 0, 0), 0, (-2, 2, 0, 0), {"M2": 1}),
+    "MF": ((0, 2, 0, 0, 0), 0, (-2, 0, 0, 0), {"Mf": 1}),
+    "RHO": ((1, -3, 3, -1, 0), 90, (2, -1, 0, 0), {"O1": 1}),
+    "Q1": ((1, -3, 1, 1, 0), 90, (2, -1, 0, 0), {"O1": 1}),
+    "T2": ((2, 0, -1, 0, 1), 0, (0, 0, 0, 0), {}),
+    "R2": ((2, 0, 1, 0, -1), 180, (0, 0, 0, 0), {}),
+    "2Q1": ((1, -4, 1, 2, 0), 90, (2, -1, 0, 0), {"O1": 1}),
+    "P1": ((1, 0, -1, 0, 0), 90, (0, 0, 0, 0), {}),
+    "2SM2": ((2, 2, -2, 0, 0), 0, (-2, 2, 0, 0), {"M2": 1}),
+    "M3": ((3, -3, 3, 0, 0), 0, (3, -3, 0, 0), {"M2": 1.5}),
+    "L2": ((2, -1, 2, -1, 0), 180, (2, -2, 0, 0), {"M2": 1}),
+    "2MK3": ((3, -4, 3, 0, 0), 90, (4, -4, 1, 0), {"M2": 2, "K1": 1}),
+    "K2": ((2, 0, 2, 0, 0), 0, (0, 0, 0, -1), {"K2": 1}),
+    "M8": ((8, -8, 8, 0, 0), 0, (8, -8, 0, 0), {"M2": 4}),
+    "MS4": ((4, -2, 2, 0, 0), 0, (2, -2, 0, 0), {"M2": 1}),
+}
+
+
+class _Station:
+    """Constituent arrays for one station, ready for vectorised evaluation."""
+
+    def __init__(self, meta: Dict[str, Any], rows: List[Dict[str, Any]]):
+        self.station_id = str(meta.get("station_id", ""))
+        self.published = str(meta.get("source", "")).startswith(NOAA_SOURCE_PREFIX)
+        self.datum_offset_ft = float(meta.get("datum_offset_ft", 0.0))
+        names = [row["name"].upper() for row in rows]
+        self.names = names
+        self.amplitude = np.array([float(row["amplitude"]) for row in rows])
+        self.phase = np.radians([float(row["phase_GMT"]) for row in rows])
+        self.arg_coeffs = np.array([_CONSTITUENTS[n][0] for n in names], dtype=float)
+        self.offset = np.array([_CONSTITUENTS[n][1] for n in names], dtype=float)
+        self.u_coeffs = np.array([_CONSTITUENTS[n][2] for n in names], dtype=float)
+        self.f_powers = np.array(
+            [[_CONSTITUENTS[n][3].get(base, 0.0) for base in _F_BASES] for n in names]
+        )
+
+    def heights(self, epoch_seconds: np.ndarray) -> np.ndarray:
+        """Predicted heights (feet above datum) at UTC epoch seconds."""
+        args, nodal = _astronomy(epoch_seconds)
+        # (constituents x times) throughout
+        v = np.radians(self.arg_coeffs @ args + self.offset[:, None])
+        u = np.radians(self.u_coeffs @ nodal["u_terms"])
+        f = np.exp(self.f_powers @ np.log(nodal["f_bases"]))
+        waves = f * self.amplitude[:, None] * np.cos(v + u - self.phase[:, None])
+        return self.datum_offset_ft + waves.sum(axis=0)
+
+
+def _astronomy(epoch_seconds: np.ndarray) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Astronomical arguments and nodal terms at each time.
+
+    Returns:
+        (args, nodal): args is 5 x n degrees (T, s, h, p, p1), each reduced
+        mod 360; nodal holds 'u_terms' (4 x n degrees: xi, nu, nu', 2nu'')
+        and 'f_bases' (len(_F_BASES) x n).
+    """
+    t = (epoch_seconds / 86400.0 + 2440587.5 - 2451545.0) / 36525.0  # Julian centuries, J2000
+    hours = np.mod(epoch_seconds / 3600.0, 24.0)
+    tau = 180.0 + 15.0 * hours
+    s = 218.3164477 + 481267.88123421 * t
+    h = 280.46646 + 36000.76983 * t
+    p = 83.3532465 + 4069.0137287 * t
+    n = 125.04452 - 1934.136261 * t
+    p1 = 282.93735 + 1.71946 * t
+    args = np.mod(np.vstack([tau, s, h, p, p1]), 360.0)
+
+    # Lunar orbit inclination to the equator and the derived angles
+    omega, incl = np.radians(23.4393), np.radians(5.145)
+    n_rad = np.radians(n)
+    big_i = np.arccos(np.cos(omega) * np.cos(incl) - np.sin(omega) * np.sin(incl) * np.cos(n_rad))
+    half_n = np.tan(n_rad / 2.0)
+    e1 = np.arctan(np.cos((omega - incl) / 2.0) / np.cos((omega + incl) / 2.0) * half_n) - n_rad / 2.0
+    e2 = np.arctan(np.sin((omega - incl) / 2.0) / np.sin((omega + incl) / 2.0) * half_n) - n_rad / 2.0
+    # tan() of N/2 wraps at N = 180 deg; fold both terms back into (-90, 90]
+    e1 = np.mod(e1 + np.pi / 2, np.pi) - np.pi / 2
+    e2 = np.mod(e2 + np.pi / 2, np.pi) - np.pi / 2
+    xi = -(e1 + e2)
+    nu = e1 - e2
+    sin_i, sin_2i = np.sin(big_i), np.sin(2 * big_i)
+    nu_p = np.arctan2(sin_2i * np.sin(nu), sin_2i * np.cos(nu) + 0.3347)
+    nu_pp2 = np.arctan2(sin_i ** 2 * np.sin(2 * nu), sin_i ** 2 * np.cos(2 * nu) + 0.0727)
+    u_terms = np.degrees(np.vstack([xi, nu, nu_p, nu_pp2]))
+
+    cos_half = np.cos(big_i / 2.0)
+    f_bases = np.vstack([
+        cos_half ** 4 / 0.9154,  # M2
+        sin_i * cos_half ** 2 / 0.3800,  # O1
+        np.sqrt(0.8965 * sin_2i ** 2 + 0.6001 * sin_2i * np.cos(nu) + 0.1006),  # K1
+        np.sqrt(19.0444 * sin_i ** 4 + 2.7702 * sin_i ** 2 * np.cos(2 * nu) + 0.0981),  # K2
+        sin_i * np.sin(big_i / 2.0) ** 2 / 0.01640,  # OO1
+        sin_2i / 0.7214,  # J1
+        (2.0 / 3.0 - sin_i ** 2) / 0.5021,  # Mm
+        sin_i ** 2 / 0.1578,  # Mf
+    ])
+    return args, {"u_terms": u_terms, "f_bases": f_bases}
+
+
+def _constituents_path(station_id: str) -> str:
+    return os.path.join(CALENDARS_DIR, f"tide_constituents_{station_id}.json")
+
+
+@lru_cache(maxsize=4)
+def _load_station(path: str) -> Optional[_Station]:
+    """Load and validate a constituents file (memoised per path)."""
+    if not os.path.exists(path):
+        log(f"Tide constituents not found at {path}")
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        rows = [
+            row for row in data.get("HarmonicConstituents", [])
+            if str(row.get("name", "")).upper() in _CONSTITUENTS and float(row.get("amplitude", 0)) > 0
+        ]
+        if not rows:
+            log(f"Tide constituents file has no usable constituents: {path}")
+            return None
+        return _Station(data, rows)
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        log(f"Tide constituents load error: {exc}")
+        return None
+
+
+def get_station(station_id: str = DEFAULT_STATION_ID) -> Optional[_Station]:
+    """The bundled station model, or None if no constituents are available."""
+    return _load_station(_constituents_path(station_id))
+
+
+def _epoch_range(start: datetime, end: datetime, step_minutes: float) -> np.ndarray:
+    step = step_minutes * 60.0
+    return np.arange(start.timestamp(), end.timestamp() + step / 2, step)
+
+
+def _to_local(epoch: float, tz: ZoneInfo) -> datetime:
+    return datetime.fromtimestamp(float(epoch), tz=timezone.utc).astimezone(tz)
+
+
+def predict_curve(
+    start: datetime,
+    end: datetime,
+    interval_minutes: float = 6,
+    station_id: str = DEFAULT_STATION_ID,
+) -> Optional[Tuple[List[datetime], np.ndarray]]:
+    """Continuous predicted water level between two aware datetimes.
+
+    Returns:
+        (times in start's timezone, heights in feet above MLLW), or None
+        if the station has no constituents
+    """
+    station = get_station(station_id)
+    if station is None:
+        return None
+    epochs = _epoch_range(start, end, interval_minutes)
+    return [_to_local(e, start.tzinfo) for e in epochs], station.heights(epochs)
+
+
+def predict_hilo(
+    start: datetime,
+    end: datetime,
+    station_id: str = DEFAULT_STATION_ID,
+) -> Optional[List[Dict[str, str]]]:
+    """High and low tides between two aware datetimes.
+
+    The curve is sampled every HILO_SEARCH_MINUTES, extrema are located
+    where the slope changes sign, then refined with a parabola through
+    the neighbouring samples (sub-minute accuracy).
+
+    Returns:
+        NOAA ``interval=hilo`` shaped entries in start's timezone:
+        [{"t": "YYYY-MM-DD HH:MM", "v": "3.412", "type": "H"|"L"}, ...],
+        or None if the station has no constituents
+    """
+    station = get_station(station_id)
+    if station is None:
+        return None
+    step = HILO_SEARCH_MINUTES * 60.0
+    epochs = _epoch_range(start - timedelta(seconds=step), end + timedelta(seconds=step), HILO_SEARCH_MINUTES)
+    y = station.heights(epochs)
+
+    slope = np.sign(np.diff(y))
+    turning = np.nonzero(slope[:-1] != slope[1:])[0] + 1
+    before, at, after = y[turning - 1], y[turning], y[turning + 1]
+    curvature = before - 2 * at + after
+    shift = np.where(curvature != 0, 0.5 * (before - after) / np.where(curvature != 0, curvature, 1), 0.0)
+    times = epochs[turning] + shift * step
+    heights = at - 0.25 * (before - after) * shift
+    is_high = curvature < 0
+
+    window = (times >= start.timestamp()) & (times <= end.timestamp())
+    return [
+        {
+            "t": _to_local(t, start.tzinfo).strftime("%Y-%m-%d %H:%M"),
+            "v": f"{v:.3f}",
+            "type": "H" if high else "L",
+        }
+        for t, v, high in zip(times[window], heights[window], is_high[window])
+    ]
+
+
+def compare_hilo(
+    local: List[Dict[str, str]], reference: List[Dict[str, str]]
+) -> Optional[Dict[str, float]]:
+    """Worst disagreement between two NOAA-shaped hi/lo lists.
+
+    Each reference event is matched to the nearest local event of the
+    same type. Returns {"max_minutes", "max_feet", "matched"}, or None
+    if nothing could be matched.
+    """
+    def parse(events):
+        return [
+            (e["type"], datetime.strptime(e["t"], "%Y-%m-%d %H:%M"), float(e["v"]))
+            for e in events if e.get("type") in ("H", "L")
+        ]
+
+    ours = parse(local)
+    worst_minutes = worst_feet = 0.0
+    matched = 0
+    for kind, when, height in parse(reference):
+        candidates = [(abs((t - when).total_seconds()) / 60, abs(v - height)) for k, t, v in ours if k == kind]
+        if not candidates:
+            continue
+        minutes, feet = min(candidates)
+        worst_minutes, worst_feet = max(worst_minutes, minutes), max(worst_feet, feet)
+        matched += 1
+    if not matched:
+        return None
+    return {"max_minutes": round(worst_minutes, 1), "max_feet": round(worst_feet, 2), "matched": matched}
+
+
+def refresh_constituents(station_id: str = DEFAULT_STATION_ID) -> Optional[str]:
+    """Download a station's harmonic constants and datums from NOAA.
+
+    Writes the bundled constituents file (MSL above MLLW becomes the
+    datum offset). Returns the path written, or None on failure.
+    """
+    import requests
+
+    base = f"{NOAA_METADATA_URL}/{station_id}"
+    try:
+        harcon = requests.get(f"{base}/harcon.json", params={"units": "english"}, timeout=15)
+        harcon.raise_for_status()
+        datums = requests.get(f"{base}/datums.json", params={"units": "english"}, timeout=15)
+        datums.raise_for_status()
+        levels = {d["name"]: float(d["value"]) for d in datums.json().get("datums", [])}
+        constituents = harcon.json().get("HarmonicConstituents", [])
+    except Exception as exc:  # noqa: BLE001
+        log(f"Constituent refresh failed for {station_id}: {exc}")
+        return None
+    if not constituents or "MSL" not in levels or "MLLW" not in levels:
+        log(f"NOAA returned incomplete constants for {station_id}")
+        return None
+
+    path = _constituents_path(station_id)
+    atomic_write_json(path, {
+        "station_id": station_id,
+        "units": "feet",
+        "datum": "MLLW",
+        "datum_offset_ft": round(levels["MSL"] - levels["MLLW"], 3),
+        "source": f"{NOAA_SOURCE_PREFIX} harcon/datums, retrieved {datetime.now(timezone.utc):%Y-%m-%d}",
+        "HarmonicConstituents": [
+            {key: row.get(key) for key in ("number", "name", "amplitude", "phase_GMT", "speed")}
+            for row in constituents
+        ],
+    })
+    _load_station.cache_clear()
+    log(f"Wrote {len(constituents)} constituents to {path}")
+    return path
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Harmonic tide predictions")
+    parser.add_argument("--station", default=DEFAULT_STATION_ID)
+    parser.add_argument("--days", type=int, default=1, help="Days of hi/lo events to print")
+    parser.add_argument("--refresh", action="store_true", help="Re-download constituents from NOAA")
+    args = parser.parse_args()
+
+    if args.refresh:
+        print(refresh_constituents(args.station) or "Refresh failed")
+    else:
+        cfg = _get_settings()
+        tz = ZoneInfo(cfg.tz if cfg else os.getenv("TZ", "America/New_York"))
+        day = datetime.now(tz).replace(hour=0, minute=0, second=0, microsecond=0)
+        print(json.dumps(predict_hilo(day, day + timedelta(days=args.days), args.station), indent=2))
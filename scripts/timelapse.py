@@ -6,16 +6,26 @@ Creates animated GIFs from archived greenhouse images.
 
 import glob
 import io
+import math
 import os
 import re
-from datetime import datetime, timedelta
-from typing import List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
 
-import requests
-from PIL import Image
+from PIL import Image, features
+
+import solar
 
 from utils.logger import create_logger
-from utils.image_utils import sample_frames_evenly
+from utils.image_utils import (
+    FRAME_PREP_WORKERS,
+    deflicker_frames,
+    select_quality_frames,
+)
 
 log = create_logger("timelapse")
 
@@ -36,78 +46,52 @@ def _get_settings():
 _cfg = _get_settings()
 ARCHIVE_ROOT = _cfg.archive_path if _cfg else os.getenv("ARCHIVE_ROOT", "/app/data/archive")
 
+# Size budget for the timelapse embedded in the daily/weekly email. The GIF
+# is most of the message, so this keeps big-weather days mobile-friendly.
+EMAIL_TIMELAPSE_BUDGET_KB = int(os.getenv("TIMELAPSE_EMAIL_BUDGET_KB", "1500"))
+
+# Quality steps tried from best to smallest, as
+# (fraction of max width, fraction of frames, palette colours).
+BUDGET_STEPS: Tuple[Tuple[float, float, int], ...] = (
+    (1.0, 1.0, 128),
+    (1.0, 1.0, 96),
+    (0.9, 1.0, 96),
+    (0.9, 0.75, 96),
+    (0.8, 0.75, 64),
+    (0.7, 0.75, 64),
+    (0.7, 0.5, 64),
+    (0.6, 0.5, 48),
+    (0.5, 0.5, 32),
+)
+BUDGET_PROBE_WIDTH = 120  # Width of the frames encoded for the first estimate
+BUDGET_MIN_FRAMES = 20  # Never thin the animation below this
+BUDGET_MAX_ATTEMPTS = 4  # Full-size encodes before settling for the best so far
+ALT_FORMAT_QUALITY = 70  # Lossy quality for the WebP/AVIF alternative
+
 
 def get_sunrise_sunset(target_date: datetime) -> tuple[datetime, datetime]:
-    """Get sunrise and sunset times for a specific date using OpenWeather API."""
-    cfg = _get_settings()
-    api_key = cfg.openweather_api_key if cfg else os.getenv("OPENWEATHER_API_KEY")
-    lat = cfg.lat if cfg else os.getenv("LAT")
-    lon = cfg.lon if cfg else os.getenv("LON")
-
-    if not api_key or not lat or not lon:
-        log("Weather API config missing, using approximate daylight hours")
-        # Use approximate daylight hours (7 AM to 6 PM) for the target date
-        sunrise = target_date.replace(hour=7, minute=0, second=0, microsecond=0)
-        sunset = target_date.replace(hour=18, minute=0, second=0, microsecond=0)
+    """Get sunrise and sunset (naive local time) for a date, computed offline."""
+    sun = solar.get_sun_times(target_date)
+    if sun.sunrise and sun.sunset:
+        sunrise = sun.sunrise.replace(tzinfo=None)
+        sunset = sun.sunset.replace(tzinfo=None)
+        log(
+            f"Daylight hours for {sun.date.isoformat()}: {sunrise.strftime('%H:%M')} - {sunset.strftime('%H:%M')}"
+        )
         return sunrise, sunset
 
-    try:
-        # Get weather data - we'll use current data as approximation for any date
-        url = "https://api.openweathermap.org/data/3.0/onecall"
-        params = {
-            "lat": lat,
-            "lon": lon,
-            "appid": api_key,
-            "exclude": "minutely,hourly,alerts",
-        }
-
-        resp = requests.get(url, params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-
-        daily_list = data.get("daily", [])
-
-        if daily_list:
-            # Use today's data as approximation for the target date
-            first = daily_list[0] or {}
-            sunrise_ts = first.get("sunrise")
-            sunset_ts = first.get("sunset")
-
-            if sunrise_ts and sunset_ts:
-                # Apply the sunrise/sunset times to the target date
-                sunrise_today = datetime.fromtimestamp(sunrise_ts)
-                sunset_today = datetime.fromtimestamp(sunset_ts)
-
-                # Create sunrise/sunset for the target date with today's times
-                sunrise = target_date.replace(
-                    hour=sunrise_today.hour,
-                    minute=sunrise_today.minute,
-                    second=sunrise_today.second,
-                    microsecond=0,
-                )
-                sunset = target_date.replace(
-                    hour=sunset_today.hour,
-                    minute=sunset_today.minute,
-                    second=sunset_today.second,
-                    microsecond=0,
-                )
-
-                log(
-                    f"Daylight hours for {target_date.strftime('%Y-%m-%d')}: {sunrise.strftime('%H:%M')} - {sunset.strftime('%H:%M')}"
-                )
-                return sunrise, sunset
-
-    except Exception as e:
-        log(f"Error fetching sunrise/sunset: {e}")
-
     # Fallback to approximate times for the target date
+    log("No sunrise/sunset for this date, using approximate daylight hours")
     sunrise = target_date.replace(hour=7, minute=0, second=0, microsecond=0)
     sunset = target_date.replace(hour=18, minute=0, second=0, microsecond=0)
     return sunrise, sunset
 
 
 def extract_timestamp_from_filename(filename: str) -> Optional[datetime]:
-    """Extract timestamp from image filename like 'img_camera_20251219_154635.jpg'."""
+    """Extract timestamp from image filename like 'img_camera_20251219_154635.jpg'.
+
+    Ingestion names files with the UTC capture time, so the result is naive UTC.
+    """
     match = re.search(r"(\d{8})_(\d{6})", filename)
     if match:
         date_str, time_str = match.groups()
@@ -119,47 +103,91 @@ def extract_timestamp_from_filename(filename: str) -> Optional[datetime]:
 
 
 def is_daylight_image(image_path: str, sunrise: datetime, sunset: datetime) -> bool:
-    """Check if an image was captured during daylight hours."""
+    """Check if an image was captured between naive local sunrise and sunset."""
     timestamp = extract_timestamp_from_filename(os.path.basename(image_path))
     if not timestamp:
         return True  # Include if we can't determine time
 
-    # Convert to local timezone comparison
-    return sunrise <= timestamp <= sunset
+    # Filename is UTC; compare in local time
+    local = timestamp.replace(tzinfo=timezone.utc).astimezone(_local_zone())
+    return sunrise <= local.replace(tzinfo=None) <= sunset
 
 
-def get_yesterday_images() -> List[str]:
-    """Get all images from yesterday, filtered for daylight hours."""
-    yesterday = datetime.now() - timedelta(days=1)
-    year = yesterday.strftime("%Y")
-    month = yesterday.strftime("%m")
-    day = yesterday.strftime("%d")
-
-    day_path = os.path.join(ARCHIVE_ROOT, year, month, day)
-    if not os.path.exists(day_path):
-        log(f"No archive directory for yesterday: {day_path}")
-        return []
+def filter_daylight_images(images: List[str]) -> List[str]:
+    """Keep images captured between sunrise and sunset on their own date.
+
+    Each image is checked against that day's sun times, so multi-day and
+    historical ranges are filtered correctly. Images without a timestamp
+    in the filename are kept.
+    """
+    kept = []
+    for img_path in images:
+        timestamp = extract_timestamp_from_filename(os.path.basename(img_path))
+        if timestamp is None or solar.is_daylight(timestamp):
+            kept.append(img_path)
+    return kept
 
-    # Get all images from yesterday
-    images = glob.glob(os.path.join(day_path, "*.jpg"))
-    images.sort()
 
-    log(f"Found {len(images)} total images from yesterday ({year}/{month}/{day})")
+def _local_zone() -> ZoneInfo:
+    cfg = _get_settings()
+    return ZoneInfo(cfg.tz if cfg else os.getenv("TZ", "America/New_York"))
 
-    # Get daylight hours for yesterday
-    sunrise, sunset = get_sunrise_sunset(yesterday)
 
-    # Filter for daylight images
-    daylight_images = []
-    for img_path in images:
-        if is_daylight_image(img_path, sunrise, sunset):
-            daylight_images.append(img_path)
+def get_daylight_images_for_date(local_date: date) -> List[str]:
+    """Get all daylight images for a local calendar day.
+
+    The archive is organised by UTC date, so a local day's daylight can
+    span two archive directories (e.g. summer evenings after 00:00 UTC).
+    """
+    sun = solar.get_sun_times(local_date)
+    if sun.sunrise and sun.sunset:
+        utc_days = sorted(
+            {
+                sun.sunrise.astimezone(timezone.utc).date(),
+                sun.sunset.astimezone(timezone.utc).date(),
+            }
+        )
+    else:
+        utc_days = [local_date]
+
+    images = []
+    for day in utc_days:
+        day_path = os.path.join(ARCHIVE_ROOT, day.strftime("%Y"), day.strftime("%m"), day.strftime("%d"))
+        if os.path.exists(day_path):
+            day_images = glob.glob(os.path.join(day_path, "*.jpg"))
+            day_images.sort()
+            images.extend(day_images)
+
+    if not images:
+        log(f"No archive images for {local_date.isoformat()}")
+        return []
+
+    log(f"Found {len(images)} total images for {local_date.isoformat()}")
+
+    daylight_images = [
+        img_path
+        for img_path in filter_daylight_images(images)
+        if _local_date_of(img_path) in (None, local_date)
+    ]
 
     log(f"Filtered to {len(daylight_images)} daylight images")
     return daylight_images
 
 
-# sample_frames_evenly imported from utils.image_utils
+def _local_date_of(image_path: str) -> Optional[date]:
+    timestamp = extract_timestamp_from_filename(os.path.basename(image_path))
+    if timestamp is None:
+        return None
+    return timestamp.replace(tzinfo=timezone.utc).astimezone(_local_zone()).date()
+
+
+def get_yesterday_images() -> List[str]:
+    """Get all images from yesterday, filtered for daylight hours."""
+    yesterday = datetime.now(_local_zone()).date() - timedelta(days=1)
+    return get_daylight_images_for_date(yesterday)
+
+
+# select_quality_frames imported from utils.image_utils
 
 
 def get_images_for_period(days: int = 7) -> List[str]:
@@ -183,6 +211,65 @@ def get_images_for_period(days: int = 7) -> List[str]:
     return images
 
 
+def _load_gif_frame(img_path: str, max_width: int, max_height: int) -> Optional[Image.Image]:
+    """Open, convert and downscale one frame for GIF encoding."""
+    try:
+        img = Image.open(img_path)
+        img.draft("RGB", (max_width, max_height))
+
+        # Convert to RGB if necessary
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+
+        # Force resize to max_width while maintaining aspect ratio
+        if img.width > max_width:
+            ratio = max_width / img.width
+            new_height = int(img.height * ratio)
+            img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
+
+        # Also enforce max_height if needed
+        if img.height > max_height:
+            ratio = max_height / img.height
+            new_width = int(img.width * ratio)
+            img = img.resize((new_width, max_height), Image.Resampling.LANCZOS)
+
+        return img
+    except Exception as e:
+        log(f"Error processing {img_path}: {e}")
+        return None
+
+
+def _prepare_frames(
+    images: List[str], max_width: int, max_height: int, deflicker: bool
+) -> Optional[List[Image.Image]]:
+    """Decode, downscale and (optionally) deflicker frames on a thread pool.
+
+    Returns:
+        RGB frames, or None if fewer than two could be loaded
+    """
+    prep_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, FRAME_PREP_WORKERS)) as pool:
+        loaded = list(
+            pool.map(lambda path: _load_gif_frame(path, max_width, max_height), images)
+        )
+    frames = [frame for frame in loaded if frame is not None]
+
+    if len(frames) < 2:
+        log("Not enough valid frames for timelapse")
+        return None
+
+    if deflicker:
+        frames = deflicker_frames(frames)
+    prep_seconds = time.perf_counter() - prep_start
+
+    log(
+        f"Assembled {len(frames)} frames (target size: {max_width}px wide) in "
+        f"{prep_seconds:.2f}s ({prep_seconds * 1000 / len(frames):.1f}ms/frame, "
+        f"deflicker={'on' if deflicker else 'off'})"
+    )
+    return frames
+
+
 def create_timelapse_gif(
     images: List[str],
     output_path: Optional[str] = None,
@@ -192,6 +279,7 @@ def create_timelapse_gif(
     max_height: int = 400,
     optimize: bool = True,
     colors: int = 256,
+    deflicker: bool = True,
 ) -> Optional[bytes]:
     """Create a looping GIF timelapse from a list of images.
 
@@ -204,6 +292,7 @@ def create_timelapse_gif(
         max_height: Maximum height of output GIF
         optimize: Whether to apply optimization
         colors: Maximum number of colors for quantization
+        deflicker: Whether to smooth frame-to-frame exposure changes
 
     Returns:
         GIF bytes, or None on failure
@@ -212,46 +301,16 @@ def create_timelapse_gif(
         log("No images provided for timelapse")
         return None
 
-    # Sample images evenly if we have too many
+    # Pick frames from cached curator metrics so unused files are never opened
     if len(images) > max_frames:
-        step = len(images) / max_frames
-        indices = [int(i * step) for i in range(max_frames)]
-        images = [images[i] for i in indices]
+        images = select_quality_frames(images, max_frames)
 
     log(f"Creating timelapse from {len(images)} images")
 
-    frames = []
-    for img_path in images:
-        try:
-            img = Image.open(img_path)
-
-            # Convert to RGB if necessary
-            if img.mode != "RGB":
-                img = img.convert("RGB")
-
-            # Force resize to max_width while maintaining aspect ratio
-            if img.width > max_width:
-                ratio = max_width / img.width
-                new_height = int(img.height * ratio)
-                img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
-
-            # Also enforce max_height if needed
-            if img.height > max_height:
-                ratio = max_height / img.height
-                new_width = int(img.width * ratio)
-                img = img.resize((new_width, max_height), Image.Resampling.LANCZOS)
-
-            frames.append(img)
-        except Exception as e:
-            log(f"Error processing {img_path}: {e}")
-            continue
-
-    if len(frames) < 2:
-        log("Not enough valid frames for timelapse")
+    frames = _prepare_frames(images, max_width, max_height, deflicker)
+    if frames is None:
         return None
 
-    log(f"Assembled {len(frames)} frames (target size: {max_width}px wide)")
-
     # Create GIF in memory
     gif_buffer = io.BytesIO()
 
@@ -268,11 +327,15 @@ def create_timelapse_gif(
         save_kwargs["optimize"] = True
         save_kwargs["colors"] = colors
 
+    encode_start = time.perf_counter()
     frames[0].save(gif_buffer, **save_kwargs)
+    encode_seconds = time.perf_counter() - encode_start
 
     gif_bytes = gif_buffer.getvalue()
     log(
-        f"Created timelapse GIF: {len(gif_bytes)} bytes ({len(gif_bytes) / 1024 / 1024:.1f}MB)"
+        f"Created timelapse GIF: {len(gif_bytes)} bytes ({len(gif_bytes) / 1024 / 1024:.1f}MB, "
+        f"{len(gif_bytes) / len(frames) / 1024:.1f}KB/frame), "
+        f"encoded in {encode_seconds:.2f}s ({encode_seconds * 1000 / len(frames):.1f}ms/frame)"
     )
 
     # Optionally save to file
@@ -284,19 +347,281 @@ def create_timelapse_gif(
     return gif_bytes
 
 
-def create_daily_timelapse() -> Optional[bytes]:
+@dataclass
+class BudgetedTimelapse:
+    """A timelapse encoded to fit a byte budget."""
+
+    gif: bytes
+    frames: int
+    width: int
+    colors: int
+    budget_bytes: int
+    attempts: int
+    encode_seconds: float
+    alt_format: Optional[str] = None
+    alt_bytes: Optional[bytes] = None
+
+    @property
+    def within_budget(self) -> bool:
+        return len(self.gif) <= self.budget_bytes
+
+
+def _subsample(frames: List[Image.Image], count: int) -> List[Image.Image]:
+    if count >= len(frames):
+        return frames
+    step = len(frames) / count
+    return [frames[int(i * step)] for i in range(count)]
+
+
+def _resize_frames(frames: List[Image.Image], width: int) -> List[Image.Image]:
+    if width >= frames[0].width:
+        return frames
+    height = max(1, round(frames[0].height * width / frames[0].width))
+    with ThreadPoolExecutor(max_workers=max(1, FRAME_PREP_WORKERS)) as pool:
+        return list(
+            pool.map(lambda f: f.resize((width, height), Image.Resampling.LANCZOS), frames)
+        )
+
+
+def _encode_gif(frames: List[Image.Image], frame_duration_ms: int, colors: int) -> bytes:
+    """Quantize each frame to ``colors`` and encode a looping GIF."""
+    with ThreadPoolExecutor(max_workers=max(1, FRAME_PREP_WORKERS)) as pool:
+        paletted = list(pool.map(lambda f: f.quantize(colors=colors), frames))
+    buffer = io.BytesIO()
+    paletted[0].save(
+        buffer,
+        format="GIF",
+        save_all=True,
+        append_images=paletted[1:],
+        duration=frame_duration_ms,
+        loop=0,
+        optimize=True,
+    )
+    return buffer.getvalue()
+
+
+def _encode_alternate(
+    frames: List[Image.Image], frame_duration_ms: int, fmt: str
+) -> Optional[bytes]:
+    """Encode an animated WebP or AVIF, or None if Pillow lacks support."""
+    if not features.check(fmt):
+        log(f"Pillow has no {fmt.upper()} support, skipping alternate timelapse")
+        return None
+    buffer = io.BytesIO()
+    try:
+        frames[0].save(
+            buffer,
+            format=fmt.upper(),
+            save_all=True,
+            append_images=frames[1:],
+            duration=frame_duration_ms,
+            loop=0,
+            quality=ALT_FORMAT_QUALITY,
+        )
+    except Exception as e:
+        log(f"Error encoding {fmt.upper()} timelapse: {e}")
+        return None
+    return buffer.getvalue()
+
+
+def encode_to_budget(
+    frames: List[Image.Image],
+    budget_bytes: int,
+    frame_duration_ms: int = 100,
+    alt_format: Optional[str] = None,
+) -> BudgetedTimelapse:
+    """Encode frames as the best-quality GIF that fits ``budget_bytes``.
+
+    A probe GIF of every frame at BUDGET_PROBE_WIDTH gives a bytes-per-pixel
+    estimate. Each step in BUDGET_STEPS is estimated from that, and the best
+    step estimated to fit is encoded at full size. The real size then
+    corrects the estimate: an overshoot moves down to the next step that
+    should fit, and a fit tries one step up if that now looks affordable.
+    Resized frames are cached per width, so no attempt re-decodes or
+    re-resizes. Animation length is kept constant when frames are dropped.
+
+    If nothing fits within BUDGET_MAX_ATTEMPTS encodes, the smallest GIF
+    produced is returned (``within_budget`` is False).
+
+    Args:
+        frames: RGB frames at the largest size allowed
+        budget_bytes: Target GIF size
+        frame_duration_ms: Frame duration with every frame included
+        alt_format: Also encode "webp" or "avif" with the chosen frames
+
+    Returns:
+        BudgetedTimelapse with the GIF and the parameters chosen
+    """
+    start = time.perf_counter()
+    max_width = frames[0].width
+    aspect = frames[0].height / frames[0].width
+    resized: Dict[int, List[Image.Image]] = {max_width: frames}
+
+    def sized(width: int) -> List[Image.Image]:
+        if width not in resized:
+            resized[width] = _resize_frames(frames, width)
+        return resized[width]
+
+    steps = []
+    for width_scale, frame_scale, colors in BUDGET_STEPS:
+        width = max(1, round(max_width * width_scale))
+        count = max(min(len(frames), BUDGET_MIN_FRAMES), round(len(frames) * frame_scale))
+        steps.append((width, count, colors))
+
+    # Estimate from a small copy at the top palette size; LZW output grows
+    # roughly with bits per pixel, so smaller palettes scale by log2(colours).
+    probe_width = min(BUDGET_PROBE_WIDTH, max_width)
+    top_colors = steps[0][2]
+    probe = _encode_gif(sized(probe_width), frame_duration_ms, top_colors)
+    probe_pixels = probe_width * max(1, round(probe_width * aspect)) * len(frames)
+    bytes_per_pixel = len(probe) / probe_pixels
+
+    def estimate(index: int) -> float:
+        width, count, colors = steps[index]
+        pixels = width * max(1, round(width * aspect)) * count
+        return bytes_per_pixel * pixels * math.log2(colors) / math.log2(top_colors)
+
+    def first_fit(after: int, correction: float) -> int:
+        for index in range(after, len(steps)):
+            if estimate(index) * correction <= budget_bytes:
+                return index
+        return len(steps) - 1
+
+    results: Dict[int, bytes] = {}
+    correction = 1.0
+    index = first_fit(0, correction)
+    while len(results) < BUDGET_MAX_ATTEMPTS:
+        width, count, colors = steps[index]
+        duration = round(frame_duration_ms * len(frames) / count)
+        gif = _encode_gif(_subsample(sized(width), count), duration, colors)
+        results[index] = gif
+        correction = len(gif) / estimate(index)
+
+        if len(gif) <= budget_bytes:
+            up = index - 1
+            if up >= 0 and up not in results and estimate(up) * correction <= budget_bytes:
+                index = up
+                continue
+            break
+        next_index = first_fit(index + 1, correction)
+        if next_index in results:
+            break
+        index = next_index
+
+    fitting = [i for i, gif in results.items() if len(gif) <= budget_bytes]
+    chosen = min(fitting) if fitting else min(results, key=lambda i: len(results[i]))
+    width, count, colors = steps[chosen]
+
+    alt_bytes = None
+    if alt_format:
+        duration = round(frame_duration_ms * len(frames) / count)
+        alt_bytes = _encode_alternate(
+            _subsample(sized(width), count), duration, alt_format.lower()
+        )
+
+    return BudgetedTimelapse(
+        gif=results[chosen],
+        frames=count,
+        width=width,
+        colors=colors,
+        budget_bytes=budget_bytes,
+        attempts=len(results),
+        encode_seconds=time.perf_counter() - start,
+        alt_format=alt_format.lower() if alt_bytes else None,
+        alt_bytes=alt_bytes,
+    )
+
+
+def create_budgeted_timelapse(
+    images: List[str],
+    budget_bytes: int,
+    output_path: Optional[str] = None,
+    max_frames: int = 60,
+    frame_duration_ms: int = 100,
+    max_width: int = 400,
+    max_height: int = 267,
+    deflicker: bool = True,
+    alt_format: Optional[str] = None,
+) -> Optional[BudgetedTimelapse]:
+    """Create a timelapse GIF that fits a byte budget.
+
+    Frames are decoded once at ``max_width``/``max_height`` and handed to
+    encode_to_budget(), which picks width, frame count and palette size.
+
+    Args:
+        images: List of image file paths
+        budget_bytes: Target GIF size
+        output_path: Optional path to save the GIF (the alternate format is
+            saved next to it with its own extension)
+        max_frames: Maximum number of frames to include
+        frame_duration_ms: Duration per frame with all frames included
+        max_width: Maximum width of output GIF
+        max_height: Maximum height of output GIF
+        deflicker: Whether to smooth frame-to-frame exposure changes
+        alt_format: Also encode "webp" or "avif" for clients that support it
+
+    Returns:
+        BudgetedTimelapse, or None on failure
+    """
+    if not images:
+        log("No images provided for timelapse")
+        return None
+
+    if len(images) > max_frames:
+        images = select_quality_frames(images, max_frames)
+
+    log(f"Creating budgeted timelapse from {len(images)} images ({budget_bytes / 1024:.0f}KB budget)")
+
+    frames = _prepare_frames(images, max_width, max_height, deflicker)
+    if frames is None:
+        return None
+
+    result = encode_to_budget(frames, budget_bytes, frame_duration_ms, alt_format)
+    size = len(result.gif)
+    log(
+        f"Created timelapse GIF: {size / 1024:.0f}KB of {budget_bytes / 1024:.0f}KB budget "
+        f"({size * 100 / budget_bytes:.0f}%{'' if result.within_budget else ', OVER BUDGET'}), "
+        f"{result.frames} frames at {result.width}px, {result.colors} colours, "
+        f"{result.attempts} full encode(s) in {result.encode_seconds:.2f}s"
+    )
+    if result.alt_bytes:
+        log(
+            f"Created {result.alt_format.upper()} alternate: {len(result.alt_bytes) / 1024:.0f}KB "
+            f"({len(result.alt_bytes) * 100 / size:.0f}% of GIF)"
+        )
+
+    if output_path:
+        with open(output_path, "wb") as f:
+            f.write(result.gif)
+        log(f"Saved timelapse to {output_path}")
+        if result.alt_bytes:
+            alt_path = f"{os.path.splitext(output_path)[0]}.{result.alt_format}"
+            with open(alt_path, "wb") as f:
+                f.write(result.alt_bytes)
+            log(f"Saved {result.alt_format.upper()} alternate to {alt_path}")
+
+    return result
+
+
+def create_daily_timelapse(local_date: Optional[date] = None) -> Optional[bytes]:
     """Create a daily timelapse GIF from yesterday's daylight images.
 
     This function:
     - Gets all images from yesterday (00:00 to 23:59)
     - Filters for daylight hours only
     - Samples up to 60 frames for smooth animation
-    - Optimizes for email delivery
-    """
-    log("Creating daily timelapse from yesterday's images...")
+    - Fits the GIF to TIMELAPSE_EMAIL_BUDGET_KB for email delivery
 
-    # Get yesterday's daylight images
-    daylight_images = get_yesterday_images()
+    Args:
+        local_date: Local day to render instead of yesterday (the
+            post-sunset pre-build renders the same day's images)
+    """
+    if local_date is None:
+        log("Creating daily timelapse from yesterday's images...")
+        daylight_images = get_yesterday_images()
+    else:
+        log(f"Creating daily timelapse from {local_date} images...")
+        daylight_images = get_daylight_images_for_date(local_date)
 
     if not daylight_images:
         log("No daylight images found for daily timelapse")
@@ -304,41 +629,43 @@ def create_daily_timelapse() -> Optional[bytes]:
 
     # Sample frames for smooth animation
     target_frames = 60
-    sampled_images = sample_frames_evenly(daylight_images, target_frames)
+    sampled_images = select_quality_frames(daylight_images, target_frames)
 
     if len(sampled_images) < 2:
         log("Not enough daylight images for daily timelapse")
         return None
 
-    # Create optimized GIF with specific parameters for daily use
-    return create_timelapse_gif(
+    # Fit the email size budget; 60 frames at 10 fps is a 6-second animation
+    result = create_budgeted_timelapse(
         sampled_images,
-        max_frames=60,  # 60 frames for 6-second animation
-        frame_duration_ms=100,  # 10 fps
-        max_width=400,  # Reduced from 600px for smaller email file size
+        budget_bytes=EMAIL_TIMELAPSE_BUDGET_KB * 1024,
+        max_frames=60,
+        frame_duration_ms=100,
+        max_width=400,
         max_height=267,  # Maintain 3:2 aspect ratio
-        optimize=True,
-        colors=128,  # Aggressive color quantization for smaller file size
     )
+    return result.gif if result else None
 
 
 def create_weekly_timelapse() -> Optional[bytes]:
     """Create a timelapse GIF from the past week's images."""
-    images = get_images_for_period(days=7)
+    images = filter_daylight_images(get_images_for_period(days=7))
 
     if not images:
         log("No images found for weekly timelapse")
         return None
 
-    log(f"Found {len(images)} images from the past week")
+    log(f"Found {len(images)} daylight images from the past week")
 
-    return create_timelapse_gif(
+    result = create_budgeted_timelapse(
         images,
+        budget_bytes=EMAIL_TIMELAPSE_BUDGET_KB * 1024,
         max_frames=100,  # 100 frames for weekly edition
         frame_duration_ms=100,  # 10 fps for 10-second animation
-        max_width=400,  # Reduced from 600px for smaller email file size
+        max_width=400,
         max_height=267,  # Maintain 3:2 aspect ratio
     )
+    return result.gif if result else None
 
 
 def create_daily_timelapse_for_web() -> Optional[str]:
@@ -349,7 +676,6 @@ def create_daily_timelapse_for_web() -> Optional[str]:
     Returns:
         Path to saved file, or None on failure
     """
-    from datetime import date
     from pathlib import Path
     
     images = get_yesterday_images()
@@ -359,7 +685,7 @@ def create_daily_timelapse_for_web() -> Optional[str]:
         return None
     
     # Sample to reasonable frame count
-    sampled_images = sample_frames_evenly(images, 60)
+    sampled_images = select_quality_frames(images, 60)
     
     if len(sampled_images) < 2:
         log("Not enough daylight images for website timelapse")
@@ -398,6 +724,15 @@ if __name__ == "__main__":
     parser.add_argument("--days", type=int, default=7, help="Number of days to include")
     parser.add_argument("--output", type=str, help="Output file path")
     parser.add_argument("--test", action="store_true", help="Test run")
+    parser.add_argument(
+        "--no-deflicker", action="store_true", help="Skip exposure smoothing (for comparison)"
+    )
+    parser.add_argument(
+        "--budget-kb", type=int, help="Fit the GIF to this size (email settings: 400px, 60 frames)"
+    )
+    parser.add_argument(
+        "--alt", choices=["webp", "avif"], help="Also write an animated WebP/AVIF (with --budget-kb)"
+    )
     args = parser.parse_args()
 
     images = get_images_for_period(args.days)
@@ -410,6 +745,22 @@ if __name__ == "__main__":
             print(f"  ... and {len(images) - 5} more")
     else:
         output = args.output or "/tmp/timelapse.gif"
-        gif_bytes = create_timelapse_gif(images, output_path=output)
+        if args.budget_kb:
+            result = create_budgeted_timelapse(
+                images,
+                budget_bytes=args.budget_kb * 1024,
+                output_path=output,
+                deflicker=not args.no_deflicker,
+                alt_format=args.alt,
+            )
+            if result:
+                print(
+                    f"Created {output} ({len(result.gif)} bytes, budget {result.budget_bytes}, "
+                    f"{result.frames} frames at {result.width}px, {result.colors} colours)"
+                )
+            raise SystemExit(0 if result else 1)
+        gif_bytes = create_timelapse_gif(
+            images, output_path=output, deflicker=not args.no_deflicker
+        )
         if gif_bytes:
             print(f"Created {output} ({len(gif_bytes)} bytes)")
@@ -2,11 +2,12 @@
 
 from utils.logger import create_logger
 from utils.io import atomic_write_json, atomic_read_json
-from utils.image_utils import sample_frames_evenly
+from utils.image_utils import sample_frames_evenly, select_quality_frames
 
 __all__ = [
     "create_logger",
     "atomic_write_json",
     "atomic_read_json",
     "sample_frames_evenly",
+    "select_quality_frames",
 ]
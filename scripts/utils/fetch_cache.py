@@ -0,0 +1,223 @@
+"""Shared TTL cache for external API responses.
+
+One persisted cache under /app/data that every process (publisher, web
+API, scheduler jobs) goes through, so a morning's worth of callers share
+one OpenWeather call instead of each making their own.
+
+- Per-source TTLs (SOURCE_TTL_SECONDS, overridable per call)
+- Single-flight: concurrent callers, in any process, wait on a file lock
+  while the first one fetches, then read its result
+- Stale-if-error: if a refresh fails, the last good response is served
+  for up to ``max_stale`` seconds
+
+Usage:
+    from utils.fetch_cache import cached_fetch
+
+    data = cached_fetch("openweather", lambda: _fetch_weather_data(url, params))
+    tides = cached_fetch("noaa_tides", fetch_tides, key="20250618")
+
+    # From a coroutine (fetch returns an awaitable)
+    data = await cached_fetch_async("openweather", fetch, deadline=deadline)
+
+The fetch callable may raise or return a falsy value to signal failure.
+"""
+
+import asyncio
+import fcntl
+import os
+import re
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from utils.io import atomic_read_json, atomic_write_json
+from utils.logger import create_logger
+
+log = create_logger("fetch_cache")
+
+DEFAULT_CACHE_DIR = "/app/data/fetch_cache"
+
+# Freshness per source (seconds)
+SOURCE_TTL_SECONDS = {
+    "openweather": 15 * 60,  # Current conditions move; forecasts don't
+    "noaa_tides": 6 * 3600,  # Predictions for a fixed date range
+    "noaa_sound": 30 * 60,  # Observed level updates every 6 minutes
+}
+DEFAULT_TTL_SECONDS = 15 * 60
+DEFAULT_MAX_STALE_SECONDS = 24 * 3600
+LOCK_TIMEOUT_SECONDS = 60  # Longest we wait on another process's fetch
+
+
+def _cache_dir() -> str:
+    # Read per call so tests and tools can redirect it
+    return os.getenv("FETCH_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+
+def _entry_path(source: str, key: str) -> str:
+    name = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{source}-{key}" if key else source)
+    return os.path.join(_cache_dir(), f"{name}.json")
+
+
+def _read_entry(path: str) -> Optional[dict]:
+    entry = atomic_read_json(path, default=None)
+    if isinstance(entry, dict) and "fetched_at" in entry:
+        return entry
+    return None
+
+
+def _acquire(lock_file, timeout: float) -> bool:
+    """Take an exclusive flock, polling until ``timeout``."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except (BlockingIOError, OSError):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.1)
+
+
+async def _acquire_async(lock_file, deadline: float) -> bool:
+    """Like _acquire, but yields to the event loop between polls."""
+    while True:
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except (BlockingIOError, OSError):
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.1)
+
+
+def _is_fresh(entry: Optional[dict], ttl: float) -> bool:
+    return bool(entry) and time.time() - entry["fetched_at"] < ttl
+
+
+def _settle(source: str, path: str, data: Any, entry: Optional[dict], max_stale: float) -> Any:
+    """Store a successful fetch, or fall back to a stale entry on failure."""
+    if data:
+        try:
+            atomic_write_json(path, {"fetched_at": time.time(), "data": data}, indent=None)
+        except Exception as exc:  # noqa: BLE001
+            log(f"{source}: cache write error: {exc}")
+        return data
+    if _is_fresh(entry, max_stale):
+        age = time.time() - entry["fetched_at"]
+        log(f"{source}: refresh failed; serving cached response from {age / 60:.0f} min ago")
+        return entry["data"]
+    return data
+
+
+def cached_fetch(
+    source: str,
+    fetch: Callable[[], Any],
+    key: str = "",
+    ttl: Optional[float] = None,
+    max_stale: float = DEFAULT_MAX_STALE_SECONDS,
+) -> Any:
+    """Return a cached response for ``source``/``key``, fetching if expired.
+
+    Args:
+        source: Source name (selects the TTL and cache file)
+        fetch: Zero-argument callable performing the real request
+        key: Distinguishes requests within a source (e.g. a date)
+        ttl: Freshness in seconds (default: SOURCE_TTL_SECONDS[source])
+        max_stale: How old a response may be when served after a failed refresh
+
+    Returns:
+        Fresh or stale-if-error data, else whatever ``fetch`` returned
+        (None if it raised)
+    """
+    ttl = SOURCE_TTL_SECONDS.get(source, DEFAULT_TTL_SECONDS) if ttl is None else ttl
+    path = _entry_path(source, key)
+
+    entry = _read_entry(path)
+    if _is_fresh(entry, ttl):
+        return entry["data"]
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        lock_file = open(f"{path}.fetch.lock", "w")
+    except OSError as exc:
+        log(f"{source}: cache unavailable ({exc}); fetching directly")
+        return _call(source, fetch)
+
+    with lock_file:
+        if not _acquire(lock_file, LOCK_TIMEOUT_SECONDS):
+            log(f"{source}: timed out waiting for another fetch")
+            if _is_fresh(entry, max_stale):
+                return entry["data"]
+            return _call(source, fetch)
+
+        # Another caller may have refreshed it while we waited
+        entry = _read_entry(path)
+        if _is_fresh(entry, ttl):
+            return entry["data"]
+
+        return _settle(source, path, _call(source, fetch), entry, max_stale)
+
+
+async def cached_fetch_async(
+    source: str,
+    fetch: Callable[[], Awaitable[Any]],
+    key: str = "",
+    ttl: Optional[float] = None,
+    max_stale: float = DEFAULT_MAX_STALE_SECONDS,
+    deadline: Optional[float] = None,
+) -> Any:
+    """Coroutine version of cached_fetch() for ``fetch`` returning an awaitable.
+
+    ``deadline`` (a time.monotonic() value) also bounds the wait for
+    another process's in-flight fetch; past it the stale entry, if any,
+    is served rather than waiting.
+    """
+    ttl = SOURCE_TTL_SECONDS.get(source, DEFAULT_TTL_SECONDS) if ttl is None else ttl
+    path = _entry_path(source, key)
+    if deadline is None:
+        deadline = time.monotonic() + LOCK_TIMEOUT_SECONDS
+
+    entry = _read_entry(path)
+    if _is_fresh(entry, ttl):
+        return entry["data"]
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        lock_file = open(f"{path}.fetch.lock", "w")
+    except OSError as exc:
+        log(f"{source}: cache unavailable ({exc}); fetching directly")
+        return await _call_async(source, fetch)
+
+    with lock_file:
+        if not await _acquire_async(lock_file, deadline):
+            log(f"{source}: deadline passed waiting for another fetch")
+            return entry["data"] if _is_fresh(entry, max_stale) else None
+
+        entry = _read_entry(path)
+        if _is_fresh(entry, ttl):
+            return entry["data"]
+
+        return _settle(source, path, await _call_async(source, fetch), entry, max_stale)
+
+
+def _call(source: str, fetch: Callable[[], Any]) -> Any:
+    try:
+        return fetch()
+    except Exception as exc:  # noqa: BLE001
+        log(f"{source}: fetch failed: {exc}")
+        return None
+
+
+async def _call_async(source: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    try:
+        return await fetch()
+    except Exception as exc:  # noqa: BLE001
+        log(f"{source}: fetch failed: {exc}")
+        return None
+
+
+def invalidate(source: str, key: str = "") -> None:
+    """Drop a cached response so the next call refetches."""
+    try:
+        os.remove(_entry_path(source, key))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,114 @@
+"""Pooled async HTTP for external data fetches.
+
+One ``httpx.AsyncClient`` (keep-alive, connection pool) is shared by the
+NOAA and OpenWeather requests of a gathering phase so they run
+concurrently. Retries use tenacity like the sync fetchers (3 attempts,
+exponential backoff from 2 s up to 30 s, with jitter so the concurrent
+requests don't retry in lockstep), but are stopped by one shared
+deadline: no attempt or backoff starts that would end past it, so the
+phase as a whole has a bounded wall time instead of stacked per-call
+retries.
+
+Usage:
+    import asyncio, time
+    from utils.http_client import async_client, fetch_json_async
+
+    async def main():
+        deadline = time.monotonic() + 20
+        async with async_client() as client:
+            data = await fetch_json_async(client, url, params, deadline)
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    RetryError,
+    retry_if_exception_type,
+    stop_after_attempt,
+    stop_before_delay,
+    wait_exponential_jitter,
+)
+
+from utils.logger import create_logger
+
+log = create_logger("http_client")
+
+RETRY_ATTEMPTS = 3
+RETRY_MIN_WAIT = 2.0
+RETRY_MAX_WAIT = 30.0
+RETRY_JITTER = 1.0
+
+
+def async_client(max_connections: int = 8) -> httpx.AsyncClient:
+    """AsyncClient with keep-alive pooling for external API calls."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=30.0,
+        ),
+        headers={"User-Agent": "greenhouse-gazette"},
+        follow_redirects=True,
+    )
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    log(
+        f"Attempt {retry_state.attempt_number} for {retry_state.args[1]} failed "
+        f"({retry_state.outcome.exception()}); retrying in {retry_state.upcoming_sleep:.0f}s"
+    )
+
+
+async def _get_json(
+    client: httpx.AsyncClient, url: str, params: Dict[str, Any], deadline: float, timeout: float
+) -> Dict[str, Any]:
+    resp = await client.get(url, params=params, timeout=min(timeout, deadline - time.monotonic()))
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def fetch_json_async(
+    client: httpx.AsyncClient,
+    url: str,
+    params: Dict[str, Any],
+    deadline: float,
+    timeout: float = 10.0,
+    attempts: int = RETRY_ATTEMPTS,
+) -> Optional[Dict[str, Any]]:
+    """GET ``url`` and decode JSON, retrying transport/HTTP errors until ``deadline``.
+
+    Args:
+        client: Shared AsyncClient
+        url: Endpoint
+        params: Query parameters
+        deadline: time.monotonic() value after which no attempt is started
+        timeout: Per-attempt timeout (clipped to the time left)
+        attempts: Maximum attempts
+
+    Returns:
+        Decoded JSON, or None if every attempt failed or time ran out
+    """
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        log(f"Deadline reached before requesting {url}")
+        return None
+    retrying = AsyncRetrying(
+        # stop_before_delay is stop_after_delay counting the coming backoff,
+        # so a retry that would end past the deadline isn't started
+        stop=stop_after_attempt(attempts) | stop_before_delay(remaining),
+        wait=wait_exponential_jitter(initial=RETRY_MIN_WAIT, max=RETRY_MAX_WAIT, jitter=RETRY_JITTER),
+        retry=retry_if_exception_type((httpx.HTTPError, ValueError)),
+        before_sleep=_log_retry,
+        sleep=asyncio.sleep,
+    )
+    try:
+        return await retrying(_get_json, client, url, params, deadline, timeout)
+    except RetryError as exc:
+        last = exc.last_attempt
+        log(f"Giving up on {url} after {last.attempt_number} attempt(s): {last.exception()}")
+        return None
@@ -3,18 +3,49 @@
 Provides common image processing functions used by timelapse generators.
 
 Usage:
-    from utils.image_utils import sample_frames_evenly
+    from utils.image_utils import sample_frames_evenly, select_quality_frames
     
     # Sample 50 frames evenly from a list of 500 images
     frames = sample_frames_evenly(all_images, target_count=50)
+
+    # Same, but skip dark/blurry/duplicate frames using curator metrics
+    frames = select_quality_frames(all_images, target_count=50)
+
+    # Even out exposure across a sequence of loaded PIL frames
+    frames = deflicker_frames(frames)
 """
 
-from typing import List
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
 
+from utils.io import atomic_read_json, atomic_write_json
 from utils.logger import create_logger
 
 log = create_logger("image_utils")
 
+# Per-day sidecar written by curator alongside archived images
+FRAME_METRICS_FILENAME = ".frame_metrics.json"
+
+# Sharpness is measured on a fixed-width copy so thresholds don't depend
+# on camera resolution.
+METRICS_ANALYSIS_WIDTH = 640
+
+# Quality gates for timelapse frame selection
+MIN_FRAME_LUMINANCE = 30.0  # Matches curator's "dim" threshold
+MIN_FRAME_SHARPNESS = 15.0  # Laplacian variance at METRICS_ANALYSIS_WIDTH
+MAX_DUPLICATE_DISTANCE = 2  # dHash Hamming distance treated as a repeat
+
+# Deflicker: frames are pulled towards a moving average of their neighbours'
+# brightness. Pillow releases the GIL while decoding/resizing, so frame prep
+# runs on a thread pool.
+DEFLICKER_WINDOW = 9  # Frames in the smoothing window (odd)
+DEFLICKER_MAX_GAIN = 1.5  # Clamp so night-to-day transitions aren't flattened
+DEFLICKER_THUMB_SIZE = (160, 120)  # Decode size when no cached luma exists
+FRAME_PREP_WORKERS = int(
+    os.getenv("TIMELAPSE_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+
 
 def sample_frames_evenly(images: List[str], target_count: int) -> List[str]:
     """Sample frames evenly from an image list to reach target count.
@@ -38,3 +69,287 @@ def sample_frames_evenly(images: List[str], target_count: int) -> List[str]:
 
     log(f"Sampled {len(sampled)} frames from {len(images)} images")
     return sampled
+
+
+def compute_frame_metrics(gray: Any) -> Dict[str, Any]:
+    """Compute cheap quality metrics for a grayscale image.
+
+    Args:
+        gray: 2-D uint8 numpy array (OpenCV grayscale image)
+
+    Returns:
+        Dict with ``luma`` (mean brightness 0-255), ``sharpness``
+        (Laplacian variance) and ``dhash`` (64-bit difference hash as hex)
+    """
+    import cv2
+
+    height, width = gray.shape[:2]
+    if width > METRICS_ANALYSIS_WIDTH:
+        scaled_height = max(1, int(height * METRICS_ANALYSIS_WIDTH / width))
+        small = cv2.resize(
+            gray, (METRICS_ANALYSIS_WIDTH, scaled_height), interpolation=cv2.INTER_AREA
+        )
+    else:
+        small = gray
+
+    sharpness = float(cv2.Laplacian(small, cv2.CV_64F).var())
+
+    # dHash: compare horizontally adjacent pixels of a 9x8 thumbnail
+    thumb = cv2.resize(small, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (thumb[:, 1:] > thumb[:, :-1]).flatten()
+    dhash = 0
+    for bit in bits:
+        dhash = (dhash << 1) | int(bit)
+
+    return {
+        "luma": round(float(gray.mean()), 2),
+        "sharpness": round(sharpness, 2),
+        "dhash": f"{dhash:016x}",
+    }
+
+
+def record_frame_metrics(image_path: str, metrics: Dict[str, Any]) -> None:
+    """Store metrics for an image in its directory's sidecar file."""
+    sidecar = os.path.join(os.path.dirname(image_path), FRAME_METRICS_FILENAME)
+    existing = atomic_read_json(sidecar, default={})
+    if not isinstance(existing, dict):
+        existing = {}
+    existing[os.path.basename(image_path)] = metrics
+    atomic_write_json(sidecar, existing, indent=None)
+
+
+def load_frame_metrics(images: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Load cached metrics for the given images, keyed by image path.
+
+    Reads one sidecar per directory; never opens the images themselves.
+    Images without cached metrics are simply absent from the result.
+    """
+    by_dir: Dict[str, Dict[str, Any]] = {}
+    result: Dict[str, Dict[str, Any]] = {}
+    for path in images:
+        directory = os.path.dirname(path)
+        if directory not in by_dir:
+            data = atomic_read_json(
+                os.path.join(directory, FRAME_METRICS_FILENAME), default={}
+            )
+            by_dir[directory] = data if isinstance(data, dict) else {}
+        entry = by_dir[directory].get(os.path.basename(path))
+        if entry:
+            result[path] = entry
+    return result
+
+
+def hash_distance(a: Optional[str], b: Optional[str]) -> int:
+    """Hamming distance between two hex dHashes (64 if either is missing)."""
+    if not a or not b:
+        return 64
+    try:
+        return bin(int(a, 16) ^ int(b, 16)).count("1")
+    except ValueError:
+        return 64
+
+
+def _is_usable(
+    metrics: Optional[Dict[str, Any]], min_luminance: float, min_sharpness: float
+) -> bool:
+    """Frames without metrics (e.g. archived before curation stored them) pass."""
+    if not metrics:
+        return True
+    if metrics.get("luma", min_luminance) < min_luminance:
+        return False
+    if metrics.get("sharpness", min_sharpness) < min_sharpness:
+        return False
+    return True
+
+
+def select_quality_frames(
+    images: List[str],
+    target_count: int,
+    metrics: Optional[Dict[str, Dict[str, Any]]] = None,
+    min_luminance: float = MIN_FRAME_LUMINANCE,
+    min_sharpness: float = MIN_FRAME_SHARPNESS,
+    max_duplicate_distance: int = MAX_DUPLICATE_DISTANCE,
+) -> List[str]:
+    """Sample frames evenly across the timeline, skipping poor-quality ones.
+
+    Frames that are too dark or too blurry are dropped first, then the
+    remaining timeline is split into ``target_count`` equal slots. From each
+    slot the frame closest to the slot centre is taken unless it is a
+    near-duplicate of the previous pick, in which case its neighbours are
+    tried. A slot made up only of duplicates is left out.
+
+    Only the cached curator metrics are consulted, so no image is opened.
+    Falls back to ``sample_frames_evenly`` when too few frames pass.
+
+    Args:
+        images: List of image file paths (sorted chronologically)
+        target_count: Maximum number of frames in output
+        metrics: Optional pre-loaded metrics (see ``load_frame_metrics``)
+        min_luminance: Minimum mean brightness (0-255)
+        min_sharpness: Minimum Laplacian variance
+        max_duplicate_distance: dHash distance at or below which a frame
+            counts as a duplicate of the previous pick
+
+    Returns:
+        List of selected image paths in chronological order
+    """
+    if not images or target_count <= 0:
+        return []
+
+    if metrics is None:
+        metrics = load_frame_metrics(images)
+
+    usable = [
+        i
+        for i, path in enumerate(images)
+        if _is_usable(metrics.get(path), min_luminance, min_sharpness)
+    ]
+    if len(usable) < min(2, len(images)):
+        log("Too few frames pass quality gates; using plain even sampling")
+        return sample_frames_evenly(images, target_count)
+
+    # Slot over the usable frames so rejected stretches don't cost frames;
+    # within a slot prefer the frame nearest its centre to keep spacing even.
+    if len(usable) <= target_count:
+        slots = [[i] for i in usable]
+    else:
+        step = len(usable) / target_count
+        slots = []
+        for slot in range(target_count):
+            members = usable[int(slot * step) : int((slot + 1) * step)]
+            centre = (len(members) - 1) / 2
+            order = sorted(range(len(members)), key=lambda k: abs(k - centre))
+            slots.append([members[k] for k in order])
+
+    selected: List[str] = []
+    last_hash: Optional[str] = None
+    for candidates in slots:
+        for idx in candidates:
+            frame_hash = (metrics.get(images[idx]) or {}).get("dhash")
+            if (
+                last_hash is not None
+                and hash_distance(frame_hash, last_hash) <= max_duplicate_distance
+            ):
+                continue
+            selected.append(images[idx])
+            if frame_hash:
+                last_hash = frame_hash
+            break
+
+    log(
+        f"Selected {len(selected)} quality frames from {len(images)} images "
+        f"({len(images) - len(usable)} rejected, {len(metrics)} with metrics)"
+    )
+    return selected
+
+
+def read_frame_luminance(image_path: str) -> Optional[float]:
+    """Mean brightness of an image, decoded at thumbnail size.
+
+    Uses JPEG draft mode so the decoder only produces a small image.
+    Returns None if the file cannot be read.
+    """
+    import numpy as np
+    from PIL import Image
+
+    try:
+        with Image.open(image_path) as img:
+            img.draft("L", DEFLICKER_THUMB_SIZE)
+            gray = img.convert("L")
+            gray.thumbnail(DEFLICKER_THUMB_SIZE)
+            return float(np.asarray(gray, dtype=np.uint8).mean())
+    except Exception as exc:  # noqa: BLE001
+        log(f"Could not measure luminance of {image_path}: {exc}")
+        return None
+
+
+def frame_luminances(
+    images: List[str],
+    metrics: Optional[Dict[str, Dict[str, Any]]] = None,
+    workers: int = FRAME_PREP_WORKERS,
+) -> List[Optional[float]]:
+    """Per-frame mean luminance, preferring cached curator metrics.
+
+    Only frames without a cached ``luma`` are decoded (as thumbnails,
+    in parallel).
+    """
+    if metrics is None:
+        metrics = load_frame_metrics(images)
+
+    lumas: List[Optional[float]] = [
+        (metrics.get(path) or {}).get("luma") for path in images
+    ]
+    missing = [i for i, luma in enumerate(lumas) if luma is None]
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            measured = pool.map(read_frame_luminance, [images[i] for i in missing])
+            for i, luma in zip(missing, measured):
+                lumas[i] = luma
+    return lumas
+
+
+def deflicker_gains(
+    lumas: Sequence[Optional[float]],
+    window: int = DEFLICKER_WINDOW,
+    max_gain: float = DEFLICKER_MAX_GAIN,
+) -> List[float]:
+    """Compute a per-frame brightness gain that smooths exposure flicker.
+
+    Each frame's log-luminance is compared with a moving average over
+    ``window`` neighbours; the gain moves the frame onto that curve. Slow
+    changes (sunrise, clouds rolling in) survive, frame-to-frame jumps
+    don't. Frames with unknown luminance get a gain of 1.0.
+
+    Returns:
+        List of gains, one per input frame
+    """
+    import numpy as np
+
+    count = len(lumas)
+    if count < 3:
+        return [1.0] * count
+
+    values = np.array(
+        [np.nan if v is None or v <= 0 else float(v) for v in lumas], dtype=np.float64
+    )
+    known = ~np.isnan(values)
+    if known.sum() < 3:
+        return [1.0] * count
+
+    # Fill unknown frames by interpolation so they don't skew neighbours
+    positions = np.arange(count)
+    log_luma = np.interp(positions, positions[known], np.log(values[known]))
+
+    window = max(3, min(window, count) | 1)
+    pad = window // 2
+    padded = np.pad(log_luma, pad, mode="edge")
+    smoothed = np.convolve(padded, np.ones(window) / window, mode="valid")
+
+    gains = np.exp(smoothed - log_luma)
+    gains = np.clip(gains, 1.0 / max_gain, max_gain)
+    gains[~known] = 1.0
+    return gains.tolist()
+
+
+def apply_gain(img: Any, gain: float) -> Any:
+    """Scale a PIL image's brightness by ``gain`` using a lookup table."""
+    import numpy as np
+    from PIL import Image
+
+    if abs(gain - 1.0) < 0.01:
+        return img
+    lut = np.clip(np.arange(256) * gain + 0.5, 0, 255).astype(np.uint8)
+    return Image.fromarray(lut[np.asarray(img)], mode=img.mode)
+
+
+def deflicker_frames(frames: List[Any], workers: int = FRAME_PREP_WORKERS) -> List[Any]:
+    """Deflicker a sequence of already-downscaled PIL frames in memory."""
+    import numpy as np
+
+    if len(frames) < 3:
+        return frames
+
+    lumas = [float(np.asarray(f.convert("L")).mean()) for f in frames]
+    gains = deflicker_gains(lumas)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return list(pool.map(apply_gain, frames, gains))
@@ -0,0 +1,199 @@
+"""Small dependency-aware task runner for Greenhouse Gazette scripts.
+
+Runs a handful of named steps concurrently, starting each one as soon as
+the steps it depends on have finished. I/O-bound steps run on threads;
+CPU-bound steps can be sent to a process pool. Per-step timings are
+logged as a summary at the end.
+
+Usage:
+    from utils.task_graph import TaskGraph
+
+    graph = TaskGraph("edition")
+    graph.add("weather", weather_service.get_current_weather)
+    graph.add("chart", chart_generator.generate_temperature_chart,
+              kwargs={"hours": 24}, in_process=True)
+    graph.add("narrative", make_narrative, deps=["weather"])
+    results = graph.run()
+
+Each step is called with the results of its dependencies as positional
+arguments (in ``deps`` order), followed by any ``args``/``kwargs``. A step
+that raises yields ``None``; its dependents still run and must cope.
+"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.logger import create_logger
+
+log = create_logger("task_graph")
+
+
+@dataclass
+class _Task:
+    name: str
+    func: Callable[..., Any]
+    deps: Tuple[str, ...]
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+    in_process: bool
+    start: float = 0.0
+    duration: float = 0.0
+    error: Optional[BaseException] = None
+    where: str = "thread"
+
+
+class TaskGraph:
+    """Named steps with dependencies, executed concurrently by ``run()``."""
+
+    def __init__(self, name: str = "pipeline", process_workers: int = 2):
+        self.name = name
+        self.process_workers = process_workers
+        self.wall_seconds = 0.0
+        self._tasks: Dict[str, _Task] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        deps: Sequence[str] = (),
+        args: Sequence[Any] = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+        in_process: bool = False,
+    ) -> None:
+        """Register a step. Dependencies must already be registered.
+
+        ``in_process`` steps run in a worker process; ``func`` and its
+        arguments must be picklable (module-level functions). If the
+        process pool can't take the step, it runs on a thread instead.
+        """
+        if name in self._tasks:
+            raise ValueError(f"Duplicate task name: {name}")
+        missing = [dep for dep in deps if dep not in self._tasks]
+        if missing:
+            raise ValueError(f"Task '{name}' depends on unknown task(s): {missing}")
+        self._tasks[name] = _Task(
+            name=name,
+            func=func,
+            deps=tuple(deps),
+            args=tuple(args),
+            kwargs=dict(kwargs or {}),
+            in_process=in_process,
+        )
+
+    def run(self) -> Dict[str, Any]:
+        """Execute all steps and return their results keyed by name."""
+        results: Dict[str, Any] = {}
+        futures: Dict[str, Future] = {}
+        origin = time.perf_counter()
+
+        needs_processes = any(task.in_process for task in self._tasks.values())
+        process_pool = (
+            ProcessPoolExecutor(
+                max_workers=max(1, self.process_workers),
+                # spawn: forking while worker threads hold locks can deadlock
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            if needs_processes
+            else None
+        )
+        results_lock = threading.Lock()
+
+        def execute(task: _Task) -> Any:
+            dep_values = [futures[dep].result() for dep in task.deps]
+            call_args = (*dep_values, *task.args)
+            task.start = time.perf_counter() - origin
+            try:
+                if task.in_process and process_pool is not None:
+                    try:
+                        value = process_pool.submit(task.func, *call_args, **task.kwargs).result()
+                        task.where = "process"
+                    except Exception as exc:  # noqa: BLE001
+                        if not _is_pool_error(exc):
+                            raise
+                        log(f"[{self.name}] {task.name}: process pool unavailable ({exc}); running on thread")
+                        value = task.func(*call_args, **task.kwargs)
+                else:
+                    value = task.func(*call_args, **task.kwargs)
+            except Exception as exc:  # noqa: BLE001
+                task.error = exc
+                value = None
+                log(f"[{self.name}] {task.name} failed: {exc}")
+            finally:
+                task.duration = time.perf_counter() - origin - task.start
+            with results_lock:
+                results[task.name] = value
+            return value
+
+        try:
+            # One thread per step so waiting on dependencies can't starve the pool
+            with ThreadPoolExecutor(
+                max_workers=max(1, len(self._tasks)), thread_name_prefix=self.name
+            ) as pool:
+                for task in self._tasks.values():
+                    futures[task.name] = pool.submit(execute, task)
+                for future in futures.values():
+                    future.result()
+        finally:
+            if process_pool is not None:
+                process_pool.shutdown(wait=True, cancel_futures=True)
+
+        self.wall_seconds = time.perf_counter() - origin
+        self.log_summary()
+        return results
+
+    def timings(self) -> List[Dict[str, Any]]:
+        """Per-step timing records, ordered by start time."""
+        return [
+            {
+                "name": task.name,
+                "start": round(task.start, 3),
+                "duration": round(task.duration, 3),
+                "where": task.where,
+                "ok": task.error is None,
+            }
+            for task in sorted(self._tasks.values(), key=lambda t: t.start)
+        ]
+
+    def critical_path(self) -> Tuple[List[str], float]:
+        """Longest dependency chain by summed step duration."""
+        best: Dict[str, Tuple[float, List[str]]] = {}
+        for task in self._tasks.values():  # insertion order is topological
+            prior = max(
+                (best[dep] for dep in task.deps), key=lambda item: item[0], default=(0.0, [])
+            )
+            best[task.name] = (prior[0] + task.duration, prior[1] + [task.name])
+        if not best:
+            return [], 0.0
+        total, chain = max(best.values(), key=lambda item: item[0])
+        return chain, total
+
+    def log_summary(self) -> None:
+        """Log per-step timings, the critical path and the wall-clock total."""
+        serial = sum(task.duration for task in self._tasks.values())
+        chain, chain_seconds = self.critical_path()
+        lines = [f"[{self.name}] stage timings:"]
+        for record in self.timings():
+            status = "ok" if record["ok"] else "FAILED"
+            lines.append(
+                f"  {record['name']:<14} start {record['start']:6.2f}s  "
+                f"took {record['duration']:6.2f}s  ({record['where']}, {status})"
+            )
+        lines.append(
+            f"  wall {self.wall_seconds:.2f}s vs {serial:.2f}s serial; "
+            f"critical path {' -> '.join(chain)} = {chain_seconds:.2f}s"
+        )
+        log("\n".join(lines))
+
+
+def _is_pool_error(exc: BaseException) -> bool:
+    """Whether an exception came from the process pool rather than the step."""
+    import pickle
+    from concurrent.futures.process import BrokenProcessPool
+
+    if isinstance(exc, (BrokenProcessPool, pickle.PicklingError)):
+        return True
+    return "pickle" in str(exc).lower()
@@ -69,6 +69,33 @@ def mock_env_vars(monkeypatch):
         monkeypatch.setenv(key, value)
 
 
+@pytest.fixture(autouse=True)
+def isolated_fetch_cache(tmp_path, monkeypatch):
+    """Give each test its own external API response cache."""
+    monkeypatch.setenv("FETCH_CACHE_DIR", str(tmp_path / "fetch_cache"))
+
+
+@pytest.fixture(autouse=True)
+def isolated_llm_slots(tmp_path, monkeypatch):
+    """Give each test its own LLM gateway slot locks and metrics file."""
+    monkeypatch.setenv("LLM_SLOT_DIR", str(tmp_path / "llm_slots"))
+    monkeypatch.setenv("LLM_METRICS_PATH", str(tmp_path / "llm_metrics.json"))
+
+
+@pytest.fixture(autouse=True, scope="session")
+def isolated_template_cache(tmp_path_factory):
+    """Keep compiled email template bytecode out of /app/data."""
+    os.environ["TEMPLATE_CACHE_DIR"] = str(tmp_path_factory.mktemp("jinja"))
+
+
+@pytest.fixture(autouse=True)
+def isolated_mail_outbox(tmp_path, monkeypatch):
+    """Give each test its own outbound mail queue, with no sender thread."""
+    import mail_outbox
+    monkeypatch.setenv("MAIL_OUTBOX_DIR", str(tmp_path / "outbox"))
+    monkeypatch.setattr(mail_outbox, "start", lambda: None)
+
+
 # =============================================================================
 # Data Fixtures
 # =============================================================================
@@ -0,0 +1,166 @@
+"""
+Unit tests for conditions_log.py and context_backtest.py
+"""
+
+import json
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+import conditions_log
+import context_backtest
+
+GRAPH = {
+    "thresholds": {"sound_flood_minor_ft": 2.0},
+    "alerts": [
+        {"id": "freeze", "priority": "critical", "text": "Hard freeze", "triggers": {"temp_lt_f": 28}},
+    ],
+    "sensory": [],
+    "infrastructure": [
+        {"id": "bridge_wind", "text": "Bridge advisory", "triggers": {"wind_gt_mph": 30}},
+    ],
+    "micro_seasons": [
+        {"id": "ghost_season", "name": "Ghost Season", "months": [1, 2], "vibe": "Quiet."},
+    ],
+}
+
+
+@pytest.fixture
+def log_dirs(tmp_path, monkeypatch):
+    sensor_dir = tmp_path / "sensor_log"
+    conditions_dir = sensor_dir / "conditions"
+    conditions_dir.mkdir(parents=True)
+    monkeypatch.setattr(conditions_log, "SENSOR_LOG_DIR", str(sensor_dir))
+    monkeypatch.setattr(conditions_log, "CONDITIONS_LOG_DIR", str(conditions_dir))
+    return sensor_dir, conditions_dir
+
+
+def _write(log_dir, entries):
+    """Append entries (ts as naive UTC datetime) in the monthly JSONL layout."""
+    for ts, body in entries:
+        with open(log_dir / ts.strftime("%Y-%m.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps({"ts": ts.isoformat() + "Z", **body}, separators=(",", ":")) + "\n")
+
+
+class TestRecordConditions:
+    """Tests for record_conditions()."""
+
+    @pytest.mark.unit
+    def test_appends_snapshot(self, log_dirs):
+        _, conditions_dir = log_dirs
+        data = {
+            "weather": {"outdoor_temp": 50, "wind_arrow": "↑"},
+            "coast_sky": {"sound_level": {"observed_level_ft": 1.2}},
+        }
+        with patch("conditions_log.external_data.gather_external_data", return_value=data):
+            conditions_log.record_conditions(datetime(2025, 12, 3, 14, 0))
+
+        [line] = (conditions_dir / "2025-12.jsonl").read_text().splitlines()
+        assert line.startswith('{"ts":"2025-12-03T14:00:00Z"')
+        assert json.loads(line)["weather"] == {"outdoor_temp": 50}
+        assert json.loads(line)["coast"] == {"observed_level_ft": 1.2}
+
+    @pytest.mark.unit
+    def test_skips_when_nothing_fetched(self, log_dirs):
+        _, conditions_dir = log_dirs
+        with patch("conditions_log.external_data.gather_external_data", return_value={}):
+            assert conditions_log.record_conditions() is None
+        assert not list(conditions_dir.iterdir())
+
+
+class TestReadHourly:
+    """Tests for read_hourly()."""
+
+    @pytest.mark.unit
+    def test_keeps_last_entry_per_hour(self, log_dirs):
+        sensor_dir, _ = log_dirs
+        _write(sensor_dir, [
+            (datetime(2025, 1, 31, 23, 0), {"sensors": {"t": 1}}),
+            (datetime(2025, 1, 31, 23, 59), {"sensors": {"t": 2}}),
+            (datetime(2025, 2, 1, 0, 30), {"sensors": {"t": 3}}),
+            (datetime(2025, 2, 1, 2, 0), {"sensors": {"t": 4}}),
+        ])
+        with open(sensor_dir / "2025-02.jsonl", "a", encoding="utf-8") as f:
+            f.write('{"sensors": {"t": 5}, "ts": "2025-02-01T01:10:00Z"}\nnot json\n')
+
+        hourly = conditions_log.read_hourly(str(sensor_dir), datetime(2025, 1, 31, 23), datetime(2025, 2, 1, 2))
+
+        assert {hour: e["sensors"]["t"] for hour, e in hourly.items()} == {
+            "2025-01-31T23": 2, "2025-02-01T00": 3, "2025-02-01T01": 5,
+        }
+
+
+class TestBuildCases:
+    """Tests for build_cases()."""
+
+    @pytest.mark.unit
+    def test_forward_fills_and_merges(self, log_dirs):
+        sensor_dir, conditions_dir = log_dirs
+        _write(sensor_dir, [(datetime(2025, 6, 1, 10, 30), {"sensors": {"outdoor_temp": 60, "humidity": 80}})])
+        _write(conditions_dir, [(datetime(2025, 6, 1, 10, 0), {
+            "weather": {"outdoor_temp": 72}, "coast": {"observed_level_ft": 1.1},
+        })])
+
+        hours, cases = context_backtest.build_cases(
+            datetime(2025, 6, 1, 9), datetime(2025, 6, 1, 16), context_backtest._local_zone()
+        )
+
+        assert [h - hours[0] for h in hours] == [0, 1, 2, 3]  # 10Z-13Z; 14Z is past both fill limits
+        when, weather, coast = cases[0]
+        assert when.isoformat() == "2025-06-01T06:00:00-04:00"
+        assert weather == {"outdoor_temp": 72, "humidity": 80}
+        assert coast == {"observed_level_ft": 1.1}
+        assert cases[2][1] == {"outdoor_temp": 72}  # Sensor reading too old by 12Z
+
+
+class TestRunBacktest:
+    """Tests for run_backtest()."""
+
+    @pytest.mark.unit
+    def test_counts_and_episodes_across_chunks(self, log_dirs):
+        _, conditions_dir = log_dirs
+        start = datetime(2025, 1, 31, 20)
+        _write(conditions_dir, [
+            (start + timedelta(hours=i), {
+                "weather": {"outdoor_temp": 20 if 2 <= i <= 5 else 40, "wind_mph": 10, "wind_deg": 225},
+                "coast": {"observed_level_ft": 2.5 if i == 8 else 1.0},
+            })
+            for i in range(9)  # 20Z Jan 31 - 04Z Feb 1; the replay is split at the UTC month
+        ])
+
+        report = context_backtest.run_backtest(datetime(2025, 1, 31), datetime(2025, 2, 2), GRAPH, workers=1)
+        rules = {r["id"]: r for r in report["rules"]}
+
+        assert report["hours"] == 12  # 9 snapshots + 3 forward-filled
+        assert report["gaps"] == 36
+        assert (rules["freeze"]["hours"], rules["freeze"]["episodes"]) == (4, 1)
+        assert (rules["ghost_season"]["hours"], rules["ghost_season"]["episodes"]) == (12, 1)
+        assert rules["flood_minor"]["hours"] == 4
+        assert rules["bridge_wind"]["hours"] == 0
+        assert {"a": "freeze", "b": "ghost_season", "hours": 4} in report["cooccurrence"]
+        assert {"id": "freeze", "start": "2025-01-31T17:00:00-05:00",
+                "end": "2025-01-31T20:00:00-05:00", "hours": 4} in report["timeline"]
+        assert "freeze" in context_backtest.format_report(report, timeline=True)
+
+
+class TestApplyOverride:
+    """Tests for apply_override()."""
+
+    @pytest.mark.unit
+    def test_threshold_and_list_paths(self):
+        graph = json.loads(json.dumps(GRAPH))
+        context_backtest.apply_override(graph, "thresholds.sound_flood_minor_ft=1.8")
+        context_backtest.apply_override(graph, "infrastructure.bridge_wind.triggers.wind_gt_mph=35")
+
+        assert graph["thresholds"]["sound_flood_minor_ft"] == 1.8
+        assert graph["infrastructure"][0]["triggers"]["wind_gt_mph"] == 35
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("assignment, error", [
+        ("alerts.nope.triggers.temp_lt_f=30", KeyError),
+        ("thresholds.sound_flood_minor_ft", ValueError),
+    ])
+    def test_rejects_bad_paths(self, assignment, error):
+        with pytest.raises(error):
+            context_backtest.apply_override(json.loads(json.dumps(GRAPH)), assignment)
@@ -0,0 +1,161 @@
+"""
+Unit tests for context_engine.py
+"""
+
+import json
+import os
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+import context_engine
+
+GRAPH = {
+    "version": "test",
+    "thresholds": {"sound_flood_moderate_ft": 3.0},
+    "flooding_zones": {"second_to_flood": "Colington Rd"},
+    "alerts": [
+        {"id": "freeze", "priority": "critical", "icon": "🥶", "text": "Hard freeze",
+         "triggers": {"temp_lt_f": 28}},
+        {"id": "sw_blow", "text": "SW blow", "triggers": {"wind_dir": "SW", "wind_gt_mph": 20}},
+    ],
+    "sensory": [
+        {"id": "calm_evening", "icon": "🌅", "text": "Glassy water",
+         "triggers": {"wind_lt_mph": 5, "hour_between": [17, 20]}},
+    ],
+    "infrastructure": [
+        {"id": "septic", "text": "Septic strain", "triggers": {"rain_24h_gt_in": 1.5}},
+    ],
+    "micro_seasons": [
+        {"id": "ghost_season", "name": "Ghost Season", "months": [1, 2], "vibe": "Quiet."},
+        {"id": "winter_wrap", "name": "Wrap", "start_md": [11, 15], "end_md": [2, 28], "vibe": "Cold."},
+        {"id": "friday_tourists", "name": "Turnover", "months": [6, 7], "dow": 5, "vibe": "Traffic."},
+        {"id": "dry_june", "name": "Dry June", "months": [6], "vibe": "Dust.",
+         "triggers": {"rain_24h_lt_in": 0.1}},
+    ],
+}
+
+CALM = {"wind_mph": 3, "wind_deg": 180, "rain_last_24h_in": 0, "outdoor_temp": 70}
+
+
+@pytest.fixture
+def graph_file(tmp_path):
+    path = tmp_path / "graph.json"
+    path.write_text(json.dumps(GRAPH))
+    with patch("context_engine._get_graph_path", return_value=str(path)):
+        yield path
+
+
+def _ids(flags):
+    return [f["id"] for f in flags]
+
+
+class TestEvaluateContextBatch:
+    """Tests for evaluate_context_batch()."""
+
+    @pytest.mark.unit
+    def test_triggers_and_flooding(self, graph_file):
+        weather = {"wind_mph": 25, "wind_deg": 225, "rain_last_24h_in": 2.0, "outdoor_temp": 20}
+        [flags] = context_engine.evaluate_context_batch(
+            [(datetime(2025, 3, 10, 9), weather, {"observed_level_ft": 3.2})]
+        )
+
+        assert _ids(flags) == ["freeze", "sw_blow", "flood_moderate", "septic"]
+        assert "Colington Rd" in flags[2]["text"]
+
+    @pytest.mark.unit
+    def test_missing_temperature_never_matches_temp_triggers(self, graph_file):
+        [flags] = context_engine.evaluate_context_batch(
+            [(datetime(2025, 3, 10, 9), {"wind_mph": 10}, {})]
+        )
+        assert "freeze" not in _ids(flags)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("when, expected", [
+        (datetime(2025, 1, 15, 9), ["ghost_season", "winter_wrap"]),
+        (datetime(2024, 2, 29, 9), ["ghost_season"]),  # after Feb 28 end
+        (datetime(2025, 11, 15, 9), ["winter_wrap"]),
+        (datetime(2025, 6, 13, 9), ["friday_tourists", "dry_june"]),  # a Friday
+        (datetime(2025, 6, 14, 9), ["dry_june"]),
+        (datetime(2025, 9, 1, 9), []),
+    ])
+    def test_season_index(self, graph_file, when, expected):
+        [flags] = context_engine.evaluate_context_batch([(when, CALM, {})])
+        assert [f["id"] for f in flags if f["kind"] == "micro_seasons"] == expected
+
+    @pytest.mark.unit
+    def test_season_triggers_still_apply(self, graph_file):
+        wet = dict(CALM, rain_last_24h_in=0.5)
+        [flags] = context_engine.evaluate_context_batch([(datetime(2025, 6, 14, 9), wet, {})])
+        assert "dry_june" not in _ids(flags)
+
+    @pytest.mark.unit
+    def test_alternative_graph(self, graph_file):
+        tuned = dict(GRAPH, thresholds={"sound_flood_moderate_ft": 2.0})
+        cases = [(datetime(2025, 3, 10, 9), CALM, {"observed_level_ft": 2.5})]
+
+        assert "flood_moderate" not in _ids(context_engine.evaluate_context_batch(cases)[0])
+        assert "flood_moderate" in _ids(context_engine.evaluate_context_batch(cases, graph=tuned)[0])
+
+
+class TestEvaluateContextMatrix:
+    """Tests for evaluate_context_matrix()."""
+
+    @pytest.mark.unit
+    def test_matches_batch(self, graph_file):
+        cases = [
+            (datetime(2025, month, day, hour), {
+                "wind_mph": wind, "wind_deg": deg, "rain_last_24h_in": rain, "outdoor_temp": temp,
+            }, {"observed_level_ft": level} if level is not None else {})
+            for month, day in [(1, 15), (2, 28), (6, 13), (6, 14), (11, 20)]
+            for hour in (9, 18)
+            for wind, deg, rain, temp, level in [
+                (25, 225, 2.0, 20, 3.2), (3, 180, 0, 70, None), (22, None, 0.05, None, 1.0),
+            ]
+        ]
+        rules, mask = context_engine.evaluate_context_matrix(cases)
+        batch = context_engine.evaluate_context_batch(cases)
+
+        assert mask.shape == (len(cases), len(rules))
+        assert [[rules[j]["id"] for j in row.nonzero()[0]] for row in mask] == [_ids(f) for f in batch]
+
+    @pytest.mark.unit
+    def test_no_graph(self):
+        with patch("context_engine._load_graph", return_value={}):
+            rules, mask = context_engine.evaluate_context_matrix([(datetime(2025, 1, 1), CALM, {})])
+        assert rules == [] and mask.shape == (1, 0)
+
+
+class TestGetRichContext:
+    """Tests for get_rich_context()."""
+
+    @pytest.mark.unit
+    def test_formats_by_priority(self, graph_file):
+        weather = {"wind_mph": 3, "wind_deg": 180, "rain_last_24h_in": 0, "outdoor_temp": 20}
+        with patch("context_engine.random.random", return_value=0.0):
+            flags = context_engine.get_rich_context(datetime(2025, 1, 15, 18), weather, {})
+
+        assert flags == [
+            "🥶 Hard freeze",
+            "🌅 Glassy water",
+            "📅 SEASON: Ghost Season. Quiet.",
+            "📅 SEASON: Wrap. Cold.",
+        ]
+
+    @pytest.mark.unit
+    def test_recompiles_when_graph_changes(self, graph_file):
+        when = datetime(2025, 3, 10, 9)
+        assert context_engine.get_rich_context(when, {"outdoor_temp": 20}, {}) == ["🥶 Hard freeze"]
+
+        changed = dict(GRAPH, alerts=[dict(GRAPH["alerts"][0], text="Pipes at risk")])
+        graph_file.write_text(json.dumps(changed))
+        os.utime(graph_file, (1, 1))
+
+        assert context_engine.get_rich_context(when, {"outdoor_temp": 20}, {}) == ["🥶 Pipes at risk"]
+
+    @pytest.mark.unit
+    def test_no_graph(self):
+        with patch("context_engine._load_graph", return_value={}):
+            assert context_engine.get_rich_context(datetime(2025, 1, 1), CALM, {}) == []
+            assert context_engine.evaluate_context_batch([(datetime(2025, 1, 1), CALM, {})]) == [[]]
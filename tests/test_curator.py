@@ -171,6 +171,29 @@ class TestProcessFile:
         # Should not raise
         curator.process_file("/nonexistent/file.jpg")
 
+    @pytest.mark.unit
+    def test_caches_frame_metrics(self, tmp_path, monkeypatch):
+        """Should store luminance, sharpness and hash next to archived image."""
+        import cv2
+        from utils.image_utils import load_frame_metrics
+
+        img = np.full((100, 100, 3), 128, dtype=np.uint8)
+        img_path = tmp_path / "test.jpg"
+        cv2.imwrite(str(img_path), img)
+
+        archive_root = tmp_path / "archive"
+        archive_root.mkdir()
+        monkeypatch.setattr(curator, "ARCHIVE_ROOT", str(archive_root))
+
+        curator.process_file(str(img_path))
+
+        archived = [str(p) for p in archive_root.rglob("*.jpg")]
+        metrics = load_frame_metrics(archived)
+        entry = metrics[archived[0]]
+        assert entry["luma"] == pytest.approx(128, abs=2)
+        assert "sharpness" in entry
+        assert len(entry["dhash"]) == 16
+
 
 class TestLuminanceThresholds:
     """Tests for luminance threshold constants."""
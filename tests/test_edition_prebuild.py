@@ -0,0 +1,129 @@
+"""
+Unit tests for edition_prebuild.py
+"""
+
+from datetime import date, datetime
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import pytest
+
+import edition_prebuild
+
+TZ = ZoneInfo("America/New_York")
+
+# Tuesday 2025-06-17 evening build / Wednesday 2025-06-18 morning edition
+SUNSET_BUILD = datetime(2025, 6, 17, 20, 55, tzinfo=TZ)
+EARLY_BUILD = datetime(2025, 6, 18, 5, 0, tzinfo=TZ)
+DISPATCH = datetime(2025, 6, 18, 7, 0, tzinfo=TZ)
+
+
+@pytest.fixture
+def staging(tmp_path, monkeypatch):
+    monkeypatch.setattr(edition_prebuild, "STAGING_ROOT", str(tmp_path))
+    return tmp_path
+
+
+def _patched_sources(gif=b"GIF89a", chart=b"PNG"):
+    return (
+        patch("edition_prebuild.timelapse.create_daily_timelapse", return_value=gif),
+        patch("edition_prebuild.timelapse.create_weekly_timelapse", return_value=gif),
+        patch("edition_prebuild.chart_generator.generate_temperature_chart", return_value=chart),
+        patch(
+            "edition_prebuild.external_data.gather_external_data",
+            return_value={"weather": {"condition": "Clear"}, "coast_sky": {"tide_summary": {}}},
+        ),
+    )
+
+
+class TestEditionDate:
+    """Tests for edition_date_for()."""
+
+    @pytest.mark.unit
+    def test_evening_targets_tomorrow(self):
+        assert edition_prebuild.edition_date_for(SUNSET_BUILD) == date(2025, 6, 18)
+
+    @pytest.mark.unit
+    def test_early_morning_targets_today(self):
+        assert edition_prebuild.edition_date_for(EARLY_BUILD) == date(2025, 6, 18)
+
+
+class TestPrebuildEdition:
+    """Tests for prebuild_edition()."""
+
+    @pytest.mark.unit
+    def test_sunset_build_only_renders_gif(self, staging):
+        """Far from dispatch, only the GIF is worth building."""
+        daily, weekly, chart, external = _patched_sources()
+        with daily as mock_daily, weekly, chart as mock_chart, external as mock_external:
+            build_dir = edition_prebuild.prebuild_edition(SUNSET_BUILD)
+
+        assert build_dir is not None
+        mock_daily.assert_called_once_with(date(2025, 6, 17))
+        mock_chart.assert_not_called()
+        mock_external.assert_not_called()
+
+        manifest = edition_prebuild._current_build(date(2025, 6, 18))
+        assert set(manifest["assets"]) == {"timelapse"}
+        assert manifest["weekly"] is False
+
+    @pytest.mark.unit
+    def test_early_build_reuses_gif_and_adds_fresh_assets(self, staging):
+        """The 05:00 build keeps the sunset GIF and adds chart/weather/tides."""
+        with _patched_sources()[0]:
+            edition_prebuild.prebuild_edition(SUNSET_BUILD)
+
+        daily, weekly, chart, external = _patched_sources()
+        with daily as mock_daily, weekly, chart, external:
+            edition_prebuild.prebuild_edition(EARLY_BUILD)
+
+        mock_daily.assert_not_called()
+        manifest = edition_prebuild._current_build(date(2025, 6, 18))
+        assert set(manifest["assets"]) == {"timelapse", "chart", "weather", "coast_sky"}
+        assert manifest["assets"]["timelapse"] == SUNSET_BUILD.isoformat()
+        # Superseded sunset build is pruned
+        assert len([p for p in (staging / "2025-06-18").iterdir() if p.is_dir()]) == 1
+
+    @pytest.mark.unit
+    def test_nothing_built_stages_nothing(self, staging):
+        with _patched_sources(gif=None)[0]:
+            assert edition_prebuild.prebuild_edition(SUNSET_BUILD) is None
+        assert edition_prebuild._current_build(date(2025, 6, 18)) is None
+
+
+class TestLoadStagedAssets:
+    """Tests for load_staged_assets()."""
+
+    def _build(self):
+        daily, weekly, chart, external = _patched_sources()
+        with daily, weekly, chart, external:
+            edition_prebuild.prebuild_edition(EARLY_BUILD)
+
+    @pytest.mark.unit
+    def test_returns_all_assets_at_dispatch(self, staging):
+        self._build()
+        staged = edition_prebuild.load_staged_assets(False, now=DISPATCH)
+
+        assert staged["timelapse"] == b"GIF89a"
+        assert staged["chart"] == b"PNG"
+        assert staged["weather"] == {"condition": "Clear"}
+        assert "coast_sky" in staged
+
+    @pytest.mark.unit
+    def test_skips_stale_fresh_assets(self, staging):
+        """A late manual run should rebuild chart/weather but keep the GIF."""
+        self._build()
+        staged = edition_prebuild.load_staged_assets(
+            False, now=datetime(2025, 6, 18, 11, 0, tzinfo=TZ)
+        )
+
+        assert set(staged) == {"timelapse"}
+
+    @pytest.mark.unit
+    def test_ignores_mismatched_edition_mode(self, staging):
+        self._build()
+        assert edition_prebuild.load_staged_assets(True, now=DISPATCH) == {}
+
+    @pytest.mark.unit
+    def test_empty_when_nothing_staged(self, staging):
+        assert edition_prebuild.load_staged_assets(False, now=DISPATCH) == {}
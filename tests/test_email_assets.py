@@ -0,0 +1,82 @@
+"""
+Unit tests for email_assets.py (hosted email images)
+"""
+
+import os
+import time
+
+import pytest
+
+import email_assets
+
+
+@pytest.fixture
+def asset_dir(tmp_path, monkeypatch):
+    path = tmp_path / "email"
+    monkeypatch.setenv("EMAIL_ASSET_DIR", str(path))
+    monkeypatch.setenv("EMAIL_ASSET_BASE_URL", "https://example.com/static/email/")
+    return path
+
+
+class TestPublish:
+    """Tests for publish() and prune()."""
+
+    @pytest.mark.unit
+    def test_content_hashed_and_idempotent(self, asset_dir):
+        first = email_assets.publish(b"GIF89a-one", "gif")
+        again = email_assets.publish(b"GIF89a-one", "gif")
+        other = email_assets.publish(b"GIF89a-two", "gif")
+
+        assert first == again != other
+        assert first.startswith("https://example.com/static/email/") and first.endswith(".gif")
+        assert (asset_dir / first.rsplit("/", 1)[1]).read_bytes() == b"GIF89a-one"
+        assert len(list(asset_dir.iterdir())) == 2
+
+    @pytest.mark.unit
+    def test_unwritable_dir_falls_back_to_inline(self, tmp_path, monkeypatch):
+        blocker = tmp_path / "file"
+        blocker.write_text("not a directory")
+        monkeypatch.setenv("EMAIL_ASSET_DIR", str(blocker / "email"))
+        monkeypatch.setenv("EMAIL_ASSET_BASE_URL", "https://example.com/static/email")
+
+        assert email_assets.publish(b"data", "png") is None
+
+    @pytest.mark.unit
+    def test_prune_removes_old_assets(self, asset_dir):
+        old_url = email_assets.publish(b"old", "png")
+        old_path = asset_dir / old_url.rsplit("/", 1)[1]
+        stale = time.time() - (email_assets.RETENTION_DAYS + 1) * 86400
+        os.utime(old_path, (stale, stale))
+
+        email_assets.publish(b"new", "png")
+
+        assert not old_path.exists()
+        assert len(list(asset_dir.iterdir())) == 1
+
+    @pytest.mark.unit
+    def test_republishing_keeps_asset_from_prune(self, asset_dir):
+        url = email_assets.publish(b"still used", "png")
+        path = asset_dir / url.rsplit("/", 1)[1]
+        stale = time.time() - (email_assets.RETENTION_DAYS + 1) * 86400
+        os.utime(path, (stale, stale))
+
+        assert email_assets.publish(b"still used", "png") == url
+        assert path.exists()
+
+    @pytest.mark.unit
+    def test_mode_and_inline_recipients(self, monkeypatch):
+        monkeypatch.setenv("EMAIL_ASSET_MODE", "Hosted")
+        monkeypatch.setenv("EMAIL_ASSET_BASE_URL", "https://example.com/static/email")
+        monkeypatch.setenv("EMAIL_INLINE_RECIPIENTS", " A@example.com, ,b@example.com")
+
+        assert email_assets.hosted_enabled() is True
+        assert email_assets.inline_recipients() == ["a@example.com", "b@example.com"]
+
+    @pytest.mark.unit
+    def test_hosted_needs_base_url(self, asset_dir, monkeypatch):
+        monkeypatch.setenv("EMAIL_ASSET_MODE", "hosted")
+        monkeypatch.delenv("EMAIL_ASSET_BASE_URL")
+
+        assert email_assets.hosted_enabled() is False
+        assert email_assets.publish(b"data", "png") is None
+        assert not asset_dir.exists()
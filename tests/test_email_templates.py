@@ -0,0 +1,65 @@
+"""
+Unit tests for email_templates.py (compiled environment and partials)
+"""
+
+import pytest
+
+import email_preview
+import email_templates
+
+
+@pytest.fixture
+def fresh_env(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "jinja"
+    monkeypatch.setenv("TEMPLATE_CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(email_templates, "_env", None)
+    monkeypatch.setattr(email_templates, "_partials", {})
+    return cache_dir
+
+
+class TestEnvironment:
+    """Tests for the process-wide environment and bytecode cache."""
+
+    @pytest.mark.unit
+    def test_environment_is_reused(self, fresh_env):
+        assert email_templates._get_jinja_env() is email_templates._get_jinja_env()
+
+    @pytest.mark.unit
+    def test_compiled_templates_written_to_cache_dir(self, fresh_env):
+        email_preview.render_email("normal")
+
+        assert list(fresh_env.glob("__jinja2_*.cache"))
+
+    @pytest.mark.unit
+    def test_weekly_edition_renders(self, fresh_env):
+        html = email_preview.render_email("weekly")
+
+        assert "Seven days, no surprises." in html
+
+
+class TestPartials:
+    """Tests for render_partial()."""
+
+    @pytest.mark.unit
+    def test_partial_is_memoised(self, fresh_env):
+        first = email_templates.render_partial("styles/head.html")
+
+        assert email_templates.render_partial("styles/head.html") is first
+        assert first.startswith("<style")
+
+    @pytest.mark.unit
+    def test_stylesheet_included_once_per_email(self, fresh_env):
+        html = email_preview.render_email("normal")
+
+        assert html.count("GREENHOUSE GAZETTE - DARK MODE THEME") == 1
+
+
+class TestBenchmark:
+    """Tests for the preview render benchmark."""
+
+    @pytest.mark.unit
+    def test_reports_daily_and_weekly(self, fresh_env):
+        results = email_preview.benchmark(iterations=3)
+
+        assert set(results) == {"daily", "weekly"}
+        assert all(t["first_ms"] > 0 and t["render_ms"] > 0 for t in results.values())
@@ -0,0 +1,195 @@
+"""
+Unit tests for external_data.py and utils/http_client.py
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+from zoneinfo import ZoneInfo
+
+import httpx
+import pytest
+
+import coast_sky_service
+import external_data
+from utils.http_client import fetch_json_async
+
+URL = "https://api.example.test/data"
+
+TIDES = {
+    "predictions": [
+        {"t": "2025-06-18 04:12", "v": "3.4", "type": "H"},
+        {"t": "2025-06-18 10:30", "v": "0.2", "type": "L"},
+    ]
+}
+SOUND = {"data": [{"t": "2025-06-18 06:54", "v": "1.10"}]}
+
+
+def _client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _run(coro_factory, handler):
+    async def main():
+        async with _client(handler) as client:
+            return await coro_factory(client)
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(main())
+    finally:
+        loop.close()
+
+
+class TestFetchJsonAsync:
+    """Tests for fetch_json_async()."""
+
+    @pytest.mark.unit
+    def test_returns_json(self):
+        result = _run(
+            lambda c: fetch_json_async(c, URL, {}, time.monotonic() + 5),
+            lambda request: httpx.Response(200, json={"ok": True}),
+        )
+        assert result == {"ok": True}
+
+    @pytest.mark.unit
+    def test_retries_until_success(self):
+        calls = []
+
+        def handler(request):
+            calls.append(1)
+            if len(calls) < 3:
+                return httpx.Response(503)
+            return httpx.Response(200, json={"ok": True})
+
+        with patch("utils.http_client.asyncio.sleep", new=AsyncMock()) as sleep:
+            result = _run(lambda c: fetch_json_async(c, URL, {}, time.monotonic() + 120), handler)
+
+        assert result == {"ok": True}
+        assert len(calls) == 3
+        # Exponential backoff from 2s, plus up to a second of jitter
+        first, second = [call.args[0] for call in sleep.await_args_list]
+        assert 2.0 <= first <= 3.0 and 4.0 <= second <= 5.0
+
+    @pytest.mark.unit
+    def test_no_retry_past_deadline(self):
+        """A backoff that would overrun the deadline ends the attempts."""
+        calls = []
+
+        def handler(request):
+            calls.append(1)
+            return httpx.Response(500)
+
+        start = time.monotonic()
+        result = _run(lambda c: fetch_json_async(c, URL, {}, time.monotonic() + 1), handler)
+
+        assert result is None
+        assert len(calls) == 1
+        assert time.monotonic() - start < 1
+
+    @pytest.mark.unit
+    def test_expired_deadline_makes_no_request(self):
+        calls = []
+        result = _run(
+            lambda c: fetch_json_async(c, URL, {}, time.monotonic() - 1),
+            lambda request: calls.append(1) or httpx.Response(200, json={}),
+        )
+        assert result is None
+        assert calls == []
+
+
+class TestCoastSkyAsync:
+    """Tests for coast_sky_service.get_coast_sky_summary_async()."""
+
+    NOW = datetime(2025, 6, 18, 6, 55, tzinfo=ZoneInfo("America/New_York"))
+
+    @pytest.fixture(autouse=True)
+    def noaa_tides(self):
+        """Exercise the NOAA tide path (no local harmonic model)."""
+        with patch("coast_sky_service._predict_tides", return_value=None):
+            yield
+
+    @pytest.mark.unit
+    def test_noaa_requests_run_concurrently(self):
+        async def handler(request):
+            await asyncio.sleep(0.3)
+            if request.url.params["product"] == "predictions":
+                return httpx.Response(200, json=TIDES)
+            return httpx.Response(200, json=SOUND)
+
+        start = time.monotonic()
+        summary = _run(
+            lambda c: coast_sky_service.get_coast_sky_summary_async(
+                c, time.monotonic() + 10, now_local=self.NOW
+            ),
+            handler,
+        )
+
+        assert time.monotonic() - start < 0.55
+        assert summary["tide_summary"]["max_high_ft"] == 3.4
+        assert summary["sound_level"]["observed_level_ft"] == 1.1
+
+    @pytest.mark.unit
+    def test_second_call_is_served_from_cache(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.params["product"])
+            return httpx.Response(200, json=TIDES if calls[-1] == "predictions" else SOUND)
+
+        for _ in range(2):
+            _run(
+                lambda c: coast_sky_service.get_coast_sky_summary_async(
+                    c, time.monotonic() + 10, now_local=self.NOW
+                ),
+                handler,
+            )
+
+        assert sorted(calls) == ["predictions", "water_level"]
+
+    @pytest.mark.unit
+    def test_noaa_error_payload_is_dropped(self):
+        def handler(request):
+            return httpx.Response(200, json={"error": {"message": "No data"}})
+
+        summary = _run(
+            lambda c: coast_sky_service.get_coast_sky_summary_async(
+                c, time.monotonic() + 10, now_local=self.NOW
+            ),
+            handler,
+        )
+
+        assert "tide_summary" not in summary
+        assert "sound_level" not in summary
+
+
+class TestGatherExternalData:
+    """Tests for gather_external_data()."""
+
+    @pytest.mark.unit
+    def test_returns_requested_sources_only(self):
+        with patch(
+            "external_data.weather_service.get_current_weather_async",
+            new=AsyncMock(return_value={"condition": "Clear"}),
+        ), patch(
+            "external_data.coast_sky_service.get_coast_sky_summary_async",
+            new=AsyncMock(return_value={"sky_summary": {}}),
+        ) as coast:
+            result = external_data.gather_external_data(coast_sky=False)
+
+        assert result == {"weather": {"condition": "Clear"}}
+        coast.assert_not_awaited()
+
+    @pytest.mark.unit
+    def test_failed_source_maps_to_empty(self):
+        with patch(
+            "external_data.weather_service.get_current_weather_async",
+            new=AsyncMock(side_effect=RuntimeError("boom")),
+        ), patch(
+            "external_data.coast_sky_service.get_coast_sky_summary_async",
+            new=AsyncMock(return_value={"sky_summary": {"x": 1}}),
+        ):
+            result = external_data.gather_external_data()
+
+        assert result == {"weather": {}, "coast_sky": {"sky_summary": {"x": 1}}}
@@ -0,0 +1,107 @@
+"""
+Unit tests for utils/fetch_cache.py
+"""
+
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from utils import fetch_cache
+from utils.fetch_cache import cached_fetch
+
+
+def _age_entry(source, key, seconds):
+    """Backdate a cached entry by ``seconds``."""
+    path = fetch_cache._entry_path(source, key)
+    with open(path, "r", encoding="utf-8") as f:
+        entry = json.load(f)
+    entry["fetched_at"] -= seconds
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+
+
+class TestCachedFetch:
+    """Tests for cached_fetch()."""
+
+    @pytest.mark.unit
+    def test_fresh_entry_skips_fetch(self):
+        fetch = MagicMock(return_value={"temp": 70})
+
+        assert cached_fetch("openweather", fetch) == {"temp": 70}
+        assert cached_fetch("openweather", fetch) == {"temp": 70}
+        fetch.assert_called_once()
+
+    @pytest.mark.unit
+    def test_expired_entry_refetches(self):
+        cached_fetch("openweather", lambda: {"temp": 70})
+        _age_entry("openweather", "", fetch_cache.SOURCE_TTL_SECONDS["openweather"] + 1)
+
+        assert cached_fetch("openweather", lambda: {"temp": 75}) == {"temp": 75}
+
+    @pytest.mark.unit
+    def test_serves_stale_when_refresh_fails(self):
+        cached_fetch("noaa_sound", lambda: {"level": 1.2})
+        _age_entry("noaa_sound", "", 3600)
+
+        def boom():
+            raise ConnectionError("down")
+
+        assert cached_fetch("noaa_sound", boom) == {"level": 1.2}
+        assert cached_fetch("noaa_sound", lambda: None) == {"level": 1.2}
+
+    @pytest.mark.unit
+    def test_too_stale_is_not_served(self):
+        cached_fetch("noaa_sound", lambda: {"level": 1.2})
+        _age_entry("noaa_sound", "", 3600)
+
+        assert cached_fetch("noaa_sound", lambda: None, max_stale=60) is None
+
+    @pytest.mark.unit
+    def test_failure_without_cache_returns_none(self):
+        def boom():
+            raise ConnectionError("down")
+
+        assert cached_fetch("openweather", boom) is None
+
+    @pytest.mark.unit
+    def test_empty_results_are_not_cached(self):
+        cached_fetch("openweather", lambda: {})
+        assert cached_fetch("openweather", lambda: {"temp": 70}) == {"temp": 70}
+
+    @pytest.mark.unit
+    def test_keys_are_separate(self):
+        cached_fetch("noaa_tides", lambda: {"day": 1}, key="20250618")
+        assert cached_fetch("noaa_tides", lambda: {"day": 2}, key="20250619") == {"day": 2}
+
+    @pytest.mark.unit
+    def test_concurrent_callers_share_one_fetch(self):
+        """Single-flight: callers arriving mid-fetch wait for its result."""
+        calls = []
+
+        def slow_fetch():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"temp": 70}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cached_fetch("openweather", slow_fetch)))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [{"temp": 70}] * 4
+
+    @pytest.mark.unit
+    def test_invalidate_forces_refetch(self):
+        cached_fetch("openweather", lambda: {"temp": 70})
+        fetch_cache.invalidate("openweather")
+
+        assert cached_fetch("openweather", lambda: {"temp": 80}) == {"temp": 80}
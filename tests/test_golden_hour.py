@@ -3,8 +3,8 @@ Unit tests for golden_hour.py
 """
 
 import pytest
-from datetime import datetime
-from unittest.mock import patch
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
 from freezegun import freeze_time
 
 import golden_hour
@@ -80,15 +80,41 @@ class TestGetGoldenHour:
     """Tests for get_golden_hour() function."""
 
     @pytest.mark.unit
-    def test_returns_one_hour_before_sunset(self):
-        """Should return 1 hour before sunset."""
-        sunset = datetime(2025, 6, 15, 20, 30, 0)
-        with patch("golden_hour.get_sunset_time", return_value=sunset):
-            result = golden_hour.get_golden_hour()
-            assert result == datetime(2025, 6, 15, 19, 30, 0)
+    def test_starts_before_sunset(self):
+        """Golden hour should start roughly 35-75 minutes before sunset."""
+        target = date(2025, 6, 15)
+        golden = golden_hour.get_golden_hour(target)
+        sunset = golden_hour.get_sunset_time(target)
+        minutes = (sunset - golden).total_seconds() / 60
+        assert 35 <= minutes <= 75
 
     @pytest.mark.unit
-    def test_returns_none_if_no_sunset(self):
-        """Should return None if sunset unavailable."""
-        with patch("golden_hour.get_sunset_time", return_value=None):
+    def test_no_network_needed(self):
+        """Should compute golden hour without calling any HTTP API."""
+        with patch("requests.get", side_effect=AssertionError("network used")):
+            assert golden_hour.get_golden_hour(date(2025, 1, 15)) is not None
+
+    @pytest.mark.unit
+    def test_returns_none_if_no_golden_hour(self):
+        """Should return None if the sun never reaches golden-hour elevation."""
+        sun = MagicMock(golden_evening=(None, None))
+        with patch("golden_hour.solar.get_sun_times", return_value=sun):
             assert golden_hour.get_golden_hour() is None
+
+
+class TestGetGoldenHourTime:
+    """Tests for get_golden_hour_time() function."""
+
+    @pytest.mark.unit
+    def test_formats_as_hh_mm(self):
+        """Should return an HH:MM string in the evening."""
+        result = golden_hour.get_golden_hour_time(date(2025, 12, 15))
+        assert len(result) == 5 and result[2] == ":"
+        assert "15:00" <= result <= "17:00"
+
+    @pytest.mark.unit
+    def test_falls_back_to_seasonal_table(self):
+        """Should use the seasonal table if no golden hour is computed."""
+        with patch("golden_hour.get_golden_hour", return_value=None):
+            with patch("golden_hour.get_seasonal_golden_hour", return_value="16:30"):
+                assert golden_hour.get_golden_hour_time() == "16:30"
@@ -0,0 +1,189 @@
+"""
+Unit tests for utils/image_utils.py
+"""
+
+import numpy as np
+import pytest
+
+from utils import image_utils
+from utils.image_utils import (
+    compute_frame_metrics,
+    hash_distance,
+    sample_frames_evenly,
+    select_quality_frames,
+)
+
+
+def _metrics(luma=120.0, sharpness=100.0, dhash=None, index=0):
+    """Build a metrics entry with a distinct hash per index by default."""
+    if dhash is None:
+        dhash = f"{(0x9E3779B97F4A7C15 * (index + 1)) & 0xFFFFFFFFFFFFFFFF:016x}"
+    return {"luma": luma, "sharpness": sharpness, "dhash": dhash}
+
+
+class TestSampleFramesEvenly:
+    """Tests for sample_frames_evenly() function."""
+
+    @pytest.mark.unit
+    def test_returns_all_when_under_target(self):
+        """Should return input unchanged when already small enough."""
+        images = ["a.jpg", "b.jpg"]
+        assert sample_frames_evenly(images, 5) == images
+
+    @pytest.mark.unit
+    def test_samples_to_target(self):
+        """Should sample exactly target_count frames."""
+        images = [f"{i:03d}.jpg" for i in range(100)]
+        assert len(sample_frames_evenly(images, 10)) == 10
+
+
+class TestComputeFrameMetrics:
+    """Tests for compute_frame_metrics() function."""
+
+    @pytest.mark.unit
+    def test_flat_image_has_no_sharpness(self):
+        """A uniform image should have zero Laplacian variance."""
+        gray = np.full((60, 80), 90, dtype=np.uint8)
+        metrics = compute_frame_metrics(gray)
+        assert metrics["luma"] == pytest.approx(90)
+        assert metrics["sharpness"] == pytest.approx(0)
+
+    @pytest.mark.unit
+    def test_detailed_image_is_sharper(self):
+        """A checkerboard should score sharper than a flat frame."""
+        gray = (np.indices((200, 1000)).sum(axis=0) % 2 * 255).astype(np.uint8)
+        assert compute_frame_metrics(gray)["sharpness"] > 100
+
+    @pytest.mark.unit
+    def test_identical_images_share_hash(self):
+        """Identical content should produce identical hashes."""
+        gray = np.tile(np.arange(0, 256, 4, dtype=np.uint8), (48, 1))
+        a = compute_frame_metrics(gray)["dhash"]
+        b = compute_frame_metrics(gray.copy())["dhash"]
+        assert hash_distance(a, b) == 0
+
+
+class TestSelectQualityFrames:
+    """Tests for select_quality_frames() function."""
+
+    @pytest.mark.unit
+    def test_skips_dark_and_blurry_frames(self):
+        """Should never pick frames failing the quality gates."""
+        images = [f"{i:03d}.jpg" for i in range(40)]
+        metrics = {p: _metrics(index=i) for i, p in enumerate(images)}
+        for i in range(0, 40, 2):
+            metrics[images[i]] = _metrics(luma=5.0, index=i)
+        metrics[images[1]] = _metrics(sharpness=1.0, index=1)
+
+        result = select_quality_frames(images, 10, metrics=metrics)
+
+        assert len(result) == 10
+        assert images[1] not in result
+        assert all(int(p[:3]) % 2 == 1 for p in result)
+
+    @pytest.mark.unit
+    def test_spreads_across_timeline(self):
+        """Should take one frame per time slot."""
+        images = [f"{i:03d}.jpg" for i in range(100)]
+        metrics = {p: _metrics(index=i) for i, p in enumerate(images)}
+
+        result = select_quality_frames(images, 10, metrics=metrics)
+
+        slots = [int(p[:3]) // 10 for p in result]
+        assert slots == list(range(10))
+
+    @pytest.mark.unit
+    def test_skips_near_duplicates(self):
+        """Should not pick consecutive frames with matching hashes."""
+        images = [f"{i:03d}.jpg" for i in range(6)]
+        metrics = {p: _metrics(dhash="00000000000000ff") for p in images}
+        metrics[images[5]] = _metrics(dhash="ffffffffffffff00")
+
+        result = select_quality_frames(images, 6, metrics=metrics)
+
+        assert result == [images[0], images[5]]
+
+    @pytest.mark.unit
+    def test_frames_without_metrics_are_usable(self):
+        """Legacy frames with no cached metrics should behave like even sampling."""
+        images = [f"{i:03d}.jpg" for i in range(50)]
+
+        result = select_quality_frames(images, 5, metrics={})
+
+        assert len(result) == 5
+
+    @pytest.mark.unit
+    def test_reads_sidecar_without_opening_images(self, tmp_path, monkeypatch):
+        """Should load metrics from the sidecar and never open image files."""
+        images = [str(tmp_path / f"img_{i:03d}.jpg") for i in range(20)]
+        for i, path in enumerate(images):
+            image_utils.record_frame_metrics(
+                path, _metrics(luma=5.0 if i < 10 else 120.0, index=i)
+            )
+
+        opened = []
+        monkeypatch.setattr(
+            "PIL.Image.open", lambda *a, **k: opened.append(a) or None
+        )
+
+        result = select_quality_frames(images, 5)
+
+        assert opened == []
+        assert len(result) == 5
+        assert all(images.index(p) >= 10 for p in result)
+
+
+class TestDeflicker:
+    """Tests for the deflicker gain curve and frame helpers."""
+
+    @pytest.mark.unit
+    def test_steady_sequence_needs_no_gain(self):
+        """Constant brightness should produce unit gains."""
+        gains = image_utils.deflicker_gains([100.0] * 10)
+        assert gains == pytest.approx([1.0] * 10)
+
+    @pytest.mark.unit
+    def test_flicker_is_pulled_towards_neighbours(self):
+        """A single bright frame should be darkened, its neighbours barely touched."""
+        lumas = [100.0] * 11
+        lumas[5] = 140.0
+        gains = image_utils.deflicker_gains(lumas)
+        assert gains[5] < 0.9
+        assert gains[0] == pytest.approx(1.0, abs=0.05)
+
+    @pytest.mark.unit
+    def test_gain_is_clamped(self):
+        """Gains should never exceed the configured maximum."""
+        lumas = [200.0] * 4 + [20.0] + [200.0] * 4
+        gains = image_utils.deflicker_gains(lumas, max_gain=1.5)
+        assert max(gains) <= 1.5
+
+    @pytest.mark.unit
+    def test_unknown_luminance_keeps_unit_gain(self):
+        """Frames without a measurement should be left alone."""
+        gains = image_utils.deflicker_gains([100.0, None, 150.0, 100.0, 100.0])
+        assert gains[1] == 1.0
+
+    @pytest.mark.unit
+    def test_deflicker_frames_evens_brightness(self):
+        """Deflickered frames should have a smaller brightness spread."""
+        from PIL import Image
+
+        levels = [100, 100, 150, 100, 100, 60, 100, 100]
+        frames = [Image.new("RGB", (32, 24), (v, v, v)) for v in levels]
+
+        result = image_utils.deflicker_frames(frames)
+
+        before = np.std(levels)
+        after = np.std([np.asarray(f).mean() for f in result])
+        assert len(result) == len(frames)
+        assert after < before
+
+    @pytest.mark.unit
+    def test_frame_luminances_prefers_cache(self, tmp_path, monkeypatch):
+        """Cached luma should be used instead of decoding the image."""
+        path = str(tmp_path / "a.jpg")
+        monkeypatch.setattr(
+            image_utils, "read_frame_luminance", lambda p: pytest.fail("decoded")
+        )
+        assert image_utils.frame_luminances([path], metrics={path: {"luma": 42.0}}) == [42.0]
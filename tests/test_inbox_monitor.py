@@ -0,0 +1,281 @@
+"""
+Unit tests for inbox_monitor.py IDLE handling, batched fetch and guess judging
+"""
+
+import imaplib
+import socket
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import inbox_monitor
+
+
+class FakeConnection:
+    """imaplib-like client end of a socketpair; the test plays the server."""
+
+    def __init__(self, on_idle=b"+ idling\r\n"):
+        self.sock, self.server = socket.socketpair()
+        self.sock.settimeout(5)
+        self.file = self.sock.makefile("rb")
+        self.on_idle = on_idle
+        self.sent = []
+        self.tag = None
+
+    def send(self, data):
+        self.sent.append(data)
+        if data.endswith(b" IDLE\r\n"):
+            self.tag = data.split()[0]
+            self.server.sendall(self.on_idle)
+        elif data == b"DONE\r\n":
+            self.server.sendall(self.tag + b" OK IDLE terminated\r\n")
+
+    def readline(self):
+        return self.file.readline()
+
+
+class RecordingStop(threading.Event):
+    """Stop event whose waits return at once and are recorded."""
+
+    def __init__(self):
+        super().__init__()
+        self.waits = []
+
+    def wait(self, timeout=None):
+        self.waits.append(timeout)
+        return self.is_set()
+
+
+class TestIdleWait:
+    """Tests for idle_wait()."""
+
+    @pytest.mark.unit
+    def test_new_mail_already_buffered(self):
+        conn = FakeConnection(b"+ idling\r\n* 3 EXISTS\r\n")
+
+        began = time.monotonic()
+        assert inbox_monitor.idle_wait(conn, 5) is True
+        assert time.monotonic() - began < 1
+        assert conn.sent[-1] == b"DONE\r\n"
+
+    @pytest.mark.unit
+    def test_new_mail_pushed_later(self):
+        conn = FakeConnection()
+        threading.Timer(0.1, conn.server.sendall, args=(b"* 1 EXPUNGE\r\n* 4 EXISTS\r\n",)).start()
+
+        began = time.monotonic()
+        assert inbox_monitor.idle_wait(conn, 5) is True
+        assert time.monotonic() - began < 1
+
+    @pytest.mark.unit
+    def test_refresh_timeout(self):
+        conn = FakeConnection(b"+ idling\r\n* 2 EXPUNGE\r\n")
+
+        assert inbox_monitor.idle_wait(conn, 0.2) is False
+        assert [line.split()[-1] for line in conn.sent] == [b"IDLE", b"DONE"]
+
+    @pytest.mark.unit
+    def test_connection_closed(self):
+        conn = FakeConnection()
+        threading.Timer(0.1, conn.server.close).start()
+
+        with pytest.raises(imaplib.IMAP4.abort):
+            inbox_monitor.idle_wait(conn, 5)
+
+
+class TestRunDaemon:
+    """Tests for run_daemon() reconnects and fallback."""
+
+    @pytest.mark.unit
+    def test_reconnects_with_backoff(self, monkeypatch):
+        stop = RecordingStop()
+        connects, processed, idles = [], [], []
+
+        def connect():
+            connects.append(1)
+            if len(connects) == 2:
+                raise OSError("network down")
+            return SimpleNamespace(capabilities=("IMAP4REV1", "IDLE"), logout=lambda: None)
+
+        def idle(mail, timeout):
+            idles.append(timeout)
+            if len(connects) == 1:
+                raise imaplib.IMAP4.abort("socket error: EOF")
+            stop.set()
+            return False
+
+        monkeypatch.setattr(inbox_monitor, "INBOX_MODE", "idle")
+        monkeypatch.setattr(inbox_monitor, "_connect", connect)
+        monkeypatch.setattr(inbox_monitor, "_process_unseen", lambda mail: processed.append(mail))
+        monkeypatch.setattr(inbox_monitor, "idle_wait", idle)
+
+        inbox_monitor.run_daemon(stop)
+
+        assert len(connects) == 3
+        assert len(processed) == 2  # Unread mail handled on each successful connect
+        assert stop.waits == [inbox_monitor.IDLE_BACKOFF_MIN_SECONDS, inbox_monitor.IDLE_BACKOFF_MIN_SECONDS * 2]
+        assert idles == [inbox_monitor.IDLE_REFRESH_SECONDS] * 2
+
+    @pytest.mark.unit
+    def test_polls_without_idle_support(self, monkeypatch):
+        stop = RecordingStop()
+        polls = []
+        monkeypatch.setattr(inbox_monitor, "INBOX_MODE", "idle")
+        monkeypatch.setattr(inbox_monitor, "_connect", lambda: SimpleNamespace(
+            capabilities=("IMAP4REV1",), logout=lambda: None,
+        ))
+        monkeypatch.setattr(inbox_monitor, "poll_inbox", lambda: polls.append(1) or stop.set())
+
+        inbox_monitor.run_daemon(stop)
+
+        assert polls == [1]
+        assert stop.waits == [inbox_monitor.POLL_INTERVAL_MINUTES * 60]
+
+
+GUESS_HEADER = (
+    b"From: Player <player@example.com>\r\n"
+    b"Subject: GUESS [2026-01-17]\r\n"
+    b"Message-ID: <abc@example.com>\r\n\r\n"
+)
+SPAM_HEADER = b"From: stranger@example.com\r\nSubject: Hello\r\n\r\n"
+MIXED_STRUCTURE = (
+    b' BODYSTRUCTURE ((("TEXT" "PLAIN" ("CHARSET" "UTF-8") NIL NIL "QUOTED-PRINTABLE" 12 1 NIL NIL NIL)'
+    b'("TEXT" "HTML" ("CHARSET" "UTF-8") NIL NIL "7BIT" 40 1 NIL NIL NIL) "ALTERNATIVE")'
+    b'("IMAGE" "JPEG" ("NAME" "x.jpg") NIL NIL "BASE64" 900000 NIL ("ATTACHMENT" ("FILENAME" "x.jpg")) NIL) "MIXED"))'
+)
+
+
+class FakeMailbox:
+    """Records uid() commands and answers them from canned FETCH data."""
+
+    def __init__(self, uids, responses):
+        self.uids = uids
+        self.responses = responses
+        self.commands = []
+
+    def uid(self, command, *args):
+        self.commands.append((command,) + args)
+        if command == "SEARCH":
+            return "OK", [b" ".join(self.uids)]
+        if command == "FETCH":
+            return "OK", self.responses[args[1]]
+        return "OK", [None]
+
+
+class TestBatchedFetch:
+    """Tests for the two-phase header-first fetch."""
+
+    @pytest.mark.unit
+    def test_parse_fetch_response_with_literals(self):
+        data = [
+            (b"1 (UID 7 BODY[HEADER.FIELDS (FROM SUBJECT)] {%d}" % len(SPAM_HEADER), SPAM_HEADER),
+            b' BODYSTRUCTURE ("TEXT" "PLAIN" ("CHARSET" "us-ascii") NIL NIL "7BIT" 5 1 NIL NIL NIL))',
+            b"2 (FLAGS (\\Seen))",
+        ]
+
+        parsed = inbox_monitor.parse_fetch_response(data)
+
+        assert list(parsed) == ["7"]
+        assert parsed["7"]["BODY[HEADER.FIELDS (FROM SUBJECT)]"] == SPAM_HEADER
+        assert parsed["7"]["BODYSTRUCTURE"][:2] == ["TEXT", "PLAIN"]
+
+    @pytest.mark.unit
+    def test_find_text_part_skips_html_and_attachments(self):
+        structure = inbox_monitor.parse_fetch_response([b"1 (UID 1" + MIXED_STRUCTURE])["1"]["BODYSTRUCTURE"]
+
+        assert inbox_monitor.find_text_part(structure) == ("1.1", "QUOTED-PRINTABLE", "UTF-8")
+
+    @pytest.mark.unit
+    def test_find_text_part_single_part_and_none(self):
+        single = ["TEXT", "PLAIN", ["CHARSET", "iso-8859-1"], None, None, "8BIT", 5, 1]
+        html_only = ["TEXT", "HTML", None, None, None, "7BIT", 5, 1]
+
+        assert inbox_monitor.find_text_part(single) == ("TEXT", "8BIT", "iso-8859-1")
+        assert inbox_monitor.find_text_part(html_only) is None
+
+    @pytest.mark.unit
+    def test_only_routed_bodies_fetched_and_one_store(self, monkeypatch):
+        header_items = f"(BODYSTRUCTURE BODY.PEEK[HEADER.FIELDS ({' '.join(inbox_monitor.HEADER_FIELDS)})])"
+        mail = FakeMailbox([b"11", b"12"], {
+            header_items: [
+                (b"1 (UID 11 BODY[HEADER.FIELDS (FROM SUBJECT)] {%d}" % len(GUESS_HEADER), GUESS_HEADER),
+                MIXED_STRUCTURE,
+                (b"2 (UID 12 BODY[HEADER.FIELDS (FROM SUBJECT)] {%d}" % len(SPAM_HEADER), SPAM_HEADER),
+                b' BODYSTRUCTURE ("TEXT" "PLAIN" NIL NIL NIL "7BIT" 5 1 NIL NIL NIL))',
+            ],
+            "(BODY.PEEK[1.1])": [(b"1 (UID 11 BODY[1.1] {12}", b"stingray =E2=9C=93"), b")"],
+        })
+        handled = []
+        monkeypatch.setattr(inbox_monitor, "_get_settings", lambda: SimpleNamespace(
+            smtp_recipients=["player@example.com"], riddle_game_enabled=True,
+        ))
+        monkeypatch.setattr(inbox_monitor, "handle_guesses", lambda items: handled.extend(
+            (sender, msg["Message-ID"], inbox_monitor.get_email_body(msg)) for msg, sender in items
+        ) or len(items))
+
+        assert inbox_monitor._process_unseen(mail) == 2
+
+        assert handled == [("player@example.com", "<abc@example.com>", "stingray ✓")]
+        assert [c[0] for c in mail.commands] == ["SEARCH", "FETCH", "FETCH", "STORE"]
+        assert mail.commands[1][1] == "11,12"
+        assert sorted(mail.commands[-1][1].split(",")) == ["11", "12"]
+        assert mail.commands[2][1] == "11"
+
+
+class TestHandleGuesses:
+    """Tests for the parallel guess judging pipeline."""
+
+    @pytest.fixture
+    def pipeline(self, monkeypatch):
+        recorded, queued = [], []
+        monkeypatch.setattr(inbox_monitor, "GUESS_JUDGE_WORKERS", 20)
+        monkeypatch.setattr(inbox_monitor, "_load_riddle_state", lambda: {
+            "date": "2026-01-17", "answer": "stingray", "riddle": "Flat and fast",
+        })
+        monkeypatch.setattr(inbox_monitor, "can_send_reply", lambda sender: True)
+        monkeypatch.setattr(inbox_monitor, "record_reply_sent", lambda sender: None)
+        monkeypatch.setattr(inbox_monitor.mail_outbox, "enqueue", lambda msg, recipients: queued.append(msg) or "id")
+        monkeypatch.setattr(inbox_monitor.scorekeeper, "record_attempt", lambda **kw: recorded.append(
+            kw["user_email"]) or {"status": "correct", "points": 2, "is_first": len(recorded) == 1, "rank": len(recorded)})
+        return recorded, queued
+
+    @staticmethod
+    def _guess(n):
+        msg = inbox_monitor.email.message_from_string(
+            f"From: p{n}@example.com\nSubject: GUESS [2026-01-17]: stingray\n"
+            f"Date: Sat, 17 Jan 2026 08:{n:02d}:00 +0000\n\n"
+        )
+        return msg, f"p{n}@example.com"
+
+    @pytest.mark.unit
+    def test_judged_concurrently_recorded_in_timestamp_order(self, monkeypatch, pipeline):
+        recorded, queued = pipeline
+
+        def judge(user_guess, correct_answer, riddle_text, riddle_date):
+            time.sleep(0.2)
+            return {"correct": True, "reply_text": "Aye."}
+
+        monkeypatch.setattr(inbox_monitor.narrator, "judge_riddle", judge)
+        items = [self._guess(n) for n in reversed(range(20))]
+
+        began = time.monotonic()
+        assert inbox_monitor.handle_guesses(items) == 20
+        assert time.monotonic() - began < 1.5
+
+        assert recorded == [f"p{n}@example.com" for n in range(20)]
+        assert [msg["To"] for msg in queued] == recorded
+        assert "First to crack it" in queued[0].get_payload(decode=True).decode()
+
+    @pytest.mark.unit
+    def test_rejected_guess_replied_without_judging(self, monkeypatch, pipeline):
+        recorded, queued = pipeline
+        monkeypatch.setattr(inbox_monitor.narrator, "judge_riddle", lambda **kw: pytest.fail("judged"))
+        msg = inbox_monitor.email.message_from_string(
+            "From: p1@example.com\nSubject: GUESS [2025-12-31]: stingray\n\n"
+        )
+
+        assert inbox_monitor.handle_guess(msg, "p1@example.com") is False
+        assert recorded == []
+        assert "old news" in queued[0].get_payload(decode=True).decode()
@@ -0,0 +1,272 @@
+"""
+Unit tests for llm_gateway.py
+"""
+
+import asyncio
+import fcntl
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import llm_gateway
+
+
+async def _response(text, prompt_tokens=12, cached_tokens=None, output_tokens=5):
+    """Streamed response: the text in two chunks, usage on the last."""
+    half = len(text) // 2
+    yield SimpleNamespace(text=text[:half], usage_metadata=None)
+    yield SimpleNamespace(
+        text=text[half:],
+        usage_metadata=SimpleNamespace(
+            prompt_token_count=prompt_tokens, cached_content_token_count=cached_tokens,
+            candidates_token_count=output_tokens, thoughts_token_count=None,
+        ),
+    )
+
+
+class FakeClient:
+    """Async client stand-in; ``handler(model, contents)`` returns the text or raises."""
+
+    def __init__(self, handler, cache_error=None):
+        self.calls = []
+        self.configs = []
+        self.caches_created = []
+
+        async def generate_content_stream(model, contents, config=None):
+            self.calls.append((model, contents))
+            self.configs.append(config)
+            result = handler(model, contents)
+            if asyncio.iscoroutine(result):
+                result = await result
+            cached = 600 if config and config.get("cached_content") else None
+            return _response(result, cached_tokens=cached)
+
+        async def create(model, config):
+            if cache_error:
+                raise cache_error
+            self.caches_created.append((model, config["contents"][0]))
+            return SimpleNamespace(name=f"cachedContents/{len(self.caches_created)}")
+
+        self.aio = SimpleNamespace(
+            models=SimpleNamespace(generate_content_stream=generate_content_stream),
+            caches=SimpleNamespace(create=create),
+        )
+
+
+@pytest.fixture
+def gateway(monkeypatch):
+    """Fresh gateway loop, stats and semaphore for each test."""
+    def start(max_concurrency=2):
+        monkeypatch.setattr(llm_gateway, "MAX_CONCURRENCY", max_concurrency)
+        monkeypatch.setattr(llm_gateway, "_loop", None)
+        monkeypatch.setattr(llm_gateway, "_stats", {})
+        monkeypatch.setattr(llm_gateway, "_context_caches", {})
+        return llm_gateway._gateway_loop()
+
+    yield start
+    loop = llm_gateway._loop
+    if loop is not None:
+        loop.call_soon_threadsafe(loop.stop)
+
+
+def _call(prompt, client, **kwargs):
+    kwargs.setdefault("purpose", "test")
+    kwargs.setdefault("model", "primary")
+    kwargs.setdefault("fallback_model", "lite")
+    return llm_gateway.generate(prompt, client=client, **kwargs)
+
+
+class TestGenerate:
+    """Tests for generate() attempts and fallback."""
+
+    @pytest.mark.unit
+    def test_primary_result_and_usage(self, gateway):
+        gateway()
+        result = _call("hello", FakeClient(lambda model, prompt: f"{model}:{prompt}"))
+
+        assert (result.text, result.value, result.model, result.fallback) == ("primary:hello", "primary:hello", "primary", False)
+        assert (result.prompt_tokens, result.output_tokens) == (12, 5)
+        assert result.prompt_chars == 5 and result.ttft_s <= result.latency_s
+        assert llm_gateway.get_stats()["test"]["calls"] == 1
+
+    @pytest.mark.unit
+    def test_falls_back_on_error(self, gateway):
+        gateway()
+
+        def handler(model, prompt):
+            if model == "primary":
+                raise RuntimeError("503")
+            return "from lite"
+
+        result = _call("hello", FakeClient(handler))
+
+        assert (result.text, result.model, result.fallback) == ("from lite", "lite", True)
+        assert llm_gateway.get_stats()["test"]["fallbacks"] == 1
+        metrics = llm_gateway.llm_metrics.summarize()["purposes"]["test"]
+        assert (metrics["fallbacks"], metrics["models"], metrics["errors"]) == (1, {"lite": 1}, {"api_error": 1})
+
+    @pytest.mark.unit
+    def test_falls_back_on_invalid_text(self, gateway):
+        gateway()
+        client = FakeClient(lambda model, prompt: "42" if model == "lite" else "not a number")
+
+        result = _call("hello", client, validate=int)
+        assert (result.value, result.model) == (42, "lite")
+
+        client = FakeClient(lambda model, prompt: "still not a number")
+        result = _call("hello", client, validate=int)
+        assert result.value is None and result.text == "still not a number"
+
+    @pytest.mark.unit
+    def test_fallback_runs_inside_deadline(self, gateway):
+        gateway()
+
+        async def handler(model, prompt):
+            if model == "primary":
+                await asyncio.sleep(10)
+            return "quick"
+
+        began = time.monotonic()
+        result = _call("hello", FakeClient(handler), deadline_s=1.0)
+
+        assert result.model == "lite"
+        assert time.monotonic() - began < 1.0
+
+    @pytest.mark.unit
+    def test_no_fallback_when_same_model(self, gateway):
+        gateway()
+        client = FakeClient(lambda model, prompt: (_ for _ in ()).throw(RuntimeError("down")))
+
+        assert _call("hello", client, fallback_model="primary") is None
+        assert client.calls == [("primary", "hello")]
+        assert llm_gateway.get_stats()["test"]["failures"] == 1
+
+    @pytest.mark.unit
+    def test_from_another_event_loop(self, gateway):
+        gateway()
+        client = FakeClient(lambda model, prompt: "async ok")
+
+        loop = asyncio.new_event_loop()
+        try:
+            result = loop.run_until_complete(llm_gateway.generate_async(
+                "hello", purpose="test", model="primary", fallback_model="lite", client=client,
+            ))
+        finally:
+            loop.close()
+
+        assert result.text == "async ok"
+
+
+class TestContextCache:
+    """Tests for cached_prefix handling."""
+
+    @pytest.mark.unit
+    def test_short_prefix_sent_inline(self, gateway):
+        gateway()
+        client = FakeClient(lambda model, prompt: "ok")
+
+        result = _call("today", client, cached_prefix="rules")
+
+        assert client.calls == [("primary", "rules\ntoday")]
+        assert not client.caches_created
+        assert result.prompt_chars == len("rules\ntoday")
+
+    @pytest.mark.unit
+    def test_long_prefix_cached_once(self, gateway, monkeypatch):
+        gateway()
+        monkeypatch.setattr(llm_gateway, "CONTEXT_CACHE_MIN_TOKENS", 10)
+        client = FakeClient(lambda model, prompt: "ok")
+        prefix = "rules " * 20
+
+        first = _call("today", client, cached_prefix=prefix, config={"temperature": 0})
+        second = _call("tomorrow", client, cached_prefix=prefix)
+
+        assert client.caches_created == [("primary", prefix)]
+        assert [c for _, c in client.calls] == ["today", "tomorrow"]
+        assert client.configs[0] == {"temperature": 0, "cached_content": "cachedContents/1"}
+        assert (first.cached_tokens, second.cached_tokens) == (600, 600)
+        assert llm_gateway.get_stats()["test"]["cached_tokens"] == 1200
+
+    @pytest.mark.unit
+    def test_cache_refusal_falls_back_inline(self, gateway, monkeypatch):
+        gateway()
+        monkeypatch.setattr(llm_gateway, "CONTEXT_CACHE_MIN_TOKENS", 10)
+        client = FakeClient(lambda model, prompt: "ok", cache_error=RuntimeError("not supported"))
+        prefix = "rules " * 20
+
+        _call("today", client, cached_prefix=prefix)
+        _call("tomorrow", client, cached_prefix=prefix)
+
+        assert [c for _, c in client.calls] == [f"{prefix}\ntoday", f"{prefix}\ntomorrow"]
+        assert [name for name, _ in llm_gateway._context_caches.values()] == [None]  # Not retried
+
+
+class TestScheduling:
+    """Tests for the priority semaphore and cross-process slots."""
+
+    @pytest.mark.unit
+    def test_higher_priority_runs_first(self, gateway):
+        loop = gateway(max_concurrency=1)
+        release = threading.Event()
+
+        async def handler(model, prompt):
+            if prompt == "hold":
+                while not release.is_set():
+                    await asyncio.sleep(0.01)
+            return prompt
+
+        client = FakeClient(handler)
+        futures = []
+        for prompt, priority in [
+            ("hold", llm_gateway.PRIORITY_WEB),
+            ("judge", llm_gateway.PRIORITY_JUDGE),
+            ("web", llm_gateway.PRIORITY_WEB),
+            ("edition", llm_gateway.PRIORITY_EDITION),
+        ]:
+            futures.append(asyncio.run_coroutine_threadsafe(llm_gateway.generate_async(
+                prompt, purpose="test", priority=priority, model="primary", fallback_model="lite", client=client,
+            ), loop))
+            time.sleep(0.05)
+        release.set()
+
+        assert [f.result(timeout=5).text for f in futures] == ["hold", "judge", "web", "edition"]
+        assert [prompt for _, prompt in client.calls] == ["hold", "edition", "web", "judge"]
+
+    @pytest.mark.unit
+    def test_queued_past_deadline(self, gateway):
+        loop = gateway(max_concurrency=1)
+        release = threading.Event()
+
+        async def handler(model, prompt):
+            while not release.is_set():
+                await asyncio.sleep(0.01)
+            return prompt
+
+        client = FakeClient(handler)
+        holder = asyncio.run_coroutine_threadsafe(llm_gateway.generate_async(
+            "hold", purpose="test", model="primary", fallback_model="lite", client=client,
+        ), loop)
+        time.sleep(0.05)
+
+        assert _call("late", client, deadline_s=0.2) is None
+        release.set()
+        assert holder.result(timeout=5).text == "hold"
+
+    @pytest.mark.unit
+    def test_slot_reserved_for_edition(self, gateway):
+        gateway(max_concurrency=2)
+        slot_dir = llm_gateway._slot_dir()
+        os.makedirs(slot_dir, exist_ok=True)
+        client = FakeClient(lambda model, prompt: prompt)
+
+        # Another process holds the only non-reserved slot
+        with open(os.path.join(slot_dir, "slot-1.lock"), "w") as other:
+            fcntl.flock(other.fileno(), fcntl.LOCK_EX)
+            judge = _call("judge", client, priority=llm_gateway.PRIORITY_JUDGE, deadline_s=0.3)
+            edition = _call("edition", client, priority=llm_gateway.PRIORITY_EDITION)
+
+        assert judge is None
+        assert edition.text == "edition"
@@ -0,0 +1,67 @@
+"""
+Unit tests for llm_metrics.py
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+import llm_metrics
+
+NOW = datetime(2026, 1, 25, 12, 30)
+
+
+class TestRecord:
+    """Tests for record()."""
+
+    @pytest.mark.unit
+    def test_accumulates_per_hour_and_purpose(self):
+        llm_metrics.record("narrative", 3.0, model="flash", prompt_tokens=900, output_tokens=200, now=NOW)
+        llm_metrics.record("narrative", 12.0, model="lite", fallback=True, reasons=["timeout"], now=NOW)
+        llm_metrics.record("judge", 0.4, failed=True, reasons=["api_error", "api_error"], now=NOW)
+
+        hour = llm_metrics.atomic_read_json(llm_metrics._metrics_path())["hours"]["2026-01-25T12"]
+        narrative = hour["narrative"]
+        assert (narrative["calls"], narrative["fallbacks"], narrative["failures"]) == (2, 1, 0)
+        assert narrative["latency_hist"] == [0, 0, 0, 1, 0, 1, 0, 0, 0]
+        assert narrative["models"] == {"flash": 1, "lite": 1}
+        assert narrative["errors"] == {"timeout": 1}
+        assert hour["judge"]["errors"] == {"api_error": 2}
+
+    @pytest.mark.unit
+    def test_drops_hours_past_retention(self):
+        old = NOW - timedelta(hours=llm_metrics.RETENTION_HOURS + 1)
+        llm_metrics.record("narrative", 1.0, now=old)
+        llm_metrics.record("narrative", 1.0, now=NOW)
+
+        assert list(llm_metrics.atomic_read_json(llm_metrics._metrics_path())["hours"]) == ["2026-01-25T12"]
+
+
+class TestSummarize:
+    """Tests for summarize()."""
+
+    @pytest.mark.unit
+    def test_window_rates_and_percentiles(self):
+        for latency in (0.8, 0.9, 1.5, 4.0):
+            llm_metrics.record("web_narrative", latency, model="flash", ttft_s=0.5,
+                               prompt_tokens=700, output_tokens=100, now=NOW)
+        llm_metrics.record("web_narrative", 30.0, model="lite", fallback=True, ttft_s=1.0,
+                           reasons=["timeout"], now=NOW - timedelta(hours=1))
+        llm_metrics.record("web_narrative", 1.0, now=NOW - timedelta(hours=30))  # Outside the window
+
+        summary = llm_metrics.summarize(24, now=NOW)
+        web = summary["purposes"]["web_narrative"]
+
+        assert (web["calls"], web["fallbacks"], web["fallback_rate"]) == (5, 1, 0.2)
+        assert (web["latency_s_p50"], web["latency_s_p90"]) == (2.0, 45.0)
+        assert web["ttft_s_avg"] == 0.6
+        assert web["errors"] == {"timeout": 1}
+        assert [h["hour"] for h in summary["hourly"]] == ["2026-01-25T11", "2026-01-25T12"]
+        assert summary["daily_tokens"] == {"2026-01-25": {"web_narrative": 3200}}
+        assert summary["total"]["calls"] == 5
+
+    @pytest.mark.unit
+    def test_empty_when_no_file(self):
+        summary = llm_metrics.summarize(now=NOW)
+
+        assert summary["purposes"] == {} and summary["total"]["calls"] == 0
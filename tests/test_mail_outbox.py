@@ -0,0 +1,165 @@
+"""
+Unit tests for mail_outbox.py (durable queue, pooled sender, retries, pacing)
+"""
+
+import os
+import smtplib
+import threading
+import time
+from email.message import EmailMessage
+
+import pytest
+
+import mail_outbox
+
+
+class FakeServer:
+    """SMTP connection double; ``fail`` holds exceptions to raise in order."""
+
+    def __init__(self, log, fail):
+        self.log = log
+        self.fail = fail
+
+    def sendmail(self, from_addr, to_addrs, raw):
+        if self.fail:
+            raise self.fail.pop(0)
+        self.log.append((from_addr, list(to_addrs), raw))
+        return {}
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def outbox(monkeypatch):
+    """Outbox with a fake SMTP server (conftest keeps the sender thread off)."""
+    state = {"opened": 0, "sent": [], "fail": []}
+
+    def open_smtp():
+        state["opened"] += 1
+        return FakeServer(state["sent"], state["fail"])
+
+    monkeypatch.setattr(mail_outbox, "_get_settings", lambda: None)
+    monkeypatch.setenv("SMTP_SERVER", "smtp.test.com")
+    monkeypatch.setattr(mail_outbox, "_open_smtp", open_smtp)
+    monkeypatch.setattr(mail_outbox, "MIN_SEND_INTERVAL_SECONDS", 0)
+    monkeypatch.setattr(mail_outbox, "_connection", mail_outbox._Connection())
+    return state
+
+
+def _message(subject="Hello", **headers):
+    msg = EmailMessage()
+    msg["From"] = "Gazette <gazette@example.com>"
+    msg["To"] = headers.pop("to", "a@example.com")
+    msg["Subject"] = subject
+    for name, value in headers.items():
+        msg[name.title()] = value
+    msg.set_content("body")
+    return msg
+
+
+class TestQueue:
+    """Tests for enqueue() and drain()."""
+
+    @pytest.mark.unit
+    def test_burst_delivered_over_one_connection(self, outbox):
+        ids = [mail_outbox.enqueue(_message(f"m{i}")) for i in range(3)]
+        assert len(mail_outbox._envelopes()) == 3
+
+        mail_outbox.drain()
+
+        assert outbox["opened"] == 1
+        assert [b"Subject: m%d" % i in raw for i, (_, _, raw) in enumerate(outbox["sent"])] == [True] * 3
+        assert mail_outbox._envelopes() == []
+        assert all(mail_outbox._delivered(i) is True for i in ids)
+
+    @pytest.mark.unit
+    def test_bcc_is_envelope_only(self, outbox):
+        mail_outbox.enqueue(_message(bcc="hidden@example.com"))
+
+        mail_outbox.drain()
+
+        from_addr, to_addrs, raw = outbox["sent"][0]
+        assert from_addr == "gazette@example.com"
+        assert to_addrs == ["a@example.com", "hidden@example.com"]
+        assert b"hidden@example.com" not in raw
+        assert b"\r\n" in raw and b"\r\r" not in raw
+
+    @pytest.mark.unit
+    def test_temporary_failure_backs_off(self, outbox):
+        outbox["fail"].append(smtplib.SMTPServerDisconnected("gone"))
+        outbox["fail"].append(smtplib.SMTPServerDisconnected("gone again"))
+        mail_outbox.enqueue(_message())
+
+        delay = mail_outbox.drain()
+
+        [envelope] = mail_outbox._envelopes()
+        assert envelope["attempts"] == 1
+        assert envelope["next_attempt"] - time.time() == pytest.approx(mail_outbox.RETRY_BASE_SECONDS, abs=2)
+        assert delay == pytest.approx(mail_outbox.RETRY_BASE_SECONDS, abs=2)
+
+    @pytest.mark.unit
+    def test_reconnects_once_after_idle_disconnect(self, outbox):
+        outbox["fail"].append(smtplib.SMTPServerDisconnected("idle timeout"))
+        mail_outbox.enqueue(_message())
+
+        mail_outbox.drain()
+
+        assert outbox["opened"] == 2
+        assert len(outbox["sent"]) == 1
+
+    @pytest.mark.unit
+    def test_permanent_failure_moves_to_failed(self, outbox):
+        outbox["fail"].append(smtplib.SMTPDataError(552, b"5.3.4 Message too big"))
+        msg_id = mail_outbox.enqueue(_message())
+
+        mail_outbox.drain()
+
+        assert mail_outbox._envelopes() == []
+        assert mail_outbox._delivered(msg_id) is False
+        assert os.path.exists(os.path.join(mail_outbox._failed_dir(), f"{msg_id}.eml"))
+
+    @pytest.mark.unit
+    def test_daily_limit_defers(self, outbox, monkeypatch):
+        monkeypatch.setattr(mail_outbox, "DAILY_RECIPIENT_LIMIT", 2)
+        mail_outbox.enqueue(_message("first", to="a@example.com, b@example.com"))
+        mail_outbox.enqueue(_message("second"))
+
+        delay = mail_outbox.drain()
+
+        assert len(outbox["sent"]) == 1
+        assert len(mail_outbox._envelopes()) == 1
+        assert delay == pytest.approx(86400, abs=5)
+
+    @pytest.mark.unit
+    def test_no_recipients_not_queued(self, outbox):
+        msg = _message()
+        del msg["To"]
+
+        assert mail_outbox.enqueue(msg) is None
+        assert mail_outbox._envelopes() == []
+
+    @pytest.mark.unit
+    def test_smtp_host_defaults_to_gmail(self, outbox, monkeypatch):
+        monkeypatch.delenv("SMTP_SERVER")
+        monkeypatch.delenv("SMTP_HOST", raising=False)
+
+        assert mail_outbox._smtp_config()[0] == "smtp.gmail.com"
+        assert mail_outbox.enqueue(_message()) is not None
+
+
+class TestSend:
+    """Tests for send()."""
+
+    @pytest.mark.unit
+    def test_waits_for_delivery(self, outbox, monkeypatch):
+        # Deliver from another thread, as the sender thread would
+        monkeypatch.setattr(mail_outbox, "start", lambda: threading.Timer(0.3, mail_outbox.drain).start())
+
+        assert mail_outbox.send(_message(), timeout=10) is True
+        assert len(outbox["sent"]) == 1
+
+    @pytest.mark.unit
+    def test_times_out_but_stays_queued(self, outbox):
+        assert mail_outbox.send(_message(), timeout=0.3) is False
+        assert len(mail_outbox._envelopes()) == 1
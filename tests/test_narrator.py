@@ -2,12 +2,22 @@
 Unit tests for narrator.py
 """
 
+import json
+import multiprocessing
+
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import narrator
 
 
+def _stream(text):
+    """A streamed Gemini response of one chunk."""
+    async def chunks():
+        yield MagicMock(text=text, usage_metadata=None)
+    return chunks()
+
+
 class TestSanitizeData:
     """Tests for sanitize_data() function."""
 
@@ -166,6 +176,37 @@ class TestBuildPrompt:
         assert "35" in prompt or "freeze" in prompt.lower() or "cold" in prompt.lower()
         assert "battery" in prompt.lower() or "3.4" in prompt
 
+    @pytest.mark.unit
+    def test_segments_join_to_prompt(self):
+        """The static prefix and per-request part make up the whole prompt."""
+        data = {"interior_temp": 72}
+        history = [{"date": "2025-06-17", "subject": "Hot one", "body": "Dog days."}]
+        with patch.object(narrator.context_engine, "get_rich_context", return_value=["Windy."]):
+            static, volatile = narrator.build_prompt_segments(data, history=history)
+            prompt = narrator.build_prompt(data, history=history)
+            other_static = narrator.build_prompt_segments({"interior_temp": 40})[0]
+
+        assert "\n".join((static, volatile)) == prompt
+        assert static.startswith("TASK:") and "72" not in static
+        assert "Windy." in volatile and "Hot one" in volatile
+        assert other_static is static
+
+    @pytest.mark.unit
+    def test_template_reread_only_when_changed(self, tmp_path, monkeypatch):
+        """Prompt templates are served from memory until the file changes."""
+        import os
+        monkeypatch.setattr(narrator, "_PROMPTS_DIR", str(tmp_path))
+        path = tmp_path / "persona.txt"
+        path.write_text("Salty.")
+
+        assert narrator._load_prompt_template("persona.txt") == "Salty."
+        with patch("builtins.open", side_effect=AssertionError("re-read")):
+            assert narrator._load_prompt_template("persona.txt") == "Salty."
+
+        path.write_text("Saltier.")
+        os.utime(path, (1, 1))
+        assert narrator._load_prompt_template("persona.txt") == "Saltier."
+
 
 class TestGenerateUpdate:
     """Tests for generate_update() function."""
@@ -213,3 +254,79 @@ class TestGenerateUpdate:
             _, _, _, _, augmented_data = narrator.generate_update({"interior_temp": 72})
         
         assert augmented_data.get("condition") == "Clear"
+
+
+class TestJudgeRiddle:
+    """Tests for judge_riddle() pre-judging and caching."""
+
+    @pytest.fixture
+    def judge_client(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(narrator, "_JUDGE_CACHE_PATH", str(tmp_path / "judge_cache.json"))
+        client = MagicMock()
+        client.aio.models.generate_content_stream = AsyncMock(side_effect=lambda **kwargs: _stream(
+            '{"correct": false, "reply_text": "Nope. Colder than the canal in January."}'
+        ))
+        with patch.object(narrator, "_get_client", return_value=client):
+            yield client
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("guess, answer", [
+        ("The Heron!", "heron"),
+        ("  great   blue heron ", "Great Blue Heron"),
+        ("sea gulls", "seagull"),
+        ("crab", "Crabs"),
+        ("egret", "heron / egret"),
+        ("egret", "heron (or egret)"),
+    ])
+    def test_prejudge_skips_ai(self, judge_client, guess, answer):
+        result = narrator.judge_riddle(guess, answer, "What waits in the marsh?")
+
+        assert result["correct"] is True
+        judge_client.aio.models.generate_content_stream.assert_not_called()
+
+    @pytest.mark.unit
+    def test_repeated_guess_served_from_cache(self, judge_client):
+        first = narrator.judge_riddle("A pelican", "heron", "riddle", riddle_date="2025-06-18")
+        again = narrator.judge_riddle("pelican.", "heron", "riddle", riddle_date="2025-06-18")
+
+        assert first == again == {"correct": False, "reply_text": "Nope. Colder than the canal in January."}
+        assert judge_client.aio.models.generate_content_stream.call_count == 1
+
+    @pytest.mark.unit
+    def test_cache_is_per_riddle(self, judge_client):
+        narrator.judge_riddle("pelican", "heron", "riddle", riddle_date="2025-06-18")
+        narrator.judge_riddle("pelican", "heron", "riddle", riddle_date="2025-06-19")
+        narrator.judge_riddle("pelican", "osprey", "riddle", riddle_date="2025-06-19")  # Regenerated
+
+        assert judge_client.aio.models.generate_content_stream.call_count == 3
+
+    @pytest.mark.unit
+    def test_fallback_not_cached(self, judge_client):
+        judge_client.aio.models.generate_content_stream.side_effect = [
+            Exception("API Error"),  # Judge model
+            Exception("API Error"),  # ...and its fallback
+            _stream('{"correct": true, "reply_text": "Close enough."}'),
+        ]
+        first = narrator.judge_riddle("blue heron bird", "heron", "riddle", riddle_date="2025-06-18")
+        second = narrator.judge_riddle("blue heron bird", "heron", "riddle", riddle_date="2025-06-18")
+
+        assert first["reply_text"] == "That's the one. Took a minute, but you got there."
+        assert second == {"correct": True, "reply_text": "Close enough."}
+
+    @pytest.mark.unit
+    def test_concurrent_processes_keep_every_judgement(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(narrator, "_JUDGE_CACHE_PATH", str(tmp_path / "judge_cache.json"))
+        ctx = multiprocessing.get_context("fork")
+
+        def store(worker):
+            for i in range(10):
+                narrator._store_judgement("2025-06-18", "heron", f"guess-{worker}-{i}", {"correct": False})
+
+        workers = [ctx.Process(target=store, args=(w,)) for w in range(4)]
+        for p in workers:
+            p.start()
+        for p in workers:
+            p.join()
+
+        cached = json.loads((tmp_path / "judge_cache.json").read_text())
+        assert len(cached["2025-06-18"]["judgements"]) == 40
@@ -0,0 +1,118 @@
+"""
+Unit tests for personal_editions.py (per-recipient personalised editions)
+"""
+
+import os
+from email import message_from_bytes, policy
+from email.message import EmailMessage
+from unittest.mock import patch
+
+import pytest
+
+import email_preview
+import email_templates
+import personal_editions
+import scorekeeper
+
+PLAYER = {
+    "email": "alice@example.com",
+    "display_name": "alice",
+    "points": 42,
+    "wins": 3,
+    "rank": 2,
+    "current_streak": 4,
+}
+
+
+@pytest.fixture
+def shared_msg():
+    html = email_templates.render_daily_email(**email_preview.MOCK_DATA["normal"], personal_slot=True)
+    msg = EmailMessage()
+    msg["From"] = "Greenhouse <bot@example.com>"
+    msg["To"] = "alice@example.com, bob@example.com"
+    msg["Subject"] = "Clear skies"
+    msg.set_content("plain")
+    msg.add_alternative(html, subtype="html")
+    msg.get_payload()[-1].add_related(
+        b"GIF89a" + b"\x00" * 512, maintype="image", subtype="gif", cid="<img@greenhouse>"
+    )
+    return msg
+
+
+def _html(msg):
+    return next(p for p in msg.walk() if p.get_content_type() == "text/html").get_content()
+
+
+def _stats(email):
+    return PLAYER if email == PLAYER["email"] else None
+
+
+class TestPersonalCard:
+    """Tests for personal_card()."""
+
+    @pytest.mark.unit
+    def test_player_sees_rank_and_streak(self):
+        with patch("personal_editions.scorekeeper.get_player_stats", side_effect=_stats):
+            card = personal_editions.personal_card("alice@example.com")
+
+        assert "#2 this season with 42 pts" in card
+        assert "4-day streak" in card
+
+    @pytest.mark.unit
+    def test_non_player_invited_to_play(self):
+        with patch("personal_editions.scorekeeper.get_player_stats", side_effect=_stats):
+            card = personal_editions.personal_card("Bob.Smith@example.com")
+
+        assert "bob.smith" in card
+        assert "email a guess" in card
+
+    @pytest.mark.unit
+    def test_new_season_shows_alltime_standing(self, tmp_path, monkeypatch):
+        for name in ("db", "scores", "daily_log", "archive"):
+            monkeypatch.setattr(scorekeeper, f"_get_{name}_path", lambda name=name: str(tmp_path / name))
+        scorekeeper.award_points("alice@example.com", 3, True, "2026-01-20")
+        scorekeeper.reset_season("2026-01-21")
+
+        card = personal_editions.personal_card("alice@example.com")
+
+        assert "no points yet this season" in card
+        assert "All-time you're #1 with 3 pts" in card
+        assert "email a guess" not in card
+
+
+class TestPersonalise:
+    """Tests for personalise() and queue_personalised()."""
+
+    @pytest.mark.unit
+    def test_slot_only_present_when_requested(self):
+        plain = email_templates.render_daily_email(**email_preview.MOCK_DATA["normal"])
+
+        assert email_templates.PERSONAL_SLOT not in plain
+
+    @pytest.mark.unit
+    def test_fills_slot_and_readdresses(self, shared_msg):
+        personal = personal_editions.personalise(
+            shared_msg, _html(shared_msg), "alice@example.com", "<tr><td>Hi alice</td></tr>"
+        )
+
+        assert personal["To"] == "alice@example.com"
+        assert "Hi alice" in _html(personal)
+        assert email_templates.PERSONAL_SLOT not in _html(personal)
+        # The shared edition is untouched and keeps its image
+        assert email_templates.PERSONAL_SLOT in _html(shared_msg)
+        assert any(p.get_content_type() == "image/gif" for p in personal.walk())
+
+    @pytest.mark.unit
+    def test_queues_one_message_per_recipient(self, shared_msg):
+        recipients = ["alice@example.com", "bob@example.com"]
+        with patch("personal_editions.scorekeeper.get_player_stats", side_effect=_stats):
+            msg_ids = personal_editions.queue_personalised(shared_msg, recipients)
+
+        queue_dir = os.path.join(os.environ["MAIL_OUTBOX_DIR"], "queue")
+        queued = [
+            message_from_bytes(open(os.path.join(queue_dir, f"{msg_id}.eml"), "rb").read(), policy=policy.default)
+            for msg_id in msg_ids
+        ]
+        assert [m["To"] for m in queued] == recipients
+        assert "#2 this season" in _html(queued[0])
+        assert "email a guess" in _html(queued[1])
@@ -11,6 +11,8 @@ from email.mime.multipart import MIMEMultipart
 from unittest.mock import patch, MagicMock
 from io import BytesIO
 
+import mail_outbox
+import personal_editions
 import publisher
 
 
@@ -98,6 +100,8 @@ class TestEmailWeatherTable:
             patch("publisher.timelapse.create_weekly_timelapse", return_value=None),
             patch("publisher.find_latest_image", return_value=None),
             patch("publisher.stats.get_24h_stats", return_value={}),
+            patch("publisher.external_data.gather_external_data", return_value={}),
+            patch("publisher.narrator.generate_riddle", return_value=("", None)),
         ):
             msg, _weekly_mode = publisher.build_email(dict(sample_sensor_data))
 
@@ -109,6 +113,116 @@ class TestEmailWeatherTable:
         assert "4:56 PM" in html_body
 
 
+class TestHostedAssets:
+    """Tests for EMAIL_ASSET_MODE=hosted."""
+
+    @staticmethod
+    def _variants(sample_sensor_data):
+        edition = {
+            "narrative": ("S", "H", "B", "B", dict(sample_sensor_data)),
+            "timelapse": b"GIF89a" + b"\x00" * 4096,
+            "chart": b"\x89PNG" + b"\x00" * 2048,
+        }
+        with (
+            patch.object(publisher, "run_edition_tasks", return_value=edition),
+            patch.object(publisher, "is_weekly_edition", return_value=False),
+        ):
+            return publisher.build_email_variants({"sensors": dict(sample_sensor_data), "last_seen": {}})
+
+    @staticmethod
+    def _html(msg):
+        return next(p for p in msg.walk() if p.get_content_type() == "text/html").get_content()
+
+    @pytest.mark.unit
+    def test_inline_only_by_default(self, sample_sensor_data, monkeypatch):
+        monkeypatch.delenv("EMAIL_ASSET_MODE", raising=False)
+
+        variants, _ = self._variants(sample_sensor_data)
+
+        assert list(variants) == ["inline"]
+        images = [p for p in variants["inline"].walk() if p.get_content_maintype() == "image"]
+        assert [p.get_filename() for p in images] == ["timelapse.gif", "temperature_chart.png"]
+        assert self._html(variants["inline"]).count('src="cid:') == 2
+
+    @pytest.mark.unit
+    def test_hosted_variant_references_published_assets(self, sample_sensor_data, monkeypatch, tmp_path):
+        monkeypatch.setenv("EMAIL_ASSET_MODE", "hosted")
+        monkeypatch.setenv("EMAIL_ASSET_DIR", str(tmp_path / "email"))
+        monkeypatch.setenv("EMAIL_ASSET_BASE_URL", "https://example.com/static/email")
+
+        variants, _ = self._variants(sample_sensor_data)
+
+        hosted = variants["hosted"]
+        assert not [p for p in hosted.walk() if p.get_content_maintype() == "image"]
+        html_body = self._html(hosted)
+        published = sorted(p.name for p in (tmp_path / "email").iterdir())
+        assert sorted(name.rsplit(".", 1)[1] for name in published) == ["gif", "png"]
+        for name in published:
+            assert f'src="https://example.com/static/email/{name}"' in html_body
+        assert len(hosted.as_bytes()) < len(variants["inline"].as_bytes()) - 6000
+
+    @pytest.mark.unit
+    def test_run_once_sends_inline_to_opted_out_recipients(self, monkeypatch):
+        hosted, inline = MagicMock(name="hosted"), MagicMock(name="inline")
+        monkeypatch.setenv("EMAIL_INLINE_RECIPIENTS", "Old@Example.com")
+        sent = []
+        with (
+            patch.object(publisher, "load_latest_sensor_snapshot", return_value={}),
+            patch.object(publisher, "build_email_variants", return_value=({"inline": inline, "hosted": hosted}, False)),
+            patch.object(publisher, "get_recipients_from_env", return_value=["a@example.com", "old@example.com"]),
+            patch.object(publisher, "send_email", side_effect=lambda msg, to: sent.append((msg, to))),
+            patch.object(publisher, "scorekeeper"),
+        ):
+            publisher.run_once()
+
+        assert sent == [(hosted, ["a@example.com"]), (inline, ["old@example.com"])]
+
+
+class TestPersonalisedEditions:
+    """Tests for EMAIL_PERSONALISED=1."""
+
+    @pytest.mark.unit
+    def test_run_once_queues_a_copy_per_recipient(self, monkeypatch):
+        monkeypatch.setenv("EMAIL_PERSONALISED", "1")
+        monkeypatch.delenv("EMAIL_INLINE_RECIPIENTS", raising=False)
+        inline = MagicMock(name="inline")
+        recipients = ["a@example.com", "b@example.com"]
+        with (
+            patch.object(publisher, "load_latest_sensor_snapshot", return_value={}),
+            patch.object(publisher, "build_email_variants", return_value=({"inline": inline}, False)) as build,
+            patch.object(publisher, "get_recipients_from_env", return_value=recipients),
+            patch.object(personal_editions, "queue_personalised", return_value=["1", "2"]) as queue,
+            patch.object(mail_outbox, "wait", return_value=True) as wait,
+            patch.object(publisher, "send_email") as send,
+            patch.object(publisher, "scorekeeper"),
+        ):
+            publisher.run_once()
+
+        assert build.call_args.kwargs == {"personalised": True}
+        queue.assert_called_once_with(inline, recipients)
+        assert wait.call_args.args[0] == ["1", "2"]
+        send.assert_not_called()
+
+    @pytest.mark.unit
+    def test_run_once_reports_recipients_not_queued(self, monkeypatch):
+        monkeypatch.setenv("EMAIL_PERSONALISED", "1")
+        monkeypatch.delenv("EMAIL_INLINE_RECIPIENTS", raising=False)
+        with (
+            patch.object(publisher, "load_latest_sensor_snapshot", return_value={}),
+            patch.object(publisher, "build_email_variants", return_value=({"inline": MagicMock()}, False)),
+            patch.object(publisher, "get_recipients_from_env", return_value=["a@example.com", "b@example.com"]),
+            patch.object(personal_editions, "queue_personalised", return_value=["1"]),
+            patch.object(mail_outbox, "wait", return_value=True),
+            patch.object(publisher, "scorekeeper"),
+            patch.object(publisher, "log") as log,
+        ):
+            publisher.run_once()
+
+        messages = [call.args[0] for call in log.call_args_list]
+        assert any("partially failed: only 1/2" in m for m in messages)
+        assert not any(m.startswith("Personalised edition sent") for m in messages)
+
+
 class TestSendEmail:
     """Tests for send_email() function (now in email_sender module)."""
 
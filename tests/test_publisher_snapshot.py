@@ -198,6 +198,8 @@ class TestEmailSnapshot:
             patch("timelapse.create_daily_timelapse", return_value=None),
             patch("chart_generator.generate_temperature_chart", return_value=b"PNG"),
             patch("stats.get_24h_stats", return_value={}),
+            patch("publisher.external_data.gather_external_data", return_value={}),
+            patch("narrator.generate_riddle", return_value=("", None)),
             patch("weekly_digest.load_weekly_stats", return_value={}),
             patch.object(publisher, "find_latest_image", return_value=None),
             patch.object(publisher, "is_weekly_edition", return_value=False),
@@ -238,6 +240,8 @@ class TestEmailSnapshot:
             patch("timelapse.create_daily_timelapse", return_value=None),
             patch("chart_generator.generate_temperature_chart", return_value=b"PNG"),
             patch("stats.get_24h_stats", return_value={}),
+            patch("publisher.external_data.gather_external_data", return_value={}),
+            patch("narrator.generate_riddle", return_value=("", None)),
             patch("weekly_digest.load_weekly_stats", return_value={}),
             patch.object(publisher, "find_latest_image", return_value=None),
             patch.object(publisher, "is_weekly_edition", return_value=False),
@@ -285,6 +289,8 @@ class TestEmailSnapshot:
             patch("timelapse.create_daily_timelapse", return_value=None),
             patch("chart_generator.generate_temperature_chart", return_value=b"PNG"),
             patch("stats.get_24h_stats", return_value={}),
+            patch("publisher.external_data.gather_external_data", return_value={}),
+            patch("narrator.generate_riddle", return_value=("", None)),
             patch("weekly_digest.load_weekly_stats", return_value={}),
             patch.object(publisher, "find_latest_image", return_value=None),
             patch.object(publisher, "is_weekly_edition", return_value=False),
@@ -366,6 +372,8 @@ class TestEmailRegressions:
             patch("timelapse.create_daily_timelapse", return_value=None),
             patch("chart_generator.generate_temperature_chart", return_value=b"PNG"),
             patch("stats.get_24h_stats", return_value={}),
+            patch("publisher.external_data.gather_external_data", return_value={}),
+            patch("narrator.generate_riddle", return_value=("", None)),
             patch("weekly_digest.load_weekly_stats", return_value={}),
             patch.object(publisher, "find_latest_image", return_value=None),
             patch.object(publisher, "is_weekly_edition", return_value=False),
@@ -403,6 +411,8 @@ class TestEmailRegressions:
             patch("timelapse.create_daily_timelapse", return_value=None),
             patch("chart_generator.generate_temperature_chart", return_value=b"PNG"),
             patch("stats.get_24h_stats", return_value={}),
+            patch("publisher.external_data.gather_external_data", return_value={}),
+            patch("narrator.generate_riddle", return_value=("", None)),
             patch("weekly_digest.load_weekly_stats", return_value={}),
             patch.object(publisher, "find_latest_image", return_value=None),
             patch.object(publisher, "is_weekly_edition", return_value=False),
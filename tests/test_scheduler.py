@@ -41,6 +41,18 @@ class TestSafeDailyDispatch:
                 scheduler.safe_daily_dispatch()
 
 
+class TestSafeRecordConditions:
+    """Tests for safe_record_conditions() function."""
+
+    @pytest.mark.integration
+    def test_handles_snapshot_error(self):
+        """Should log and swallow snapshot errors."""
+        with patch("scheduler.conditions_log.record_conditions", side_effect=Exception("Error")) as mock_record:
+            scheduler.safe_record_conditions()
+
+        mock_record.assert_called_once()
+
+
 class TestTriggerGoldenHourCapture:
     """Tests for trigger_golden_hour_capture() function."""
 
@@ -68,8 +80,8 @@ class TestSchedulerMain:
             mock_at = MagicMock()
             mock_day.at.return_value = mock_at
 
-            # Mock golden_hour to avoid API calls
-            with patch("scheduler.golden_hour.get_seasonal_golden_hour", return_value="16:00"):
+            # Pin golden hour so the registered times are predictable
+            with patch("scheduler.golden_hour.get_golden_hour_time", return_value="16:00"):
                 # Run main but break the loop immediately
                 with patch("scheduler.time.sleep", side_effect=KeyboardInterrupt):
                     try:
@@ -82,7 +94,7 @@ class TestSchedulerMain:
 
     @pytest.mark.integration
     def test_registers_golden_hour_job(self):
-        """Should register golden hour job at seasonal time."""
+        """Should register golden hour job at today's computed time."""
         import schedule as schedule_lib
         schedule_lib.clear()
 
@@ -92,7 +104,7 @@ class TestSchedulerMain:
             mock_at = MagicMock()
             mock_day.at.return_value = mock_at
 
-            with patch("scheduler.golden_hour.get_seasonal_golden_hour", return_value="18:30"):
+            with patch("scheduler.golden_hour.get_golden_hour_time", return_value="18:30"):
                 with patch("scheduler.time.sleep", side_effect=KeyboardInterrupt):
                     try:
                         scheduler.main()
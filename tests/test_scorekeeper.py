@@ -0,0 +1,252 @@
+"""
+Unit tests for scorekeeper.py
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+import scorekeeper
+
+TODAY = "2026-01-25"
+
+
+@pytest.fixture
+def game(tmp_path, monkeypatch):
+    """Empty game database (and JSON paths) under tmp_path; guesses open for TODAY."""
+    paths = {
+        "db": tmp_path / "riddle_game.db",
+        "scores": tmp_path / "riddle_scores.json",
+        "daily": tmp_path / "riddle_daily_log.json",
+        "archive": tmp_path / "riddle_game_archive.json",
+    }
+    monkeypatch.setattr(scorekeeper, "_get_db_path", lambda: str(paths["db"]))
+    monkeypatch.setattr(scorekeeper, "_get_scores_path", lambda: str(paths["scores"]))
+    monkeypatch.setattr(scorekeeper, "_get_daily_log_path", lambda: str(paths["daily"]))
+    monkeypatch.setattr(scorekeeper, "_get_archive_path", lambda: str(paths["archive"]))
+    return paths
+
+
+class TestRecordAttempt:
+    """Tests for record_attempt()."""
+
+    @pytest.mark.unit
+    def test_scoring_flow(self, game):
+        scorekeeper.reset_daily_log(TODAY)
+
+        assert scorekeeper.record_attempt("Mom@Example.com ", False, TODAY) == {"status": "wrong"}
+        assert scorekeeper.record_attempt("mom@example.com", True, TODAY) == {
+            "status": "correct", "points": 3, "is_first": True, "rank": 1,
+        }
+        assert scorekeeper.record_attempt("mom@example.com", True, TODAY) == {"status": "already_solved"}
+        assert scorekeeper.record_attempt("nick@example.com", True, TODAY)["points"] == 2
+        assert scorekeeper.record_attempt("nick@example.com", True, "2026-01-24") == {"status": "stale_riddle"}
+
+        assert [(p["display_name"], p["points"], p["wins"]) for p in scorekeeper.get_leaderboard()] == [
+            ("mom", 3, 1), ("nick", 2, 0),
+        ]
+        assert [w["display_name"] for w in scorekeeper.get_yesterdays_winners()] == ["mom", "nick"]
+        with sqlite3.connect(str(game["db"])) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM attempts").fetchone()[0] == 5 - 1  # Stale not logged
+
+    @pytest.mark.unit
+    def test_earlier_email_takes_first(self, game):
+        scorekeeper.reset_daily_log(TODAY)
+        sent = datetime(2026, 1, 25, 9, 0)
+
+        scorekeeper.record_attempt("late@example.com", True, TODAY, email_timestamp=sent)
+        result = scorekeeper.record_attempt("early@example.com", True, TODAY, email_timestamp=sent - timedelta(minutes=5))
+
+        assert (result["is_first"], result["points"], result["rank"]) == (True, 3, 2)
+        assert scorekeeper.get_yesterdays_winners()[0]["display_name"] == "early"
+
+    @pytest.mark.unit
+    def test_concurrent_guesses_lose_nothing(self, game):
+        scorekeeper.reset_daily_log(TODAY)
+        users = [f"player{i}@example.com" for i in range(40)]
+
+        def guess(user):
+            scorekeeper.record_attempt(user, False, TODAY)
+            scorekeeper.record_attempt(user, True, TODAY)
+
+        threads = [threading.Thread(target=guess, args=(u,)) for u in users]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        board = scorekeeper.get_leaderboard(top_n=100)
+        assert len(board) == 40
+        assert sum(p["points"] for p in board) == 40 * 2 + 1
+        assert sum(p["wins"] for p in board) == 1
+
+
+class TestLeaderboard:
+    """Tests for get_leaderboard() and get_player_stats()."""
+
+    @pytest.mark.unit
+    def test_rank_beyond_top_100(self, game):
+        for i in range(120):
+            scorekeeper.award_points(f"p{i:03d}@example.com", 200 - i, i % 2 == 0, TODAY)
+
+        assert [p["email"] for p in scorekeeper.get_leaderboard(top_n=2)] == ["p000@example.com", "p001@example.com"]
+        stats = scorekeeper.get_player_stats("P119@example.com")
+        assert (stats["rank"], stats["points"], stats["last_played"]) == (120, 81, TODAY)
+        assert scorekeeper.get_player_stats("nobody@example.com") is None
+
+    @pytest.mark.unit
+    def test_ties_keep_join_order(self, game):
+        for user in ("b@example.com", "a@example.com", "c@example.com"):
+            scorekeeper.award_points(user, 2, False, TODAY)
+
+        assert [p["display_name"] for p in scorekeeper.get_leaderboard()] == ["b", "a", "c"]
+        assert scorekeeper.get_player_stats("c@example.com")["rank"] == 3
+
+
+class TestRankedViews:
+    """Tests for the cached leaderboard views, all-time totals and streaks."""
+
+    @pytest.mark.unit
+    def test_award_updates_view_in_place(self, game, monkeypatch):
+        for user, points in (("a@example.com", 3), ("b@example.com", 2), ("c@example.com", 2)):
+            scorekeeper.award_points(user, points, False, TODAY)
+        assert scorekeeper.get_player_stats("c@example.com")["rank"] == 3
+
+        loads = []
+        original = scorekeeper._load_board
+        monkeypatch.setattr(scorekeeper, "_load_board", lambda *a: loads.append(a) or original(*a))
+        scorekeeper.award_points("c@example.com", 2, True, TODAY)
+
+        board = scorekeeper.get_leaderboard()
+        assert [p["display_name"] for p in board] == ["c", "a", "b"]
+        assert scorekeeper.get_player_stats("c@example.com")["rank"] == 1
+        assert len(loads) == 1  # Version check only; the rows came from the award
+
+        scorekeeper._board.clear()
+        assert scorekeeper.get_leaderboard() == board  # Same as a full reload
+
+    @pytest.mark.unit
+    def test_reloads_after_external_write(self, game):
+        scorekeeper.award_points("a@example.com", 2, False, TODAY)
+        assert scorekeeper.get_leaderboard()[0]["points"] == 2
+
+        # Another process (here: a plain connection) awards and bumps the version
+        with sqlite3.connect(str(game["db"])) as conn:
+            conn.execute("UPDATE players SET points = 9 WHERE email = 'a@example.com'")
+            conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'scores_version'")
+
+        assert scorekeeper.get_leaderboard()[0]["points"] == 9
+
+    @pytest.mark.unit
+    def test_alltime_survives_new_season(self, game):
+        scorekeeper.award_points("a@example.com", 3, True, "2026-01-20")
+        scorekeeper.award_points("b@example.com", 2, False, "2026-01-20")
+        scorekeeper.reset_season("2026-01-21")
+        scorekeeper.award_points("b@example.com", 2, False, "2026-01-21")
+
+        assert [p["display_name"] for p in scorekeeper.get_leaderboard()] == ["b"]
+        assert [(p["display_name"], p["points"]) for p in scorekeeper.get_leaderboard(view="alltime")] == [
+            ("b", 4), ("a", 3),
+        ]
+        stats = scorekeeper.get_player_stats("b@example.com")
+        assert (stats["rank"], stats["alltime_points"], stats["alltime_rank"]) == (1, 4, 1)
+        stats = scorekeeper.get_player_stats("a@example.com")  # Not playing this season
+        assert (stats["points"], stats["rank"], stats["alltime_points"], stats["alltime_wins"]) == (0, None, 3, 1)
+        with pytest.raises(ValueError):
+            scorekeeper.get_leaderboard(view="weekly")
+
+    @pytest.mark.unit
+    def test_stats_right_after_season_reset(self, game):
+        scorekeeper.reset_daily_log("2026-01-20")
+        scorekeeper.record_attempt("a@example.com", True, "2026-01-20")
+        scorekeeper.reset_season("2026-01-21")
+
+        stats = scorekeeper.get_player_stats("A@example.com")
+
+        assert (stats["display_name"], stats["points"], stats["wins"], stats["rank"]) == ("a", 0, 0, None)
+        assert (stats["alltime_points"], stats["alltime_wins"], stats["alltime_rank"]) == (3, 1, 1)
+        assert stats["best_streak"] == 1
+        assert scorekeeper.get_player_stats("nobody@example.com") is None
+
+    @pytest.mark.unit
+    def test_streaks(self, game):
+        for day in ("2026-01-20", "2026-01-21", "2026-01-22", "2026-01-24"):
+            scorekeeper.reset_daily_log(day)
+            scorekeeper.record_attempt("mom@example.com", True, day)
+        scorekeeper.reset_daily_log(TODAY)
+
+        stats = scorekeeper.get_player_stats("mom@example.com")
+        assert (stats["current_streak"], stats["best_streak"]) == (1, 3)
+        assert scorekeeper.get_leaderboard()[0]["streak"] == 1
+
+        scorekeeper.reset_daily_log("2026-01-26")  # Missed the 25th
+        assert scorekeeper.get_player_stats("mom@example.com")["current_streak"] == 0
+
+
+class TestDailyLog:
+    """Tests for reset_daily_log() and archive_daily_log()."""
+
+    @pytest.mark.unit
+    def test_archive_keeps_90_days(self, game):
+        old = (datetime.utcnow() - timedelta(days=120)).date().isoformat()
+        scorekeeper.reset_daily_log(old)
+        scorekeeper.record_attempt("mom@example.com", True, old)
+        scorekeeper.archive_daily_log()
+
+        today = datetime.utcnow().date().isoformat()
+        scorekeeper.reset_daily_log(today)
+        scorekeeper.record_attempt("mom@example.com", False, today)
+        scorekeeper.archive_daily_log()
+
+        with sqlite3.connect(str(game["db"])) as conn:
+            assert conn.execute("SELECT DISTINCT riddle_date FROM attempts").fetchall() == [(today,)]
+            assert conn.execute("SELECT archived_at IS NOT NULL FROM days").fetchall() == [(1,)]
+        assert scorekeeper.get_player_stats("mom@example.com")["points"] == 3  # Scores survive
+
+
+class TestMigration:
+    """Tests for the JSON import."""
+
+    @pytest.mark.unit
+    def test_imports_json_files_on_first_use(self, game):
+        game["scores"].write_text(json.dumps({
+            "season_start": "2026-01-01",
+            "players": {
+                "nick@example.com": {"display_name": "nick", "points": 5, "wins": 1, "last_played": "2026-01-11"},
+                "mom@example.com": {"display_name": "mom", "points": 5, "wins": 1, "last_played": "2026-01-10"},
+            },
+        }))
+        game["daily"].write_text(json.dumps({
+            "riddle_date": TODAY, "first_solver": "nick@example.com", "first_solve_time": "2026-01-25T08:00:00Z",
+            "solvers": ["nick@example.com"],
+            "attempts": [{"user": "nick@example.com", "display_name": "nick", "correct": True,
+                          "email_timestamp": "2026-01-25T08:00:00Z", "processed_at": "2026-01-25T08:01:00Z"}],
+        }))
+        game["archive"].write_text(json.dumps([
+            {"riddle_date": "2026-01-24", "solvers": [], "attempts": [], "archived_at": "2026-01-25T12:00:00Z"},
+        ]))
+
+        assert scorekeeper.get_season_start() == "2026-01-01"
+        assert [p["display_name"] for p in scorekeeper.get_leaderboard()] == ["nick", "mom"]
+        assert scorekeeper.get_yesterdays_winners() == [
+            {"email": "nick@example.com", "display_name": "nick", "is_first": True},
+        ]
+        assert scorekeeper.record_attempt("nick@example.com", True, TODAY) == {"status": "already_solved"}
+        assert scorekeeper.record_attempt("mom@example.com", True, TODAY)["points"] == 2
+        assert scorekeeper.migrate_from_json() is False  # Not imported twice
+
+    @pytest.mark.unit
+    def test_upgrades_v1_database(self, game):
+        with sqlite3.connect(str(game["db"])) as conn:
+            conn.executescript(scorekeeper._SCHEMA.split("CREATE TABLE IF NOT EXISTS player_totals")[0])
+            conn.execute("INSERT INTO meta VALUES ('schema_version', '1')")
+            conn.execute("INSERT INTO players (email, display_name, points, wins) VALUES ('mom@example.com', 'mom', 5, 1)")
+            conn.executemany("INSERT INTO solvers (riddle_date, user) VALUES (?, 'mom@example.com')",
+                             [("2026-01-23",), ("2026-01-24",)])
+            conn.execute("INSERT INTO meta VALUES ('riddle_date', ?)", (TODAY,))
+
+        stats = scorekeeper.get_player_stats("mom@example.com")
+        assert (stats["alltime_points"], stats["current_streak"], stats["best_streak"]) == (5, 2, 2)
@@ -0,0 +1,87 @@
+"""
+Unit tests for solar.py
+"""
+
+import pytest
+from datetime import date, datetime, timedelta, timezone
+
+import solar
+
+
+NYC = (40.7128, -74.0060, "America/New_York")
+
+
+def _hm(value):
+    return value.hour * 60 + value.minute + value.second / 60
+
+
+class TestGetSunTimes:
+    """Tests for get_sun_times() function."""
+
+    @pytest.mark.unit
+    def test_matches_published_summer_times(self):
+        """NYC 2024-06-20: sunrise 05:25, sunset 20:31 EDT (NOAA)."""
+        sun = solar.get_sun_times(date(2024, 6, 20), *NYC)
+        assert _hm(sun.sunrise) == pytest.approx(5 * 60 + 25, abs=2)
+        assert _hm(sun.sunset) == pytest.approx(20 * 60 + 31, abs=2)
+
+    @pytest.mark.unit
+    def test_matches_published_winter_times(self):
+        """NYC 2024-12-21: sunrise 07:17, sunset 16:32 EST (NOAA)."""
+        sun = solar.get_sun_times(date(2024, 12, 21), *NYC)
+        assert _hm(sun.sunrise) == pytest.approx(7 * 60 + 17, abs=2)
+        assert _hm(sun.sunset) == pytest.approx(16 * 60 + 32, abs=2)
+
+    @pytest.mark.unit
+    def test_events_are_ordered(self):
+        """Twilight, golden hour, sunrise/sunset should nest in order."""
+        sun = solar.get_sun_times(date(2025, 3, 20))
+        assert sun.civil_dawn < sun.golden_morning[0] < sun.sunrise < sun.golden_morning[1]
+        assert sun.golden_morning[1] < sun.solar_noon < sun.golden_evening[0]
+        assert sun.golden_evening[0] < sun.sunset < sun.golden_evening[1] < sun.civil_dusk
+
+    @pytest.mark.unit
+    def test_handles_dst_dates(self):
+        """Times should be in local time for the requested date across DST."""
+        before = solar.get_sun_times(date(2025, 3, 8))
+        after = solar.get_sun_times(date(2025, 3, 10))
+        assert before.sunrise.date() == date(2025, 3, 8)
+        # Clocks move forward an hour, so local sunrise jumps later
+        assert _hm(after.sunrise) - _hm(before.sunrise) > 50
+
+    @pytest.mark.unit
+    def test_memoised_per_date(self):
+        """Repeated calls for the same date should hit the cache."""
+        solar._compute_sun_times.cache_clear()
+        solar.get_sun_times(date(2025, 7, 4))
+        solar.get_sun_times(date(2025, 7, 4))
+        assert solar._compute_sun_times.cache_info().hits == 1
+
+    @pytest.mark.unit
+    def test_polar_night_has_no_sunrise(self):
+        """Above the Arctic circle in December the sun never rises."""
+        sun = solar.get_sun_times(date(2025, 12, 21), 78.2, 15.6, "UTC")
+        assert sun.sunrise is None and sun.sunset is None
+
+
+class TestIsDaylight:
+    """Tests for is_daylight() function."""
+
+    @pytest.mark.unit
+    def test_noon_is_daylight(self):
+        """Local noon should be daylight (naive treated as UTC)."""
+        assert solar.is_daylight(datetime(2025, 6, 15, 17, 0)) is True
+
+    @pytest.mark.unit
+    def test_midnight_is_dark(self):
+        """Local midnight should not be daylight."""
+        moment = datetime(2025, 6, 15, 4, 0, tzinfo=timezone.utc)
+        assert solar.is_daylight(moment) is False
+
+    @pytest.mark.unit
+    def test_civil_window_is_wider(self):
+        """Just after sunset should count as daylight only in civil mode."""
+        sun = solar.get_sun_times(date(2025, 6, 15))
+        later = sun.sunset + timedelta(minutes=10)
+        assert solar.is_daylight(later) is False
+        assert solar.is_daylight(later, civil=True) is True
@@ -0,0 +1,106 @@
+"""
+Unit tests for utils/task_graph.py
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from utils.task_graph import TaskGraph
+
+
+class TestTaskGraph:
+    """Tests for TaskGraph."""
+
+    @pytest.mark.unit
+    def test_passes_dependency_results(self):
+        """Dependency results should arrive positionally before args."""
+        graph = TaskGraph("test")
+        graph.add("a", lambda: 2)
+        graph.add("b", lambda: 3)
+        graph.add("sum", lambda a, b, c: a + b + c, deps=["a", "b"], args=(10,))
+
+        results = graph.run()
+
+        assert results == {"a": 2, "b": 3, "sum": 15}
+
+    @pytest.mark.unit
+    def test_independent_steps_overlap(self):
+        """Independent steps should run at the same time."""
+        barrier = threading.Barrier(3, timeout=5)
+        graph = TaskGraph("test")
+        for name in ("x", "y", "z"):
+            graph.add(name, barrier.wait)
+
+        start = time.perf_counter()
+        graph.run()
+
+        # A serial run would hit the barrier timeout and fail
+        assert time.perf_counter() - start < 5
+        assert all(record["ok"] for record in graph.timings())
+
+    @pytest.mark.unit
+    def test_dependent_waits_for_dependency(self):
+        """A step should not start until its dependencies finish."""
+        order = []
+        graph = TaskGraph("test")
+        graph.add("slow", lambda: (time.sleep(0.05), order.append("slow")))
+        graph.add("after", lambda _: order.append("after"), deps=["slow"])
+
+        graph.run()
+
+        assert order == ["slow", "after"]
+
+    @pytest.mark.unit
+    def test_failed_step_yields_none(self):
+        """A raising step returns None and its dependents still run."""
+        def boom():
+            raise RuntimeError("nope")
+
+        graph = TaskGraph("test")
+        graph.add("bad", boom)
+        graph.add("next", lambda value: value is None, deps=["bad"])
+
+        results = graph.run()
+
+        assert results["bad"] is None
+        assert results["next"] is True
+        assert {r["name"]: r["ok"] for r in graph.timings()} == {"bad": False, "next": True}
+
+    @pytest.mark.unit
+    def test_unpicklable_process_step_falls_back_to_thread(self):
+        """Process steps that can't be pickled should still run."""
+        func = MagicMock(return_value=b"GIF")
+        graph = TaskGraph("test")
+        graph.add("gif", func, kwargs={"hours": 24}, in_process=True)
+
+        results = graph.run()
+
+        assert results["gif"] == b"GIF"
+        func.assert_called_once_with(hours=24)
+
+    @pytest.mark.unit
+    def test_rejects_unknown_and_duplicate_steps(self):
+        """Dependencies must be registered first and names must be unique."""
+        graph = TaskGraph("test")
+        graph.add("a", lambda: 1)
+        with pytest.raises(ValueError):
+            graph.add("a", lambda: 2)
+        with pytest.raises(ValueError):
+            graph.add("b", lambda x: x, deps=["missing"])
+
+    @pytest.mark.unit
+    def test_critical_path_follows_longest_chain(self):
+        """Critical path should be the longest chain by duration."""
+        graph = TaskGraph("test")
+        graph.add("fetch", lambda: time.sleep(0.05))
+        graph.add("render", lambda _: time.sleep(0.05), deps=["fetch"])
+        graph.add("quick", lambda: None)
+
+        graph.run()
+        chain, seconds = graph.critical_path()
+
+        assert chain == ["fetch", "render"]
+        assert seconds >= 0.1
@@ -0,0 +1,180 @@
+"""
+Unit tests for tide_predictor.py
+"""
+
+import json
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pytest
+
+import coast_sky_service
+import tide_predictor
+
+TZ = ZoneInfo("America/New_York")
+DAY = datetime(2025, 6, 18, tzinfo=TZ)
+
+# Published NOAA constituent speeds (degrees/hour)
+NOAA_SPEEDS = {
+    "M2": 28.9841042, "S2": 30.0, "N2": 28.4397295, "K1": 15.0410686,
+    "O1": 13.9430356, "P1": 14.9589314, "Q1": 13.3986609, "K2": 30.0821373,
+    "M4": 57.9682084, "MK3": 44.0251729, "2MK3": 42.9271398, "L2": 29.5284789,
+    "MF": 1.0980331, "MM": 0.5443747, "SA": 0.0410686, "OO1": 16.1391017,
+}
+
+
+@pytest.fixture
+def station_file(tmp_path, monkeypatch):
+    """Write a constituents file to a temp calendars dir."""
+    monkeypatch.setattr(tide_predictor, "CALENDARS_DIR", str(tmp_path))
+
+    def write(constituents, offset=2.0, station_id="9999999",
+              source="NOAA CO-OPS harcon/datums, retrieved 2025-06-01"):
+        (tmp_path / f"tide_constituents_{station_id}.json").write_text(json.dumps({
+            "station_id": station_id,
+            "datum_offset_ft": offset,
+            "source": source,
+            "HarmonicConstituents": [
+                {"name": name, "amplitude": amp, "phase_GMT": phase}
+                for name, amp, phase in constituents
+            ],
+        }))
+        return station_id
+
+    yield write
+    tide_predictor._load_station.cache_clear()
+
+
+class TestAstronomy:
+    """Tests for the equilibrium arguments and nodal corrections."""
+
+    @pytest.mark.unit
+    def test_argument_speeds_match_noaa(self):
+        for name, speed in NOAA_SPEEDS.items():
+            coeffs = np.array(tide_predictor._CONSTITUENTS[name][0])
+            assert coeffs @ tide_predictor._ARG_SPEEDS == pytest.approx(speed, abs=1e-5), name
+
+    @pytest.mark.unit
+    def test_nodal_factors_span_schureman_ranges(self):
+        """Over one 18.6-year node cycle f(M2) stays within 0.963-1.038."""
+        epochs = np.linspace(0, 18.61 * 365.25 * 86400, 500) + 1.6e9
+        _, nodal = tide_predictor._astronomy(epochs)
+        f_m2 = nodal["f_bases"][0]
+        assert f_m2.min() == pytest.approx(0.963, abs=0.002)
+        assert f_m2.max() == pytest.approx(1.038, abs=0.002)
+        nu = nodal["u_terms"][1]
+        assert np.abs(nu).max() == pytest.approx(13.0, abs=0.1)
+        assert np.all(np.abs(np.diff(nu)) < 1.0)  # No wrap-around jumps
+
+
+class TestPredictHilo:
+    """Tests for predict_hilo()."""
+
+    @pytest.mark.unit
+    def test_semidiurnal_events_alternate(self, station_file):
+        station = station_file([("M2", 1.5, 100.0)])
+        events = tide_predictor.predict_hilo(DAY, DAY + timedelta(days=2), station)
+
+        types = [e["type"] for e in events]
+        assert len(events) in (7, 8)
+        assert all(a != b for a, b in zip(types, types[1:]))
+
+        highs = [datetime.strptime(e["t"], "%Y-%m-%d %H:%M") for e in events if e["type"] == "H"]
+        gaps = [(b - a).total_seconds() / 3600 for a, b in zip(highs, highs[1:])]
+        assert gaps == pytest.approx([12.42] * len(gaps), abs=0.05)
+        for e in events:
+            expected = 2.0 + 1.5 if e["type"] == "H" else 2.0 - 1.5
+            assert float(e["v"]) == pytest.approx(expected, abs=0.08)  # +/- nodal factor
+
+    @pytest.mark.unit
+    def test_refined_extrema_match_fine_curve(self, station_file):
+        station = station_file([("M2", 1.5, 100.0), ("K1", 0.3, 170.0), ("M4", 0.05, 40.0)])
+        events = tide_predictor.predict_hilo(DAY, DAY + timedelta(days=1), station)
+        times, heights = tide_predictor.predict_curve(
+            DAY, DAY + timedelta(days=1), interval_minutes=0.5, station_id=station
+        )
+
+        top = int(np.argmax(heights))
+        highest = max(events, key=lambda e: float(e["v"]))
+        assert float(highest["v"]) == pytest.approx(heights[top], abs=0.005)
+        event_time = datetime.strptime(highest["t"], "%Y-%m-%d %H:%M")
+        assert abs(event_time - times[top].replace(tzinfo=None)) <= timedelta(minutes=1)
+
+    @pytest.mark.unit
+    def test_missing_constituents_returns_none(self, station_file):
+        assert tide_predictor.predict_hilo(DAY, DAY + timedelta(days=1), "0000000") is None
+        assert tide_predictor.predict_curve(DAY, DAY + timedelta(days=1), station_id="0000000") is None
+
+    @pytest.mark.unit
+    def test_refreshed_files_are_marked_published(self, station_file):
+        published = station_file([("M2", 1.5, 100.0)])
+        approximate = station_file([("M2", 1.5, 100.0)], station_id="9999998", source="Approximate")
+
+        assert tide_predictor.get_station(published).published
+        assert not tide_predictor.get_station(approximate).published
+
+
+class TestCompareHilo:
+    """Tests for compare_hilo()."""
+
+    @pytest.mark.unit
+    def test_reports_worst_offsets(self):
+        ours = [
+            {"t": "2025-06-18 08:28", "v": "3.091", "type": "H"},
+            {"t": "2025-06-18 14:32", "v": "0.389", "type": "L"},
+        ]
+        noaa = [
+            {"t": "2025-06-18 08:40", "v": "3.200", "type": "H"},
+            {"t": "2025-06-18 14:30", "v": "0.350", "type": "L"},
+        ]
+        assert tide_predictor.compare_hilo(ours, noaa) == {
+            "max_minutes": 12.0, "max_feet": 0.11, "matched": 2,
+        }
+
+    @pytest.mark.unit
+    def test_nothing_matched(self):
+        assert tide_predictor.compare_hilo([], [{"t": "2025-06-18 08:40", "v": "3.2", "type": "H"}]) is None
+
+
+class TestCoastSkyTides:
+    """Tests for coast_sky_service tide sourcing."""
+
+    NOW = datetime(2025, 6, 18, 6, 55, tzinfo=TZ)
+
+    @pytest.mark.unit
+    def test_uses_harmonic_predictions(self, station_file):
+        station = station_file([("M2", 1.5, 100.0)])
+        with patch.object(coast_sky_service, "NOAA_STATION_ID", station), patch(
+            "coast_sky_service._fetch_noaa_data"
+        ) as noaa:
+            summary = coast_sky_service._get_tides(self.NOW)
+
+        noaa.assert_not_called()
+        assert summary["source"] == "harmonic"
+        assert summary["today_high_tides"] and summary["today_low_tides"]
+        assert summary["max_high_ft"] == pytest.approx(3.5, abs=0.15)  # f(M2) ~ 0.96 in 2025
+
+    @pytest.mark.unit
+    def test_unpublished_constituents_use_noaa(self, station_file):
+        station = station_file([("M2", 1.5, 100.0)], source="Approximate constants")
+        noaa = {"predictions": [{"t": "2025-06-18 04:12", "v": "3.4", "type": "H"}]}
+        with patch.object(coast_sky_service, "NOAA_STATION_ID", station), patch(
+            "coast_sky_service._fetch_noaa_data", return_value=noaa
+        ):
+            summary = coast_sky_service._get_tides(self.NOW)
+
+        assert summary["source"] == "noaa"
+        assert summary["max_high_ft"] == 3.4
+
+    @pytest.mark.unit
+    def test_falls_back_to_noaa(self):
+        noaa = {"predictions": [{"t": "2025-06-18 04:12", "v": "3.4", "type": "H"}]}
+        with patch("coast_sky_service._predict_tides", return_value=None), patch(
+            "coast_sky_service._fetch_noaa_data", return_value=noaa
+        ):
+            summary = coast_sky_service._get_tides(self.NOW)
+
+        assert summary["source"] == "noaa"
+        assert summary["max_high_ft"] == 3.4
@@ -66,6 +66,41 @@ class TestGetImagesForPeriod:
         assert len(result) == 3
 
 
+class TestDaylightImages:
+    """Tests for offline daylight filtering."""
+
+    @pytest.mark.unit
+    def test_collects_evening_from_next_utc_directory(self, tmp_path, monkeypatch):
+        """A summer evening after 00:00 UTC should still belong to the local day."""
+        archive = tmp_path / "archive"
+        names = {
+            "2025/06/15": ["img_cam_20250615_030000.jpg",  # 23:00 EDT on 6/14
+                           "img_cam_20250615_160000.jpg"],  # noon EDT
+            "2025/06/16": ["img_cam_20250616_000500.jpg",  # 20:05 EDT, before sunset
+                           "img_cam_20250616_020000.jpg",  # 22:00 EDT, dark
+                           "img_cam_20250616_160000.jpg"],  # noon on 6/16
+        }
+        for day, files in names.items():
+            day_dir = archive / day
+            day_dir.mkdir(parents=True)
+            for name in files:
+                (day_dir / name).touch()
+        monkeypatch.setattr(timelapse, "ARCHIVE_ROOT", str(archive))
+
+        from datetime import date
+        result = [os.path.basename(p) for p in timelapse.get_daylight_images_for_date(date(2025, 6, 15))]
+
+        assert result == ["img_cam_20250615_160000.jpg", "img_cam_20250616_000500.jpg"]
+
+    @pytest.mark.unit
+    def test_sunrise_sunset_uses_target_date(self):
+        """Sunrise/sunset should differ between winter and summer dates."""
+        winter = timelapse.get_sunrise_sunset(datetime(2025, 12, 21))
+        summer = timelapse.get_sunrise_sunset(datetime(2025, 6, 21))
+        assert (summer[1] - summer[0]) > (winter[1] - winter[0]) + timedelta(hours=4)
+        assert winter[0].date() == datetime(2025, 12, 21).date()
+
+
 class TestCreateTimelapseGif:
     """Tests for create_timelapse_gif() function."""
 
@@ -151,3 +186,78 @@ class TestCreateTimelapseGif:
 
         assert output_path.exists()
         assert output_path.stat().st_size > 0
+
+
+def _noisy_frames(count=12, size=(120, 80)):
+    """Frames with enough detail that GIF size tracks the encode settings."""
+    from PIL import Image
+
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)
+    return [
+        Image.fromarray(np.clip(base.astype(int) + i * 5, 0, 255).astype(np.uint8))
+        for i in range(count)
+    ]
+
+
+class TestEncodeToBudget:
+    """Tests for the size-budgeted GIF encoder."""
+
+    @pytest.mark.unit
+    def test_generous_budget_keeps_full_quality(self):
+        frames = _noisy_frames()
+        result = timelapse.encode_to_budget(frames, budget_bytes=50 * 1024 * 1024)
+
+        assert result.within_budget
+        assert (result.width, result.frames, result.colors) == (120, 12, 128)
+        assert result.gif[:3] == b"GIF"
+
+    @pytest.mark.unit
+    def test_tight_budget_shrinks_output(self):
+        frames = _noisy_frames()
+        full = timelapse.encode_to_budget(frames, budget_bytes=50 * 1024 * 1024)
+        budget = len(full.gif) // 2
+
+        result = timelapse.encode_to_budget(frames, budget_bytes=budget)
+
+        assert result.within_budget
+        assert len(result.gif) <= budget
+        assert result.attempts <= timelapse.BUDGET_MAX_ATTEMPTS
+        assert (result.width, result.frames, result.colors) != (120, 12, 128)
+
+    @pytest.mark.unit
+    def test_impossible_budget_returns_smallest_attempt(self):
+        result = timelapse.encode_to_budget(_noisy_frames(), budget_bytes=100)
+
+        assert not result.within_budget
+        assert result.colors == timelapse.BUDGET_STEPS[-1][2]
+        assert result.gif[:3] == b"GIF"
+
+    @pytest.mark.unit
+    def test_alternate_format(self):
+        from PIL import features
+
+        if not features.check("webp"):
+            pytest.skip("Pillow built without WebP")
+        result = timelapse.encode_to_budget(
+            _noisy_frames(), budget_bytes=50 * 1024 * 1024, alt_format="webp"
+        )
+
+        assert result.alt_format == "webp"
+        assert result.alt_bytes[:4] == b"RIFF"
+
+    @pytest.mark.unit
+    def test_create_budgeted_timelapse_writes_files(self, tmp_path):
+        images = []
+        for i, frame in enumerate(_noisy_frames(count=5)):
+            path = tmp_path / f"image_{i}.jpg"
+            frame.save(str(path))
+            images.append(str(path))
+
+        output_path = tmp_path / "daily.gif"
+        result = timelapse.create_budgeted_timelapse(
+            images, budget_bytes=1024 * 1024, output_path=str(output_path)
+        )
+
+        assert result is not None
+        assert output_path.read_bytes() == result.gif
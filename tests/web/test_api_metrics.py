@@ -0,0 +1,39 @@
+"""Tests for /api/metrics/llm endpoint."""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import llm_metrics
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class TestLLMMetricsEndpoint:
+    """Tests for GET /api/metrics/llm."""
+
+    @pytest.mark.unit
+    def test_returns_summary(self):
+        llm_metrics.record("narrative", 4.2, model="flash", prompt_tokens=1000, output_tokens=250)
+        from web.api.routers.metrics import get_llm_metrics
+
+        result = _run(get_llm_metrics(hours=6))
+
+        assert result["window_hours"] == 6
+        assert result["purposes"]["narrative"]["calls"] == 1
+        assert result["total"]["output_tokens"] == 250
+
+    @pytest.mark.unit
+    def test_rejects_bad_window(self):
+        from web.api.routers.metrics import get_llm_metrics
+
+        with pytest.raises(HTTPException) as exc:
+            _run(get_llm_metrics(hours=0))
+        assert exc.value.status_code == 400
@@ -126,6 +126,31 @@ class TestLeaderboardEndpoint:
         finally:
             del sys.modules["scorekeeper"]
 
+    @pytest.mark.unit
+    def test_alltime_view(self):
+        """Should pass the view through and reject unknown views."""
+        import sys
+        mock_sk = MagicMock()
+        mock_sk.get_leaderboard.return_value = [
+            {"email": "josh@test.com", "display_name": "josh", "points": 40, "wins": 9, "streak": 4},
+        ]
+        sys.modules["scorekeeper"] = mock_sk
+        
+        try:
+            from fastapi import HTTPException
+            from web.api.routers.riddle import get_leaderboard
+            import asyncio
+            
+            result = asyncio.get_event_loop().run_until_complete(get_leaderboard(view="alltime"))
+            
+            assert mock_sk.get_leaderboard.call_args.kwargs["view"] == "alltime"
+            assert (result["view"], result["players"][0]["streak"]) == ("alltime", 4)
+            with pytest.raises(HTTPException) as exc:
+                asyncio.get_event_loop().run_until_complete(get_leaderboard(view="weekly"))
+            assert exc.value.status_code == 400
+        finally:
+            del sys.modules["scorekeeper"]
+
 
 class TestUserExtraction:
     """Tests for get_user_email function."""
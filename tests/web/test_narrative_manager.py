@@ -1,5 +1,6 @@
 """Tests for NarrativeManager service."""
 
+import asyncio
 import json
 import os
 import sys
@@ -166,3 +167,106 @@ class TestCachedNarrative:
         assert result["body"] == "Test body."
         assert result["cached"] is True
         assert "2026-01-18" in result["generated_at"]
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class TestBackgroundRefresh:
+    """Tests for condition-driven background regeneration."""
+
+    BASIS = {"temps": {"interior_temp": 70.0}, "flags": ["heat"], "offline": []}
+
+    @pytest.fixture
+    def nm(self, tmp_path, monkeypatch):
+        from web.api.services import narrative_manager as nm
+        monkeypatch.setattr(nm, "CACHE_PATH", str(tmp_path / "narrative_cache.json"))
+        monkeypatch.setattr(nm, "LOCK_PATH", str(tmp_path / "narrative_generation.lock"))
+        monkeypatch.setattr(nm, "RATE_LIMIT_PATH", str(tmp_path / "narrative_rate_limit.json"))
+        monkeypatch.setattr(nm, "settings", None)
+        monkeypatch.setattr(nm.NarrativeManager, "_is_blackout_window", lambda self: False)
+        return nm
+
+    def _manager(self, nm, age_minutes, basis, current):
+        """Manager with a cached narrative of the given age and conditions now equal to ``current``."""
+        nm.atomic_write_json(nm.CACHE_PATH, {
+            "subject": "Old", "headline": "Old", "body": "Old.",
+            "generated_at": (datetime.utcnow() - timedelta(minutes=age_minutes)).isoformat() + "Z",
+            "basis": basis,
+        })
+        manager = nm.NarrativeManager()
+        manager._load_inputs = MagicMock(return_value=({}, {}))
+        manager.generated = []
+
+        async def generate(sensor_data=None, basis=None):
+            manager.generated.append(basis)
+            return nm.CachedNarrative("New", "New", "New.", datetime.utcnow(), basis=basis)
+
+        manager._generate_narrative_async = generate
+        return manager, patch.object(nm, "conditions_basis", return_value=current)
+
+    @pytest.mark.unit
+    def test_conditions_changes(self, nm):
+        after = {"temps": {"interior_temp": 75.5}, "flags": ["heat", "storm"], "offline": ["satellite"]}
+
+        assert nm.conditions_changes(self.BASIS, after) == [
+            "interior_temp 70.0->75.5", "new flag storm", "satellite offline",
+        ]
+        assert nm.conditions_changes(self.BASIS, {**self.BASIS, "temps": {"interior_temp": 74.0}}) == []
+        assert nm.conditions_changes(self.BASIS, {**self.BASIS, "flags": []}) == []
+
+    @pytest.mark.unit
+    def test_offline_devices(self, nm):
+        recent = datetime.utcnow().isoformat() + "Z"
+        old = (datetime.utcnow() - timedelta(hours=3)).isoformat() + "Z"
+
+        assert nm._offline_devices({
+            "interior_temp": recent, "satellite_temp": old, "satellite_battery": old, "exterior_temp": old,
+            "exterior_humidity": recent,
+        }) == ["satellite"]
+
+    @pytest.mark.unit
+    def test_unchanged_conditions_not_regenerated(self, nm):
+        manager, basis = self._manager(nm, 10, self.BASIS, self.BASIS)
+        with basis:
+            assert _run(manager.refresh_if_changed()) is None
+        assert manager.generated == []
+
+    @pytest.mark.unit
+    def test_changed_conditions_regenerate(self, nm):
+        current = {**self.BASIS, "flags": ["heat", "storm"]}
+        manager, basis = self._manager(nm, 10, self.BASIS, current)
+        with basis:
+            assert _run(manager.refresh_if_changed()) == ["new flag storm"]
+
+        assert manager.generated == [current]
+        assert nm.NarrativeManager()._cache.basis == current  # Persisted for other workers
+        assert len(nm.atomic_read_json(nm.RATE_LIMIT_PATH)["timestamps"]) == 1
+
+    @pytest.mark.unit
+    def test_respects_rate_limit(self, nm):
+        nm.atomic_write_json(nm.RATE_LIMIT_PATH, {"timestamps": [datetime.utcnow().isoformat() + "Z"] * 4})
+        manager, basis = self._manager(nm, 10, self.BASIS, {**self.BASIS, "offline": ["exterior"]})
+        with basis:
+            assert _run(manager.refresh_if_changed()) is None
+        assert manager.generated == []
+
+    @pytest.mark.unit
+    def test_stale_page_load_served_from_cache(self, nm):
+        manager, basis = self._manager(nm, 120, self.BASIS, self.BASIS)
+
+        async def page_load():
+            result = await manager.get_narrative_async()
+            await manager._refresh_task
+            return result
+
+        with basis:
+            result = _run(page_load())
+
+        assert (result["subject"], result["cached"], result["refreshing"]) == ("Old", True, True)
+        assert manager._cache.subject == "New"
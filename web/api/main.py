@@ -7,6 +7,7 @@ Usage:
     uvicorn web.api.main:app --host 0.0.0.0 --port 8000
 """
 
+import asyncio
 import os
 import sys
 from contextlib import asynccontextmanager
@@ -25,8 +26,10 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
 
+import email_assets
 from utils.logger import create_logger
-from web.api.routers import status, narrative, riddle, charts, camera, stream
+from web.api.routers import status, narrative, riddle, charts, camera, stream, metrics
+from web.api.services import narrative_manager
 
 log = create_logger("web_api")
 
@@ -38,7 +41,13 @@ limiter = Limiter(key_func=get_remote_address)
 async def lifespan(app: FastAPI):
     """Application lifespan handler for startup/shutdown."""
     log("Starting Greenhouse Gazette Web API")
+    refresher = None
+    if narrative_manager.REFRESH_CHECK_SECONDS > 0:
+        # Regenerate the narrative ahead of visitors when conditions change
+        refresher = asyncio.create_task(narrative_manager.get_narrative_manager().run_refresher())
     yield
+    if refresher is not None:
+        refresher.cancel()
     log("Shutting down Greenhouse Gazette Web API")
 
 
@@ -75,6 +84,7 @@ app.include_router(riddle.router, prefix="/api", tags=["Riddle"])
 app.include_router(charts.router, prefix="/api", tags=["Charts"])
 app.include_router(camera.router, prefix="/api", tags=["Camera"])
 app.include_router(stream.router, prefix="/api", tags=["Stream"])
+app.include_router(metrics.router, prefix="/api", tags=["Metrics"])
 
 
 @app.get("/api/health")
@@ -96,6 +106,22 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 
+class ImmutableStaticFiles(StaticFiles):
+    """Static files whose names are content hashes, so they can be cached for good."""
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+# Email images published by email_assets (EMAIL_ASSET_MODE=hosted)
+app.mount(
+    "/static/email",
+    ImmutableStaticFiles(directory=email_assets.asset_dir(), check_dir=False),
+    name="email_assets",
+)
+
 # Mount timelapse static files
 TIMELAPSE_DIR = PROJECT_ROOT / "data" / "www" / "timelapses"
 if TIMELAPSE_DIR.exists():
@@ -0,0 +1,44 @@
+"""LLM metrics API endpoint.
+
+Exposes the rolling Gemini call metrics (llm_metrics.py) written by every
+process: latency, fallbacks, tokens and failure reasons per purpose.
+"""
+
+from typing import Any, Dict
+
+from fastapi import APIRouter, HTTPException
+
+import llm_metrics
+from utils.logger import create_logger
+
+log = create_logger("api_metrics")
+
+router = APIRouter()
+
+
+@router.get("/metrics/llm")
+async def get_llm_metrics(hours: int = 24) -> Dict[str, Any]:
+    """Get LLM call metrics for the last ``hours`` hours.
+    
+    Args:
+        hours: Window size, 1 to 336 (two weeks of retention)
+    
+    Returns:
+        {
+            "window_hours": 24,
+            "purposes": {"narrative": {calls, failures, fallbacks, fallback_rate,
+                         latency_s_avg/p50/p90, ttft_s_avg, latency_hist,
+                         prompt/cached/output_tokens, models, errors}, ...},
+            "total": { same fields, all purposes },
+            "hourly": [{"hour", "calls", "failures", "fallbacks", "latency_s_avg"}],
+            "daily_tokens": {"2026-01-25": {"narrative": 5120, ...}}
+        }
+    """
+    if not 1 <= hours <= llm_metrics.RETENTION_HOURS:
+        raise HTTPException(
+            status_code=400,
+            detail={"error": "invalid_window", "message": f"hours must be 1-{llm_metrics.RETENTION_HOURS}"},
+        )
+    summary = llm_metrics.summarize(hours)
+    log(f"LLM metrics request: {summary['total']['calls']} calls in {hours}h")
+    return summary
@@ -21,10 +21,11 @@ limiter = Limiter(key_func=get_remote_address)
 
 @router.get("/narrative")
 async def get_narrative() -> Dict[str, Any]:
-    """Get current narrative, auto-generating if stale.
+    """Get current narrative without waiting for generation.
     
-    Returns cached narrative if fresh, or triggers regeneration
-    if older than 60 minutes (subject to rate limits and blackout windows).
+    Always answers from cache. A narrative older than 60 minutes is
+    regenerated in the background (subject to rate limits and blackout
+    windows) and returned meanwhile with "refreshing": true.
     
     Returns:
         {
@@ -33,11 +34,12 @@ async def get_narrative() -> Dict[str, Any]:
             "body": "...",
             "generated_at": "ISO timestamp",
             "cached": bool,
-            "next_refresh_allowed_at": "ISO timestamp" (optional)
+            "next_refresh_allowed_at": "ISO timestamp" (optional),
+            "refreshing": bool (optional)
         }
     """
     manager = get_narrative_manager()
-    result = manager.get_narrative(force_refresh=False)
+    result = await manager.get_narrative_async(force_refresh=False)
     
     log(f"Narrative request: cached={result.get('cached', False)}")
     return result
@@ -54,7 +56,7 @@ async def refresh_narrative(request: Request) -> Dict[str, Any]:
         Same schema as GET /narrative, or 429 if rate limited.
     """
     manager = get_narrative_manager()
-    result = manager.get_narrative(force_refresh=True)
+    result = await manager.get_narrative_async(force_refresh=True)
     
     if result.get("rate_limited"):
         raise HTTPException(
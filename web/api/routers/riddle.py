@@ -222,11 +222,12 @@ async def submit_guess(request: Request, body: GuessRequest) -> Dict[str, Any]:
     
     # Judge the guess
     try:
-        # narrator.judge_riddle returns {"correct": bool, "reply_text": str}
-        judge_result = narrator.judge_riddle(
+        # narrator.judge_riddle_async returns {"correct": bool, "reply_text": str}
+        judge_result = await narrator.judge_riddle_async(
             guess,
             riddle_state.get("answer", ""),
             riddle_text,
+            riddle_date=riddle_date,
         )
         is_correct = judge_result.get("correct", False)
         feedback = judge_result.get("reply_text", "")
@@ -271,21 +272,35 @@ async def submit_guess(request: Request, body: GuessRequest) -> Dict[str, Any]:
     }
 
 
+LEADERBOARD_VIEWS = ("season", "alltime")
+
+
 @router.get("/leaderboard")
-async def get_leaderboard() -> Dict[str, Any]:
+async def get_leaderboard(view: str = "season") -> Dict[str, Any]:
     """Get the riddle game leaderboard.
     
+    Args:
+        view: "season" (default) or "alltime"
+    
     Returns:
         {
             "season_start": "YYYY-MM-DD",
+            "view": "season" | "alltime",
             "players": [
-                { "display_name": "...", "points": int, "wins": int }
+                { "display_name": "...", "points": int, "wins": int, "streak": int }
             ]
         }
     """
+    if view not in LEADERBOARD_VIEWS:
+        raise HTTPException(
+            status_code=400,
+            detail={"error": "invalid_view", "message": f"view must be one of {', '.join(LEADERBOARD_VIEWS)}."},
+        )
+    
     try:
         import scorekeeper
-        leaderboard = scorekeeper.get_leaderboard()
+        # A few extra in case anonymous entries are filtered out below
+        leaderboard = scorekeeper.get_leaderboard(top_n=15, view=view)
     except Exception as e:
         log(f"Get leaderboard failed: {e}")
         leaderboard = []
@@ -301,6 +316,7 @@ async def get_leaderboard() -> Dict[str, Any]:
             "display_name": display_name,
             "points": entry.get("points", 0),
             "wins": entry.get("wins", 0),
+            "streak": entry.get("streak", 0),
         })
         if len(players) >= 10:  # Top 10
             break
@@ -313,6 +329,7 @@ async def get_leaderboard() -> Dict[str, Any]:
     
     return {
         "season_start": season_start,
+        "view": view,
         "players": players,
     }
 
@@ -327,7 +344,12 @@ async def get_player_stats(request: Request) -> Dict[str, Any]:
             "points": int,
             "wins": int,
             "rank": int,
-            "last_played": "YYYY-MM-DD"
+            "last_played": "YYYY-MM-DD",
+            "current_streak": int,
+            "best_streak": int,
+            "alltime_points": int,
+            "alltime_wins": int,
+            "alltime_rank": int
         }
     """
     user_email = get_user_email(request)
@@ -355,12 +377,22 @@ async def get_player_stats(request: Request) -> Dict[str, Any]:
             "wins": 0,
             "rank": 0,
             "last_played": None,
+            "current_streak": 0,
+            "best_streak": 0,
+            "alltime_points": 0,
+            "alltime_wins": 0,
+            "alltime_rank": 0,
         }
     
     return {
         "display_name": stats.get("display_name", user_email.split("@")[0]),
         "points": stats.get("points", 0),
         "wins": stats.get("wins", 0),
-        "rank": stats.get("rank", 0),
+        "rank": stats.get("rank") or 0,
         "last_played": stats.get("last_played"),
+        "current_streak": stats.get("current_streak", 0),
+        "best_streak": stats.get("best_streak", 0),
+        "alltime_points": stats.get("alltime_points", 0),
+        "alltime_wins": stats.get("alltime_wins", 0),
+        "alltime_rank": stats.get("alltime_rank") or 0,
     }
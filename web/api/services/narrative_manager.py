@@ -5,14 +5,27 @@ Responsibilities:
 - Enforce rate limits (4/hour)
 - Prevent concurrent generation (file lock)
 - Blackout window around daily email
+- Background refresh when conditions change
+
+Routes use the async methods: generation awaits the LLM gateway instead
+of blocking the event loop or a worker thread. Page loads never wait for
+generation: a stale narrative is served from cache while a refresh runs
+in the background.
+
+The web app's refresher (run_refresher) checks conditions every
+REFRESH_CHECK_SECONDS and regenerates ahead of visitors when they have
+moved since the cached narrative was written: a temperature change of
+TEMP_CHANGE_F or more, a new knowledge-graph flag, or a device going
+offline. Rate limit, blackout window and lock apply as for any refresh.
 """
 
+import asyncio
 import fcntl
 import os
 import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from utils.io import atomic_read_json, atomic_write_json
 from utils.logger import create_logger
@@ -31,6 +44,65 @@ MAX_GENERATIONS_PER_HOUR = 4
 BLACKOUT_BEFORE_EMAIL_MINUTES = 30
 EMAIL_HOUR = 7  # 07:00 local time
 
+# Background refresh
+REFRESH_CHECK_SECONDS = int(os.getenv("NARRATIVE_REFRESH_CHECK_SECONDS", "300"))  # 0 disables
+TEMP_CHANGE_F = 5.0
+TEMP_KEYS = ("interior_temp", "exterior_temp", "outdoor_temp")
+DEVICE_OFFLINE_SECONDS = 7200  # Same threshold as the status API's staleness flag
+
+
+def _offline_devices(last_seen: Dict[str, str]) -> List[str]:
+    """Devices (sensor key prefix) none of whose sensors reported within DEVICE_OFFLINE_SECONDS."""
+    cutoff = datetime.utcnow() - timedelta(seconds=DEVICE_OFFLINE_SECONDS)
+    online: Dict[str, bool] = {}
+    for key, ts in last_seen.items():
+        device = key.split("_")[0]
+        try:
+            seen = datetime.fromisoformat(ts.replace("Z", "")) > cutoff
+        except (AttributeError, TypeError, ValueError):
+            seen = False
+        online[device] = online.get(device, False) or seen
+    return sorted(device for device, is_online in online.items() if not is_online)
+
+
+def conditions_basis(sensor_data: Dict[str, Any], last_seen: Dict[str, str]) -> Dict[str, Any]:
+    """The conditions a narrative was written from, as compared by the refresher.
+
+    Returns:
+        {"temps": {key: °F}, "flags": [knowledge-graph rule ids], "offline": [devices]}
+    """
+    temps = {
+        key: round(float(sensor_data[key]), 1)
+        for key in TEMP_KEYS
+        if isinstance(sensor_data.get(key), (int, float))
+    }
+    flags: List[str] = []
+    try:
+        import context_engine
+
+        # Every matching rule, without get_rich_context's random season sampling
+        [matches] = context_engine.evaluate_context_batch(
+            [(datetime.now(), sensor_data, sensor_data.get("sound_level") or {})]
+        )
+        flags = sorted({str(m["id"]) for m in matches if m.get("kind") != "micro_seasons"})
+    except Exception as e:
+        log(f"Context flags unavailable for refresh check: {e}")
+    return {"temps": temps, "flags": flags, "offline": _offline_devices(last_seen)}
+
+
+def conditions_changes(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> List[str]:
+    """Why a narrative written from ``old`` no longer fits ``new`` (empty if it still does)."""
+    if not old:
+        return ["no recorded conditions"]
+    reasons = []
+    for key, value in new["temps"].items():
+        before = old.get("temps", {}).get(key)
+        if before is not None and abs(value - before) >= TEMP_CHANGE_F:
+            reasons.append(f"{key} {before}->{value}")
+    reasons += [f"new flag {flag}" for flag in new["flags"] if flag not in old.get("flags", [])]
+    reasons += [f"{device} offline" for device in new["offline"] if device not in old.get("offline", [])]
+    return reasons
+
 
 @dataclass
 class CachedNarrative:
@@ -41,6 +113,7 @@ class CachedNarrative:
     body: str
     generated_at: datetime
     cached: bool = False
+    basis: Optional[Dict[str, Any]] = None  # conditions_basis() at generation
     
     def is_stale(self) -> bool:
         """Check if narrative is older than MAX_AGE_MINUTES."""
@@ -74,10 +147,16 @@ class NarrativeManager:
     
     def __init__(self):
         self._cache: Optional[CachedNarrative] = None
+        self._cache_mtime: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
         self._load_cache()
     
     def _load_cache(self) -> None:
         """Load cached narrative from disk."""
+        try:
+            self._cache_mtime = os.path.getmtime(CACHE_PATH)
+        except OSError:
+            self._cache_mtime = None
         data = atomic_read_json(CACHE_PATH, default=None)
         if data and "generated_at" in data:
             try:
@@ -92,6 +171,7 @@ class NarrativeManager:
                     headline=data.get("headline", ""),
                     body=data.get("body", ""),
                     generated_at=datetime.fromisoformat(generated_at_str),
+                    basis=data.get("basis"),
                 )
                 log(f"Loaded cached narrative from {self._cache.generated_at}")
             except Exception as e:
@@ -99,7 +179,20 @@ class NarrativeManager:
     
     def _save_cache(self, narrative: CachedNarrative) -> None:
         """Persist narrative to disk."""
-        atomic_write_json(CACHE_PATH, narrative.to_dict())
+        atomic_write_json(CACHE_PATH, {**narrative.to_dict(), "basis": narrative.basis})
+        try:
+            self._cache_mtime = os.path.getmtime(CACHE_PATH)
+        except OSError:
+            pass
+    
+    def _reload_if_changed(self) -> None:
+        """Pick up a narrative another worker process wrote."""
+        try:
+            mtime = os.path.getmtime(CACHE_PATH)
+        except OSError:
+            return
+        if mtime != self._cache_mtime:
+            self._load_cache()
     
     def _is_blackout_window(self) -> bool:
         """Check if we're within blackout period before daily email."""
@@ -181,40 +274,111 @@ class NarrativeManager:
         Returns:
             Narrative dict with metadata
         """
+        result = self._without_generation(force_refresh)
+        if result is not None:
+            return result
+        return self._generate_with_lock()
+    
+    async def get_narrative_async(self, force_refresh: bool = False) -> Dict[str, Any]:
+        """Async get_narrative() for API routes.
+        
+        Without force_refresh this never waits for generation: a stale or
+        missing narrative is refreshed in the background and the cached
+        copy (or the fallback) is returned with ``refreshing`` set.
+        """
+        self._reload_if_changed()
+        if not force_refresh:
+            if self._cache is None or self._cache.is_stale():
+                self._start_refresh()
+                return self._cached_with(refreshing=True)
+            return self._cache.to_dict()
+        
+        result = self._without_generation(force_refresh)
+        if result is not None:
+            return result
+        return await self._generate_with_lock_async()
+    
+    def _start_refresh(self) -> "asyncio.Task":
+        """Start a background refresh_if_changed() unless one is running."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_running_loop().create_task(self.refresh_if_changed())
+        return self._refresh_task
+    
+    async def refresh_if_changed(self) -> Optional[List[str]]:
+        """Regenerate if the narrative is stale or conditions have moved since it was written.
+        
+        Returns:
+            Reasons for the regeneration, or None if nothing was generated
+        """
+        try:
+            sensor_data, last_seen = await asyncio.to_thread(self._load_inputs)
+            basis = await asyncio.to_thread(conditions_basis, sensor_data, last_seen)
+            
+            def reasons() -> List[str]:
+                if self._cache is None or self._cache.is_stale():
+                    return ["stale"]
+                return conditions_changes(self._cache.basis, basis)
+            
+            self._reload_if_changed()
+            if not reasons():
+                return None
+            if self._is_blackout_window():
+                log("Blackout window active, background refresh skipped")
+                return None
+            allowed, retry_after = self._check_rate_limit()
+            if not allowed:
+                log(f"Rate limited, background refresh skipped (retry in {retry_after}s)")
+                return None
+            
+            lock_fd = self._try_lock()
+            if lock_fd is None:
+                return None
+            try:
+                self._reload_if_changed()  # Another worker may have just finished
+                why = reasons()
+                if not why:
+                    return None
+                log(f"Background refresh: {', '.join(why)}")
+                self._store(await self._generate_narrative_async(sensor_data, basis))
+                return why
+            finally:
+                self._unlock(lock_fd)
+        except Exception as e:
+            log(f"Background refresh failed: {e}")
+            return None
+    
+    async def run_refresher(self, interval_s: float = REFRESH_CHECK_SECONDS) -> None:
+        """Check conditions every ``interval_s`` until cancelled (started by the web app)."""
+        log(f"Narrative refresher running every {interval_s:.0f}s")
+        while True:
+            await self._start_refresh()
+            await asyncio.sleep(interval_s)
+    
+    def _without_generation(self, force_refresh: bool) -> Optional[Dict[str, Any]]:
+        """Response that needs no generation, or None if one should be attempted."""
         # Check if refresh is needed/allowed
         need_refresh = force_refresh or (self._cache is None) or self._cache.is_stale()
         
         if need_refresh:
             if self._is_blackout_window():
                 log("Blackout window active, using cache")
-                if self._cache:
-                    result = self._cache.to_dict()
-                    result["cached"] = True
-                    result["blackout"] = True
-                    return result
-                return self._fallback_narrative()
+                return self._cached_with(blackout=True)
             
             allowed, retry_after = self._check_rate_limit()
             if not allowed:
                 log(f"Rate limited, retry in {retry_after}s")
-                if self._cache:
-                    result = self._cache.to_dict()
-                    result["cached"] = True
-                    result["rate_limited"] = True
-                    result["retry_after"] = retry_after
-                    return result
-                return self._fallback_narrative()
+                return self._cached_with(rate_limited=True, retry_after=retry_after)
             
             # Attempt generation with file lock
-            return self._generate_with_lock()
+            return None
         
         # Return cached version
         if self._cache:
             return self._cache.to_dict()
         return self._fallback_narrative()
     
-    def _generate_with_lock(self) -> Dict[str, Any]:
-        """Generate narrative with file-based lock."""
+    def _try_lock(self):
+        """Take the generation file lock without blocking; None if held elsewhere."""
         # Ensure lock directory exists
         os.makedirs(os.path.dirname(LOCK_PATH) or ".", exist_ok=True)
         
@@ -222,36 +386,111 @@ class NarrativeManager:
             lock_fd = open(LOCK_PATH, "w")
             # Non-blocking lock attempt
             fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return lock_fd
         except (IOError, BlockingIOError, OSError):
             log("Generation already in progress")
-            if self._cache:
-                result = self._cache.to_dict()
-                result["cached"] = True
-                result["generation_in_progress"] = True
-                return result
+            return None
+    
+    @staticmethod
+    def _unlock(lock_fd) -> None:
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_UN)
+            lock_fd.close()
+        except Exception:
+            pass
+    
+    def _cached_with(self, **flags: Any) -> Dict[str, Any]:
+        """Cached narrative marked with flags, or the fallback if there is none."""
+        if not self._cache:
             return self._fallback_narrative()
-        
+        result = self._cache.to_dict()
+        result["cached"] = True
+        result.update(flags)
+        return result
+    
+    def _store(self, narrative: "CachedNarrative") -> Dict[str, Any]:
+        self._cache = narrative
+        self._save_cache(narrative)
+        self._record_generation()
+        return narrative.to_dict()
+    
+    def _generate_with_lock(self) -> Dict[str, Any]:
+        """Generate narrative with file-based lock."""
+        lock_fd = self._try_lock()
+        if lock_fd is None:
+            return self._cached_with(generation_in_progress=True)
         try:
-            # Do the actual generation
-            narrative = self._generate_narrative()
-            self._cache = narrative
-            self._save_cache(narrative)
-            self._record_generation()
-            return narrative.to_dict()
+            return self._store(self._generate_narrative())
         except Exception as e:
             log(f"Generation failed: {e}")
-            if self._cache:
-                result = self._cache.to_dict()
-                result["cached"] = True
-                result["error"] = str(e)
-                return result
-            return self._fallback_narrative()
+            return self._cached_with(error=str(e))
         finally:
-            try:
-                fcntl.flock(lock_fd, fcntl.LOCK_UN)
-                lock_fd.close()
-            except Exception:
-                pass
+            self._unlock(lock_fd)
+    
+    async def _generate_with_lock_async(self) -> Dict[str, Any]:
+        """Async _generate_with_lock()."""
+        lock_fd = self._try_lock()
+        if lock_fd is None:
+            return self._cached_with(generation_in_progress=True)
+        try:
+            return self._store(await self._generate_narrative_async())
+        except Exception as e:
+            log(f"Generation failed: {e}")
+            return self._cached_with(error=str(e))
+        finally:
+            self._unlock(lock_fd)
+    
+    @staticmethod
+    def _load_inputs() -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """(sensor snapshot merged with current weather, sensor last-seen timestamps)."""
+        from publisher import load_latest_sensor_snapshot
+        
+        # Load current sensor data
+        snapshot = load_latest_sensor_snapshot()
+        sensor_data = snapshot.get("sensors", {})
+        last_seen = snapshot.get("last_seen") or {}
+
+        # Outdoor conditions come from the shared fetch cache, so this
+        # reuses the publisher's OpenWeather call when it's recent
+        import weather_service
+        weather = weather_service.get_current_weather()
+        if weather:
+            sensor_data = {**sensor_data, **weather}
+        return sensor_data, last_seen
+    
+    async def _generate_narrative_async(
+        self,
+        sensor_data: Optional[Dict[str, Any]] = None,
+        basis: Optional[Dict[str, Any]] = None,
+    ) -> "CachedNarrative":
+        """Generate fresh narrative through the LLM gateway without blocking the loop.
+        
+        Args:
+            sensor_data: Inputs already loaded by the caller (default: load them)
+            basis: conditions_basis() of those inputs
+        """
+        log("Generating fresh narrative...")
+        
+        try:
+            import narrator
+            
+            # Snapshot and weather reads may touch disk or the network
+            if sensor_data is None:
+                sensor_data, last_seen = await asyncio.to_thread(self._load_inputs)
+                basis = await asyncio.to_thread(conditions_basis, sensor_data, last_seen)
+            subject, headline, body = await narrator.generate_narrative_only_async(sensor_data)
+            
+            return CachedNarrative(
+                subject=subject,
+                headline=headline,
+                body=body,
+                generated_at=datetime.utcnow(),
+                cached=False,
+                basis=basis,
+            )
+        except Exception as e:
+            log(f"Narrative generation failed: {e}")
+            raise
     
     def _generate_narrative(self) -> CachedNarrative:
         """Generate fresh narrative using narrator module."""
@@ -259,12 +498,9 @@ class NarrativeManager:
         
         try:
             import narrator
-            from publisher import load_latest_sensor_snapshot
-            
-            # Load current sensor data
-            snapshot = load_latest_sensor_snapshot()
-            sensor_data = snapshot.get("sensors", {})
             
+            sensor_data, last_seen = self._load_inputs()
+
             # Call generate_narrative_only if available, otherwise use generate_update
             if hasattr(narrator, "generate_narrative_only"):
                 subject, headline, body = narrator.generate_narrative_only(sensor_data)
@@ -281,6 +517,7 @@ class NarrativeManager:
                 body=body,
                 generated_at=datetime.utcnow(),
                 cached=False,
+                basis=conditions_basis(sensor_data, last_seen),
             )
         except Exception as e:
             log(f"Narrative generation failed: {e}")